@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 import logging
+from ttl_cache import TTLCache
 
 @dataclass
 class ChannelConfig:
@@ -34,7 +35,7 @@ class AdvancedChannelManager:
     
     def __init__(self):
         self.channels = self._setup_channels()
-        self.message_cache = {}
+        self.message_cache = TTLCache('channel_messages', ttl=3600, max_entries=2048)
         self.rate_limits = {}
         self.performance_metrics = {}
         
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Alert Performance Tracker
+Scores every scanner/bot alert against the price action that followed.
+Alerts land in their own SQLite database; a background loop (one
+process at a time) prices all open alerts from the shared price oracle in
+one batch and updates max favourable/adverse excursion (max_gain /
+max_loss) with array math, resolving each alert when it reaches its
+target, its stop, or its horizon. Scanners also record near-miss
+candidates (sent=0) so hit-rate and expectancy can be read per alert
+type at thresholds below the current alert cut-off.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from service_base import PeriodicWorker, Singleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+ALERT_DB_PATH = os.getenv('ALERT_PERFORMANCE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                          'alert_performance.db'))
+ALERT_TRACK_INTERVAL = int(os.getenv('ALERT_TRACK_INTERVAL', '60'))
+ALERT_HORIZON_HOURS = float(os.getenv('ALERT_HORIZON_HOURS', '24'))
+ALERT_TARGET_PCT = float(os.getenv('ALERT_TARGET_PCT', '5'))
+ALERT_STOP_PCT = float(os.getenv('ALERT_STOP_PCT', '3'))
+ALERT_DEDUPE_SECONDS = int(os.getenv('ALERT_DEDUPE_SECONDS', '3600'))
+ALERT_SHADOW_MIN_SCORE = float(os.getenv('ALERT_SHADOW_MIN_SCORE', '50'))  # near-miss candidates worth tracking
+ALERT_MIN_SAMPLES = 20
+
+OPEN_STATUSES = ('pending_price', 'active')
+RESOLVED_STATUSES = ('target_hit', 'stopped', 'expired')
+
+# Default thresholds per score unit: scanner confidence (0-100), RSI extremity
+# (RSI for overbought calls, 100-RSI for oversold ones) and position PnL size in %
+SCORE_THRESHOLDS = {
+    'confidence': [50, 55, 60, 65, 70, 75, 80, 85, 90],
+    'rsi': [70, 72, 75, 78, 80, 85, 90],
+    'pnl_pct': [5, 8, 10, 15, 20, 25, 35, 50, 75, 100]
+}
+
+
+class AlertPerformanceTracker(SQLiteStore, PeriodicWorker):
+    """Records alerts and tracks their MFE/MAE and outcome from the shared price table"""
+
+    worker_name = 'alert-performance'
+
+    def __init__(self, db_path: str = ALERT_DB_PATH,
+                 price_source: Optional[Callable[[List[str]], Dict[str, Optional[float]]]] = None,
+                 update_interval: float = ALERT_TRACK_INTERVAL, horizon_hours: float = ALERT_HORIZON_HOURS,
+                 target_pct: float = ALERT_TARGET_PCT, stop_pct: float = ALERT_STOP_PCT,
+                 auto_start: bool = False):
+        self.price_source = price_source
+        self.update_interval = update_interval
+        self.horizon_hours = horizon_hours
+        self.target_pct = target_pct
+        self.stop_pct = stop_pct
+        self._update_lock = threading.Lock()
+        self._init_worker(auto_start)
+        self.stats = {'recorded': 0, 'deduped': 0, 'updates': 0, 'priced': 0, 'resolved': 0,
+                      'update_errors': 0, 'last_update': None}
+        super().__init__(db_path)
+
+    # ---- storage -----------------------------------------------------------
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS alert_performance (
+                alert_id TEXT PRIMARY KEY,
+                source TEXT,
+                alert_type TEXT,
+                symbol TEXT,
+                direction TEXT,
+                score REAL,
+                score_unit TEXT,
+                sent INTEGER,
+                entry_price REAL,
+                current_price REAL,
+                max_gain REAL,
+                max_loss REAL,
+                performance_score REAL,
+                outcome_pct REAL,
+                status TEXT,
+                target_pct REAL,
+                stop_pct REAL,
+                horizon_hours REAL,
+                created_at TIMESTAMP,
+                resolved_at TIMESTAMP,
+                created_ts REAL,
+                updated_ts REAL,
+                payload TEXT
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_alert_perf_status ON alert_performance (status)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_alert_perf_group ON alert_performance (source, alert_type, created_ts)')
+
+    # ---- recording ---------------------------------------------------------
+
+    def record_alert(self, source: str, alert_type: str, symbol: str, score: Optional[float] = None,
+                     entry_price: Optional[float] = None, direction: str = 'long', sent: bool = True,
+                     payload: Optional[Dict] = None, score_unit: str = 'confidence') -> Optional[str]:
+        """Start tracking an alert; returns its id.
+
+        A repeat of the same source/type/symbol while the first is still open
+        (within ALERT_DEDUPE_SECONDS) is folded into it, upgrading a near-miss
+        to sent if this one went out. Without an entry price the next update
+        fills it, so recording never touches the price source. `score_unit`
+        picks the default thresholds (SCORE_THRESHOLDS) the score is read at.
+        """
+        if not symbol:
+            return None
+        self._ensure_started()
+        symbol = symbol.upper()
+        now = time.time()
+        conn = self._conn()
+        duplicate = conn.execute(f'''
+            SELECT alert_id, sent FROM alert_performance
+            WHERE source = ? AND alert_type = ? AND symbol = ? AND status IN {OPEN_STATUSES} AND created_ts >= ?
+            ORDER BY created_ts DESC LIMIT 1
+        ''', (source, alert_type, symbol, now - ALERT_DEDUPE_SECONDS)).fetchone()
+        if duplicate:
+            if sent and not duplicate['sent']:
+                conn.execute('UPDATE alert_performance SET sent = 1 WHERE alert_id = ?', (duplicate['alert_id'],))
+                conn.commit()
+            self.stats['deduped'] += 1
+            return duplicate['alert_id']
+
+        alert_id = uuid.uuid4().hex
+        conn.execute('''
+            INSERT INTO alert_performance (alert_id, source, alert_type, symbol, direction, score, score_unit, sent,
+                                           entry_price, current_price, max_gain, max_loss, performance_score, status,
+                                           target_pct, stop_pct, horizon_hours, created_at, created_ts, updated_ts,
+                                           payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (alert_id, source, alert_type, symbol, direction, score, score_unit, int(bool(sent)),
+              entry_price or None, entry_price or None, 'active' if entry_price else 'pending_price',
+              self.target_pct, self.stop_pct, self.horizon_hours, datetime.fromtimestamp(now).isoformat(), now, now,
+              json.dumps(payload, default=str) if payload else None))
+        conn.commit()
+        self.stats['recorded'] += 1
+        return alert_id
+
+    # ---- tracking ----------------------------------------------------------
+
+    def update(self, now: Optional[float] = None) -> Dict:
+        """Price every open alert in one batch and advance MFE/MAE/status as arrays"""
+        if self.price_source is None:
+            return {'error': 'No price source'}
+        with self._update_lock:
+            now = now or time.time()
+            conn = self._conn()
+            rows = conn.execute(f'''
+                SELECT alert_id, symbol, entry_price, direction, max_gain, max_loss, created_ts,
+                       target_pct, stop_pct, horizon_hours
+                FROM alert_performance WHERE status IN {OPEN_STATUSES} AND created_ts IS NOT NULL
+            ''').fetchall()
+            if not rows:
+                return {'open': 0, 'priced': 0, 'resolved': 0}
+
+            symbols = sorted({row['symbol'] for row in rows})
+            prices = self.price_source(symbols) or {}
+            nan = float('nan')
+            price = np.array([prices.get(row['symbol']) or nan for row in rows], dtype=np.float64)
+            entry = np.array([row['entry_price'] or nan for row in rows], dtype=np.float64)
+            entry = np.where(np.isnan(entry), price, entry)  # pending alerts take the first price seen
+            sign = np.array([-1.0 if row['direction'] == 'short' else 1.0 for row in rows])
+            prev_gain = np.array([row['max_gain'] or 0.0 for row in rows], dtype=np.float64)
+            prev_loss = np.array([row['max_loss'] or 0.0 for row in rows], dtype=np.float64)
+            target = np.array([row['target_pct'] or self.target_pct for row in rows], dtype=np.float64)
+            stop = np.array([row['stop_pct'] or self.stop_pct for row in rows], dtype=np.float64)
+            horizon = np.array([row['horizon_hours'] or self.horizon_hours for row in rows], dtype=np.float64)
+            created = np.array([row['created_ts'] for row in rows], dtype=np.float64)
+
+            priced = ~np.isnan(price) & (entry > 0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ret = np.where(priced, sign * (price / entry - 1.0) * 100.0, np.nan)
+            max_gain = np.where(priced, np.fmax(prev_gain, ret), prev_gain)
+            max_loss = np.where(priced, np.fmin(prev_loss, ret), prev_loss)
+            stopped = priced & (max_loss <= -stop)
+            target_hit = priced & (max_gain >= target) & ~stopped  # both in one interval: assume the stop came first
+            expired = (now - created >= horizon * 3600) & ~stopped & ~target_hit
+            resolved = stopped | target_hit | expired
+            status = np.select([stopped, target_hit, expired], ['stopped', 'target_hit', 'expired'], 'active')
+            status = np.where(~resolved & np.isnan(entry), 'pending_price', status)
+            outcome = np.select([stopped, target_hit, expired], [-stop, target, ret], np.nan)
+
+            resolved_at = datetime.fromtimestamp(now).isoformat()
+            updates = []
+            for i in np.flatnonzero(priced | resolved):
+                updates.append((
+                    None if np.isnan(entry[i]) else float(entry[i]),
+                    None if np.isnan(price[i]) else float(price[i]),
+                    round(float(max_gain[i]), 4), round(float(max_loss[i]), 4),
+                    str(status[i]), resolved_at if resolved[i] else None,
+                    None if np.isnan(ret[i]) else round(float(ret[i]), 4),
+                    None if np.isnan(outcome[i]) else round(float(outcome[i]), 4),
+                    now, rows[i]['alert_id']
+                ))
+            # Excursions only ratchet and resolved rows stay resolved, even if another
+            # process updated the same alerts in between
+            conn.executemany(f'''
+                UPDATE alert_performance
+                SET entry_price = COALESCE(entry_price, ?), current_price = COALESCE(?, current_price),
+                    max_gain = MAX(COALESCE(max_gain, 0), ?), max_loss = MIN(COALESCE(max_loss, 0), ?),
+                    status = ?, resolved_at = ?, performance_score = COALESCE(?, performance_score),
+                    outcome_pct = ?, updated_ts = ?
+                WHERE alert_id = ? AND status IN {OPEN_STATUSES}
+            ''', updates)
+            conn.commit()
+
+            self.stats['updates'] += 1
+            self.stats['priced'] += int(priced.sum())
+            self.stats['resolved'] += int(resolved.sum())
+            self.stats['last_update'] = now
+            return {'open': len(rows), 'priced': int(priced.sum()), 'resolved': int(resolved.sum())}
+
+    # ---- background loop ---------------------------------------------------
+
+    def _tick(self):
+        # Every process that recorded alerts may run this loop; only the lease holder updates
+        if not self._acquire_lease('alert_update', 2 * self.update_interval):
+            return
+        try:
+            self.update()
+        except Exception:
+            self.stats['update_errors'] += 1
+            raise
+
+    def _interval(self) -> float:
+        return self.update_interval
+
+    def _can_start(self) -> bool:
+        return self.price_source is not None
+
+    # ---- analytics ---------------------------------------------------------
+
+    def performance(self, thresholds: Optional[Iterable[float]] = None, since: Optional[float] = None,
+                    source: Optional[str] = None, sent_only: bool = False,
+                    min_samples: int = ALERT_MIN_SAMPLES) -> Dict:
+        """Hit-rate and expectancy per (source, alert_type), overall and at each score threshold.
+
+        Thresholds default to SCORE_THRESHOLDS for the group's score unit.
+        hit_rate is the share of resolved alerts with a positive outcome;
+        expectancy_pct is the mean outcome (target/stop size, or the return
+        at the horizon). best_threshold maximizes expectancy among
+        thresholds with at least `min_samples` resolved alerts.
+        """
+        self._ensure_started()
+        clauses, params = [f'status IN {RESOLVED_STATUSES}', 'outcome_pct IS NOT NULL', 'created_ts >= ?'], [since or 0]
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if sent_only:
+            clauses.append('sent = 1')
+        rows = self._conn().execute(f'''
+            SELECT source, alert_type, score, score_unit, sent, outcome_pct, max_gain, max_loss, status
+            FROM alert_performance WHERE {' AND '.join(clauses)}
+        ''', params).fetchall()
+
+        groups = {}
+        for row in rows:
+            groups.setdefault((row['source'], row['alert_type'], row['score_unit'] or 'confidence'), []).append(row)
+
+        report = []
+        for (group_source, alert_type, unit), members in sorted(groups.items(), key=lambda item: str(item[0])):
+            levels = np.array(sorted(thresholds if thresholds is not None
+                                     else SCORE_THRESHOLDS.get(unit, SCORE_THRESHOLDS['confidence'])), dtype=np.float64)
+            score = np.array([m['score'] if m['score'] is not None else np.nan for m in members], dtype=np.float64)
+            outcome = np.array([m['outcome_pct'] for m in members], dtype=np.float64)
+            mfe = np.array([m['max_gain'] or 0.0 for m in members], dtype=np.float64)
+            mae = np.array([m['max_loss'] or 0.0 for m in members], dtype=np.float64)
+            win = outcome > 0
+
+            with np.errstate(invalid='ignore'):
+                mask = score[None, :] >= levels[:, None]  # thresholds x alerts
+            counts = mask.sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                hit_rate = (mask & win).sum(axis=1) / counts * 100
+                expectancy = (mask * outcome).sum(axis=1) / counts
+                avg_mfe = (mask * mfe).sum(axis=1) / counts
+                avg_mae = (mask * mae).sum(axis=1) / counts
+
+            eligible = counts >= min_samples
+            best = None
+            if eligible.any():
+                best = float(levels[eligible][np.argmax(expectancy[eligible])])
+
+            def pct(value):
+                return None if np.isnan(value) else round(float(value), 2)
+
+            report.append({
+                'source': group_source,
+                'alert_type': alert_type,
+                'score_unit': unit,
+                'alerts': len(members),
+                'sent': sum(1 for m in members if m['sent']),
+                'target_hits': sum(1 for m in members if m['status'] == 'target_hit'),
+                'stopped': sum(1 for m in members if m['status'] == 'stopped'),
+                'hit_rate': pct(win.mean() * 100),
+                'expectancy_pct': pct(outcome.mean()),
+                'avg_mfe_pct': pct(mfe.mean()),
+                'avg_mae_pct': pct(mae.mean()),
+                'by_threshold': [
+                    {'threshold': float(t), 'alerts': int(n), 'hit_rate': pct(h), 'expectancy_pct': pct(e),
+                     'avg_mfe_pct': pct(g), 'avg_mae_pct': pct(l)}
+                    for t, n, h, e, g, l in zip(levels, counts, hit_rate, expectancy, avg_mfe, avg_mae) if n
+                ],
+                'best_threshold': best
+            })
+        return {'groups': report, 'resolved_alerts': len(rows), 'min_samples': min_samples}
+
+    def open_alerts(self, limit: int = 100) -> List[Dict]:
+        rows = self._conn().execute(f'''
+            SELECT alert_id, source, alert_type, symbol, score, score_unit, sent, direction, entry_price, current_price,
+                   max_gain, max_loss, performance_score, status, created_at
+            FROM alert_performance WHERE status IN {OPEN_STATUSES} ORDER BY created_ts DESC LIMIT ?
+        ''', (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_status(self) -> Dict:
+        counts = self._conn().execute(
+            'SELECT status, COUNT(*) AS n FROM alert_performance GROUP BY status').fetchall()
+        return {
+            'db_path': self.db_path,
+            'alerts': {row['status'] or 'unknown': row['n'] for row in counts},
+            'update_interval': self.update_interval,
+            'horizon_hours': self.horizon_hours,
+            'target_pct': self.target_pct,
+            'stop_pct': self.stop_pct,
+            'running': self.running,
+            'stats': self.stats.copy()
+        }
+
+
+_tracker: Singleton[AlertPerformanceTracker] = Singleton('ALERT_TRACKER_ENABLED')
+
+
+def _oracle_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
+    """Price source for update(); the oracle is only built (and polls) in the process that updates"""
+    from price_oracle import get_price_oracle
+    oracle = get_price_oracle()
+    return oracle.get_prices(symbols) if oracle else {}
+
+
+def get_alert_tracker(start: bool = False) -> Optional[AlertPerformanceTracker]:
+    """Shared tracker; ALERT_TRACKER_ENABLED=false disables it.
+
+    Every process can record alerts; the process that passes start=True
+    (the API server) runs the update loop.
+    """
+    tracker = _tracker.get(lambda: AlertPerformanceTracker(price_source=_oracle_prices))
+    if tracker and start:
+        tracker.auto_start = True
+    return tracker
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 import pytz
 import random
 
+from symbol_matcher import extract_primary_symbol
+
 # Railway API configuration
 RAILWAY_API_URL = "https://titan-trading-2-production.up.railway.app"
 
@@ -237,28 +239,7 @@ class AlphaOpportunitiesGenerator:
     
     def _extract_symbol_from_title(self, title):
         """Extract cryptocurrency symbol from news title"""
-        common_symbols = ['BTC', 'ETH', 'XRP', 'ADA', 'SOL', 'MATIC', 'LINK', 'UNI', 'AAVE', 'DOGE', 'SHIB']
-        title_upper = title.upper()
-        
-        for symbol in common_symbols:
-            if symbol in title_upper:
-                return symbol
-                
-        # Check for coin names
-        if 'BITCOIN' in title_upper:
-            return 'BTC'
-        elif 'ETHEREUM' in title_upper:
-            return 'ETH'
-        elif 'RIPPLE' in title_upper:
-            return 'XRP'
-        elif 'CARDANO' in title_upper:
-            return 'ADA'
-        elif 'SOLANA' in title_upper:
-            return 'SOL'
-        elif 'POLYGON' in title_upper:
-            return 'MATIC'
-        
-        return 'CRYPTO'  # Generic if no specific symbol found
+        return extract_primary_symbol(title) or 'CRYPTO'  # Generic if no specific symbol found
     
     def _filter_and_rank_opportunities(self, opportunities):
         """Filter and rank opportunities by confidence and risk/reward"""
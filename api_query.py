@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+List Query Shaping
+Shared `fields=` projection, `limit`/`cursor` pagination, `search=` and
+equality filters for list-returning endpoints. Handlers filter on the
+full records, then slice, and only project/serialize the page that is
+returned; handlers backed by paged upstream APIs turn the cursor into
+the upstream offset so discarded pages are never fetched.
+"""
+
+import base64
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_LIMIT = int(os.getenv('API_DEFAULT_PAGE_LIMIT', '100'))
+MAX_PAGE_LIMIT = int(os.getenv('API_MAX_PAGE_LIMIT', '1000'))
+
+SHAPING_ARGS = ('fields', 'limit', 'cursor', 'search')
+
+_MISSING = object()
+
+
+class QueryError(ValueError):
+    """Malformed shaping parameter (reported to the client as a 400)"""
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        kind, offset = raw.split(':', 1)
+        if kind != 'o' or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except Exception:
+        raise QueryError(f"Invalid cursor: {cursor}")
+
+
+def _lookup(record: Any, path: str) -> Any:
+    value = record
+    for part in path.split('.'):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return _MISSING
+    return value
+
+
+def project(record: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """Keep only `fields` (dotted paths keep their nesting: quote.USD.price)"""
+    if not fields or not isinstance(record, dict):
+        return record
+    out: Dict[str, Any] = {}
+    for path in fields:
+        value = _lookup(record, path)
+        if value is _MISSING:
+            continue
+        parts = path.split('.')
+        target = out
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return out
+
+
+def _matches_value(value: Any, wanted: List[str]) -> bool:
+    if isinstance(value, bool):
+        return str(value).lower() in wanted
+    return value is not _MISSING and value is not None and str(value).lower() in wanted
+
+
+@dataclass
+class ListQuery:
+    """Parsed shaping parameters for one request"""
+    fields: Optional[List[str]] = None
+    limit: int = DEFAULT_PAGE_LIMIT
+    offset: int = 0
+    search: Optional[str] = None
+    filters: Dict[str, List[str]] = field(default_factory=dict)
+    shaped: bool = False  # any shaping/filter parameter present
+
+    @classmethod
+    def from_args(cls, args, filters: Iterable[str] = (), default_limit: int = DEFAULT_PAGE_LIMIT,
+                  max_limit: int = MAX_PAGE_LIMIT) -> 'ListQuery':
+        """Read fields/limit/cursor/search plus the endpoint's allowed filter params"""
+        fields = [f.strip() for f in args.get('fields', '').split(',') if f.strip()] or None
+        try:
+            limit = int(args.get('limit', default_limit))
+        except ValueError:
+            raise QueryError(f"Invalid limit: {args.get('limit')}")
+        if limit < 1:
+            raise QueryError("limit must be at least 1")
+        cursor = args.get('cursor')
+        wanted = {}
+        for name in filters:
+            raw = args.get(name)
+            if raw:
+                wanted[name] = [v.strip().lower() for v in raw.split(',') if v.strip()]
+        return cls(
+            fields=fields,
+            limit=min(limit, max_limit),
+            offset=decode_cursor(cursor) if cursor else 0,
+            search=(args.get('search') or '').strip().lower() or None,
+            filters=wanted,
+            shaped=bool(wanted) or any(args.get(name) for name in SHAPING_ARGS)
+        )
+
+    def matches(self, record: Dict, search_keys: Sequence[str] = ()) -> bool:
+        for path, wanted in self.filters.items():
+            if not _matches_value(_lookup(record, path), wanted):
+                return False
+        if self.search:
+            return any(self.search in str(record.get(key) or '').lower() for key in search_keys)
+        return True
+
+    def select(self, items: Iterable, search_keys: Sequence[str] = (),
+               record: Optional[Callable[[Any], Dict]] = None) -> Tuple[List, int, Optional[str]]:
+        """Filter, then slice one page: (page, total_matching, next_cursor)"""
+        if self.filters or self.search:
+            items = [item for item in items if self.matches(record(item) if record else item, search_keys)]
+        elif not isinstance(items, list):
+            items = list(items)
+        page = items[self.offset:self.offset + self.limit]
+        next_offset = self.offset + len(page)
+        return page, len(items), encode_cursor(next_offset) if next_offset < len(items) else None
+
+    def respond(self, items: Iterable, search_keys: Sequence[str] = (),
+                record: Optional[Callable[[Any], Dict]] = None, **extra) -> Dict:
+        """Standard paged payload with only the requested fields serialized"""
+        page, total, next_cursor = self.select(items, search_keys, record)
+        return {
+            **extra,
+            'data': [project(item, self.fields) for item in page],
+            'count': len(page),
+            'total': total,
+            'next_cursor': next_cursor
+        }
+
+    def upstream_page(self, start: int = 1) -> Tuple[int, int]:
+        """(1-based start, limit) to request from a paged upstream API"""
+        return (self.offset + 1 if self.offset else start), self.limit
+
+    def next_upstream_cursor(self, start: int, received: int) -> Optional[str]:
+        """Cursor for the following upstream page when this one came back full"""
+        return encode_cursor(start - 1 + received) if received >= self.limit else None
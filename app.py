@@ -20,25 +20,24 @@ try:
     
     # Try to import supporting modules safely
     try:
-        from main_server import logger, exchange_manager
+        from main_server import logger, integrations
         print("Supporting modules imported successfully")
     except Exception as e:
         print(f"Warning: Supporting modules import failed: {e}")
         logger = None
-        exchange_manager = None
+        integrations = None
     
     if __name__ == "__main__":
         try:
             port = int(os.environ.get('PORT', 5000))
             print(f"Starting server on port {port}")
             
-            # Log exchange status only if available
-            if logger and exchange_manager:
+            # Integrations load on first use; warm them up once the server is listening
+            if logger and integrations:
                 logger.info("Starting crypto trading server...")
-                try:
-                    logger.info(f"Available exchanges: {exchange_manager.get_available_exchanges()}")
-                except Exception as e:
-                    logger.info(f"Exchange manager status: {str(e)}")
+                delay = float(os.environ.get('INTEGRATION_WARMUP_DELAY', 3))
+                if integrations.warm_up(delay=delay):
+                    logger.info(f"Integration warm-up scheduled in {delay:g}s")
             else:
                 print("Starting server with limited logging...")
             
@@ -19,6 +19,9 @@ from aiohttp import ClientTimeout
 import requests
 import discord
 
+from scan_store import get_scan_store
+from alert_performance import get_alert_tracker
+
 # Import crypto news module
 try:
     from crypto_news_alerts import get_general_crypto_news, get_top_mentioned_tickers
@@ -119,6 +122,14 @@ except Exception as e:
     exchange_manager = None
     print(f"❌ Exchange integration error: {e}")
 
+# Import RugCheck for screening degen plays (shared client: rate limiter + verdict cache)
+try:
+    from rugcheck_integration import get_rugcheck_api
+    rugcheck_available = True
+except ImportError as e:
+    rugcheck_available = False
+    print(f"⚠️ RugCheck screening not available: {e}")
+
 # Discord Bot Configuration (using Discord.py instead of webhooks)
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 DISCORD_CHANNELS = {
@@ -635,6 +646,7 @@ async def analyze_trading_conditions(positions):
                     'type': 'overbought',
                     'symbol': symbol,
                     'platform': platform,
+                    'side': side,
                     'rsi': round(rsi, 1),
                     'pnl': pnl_pct,
                     'confluence_score': confluence_score,
@@ -662,6 +674,7 @@ async def analyze_trading_conditions(positions):
                     'type': 'oversold',
                     'symbol': symbol,
                     'platform': platform,
+                    'side': side,
                     'rsi': round(rsi, 1),
                     'pnl': pnl_pct,
                     'message': f"🟩 **${symbol} Oversold Opportunity** (RSI: {rsi:.1f})\n" +
@@ -693,6 +706,7 @@ async def analyze_trading_conditions(positions):
                     'type': 'losing_trade',
                     'symbol': symbol,
                     'platform': platform,
+                    'side': side,
                     'pnl': pnl_pct,
                     'margin': margin_size,
                     'severity': loss_severity,
@@ -728,6 +742,7 @@ async def analyze_trading_conditions(positions):
                     'type': 'high_profit',
                     'symbol': symbol,
                     'platform': platform,
+                    'side': side,
                     'pnl': pnl_pct,
                     'profit_amount': profit_amount,
                     'message': f"💰 **${symbol} Profit Alert** (+{pnl_pct:.1f}%)\n" +
@@ -910,6 +925,30 @@ async def fetch_dexscreener_trending():
         print(f"❌ DexScreener fetch error: {e}")
         return None
 
+RUGCHECK_CHAINS = ('solana', 'ethereum', 'bsc')
+
+async def screen_dex_tokens(dex_trending):
+    """RugCheck every DexScreener token in one concurrent bulk check per chain -> {(chain, address): verdict}"""
+    if not rugcheck_available or not dex_trending:
+        return {}
+    by_chain = {}
+    for key in ('latest_boosted', 'top_boosted', 'latest_profiles'):
+        for token in dex_trending.get(key) or []:
+            chain_id, address = token.get('chainId'), token.get('tokenAddress')
+            if chain_id in RUGCHECK_CHAINS and address:
+                by_chain.setdefault(chain_id, []).append(address)
+    verdicts = {}
+    try:
+        rugcheck = get_rugcheck_api()
+        loop = asyncio.get_event_loop()
+        for chain_id, addresses in by_chain.items():
+            results = await loop.run_in_executor(None, rugcheck.bulk_check_tokens, addresses, chain_id)
+            verdicts.update({(chain_id, address): result for address, result in results.items()})
+        print(f"🛡️ RugCheck screened {len(verdicts)} DexScreener tokens")
+    except Exception as e:
+        print(f"⚠️ RugCheck screening error: {e}")
+    return verdicts
+
 async def fetch_lunarcrush_data():
     """Fetch LunarCrush social sentiment and trending data"""
     try:
@@ -1384,6 +1423,35 @@ def create_opportunity_alert_with_images(articles):
     message += f"🚀 Research these opportunities for potential alpha"
     return message
 
+# Position alert -> (implied price direction, score fn) for performance tracking
+def _position_direction(alert):
+    return 'short' if str(alert.get('side') or '').upper() == 'SHORT' else 'long'
+
+# type: (direction, score, score unit). RSI alerts are calls on the market;
+# PnL alerts are tracked along the position they are about.
+TRACKED_ALERT_TYPES = {
+    'overbought': (lambda a: 'short', lambda a: a.get('rsi'), 'rsi'),
+    'oversold': (lambda a: 'long', lambda a: 100 - a['rsi'] if a.get('rsi') is not None else None, 'rsi'),
+    'losing_trade': (_position_direction, lambda a: -a['pnl'] if a.get('pnl') is not None else None, 'pnl_pct'),
+    'high_profit': (_position_direction, lambda a: a.get('pnl'), 'pnl_pct')
+}
+
+def track_alert_performance(alerts):
+    """Hand position alerts to the alert performance tracker (entry priced by its next update)"""
+    tracker = get_alert_tracker()
+    if not tracker:
+        return 0
+    tracked = 0
+    for alert in alerts:
+        if not isinstance(alert, dict) or alert.get('type') not in TRACKED_ALERT_TYPES or not alert.get('symbol'):
+            continue
+        direction, score, unit = TRACKED_ALERT_TYPES[alert['type']]
+        tracker.record_alert('trading_alerts', alert['type'], alert['symbol'], score(alert),
+                             direction=direction(alert), score_unit=unit,
+                             payload={k: alert.get(k) for k in ('platform', 'side', 'rsi', 'pnl')})
+        tracked += 1
+    return tracked
+
 def save_alerts_for_bot(alerts):
     """Save alerts to a file that the Discord bot can read"""
     if not alerts:
@@ -1394,7 +1462,17 @@ def save_alerts_for_bot(alerts):
         if not alert_data:
             return False
 
-        # Save to JSON file for bot to read
+        # Append to the scan store (history + indexed reads for the bot/dashboard)
+        store = get_scan_store()
+        if store:
+            store.record_alerts(alert_data['alerts'])
+
+        try:
+            track_alert_performance(alert_data['alerts'])
+        except Exception as e:
+            print(f"⚠️ Alert performance tracking error: {e}")
+
+        # Latest batch snapshot for the one-off alert scripts that still read the file
         alerts_file = "latest_alerts.json"
         with open(alerts_file, 'w') as f:
             json.dump(alert_data, f, indent=2, default=str)
@@ -1828,6 +1906,7 @@ async def run_degen_memes_scan():
         
         # Get DexScreener trending tokens (actual new/viral coins)
         dex_trending = await fetch_dexscreener_trending()
+        token_verdicts = await screen_dex_tokens(dex_trending)
         
         # Get viral/meme content with degen-specific keywords
         viral_keywords = ['meme', 'viral', 'pump', 'gem', 'moonshot', 'degen', 'ape', 'airdrop', 'new token', 'launch']
@@ -1945,9 +2024,12 @@ async def run_degen_memes_scan():
         if dex_trending:
             if dex_trending.get('latest_boosted'):
                 degen_message += f"🔥 **DEXSCREENER BOOSTED (VIRAL MOMENTUM):**\n"
-                boosted_tokens = dex_trending['latest_boosted'][:6]  # Top 6 boosted
+                boosted_tokens = dex_trending['latest_boosted']
+                rugs_filtered = 0
                 
                 for token in boosted_tokens:
+                    if dex_count >= 6:  # Top 6 boosted that pass RugCheck
+                        break
                     try:
                         description = token.get('description', 'New viral token')
                         # Truncate description  
@@ -1961,6 +2043,10 @@ async def run_degen_memes_scan():
                         token_url = token.get('url', '')
                         token_address = token.get('tokenAddress', '')
                         chain_id = token.get('chainId', 'solana')
+                        verdict = token_verdicts.get((chain_id, token_address)) or {}
+                        if verdict.get('risk_level') == 'CRITICAL':
+                            rugs_filtered += 1
+                            continue
                         
                         # Try to extract symbol from description first, then URL
                         description_text = description.upper()
@@ -2007,13 +2093,16 @@ async def run_degen_memes_scan():
                         # Format token entry with fixed Discord markdown
                         short_description = description[:25] + '...' if len(description) > 25 else description
                         degen_message += f"🚀 [${token_name}]({clean_url}) - {short_description}\n"
-                        degen_message += f"   💰 ${boost_amount} | {chain_id} | `{token_address[:12] if token_address else 'N/A'}...`\n"
+                        security = f" | 🛡️ {verdict['risk_level']}" if verdict.get('risk_level') else ""
+                        degen_message += f"   💰 ${boost_amount} | {chain_id} | `{token_address[:12] if token_address else 'N/A'}...`{security}\n"
                         dex_count += 1
                     except Exception as token_error:
                         continue  # Skip problematic tokens
                 
                 if dex_count == 0:
                     degen_message += "⚠️ No boosted tokens with clear momentum today\n"
+                if rugs_filtered:
+                    degen_message += f"🛡️ RugCheck filtered {rugs_filtered} critical-risk tokens\n"
                 degen_message += f"\n"
                 
             elif dex_trending.get('latest_profiles'):
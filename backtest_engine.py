@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Vectorized Backtest Engine
+Replays stored candles (and stored news/social layer scores where the scan
+store has them) through the scanners' scoring rules:
+
+    comprehensive        ComprehensiveMarketScanner._calculate_confluence_score
+    hourly               HourlyTradeScanner._calculate_opportunity_score
+    live                 LiveTradeScanner._calculate_opportunity_score
+    real_alpha_oversold  RealAlphaScanner._calculate_oversold_confidence
+
+Each rule is re-expressed as array math over a (symbols x bars) panel, so a
+whole history is scored in one pass instead of one scanner call per coin
+per bar. Alerts are compared with what price did next: precision/recall
+against "reached +target within the horizon" and forward returns per score
+threshold. Parameter sweeps shard the grid across processes.
+
+Rules that read news/catalyst/sentiment layers refuse to run without them
+unless the engine is told to score those layers as empty; reports list
+what was missing. The scan store records news/social only, and there is
+no market-cap history, so the live rule drops its market-cap terms.
+"""
+
+import itertools
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from candles import Candles
+
+logger = logging.getLogger(__name__)
+
+BACKTEST_CANDLE_DIR = os.getenv('BACKTEST_CANDLE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       'candle_archive'))
+BACKTEST_WORKERS = int(os.getenv('BACKTEST_WORKERS', str(os.cpu_count() or 1)))
+KLINE_PAGE = 1440  # BingX max klines per request
+DEFAULT_HORIZONS = (4, 24)  # forward-return horizons in bars
+DEFAULT_THRESHOLDS = [40, 50, 60, 65, 70, 75, 80, 85, 90]
+LAYER_MAX_AGE_HOURS = 24  # news/social scores cover a 24h window
+
+INTERVAL_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+def interval_ms(timeframe: str) -> int:
+    """'15m' / '1h' / '4h' / '1d' -> milliseconds"""
+    return int(timeframe[:-1] or 1) * INTERVAL_MS[timeframe[-1]]
+
+
+# ---- storage ---------------------------------------------------------------
+
+class CandleArchive:
+    """Per-symbol candle history as .npz files, topped up from BingX klines"""
+
+    def __init__(self, root: str = BACKTEST_CANDLE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, f"{symbol.replace('/', '-').upper()}_{timeframe}.npz")
+
+    def symbols(self, timeframe: str = '1h') -> List[str]:
+        suffix = f'_{timeframe}.npz'
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.root) if name.endswith(suffix))
+
+    def load(self, symbol: str, timeframe: str = '1h', since_ms: Optional[int] = None) -> Candles:
+        path = self._path(symbol, timeframe)
+        if not os.path.exists(path):
+            return Candles.empty(symbol=symbol, timeframe=timeframe)
+        with np.load(path) as data:
+            candles = Candles(data['timestamp'], data['open'], data['high'], data['low'], data['close'],
+                              data['volume'], symbol=symbol, timeframe=timeframe, source='archive')
+        if since_ms:
+            candles = candles[int(np.searchsorted(candles.timestamp, since_ms)):]
+        return candles
+
+    def save(self, candles: Candles, timeframe: Optional[str] = None) -> int:
+        """Merge into the stored series (newer bars win on duplicate timestamps); returns stored length"""
+        timeframe = timeframe or candles.timeframe
+        stored = self.load(candles.symbol, timeframe)
+        timestamp = np.concatenate([stored.timestamp, candles.timestamp])
+        order = np.argsort(timestamp, kind='stable')
+        timestamp = timestamp[order]
+        keep = np.append(timestamp[1:] != timestamp[:-1], True)  # last of each run = the newer bar
+        columns = {field: np.concatenate([getattr(stored, field), getattr(candles, field)])[order][keep]
+                   for field in ('open', 'high', 'low', 'close', 'volume')}
+        np.savez(self._path(candles.symbol, timeframe), timestamp=timestamp[keep], **columns)
+        return int(keep.sum())
+
+    def update(self, symbol: str, timeframe: str = '1h', days: int = 365,
+               fetch: Optional[Callable[..., Candles]] = None) -> int:
+        """Page forward from the newest stored bar (or `days` back); returns bars added"""
+        if fetch is None:
+            from bingx_direct_api import bingx_direct
+            fetch = bingx_direct.get_candles
+        step = interval_ms(timeframe)
+        now = int(time.time() * 1000)
+        stored = self.load(symbol, timeframe)
+        start = int(stored.timestamp[-1]) + step if len(stored) else now - days * 86_400_000
+        before = len(stored)
+        total = before
+        while start < now - step:
+            candles = fetch(symbol, timeframe, limit=KLINE_PAGE, start_time=start)
+            candles = candles[int(np.searchsorted(candles.timestamp, start)):]
+            if not len(candles):
+                break
+            candles.symbol = symbol
+            total = self.save(candles, timeframe)
+            start = int(candles.timestamp[-1]) + step
+        return total - before
+
+
+# ---- panel -----------------------------------------------------------------
+
+class CandlePanel:
+    """Many symbols' candles aligned on one time grid as (symbols x bars) matrices (NaN = no bar)"""
+
+    __slots__ = ('symbols', 'timeframe', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbols: Sequence[str], timeframe: str, timestamp, open, high, low, close, volume):
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open, self.high, self.low, self.close, self.volume = (
+            np.asarray(m, dtype=np.float64) for m in (open, high, low, close, volume))
+
+    @classmethod
+    def from_candles(cls, series: Dict[str, Candles], timeframe: str = '1h') -> 'CandlePanel':
+        series = {symbol: c for symbol, c in series.items() if len(c)}
+        symbols = sorted(series)
+        grid = np.unique(np.concatenate([series[s].timestamp for s in symbols])) if symbols else np.array([], np.int64)
+        matrices = {field: np.full((len(symbols), len(grid)), np.nan) for field in ('open', 'high', 'low', 'close', 'volume')}
+        for row, symbol in enumerate(symbols):
+            columns = np.searchsorted(grid, series[symbol].timestamp)
+            for field, matrix in matrices.items():
+                matrix[row, columns] = getattr(series[symbol], field)
+        return cls(symbols, timeframe, grid, **matrices)
+
+    @classmethod
+    def from_archive(cls, archive: CandleArchive, symbols: Optional[Iterable[str]] = None,
+                     timeframe: str = '1h', days: Optional[int] = 365) -> 'CandlePanel':
+        since = int(time.time() * 1000) - days * 86_400_000 if days else None
+        symbols = list(symbols) if symbols is not None else archive.symbols(timeframe)
+        return cls.from_candles({s: archive.load(s, timeframe, since) for s in symbols}, timeframe)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.close.shape
+
+    @property
+    def bars_per_day(self) -> int:
+        return max(1, 86_400_000 // interval_ms(self.timeframe))
+
+    def __repr__(self):
+        return f"<CandlePanel {len(self.symbols)} symbols x {len(self.timestamp)} {self.timeframe} bars>"
+
+
+def layers_from_scan_store(panel: CandlePanel, store=None, max_age_hours: float = LAYER_MAX_AGE_HOURS) -> Dict[str, np.ndarray]:
+    """News/social layer scores recorded by the comprehensive scanner, held forward onto the panel grid"""
+    if store is None:
+        from scan_store import get_scan_store
+        store = get_scan_store()
+    names = ('news', 'social')
+    layers = {name: np.full(panel.shape, np.nan) for name in names}
+    if store is None or not len(panel.timestamp):
+        return layers
+    rows = {base: row for row, base in enumerate(s.split('-')[0].split('/')[0].upper() for s in panel.symbols)}
+    scans = store.payload_scores([f'{name}_score' for name in names],
+                                 since=panel.timestamp[0] / 1000 - max_age_hours * 3600, until=panel.timestamp[-1] / 1000)
+    for base, group in itertools.groupby(scans, key=lambda scan: scan[0]):
+        if base not in rows:
+            continue
+        group = np.array([scan[1:] for scan in group], dtype=np.float64)
+        times = group[:, 0] * 1000
+        index = np.searchsorted(times, panel.timestamp, side='right') - 1
+        fresh = (index >= 0) & (panel.timestamp - times[np.clip(index, 0, None)] <= max_age_hours * 3_600_000)
+        for column, name in enumerate(names, start=1):
+            layers[name][rows[base]] = np.where(fresh, group[np.clip(index, 0, None), column], np.nan)
+    return layers
+
+
+# ---- indicators ------------------------------------------------------------
+
+def _rows(frame: pd.DataFrame) -> np.ndarray:
+    return frame.to_numpy().T
+
+
+def compute_features(panel: CandlePanel, rsi_period: int = 14) -> Dict[str, np.ndarray]:
+    """Indicators every rule reads, computed once for the whole panel (pandas runs along the time axis)"""
+    close = pd.DataFrame(panel.close.T)
+    day = panel.bars_per_day
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / rsi_period, adjust=False, min_periods=rsi_period).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / rsi_period, adjust=False, min_periods=rsi_period).mean()
+    rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = rsi.where(avg_loss != 0, 100.0).where(avg_gain.notna())  # Wilder RSI, as TAAPI/TradingView report it
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    middle = close.rolling(20).mean()
+    lower_band = middle - 2 * close.rolling(20).std(ddof=0)
+
+    change_24h = (close / close.shift(day) - 1) * 100
+    volume_24h = pd.DataFrame((panel.close * panel.volume).T).rolling(day, min_periods=day).sum()  # quote volume
+
+    features = {
+        'close': panel.close,
+        'rsi': _rows(rsi),
+        'macd': _rows(macd),
+        'macd_signal': _rows(signal),
+        'macd_histogram': _rows(macd - signal),
+        'lower_band': _rows(lower_band),
+        'lower_band_touch': panel.low <= _rows(lower_band),
+        'change_24h': _rows(change_24h),
+        'volume_24h': _rows(volume_24h)
+    }
+    features['ready'] = ~np.isnan(panel.close) & ~np.isnan(features['rsi']) & \
+        ~np.isnan(features['lower_band']) & ~np.isnan(features['change_24h']) & (np.arange(panel.shape[1]) >= 26)
+    return features
+
+
+# ---- scoring rules (vectorized ports of the scanner methods) ---------------
+
+def rsi_technical_score(rsi: np.ndarray) -> np.ndarray:
+    """ComprehensiveMarketScanner TAAPI fallback: RSI bucket -> technical score"""
+    return np.select([rsi < 25, rsi < 30, rsi < 35, rsi > 75, rsi > 70, rsi > 65], [50, 45, 40, 20, 25, 30], 35).astype(float)
+
+
+def price_action_technical_score(change_24h: np.ndarray, volume_24h: np.ndarray) -> np.ndarray:
+    """ComprehensiveMarketScanner enhanced local analysis: 24h change bucket + volume bonus"""
+    score = np.select([change_24h > 10, change_24h > 5, change_24h > 2, change_24h < -10, change_24h < -5, change_24h < -2],
+                      [55, 45, 40, 15, 25, 30], 35)
+    return score + np.select([volume_24h > 10_000_000, volume_24h > 5_000_000, volume_24h > 1_000_000], [8, 5, 3], 0).astype(float)
+
+
+def confluence_score(technical, news, social, layers: int = 3) -> np.ndarray:
+    """ComprehensiveMarketScanner._calculate_confluence_score"""
+    base = technical * 0.6 + news * 0.25 + social * 0.15
+    positive = (technical > 20).astype(int) + (news > 5) + (social > 3)
+    bonus = np.select([positive >= 3, positive >= 2, positive >= 1], [15, 8, 3], 0)
+    multiplier = {3: 1.0, 2: 0.85, 1: 0.65}.get(layers, 0.3)
+    return np.clip((base + bonus) * multiplier, 25, 85)
+
+
+def hourly_opportunity_score(technical_strength, catalyst_score, sentiment_boost, social_boost) -> np.ndarray:
+    """HourlyTradeScanner._calculate_opportunity_score"""
+    total = (40 + np.minimum(30, technical_strength * 10) + catalyst_score
+             + np.minimum(10, sentiment_boost) + np.minimum(10, social_boost))
+    return np.clip(total, 0, 100)
+
+
+def live_opportunity_score(change_24h, volume_24h, market_cap, catalyst_score) -> np.ndarray:
+    """LiveTradeScanner._calculate_opportunity_score (market_cap None drops the cap points)"""
+    performance = np.select([change_24h > 50, change_24h > 30, change_24h > 20, change_24h > 15], [40, 35, 25, 20], 10)
+    volume = np.select([volume_24h > 50_000_000, volume_24h > 10_000_000, volume_24h > 5_000_000, volume_24h > 1_000_000],
+                       [25, 20, 15, 10], 5)
+    cap = 0 if market_cap is None else np.select(
+        [(market_cap >= 1e9) & (market_cap <= 1e10), (market_cap >= 1e8) & (market_cap <= 1e9), market_cap > 1e10], [15, 12, 8], 5)
+    return np.minimum(performance + volume + cap + np.minimum(catalyst_score, 30), 100).astype(float)
+
+
+def live_risk_score(change_24h, volume_24h, market_cap, has_catalyst) -> np.ndarray:
+    """LiveTradeScanner._assess_risk before bucketing (>45 Very High, >30 High, >15 Medium; market_cap None drops the cap term)"""
+    cap = 0 if market_cap is None else np.select([market_cap < 1e8, market_cap > 1e10], [20, -10], 0)
+    return (np.select([change_24h > 100, change_24h > 50, change_24h > 25], [40, 30, 20], 0)
+            + np.select([volume_24h < 1_000_000, volume_24h > 50_000_000], [25, -15], 0)
+            + cap - 15 * has_catalyst)
+
+
+def oversold_confidence(rsi, macd_histogram, macd, macd_signal, lower_band_touch) -> np.ndarray:
+    """RealAlphaScanner._calculate_oversold_confidence"""
+    confidence = (np.select([rsi < 20, rsi < 25, rsi < 30], [40, 30, 20], 0)
+                  + np.select([macd_histogram > 0, macd_signal < macd], [30, 20], 0)
+                  + 30 * lower_band_touch)
+    return np.minimum(confidence, 100).astype(float)
+
+
+def _layer(layers: Dict[str, np.ndarray], name: str, shape, default: float = 0.0) -> np.ndarray:
+    """A layer with stale/unknown bars at `default` - what the scanner scores when that input is empty.
+    Whether the layer may be missing altogether is the engine's call (see SCANNERS)"""
+    values = layers.get(name)
+    return np.full(shape, default) if values is None else np.where(np.isnan(values), default, values)
+
+
+def bullish_macd_cross(features) -> np.ndarray:
+    """MACD crossed above its signal line on this bar (histogram turned positive)"""
+    histogram = features['macd_histogram']
+    previous = np.full(histogram.shape, np.nan)
+    previous[:, 1:] = histogram[:, :-1]
+    return (histogram > 0) & (previous <= 0)
+
+
+def comprehensive_rule(features, layers, params):
+    shape = features['close'].shape
+    if params['technical_source'] == 'rsi':
+        technical = rsi_technical_score(features['rsi'])
+    else:
+        technical = price_action_technical_score(features['change_24h'], features['volume_24h'])
+    score = confluence_score(technical, _layer(layers, 'news', shape), _layer(layers, 'social', shape), params['layers'])
+    return score, features['ready']
+
+
+def hourly_rule(features, layers, params):
+    shape = features['close'].shape
+    rsi = features['rsi']
+    # The live check (histogram > 0 and signal > macd) contradicts itself since TAAPI's histogram is
+    # macd - signal, so it never fires; the backtest scores the crossover that check was meant to catch
+    macd_cross = bullish_macd_cross(features)
+    below_band = features['close'] < features['lower_band']
+    strength = (rsi < 30).astype(int) + macd_cross + below_band
+    signals = (rsi < 40).astype(int) + macd_cross + below_band
+    catalyst = _layer(layers, 'catalyst', shape)
+    sentiment = _layer(layers, 'sentiment', shape, 50.0)
+    social = _layer(layers, 'social_momentum', shape, 50.0)
+    score = hourly_opportunity_score(strength, catalyst, np.maximum(0, (sentiment - 50) / 10),
+                                     np.maximum(0, (social - 60) / 10))
+    gate = features['ready'] & (signals >= params['min_ta_signals'])
+    if params['require_catalyst']:
+        gate &= catalyst > 0
+    return score, gate
+
+
+def live_rule(features, layers, params):
+    shape = features['close'].shape
+    change, volume = features['change_24h'], features['volume_24h']
+    market_cap = _layer(layers, 'market_cap', shape) if 'market_cap' in layers else None  # no history: terms dropped
+    catalyst = _layer(layers, 'catalyst', shape)
+    score = live_opportunity_score(change, volume, market_cap, catalyst)
+    gate = (features['ready'] & (change >= params['min_change_24h']) & (volume >= params['min_volume'])
+            & (live_risk_score(change, volume, market_cap, catalyst > 0) <= params['max_risk_score']))
+    return score, gate
+
+
+def oversold_rule(features, layers, params):
+    score = oversold_confidence(features['rsi'], features['macd_histogram'], features['macd'],
+                                features['macd_signal'], features['lower_band_touch'])
+    return score, features['ready'] & (features['rsi'] < params['max_rsi'])
+
+
+# rule, live parameters (min_score is the scanner's alert cut-off on the rule's score),
+# layers the rule needs, layers whose score/risk terms are dropped when absent
+SCANNERS = {
+    'comprehensive': (comprehensive_rule, {'min_score': 85, 'technical_source': 'price_action', 'layers': 3},
+                      ('news', 'social'), ()),
+    'hourly': (hourly_rule, {'min_score': 70, 'min_ta_signals': 3, 'require_catalyst': True},
+               ('catalyst', 'sentiment', 'social_momentum'), ()),
+    'live': (live_rule, {'min_score': 65, 'min_change_24h': 15, 'min_volume': 1_000_000, 'max_risk_score': 45},
+             ('catalyst',), ('market_cap',)),
+    'real_alpha_oversold': (oversold_rule, {'min_score': 70, 'max_rsi': 25}, (), ())  # confidence > 60, scores step by 10
+}
+
+
+class MissingLayersError(ValueError):
+    """A rule needs layers the engine wasn't given"""
+
+
+# ---- evaluation ------------------------------------------------------------
+
+class BacktestEngine:
+    """Scores a CandlePanel with the scanner rules and measures alerts against forward price action"""
+
+    def __init__(self, panel: CandlePanel, layers: Optional[Dict[str, np.ndarray]] = None,
+                 horizons: Sequence[int] = DEFAULT_HORIZONS, target_pct: float = 5.0,
+                 label_horizon: int = 24, edge_only: bool = True, allow_missing_layers: bool = False):
+        self.panel = panel
+        self.layers = layers or {}
+        # Off: rules that need an absent layer refuse to run. On: they run with it scored as empty and say so
+        self.allow_missing_layers = allow_missing_layers
+        self.horizons = tuple(horizons)
+        self.target_pct = target_pct
+        self.label_horizon = label_horizon
+        self.edge_only = edge_only  # count an alert once per run of consecutive qualifying bars (scanner cooldowns)
+        self._features = None
+        self._outcomes = None
+
+    @property
+    def features(self) -> Dict[str, np.ndarray]:
+        if self._features is None:
+            self._features = compute_features(self.panel)
+        return self._features
+
+    @property
+    def outcomes(self) -> Dict[str, np.ndarray]:
+        """Forward returns per horizon and the 'good opportunity' label (high reached +target_pct within label_horizon)"""
+        if self._outcomes is None:
+            close = self.panel.close
+            outcomes = {}
+            for h in self.horizons:
+                forward = np.full(close.shape, np.nan)
+                forward[:, :-h] = (close[:, h:] / close[:, :-h] - 1) * 100
+                outcomes[f'return_{h}'] = forward
+            high = pd.DataFrame(self.panel.high.T)
+            peak = _rows(high.rolling(self.label_horizon, min_periods=self.label_horizon).max().shift(-self.label_horizon))
+            excursion = (peak / close - 1) * 100
+            outcomes['valid'] = ~np.isnan(excursion)
+            outcomes['label'] = excursion >= self.target_pct
+            self._outcomes = outcomes
+        return self._outcomes
+
+    def missing_layers(self, scanner: str) -> Dict[str, List[str]]:
+        """Required layers not supplied, and optional ones whose terms the rule will drop"""
+        _, _, required, optional = SCANNERS[scanner]
+        return {'missing_layers': [name for name in required if name not in self.layers],
+                'excluded_terms': [name for name in optional if name not in self.layers]}
+
+    def signals(self, scanner: str, params: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        rule, defaults, _, _ = SCANNERS[scanner]
+        missing = self.missing_layers(scanner)['missing_layers']
+        if missing and not self.allow_missing_layers:
+            raise MissingLayersError(f"{scanner} needs layers {', '.join(missing)} "
+                                     f"(pass them or allow_missing_layers=True)")
+        params = {**defaults, **(params or {})}
+        score, gate = rule(self.features, self.layers, params)
+        return score, gate, params
+
+    def _alerts(self, fires: np.ndarray) -> np.ndarray:
+        if not self.edge_only:
+            return fires
+        previous = np.zeros_like(fires)
+        previous[:, 1:] = fires[:, :-1]
+        return fires & ~previous
+
+    def _metrics(self, alerts: np.ndarray) -> Dict:
+        outcomes = self.outcomes
+        valid = outcomes['valid']
+        alerts = alerts & valid
+        count = int(alerts.sum())
+        hits = int((alerts & outcomes['label']).sum())
+        positives = int((outcomes['label'] & valid).sum())
+        days = max(len(self.panel.timestamp) / self.panel.bars_per_day, 1e-9)
+        metrics = {
+            'alerts': count,
+            'alerts_per_day': round(count / days, 2),
+            'symbols_alerted': int(alerts.any(axis=1).sum()),
+            'precision': round(hits / count * 100, 2) if count else None,
+            'recall': round(hits / positives * 100, 2) if positives else None
+        }
+        for h in self.horizons:
+            forward = outcomes[f'return_{h}'][alerts]
+            forward = forward[~np.isnan(forward)]
+            metrics[f'avg_return_{h}'] = round(float(forward.mean()), 3) if len(forward) else None
+            metrics[f'hit_rate_{h}'] = round(float((forward > 0).mean() * 100), 2) if len(forward) else None
+        return metrics
+
+    def baseline(self) -> Dict:
+        """Every valid bar as an 'alert': the base rate precision is judged against"""
+        outcomes = self.outcomes
+        metrics = {'bars': int(outcomes['valid'].sum()),
+                   'label_rate': round(float(outcomes['label'][outcomes['valid']].mean() * 100), 2) if outcomes['valid'].any() else None}
+        for h in self.horizons:
+            forward = outcomes[f'return_{h}']
+            metrics[f'avg_return_{h}'] = round(float(np.nanmean(forward)), 3) if np.isfinite(forward).any() else None
+        return metrics
+
+    def run(self, scanner: str, params: Optional[Dict] = None,
+            thresholds: Optional[Iterable[float]] = DEFAULT_THRESHOLDS) -> Dict:
+        """Metrics at the scanner's live cut-off and at each score threshold"""
+        started = time.perf_counter()
+        score, gate, params = self.signals(scanner, params)
+        report = {
+            'scanner': scanner,
+            'params': params,
+            **self.missing_layers(scanner),
+            'symbols': len(self.panel.symbols),
+            'bars': len(self.panel.timestamp),
+            'timeframe': self.panel.timeframe,
+            'start': datetime.fromtimestamp(self.panel.timestamp[0] / 1000).isoformat() if len(self.panel.timestamp) else None,
+            'end': datetime.fromtimestamp(self.panel.timestamp[-1] / 1000).isoformat() if len(self.panel.timestamp) else None,
+            'label': {'target_pct': self.target_pct, 'horizon_bars': self.label_horizon},
+            'live_threshold': self._metrics(self._alerts(gate & (score >= params['min_score']))),
+            'by_threshold': [{'threshold': t, **self._metrics(self._alerts(gate & (score >= t)))}
+                             for t in (thresholds or [])]
+        }
+        report['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        return report
+
+    def run_all(self, thresholds: Optional[Iterable[float]] = DEFAULT_THRESHOLDS,
+                scanners: Optional[Iterable[str]] = None) -> Dict:
+        """Every scanner that can run; ones refused for missing layers are listed with what they lack"""
+        report = {'baseline': self.baseline(), 'scanners': {}, 'skipped': {}}
+        for name in scanners or SCANNERS:
+            try:
+                report['scanners'][name] = self.run(name, thresholds=thresholds)
+            except MissingLayersError:
+                report['skipped'][name] = self.missing_layers(name)['missing_layers']
+        return report
+
+    def sweep(self, scanner: str, grid: Dict[str, Sequence], processes: int = BACKTEST_WORKERS,
+              sort_by: str = 'precision', min_alerts: int = 1) -> List[Dict]:
+        """Every combination of `grid` params (over the scanner defaults), best `sort_by` first"""
+        keys = list(grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+        if processes <= 1 or len(combos) < 2:
+            results = [_sweep_point(self, scanner, combo) for combo in combos]
+        else:
+            chunks = [combos[i::processes] for i in range(min(processes, len(combos)))]
+            # Workers inherit the computed features/outcomes instead of rebuilding them
+            state = (self.panel, self.layers, self._settings(), self.features, self.outcomes)
+            with ProcessPoolExecutor(len(chunks), initializer=_init_sweep_worker, initargs=state) as pool:
+                results = [r for chunk in pool.map(_sweep_chunk, [scanner] * len(chunks), chunks) for r in chunk]
+        results = [r for r in results if r['alerts'] >= min_alerts]
+        return sorted(results, key=lambda r: (r[sort_by] is not None, r[sort_by] or 0), reverse=True)
+
+    def _settings(self) -> Dict:
+        return {'horizons': self.horizons, 'target_pct': self.target_pct,
+                'label_horizon': self.label_horizon, 'edge_only': self.edge_only,
+                'allow_missing_layers': self.allow_missing_layers}
+
+
+def _sweep_point(engine: BacktestEngine, scanner: str, params: Dict) -> Dict:
+    score, gate, merged = engine.signals(scanner, params)
+    return {'params': params, **engine._metrics(engine._alerts(gate & (score >= merged['min_score'])))}
+
+
+_worker_engine = None
+
+
+def _init_sweep_worker(panel, layers, settings, features, outcomes):
+    """One engine per worker, reused for its share of the grid"""
+    global _worker_engine
+    _worker_engine = BacktestEngine(panel, layers, **settings)
+    _worker_engine._features = features
+    _worker_engine._outcomes = outcomes
+
+
+def _sweep_chunk(scanner: str, combos: List[Dict]) -> List[Dict]:
+    return [_sweep_point(_worker_engine, scanner, combo) for combo in combos]
+
+
+if __name__ == "__main__":
+    # python backtest_engine.py [scanner ...]  - replays the candle archive (BACKTEST_TIMEFRAME / BACKTEST_DAYS)
+    import json
+    logging.basicConfig(level=logging.INFO)
+    archive = CandleArchive()
+    panel = CandlePanel.from_archive(archive, timeframe=os.getenv('BACKTEST_TIMEFRAME', '1h'),
+                                     days=int(os.getenv('BACKTEST_DAYS', '365')))
+    print(f"📊 {panel}")
+    engine = BacktestEngine(panel, layers_from_scan_store(panel),
+                            allow_missing_layers=os.getenv('BACKTEST_ALLOW_MISSING_LAYERS', 'false').lower() == 'true')
+    print(json.dumps(engine.run_all(scanners=sys.argv[1:] or None), indent=2, default=str))
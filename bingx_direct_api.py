@@ -4,11 +4,21 @@ Direct BingX API integration using official endpoints
 Fixes pricing accuracy issues by bypassing CCXT
 """
 
+import os
 import requests
 import time
 import hmac
 import hashlib
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional
+
+from bingx_ws_feed import to_bingx_symbol
+from candles import Candles
+
+# All-symbol ticker snapshot is re-pulled when older than this (seconds)
+TICKER_SNAPSHOT_TTL = float(os.getenv('BINGX_TICKER_SNAPSHOT_TTL', '5'))
+# ...and not served at all once this long past its last successful refresh (per-symbol REST instead)
+TICKER_SNAPSHOT_MAX_AGE = float(os.getenv('BINGX_TICKER_SNAPSHOT_MAX_AGE', '60'))
 
 class BingXDirectAPI:
     """Direct BingX API client using official documentation"""
@@ -17,13 +27,179 @@ class BingXDirectAPI:
         self.base_url = "https://open-api.bingx.com"
         self.api_key = api_key
         self.secret_key = secret_key
+        self.ws_feed = None  # BingXWebSocketFeed, see attach_ws_feed
+        self.snapshot_ttl = TICKER_SNAPSHOT_TTL
+        self.snapshot_max_age = TICKER_SNAPSHOT_MAX_AGE
+        self.ticker_snapshot: Dict[str, Dict] = {}  # BTC-USDT -> CCXT-like ticker
+        self.snapshot_at = 0.0     # last refresh attempt
+        self.snapshot_ok_at = 0.0  # last successful refresh
+        self.snapshot_stats = {'refreshes': 0, 'errors': 0, 'hits': 0, 'misses': 0}
+        self._snapshot_lock = threading.Lock()
+    
+    def attach_ws_feed(self, feed) -> None:
+        """Serve ticker/price/orderbook reads from a WebSocket feed's memory first"""
+        self.ws_feed = feed
+        if feed.contract_source is None:
+            # The all-symbol snapshot lists every swap contract
+            feed.contract_source = lambda: self.refresh_ticker_snapshot().keys()
+    
+    def _ws_lookup(self, symbol: str, getter: str, *args):
+        """Fresh value from the WS feed, or None (subscribing the symbol for next time)"""
+        if self.ws_feed is None:
+            return None
+        value = getattr(self.ws_feed, getter)(symbol, *args)
+        if value is None and not self.ws_feed.is_subscribed(symbol):
+            self.ws_feed.subscribe(symbol)
+        return value
+    
+    @staticmethod
+    def _format_ticker(symbol: str, ticker_data: Dict, source: str = 'bingx_direct_api') -> Dict:
+        """Raw /quote/ticker row -> CCXT-like ticker"""
+        return {
+            'symbol': symbol,
+            'last': float(ticker_data.get('lastPrice', 0)),
+            'bid': float(ticker_data.get('bidPrice', 0)),
+            'ask': float(ticker_data.get('askPrice', 0)),
+            'high': float(ticker_data.get('highPrice', 0)),
+            'low': float(ticker_data.get('lowPrice', 0)),
+            'volume': float(ticker_data.get('volume', 0)),
+            'baseVolume': float(ticker_data.get('volume', 0)),
+            'quoteVolume': float(ticker_data.get('quoteVolume', 0) or 0),
+            'change': float(ticker_data.get('priceChange', 0)),
+            'percentage': float(str(ticker_data.get('priceChangePercent', 0)).rstrip('%') or 0),
+            'timestamp': ticker_data.get('time') or ticker_data.get('closeTime'),
+            'datetime': None,
+            'info': ticker_data,
+            'source': source
+        }
+    
+    def get_all_tickers(self) -> Dict[str, Dict]:
+        """
+        24hr ticker statistics for every perpetual in one request
+        Endpoint: /openApi/swap/v2/quote/ticker (no symbol)
+        Returns {BTC-USDT: CCXT-like ticker}
+        """
+        path = '/openApi/swap/v2/quote/ticker'
+        response = requests.get(f"{self.base_url}{path}",
+                                params={'timestamp': int(time.time() * 1000)}, timeout=15)
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
+        data = response.json()
+        if data.get('code') != 0 or not isinstance(data.get('data'), list):
+            raise Exception(f"BingX API error: {data.get('msg', 'Unknown error')}")
+        return {row['symbol']: self._format_ticker(row['symbol'], row, 'bingx_snapshot')
+                for row in data['data'] if row.get('symbol')}
+    
+    def get_all_premium_index(self) -> Dict[str, Dict]:
+        """
+        Mark/index price and funding for every perpetual in one request
+        Endpoint: /openApi/swap/v2/quote/premiumIndex (no symbol)
+        """
+        path = '/openApi/swap/v2/quote/premiumIndex'
+        response = requests.get(f"{self.base_url}{path}",
+                                params={'timestamp': int(time.time() * 1000)}, timeout=15)
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
+        data = response.json()
+        if data.get('code') != 0 or not isinstance(data.get('data'), list):
+            raise Exception(f"BingX API error: {data.get('msg', 'Unknown error')}")
+        return {row['symbol']: {
+                    'mark_price': float(row.get('markPrice', 0) or 0),
+                    'index_price': float(row.get('indexPrice', 0) or 0),
+                    'funding_rate': float(row.get('lastFundingRate', 0) or 0),
+                    'next_funding_time': row.get('nextFundingTime')
+                } for row in data['data'] if row.get('symbol')}
+    
+    def refresh_ticker_snapshot(self, force: bool = False) -> Dict[str, Dict]:
+        """
+        Re-pull the all-symbol snapshot (tickers + premium index) when older
+        than snapshot_ttl. Concurrent callers share one refresh. Returns an
+        empty table once the last successful refresh is older than
+        snapshot_max_age, so callers fall back to per-symbol REST.
+        """
+        if not force and time.time() - self.snapshot_at < self.snapshot_ttl:
+            return self._servable_snapshot()
+        with self._snapshot_lock:
+            if not force and time.time() - self.snapshot_at < self.snapshot_ttl:
+                return self._servable_snapshot()
+            try:
+                tickers = self.get_all_tickers()
+                try:
+                    premium = self.get_all_premium_index()
+                except Exception as e:
+                    premium = {}
+                    print(f"⚠️ BingX premium index snapshot failed: {e}")
+                for bingx_symbol, funding in premium.items():
+                    if bingx_symbol in tickers:
+                        tickers[bingx_symbol].update({
+                            'markPrice': funding['mark_price'],
+                            'indexPrice': funding['index_price'],
+                            'fundingRate': funding['funding_rate'],
+                            'nextFundingTime': funding['next_funding_time']
+                        })
+                self.ticker_snapshot = tickers
+                self.snapshot_ok_at = time.time()
+                self.snapshot_stats['refreshes'] += 1
+            except Exception as e:
+                self.snapshot_stats['errors'] += 1
+                print(f"⚠️ BingX ticker snapshot failed: {e}")
+            # Failed refreshes also wait a TTL so a BingX outage isn't hammered
+            self.snapshot_at = time.time()
+        return self._servable_snapshot()
+    
+    def _snapshot_age(self) -> Optional[float]:
+        """Seconds since the last successful refresh (None before the first)"""
+        return time.time() - self.snapshot_ok_at if self.snapshot_ok_at else None
+    
+    def _servable_snapshot(self) -> Dict[str, Dict]:
+        age = self._snapshot_age()
+        return self.ticker_snapshot if age is not None and age <= self.snapshot_max_age else {}
+    
+    def _snapshot_lookup(self, symbol: str) -> Optional[Dict]:
+        """Ticker from the all-symbol snapshot, or None when missing"""
+        ticker = self.refresh_ticker_snapshot().get(to_bingx_symbol(symbol))
+        if ticker is None:
+            self.snapshot_stats['misses'] += 1
+            return None
+        self.snapshot_stats['hits'] += 1
+        return {**ticker, 'symbol': symbol, 'age_seconds': round(self._snapshot_age(), 3)}
+    
+    def get_price_table(self) -> Dict[str, Dict]:
+        """Snapshot as a price-oracle source: {BASE: {'price', 'change_24h', 'volume_24h'}}"""
+        return {bingx_symbol.split('-')[0]: {
+                    'price': ticker['last'],
+                    'change_24h': ticker['percentage'],
+                    'volume_24h': ticker['quoteVolume'] or ticker['volume'] * ticker['last']
+                } for bingx_symbol, ticker in self.refresh_ticker_snapshot().items()
+                if bingx_symbol.endswith('-USDT') and ticker['last']}
+    
+    def get_snapshot_status(self) -> Dict:
+        age = self._snapshot_age()
+        return {
+            'symbols': len(self.ticker_snapshot),
+            'age_seconds': round(age, 1) if age is not None else None,
+            'stale': age is None or age > self.snapshot_max_age,
+            'ttl_seconds': self.snapshot_ttl,
+            'max_age_seconds': self.snapshot_max_age,
+            **self.snapshot_stats
+        }
     
     def get_ticker(self, symbol: str) -> Dict:
         """
         Get 24hr ticker statistics using official BingX API
         Endpoint: /openApi/swap/v2/quote/ticker
         PUBLIC ENDPOINT - No authentication required
+        Served from the WebSocket feed when attached and fresh, then from
+        the all-symbol snapshot; per-symbol REST only on a snapshot miss
         """
+        cached = self._ws_lookup(symbol, 'get_ticker')
+        if cached is not None:
+            return cached
+        
+        cached = self._snapshot_lookup(symbol)
+        if cached is not None:
+            return cached
+        
         try:
             # Convert symbol format if needed (BTC/USDT -> BTC-USDT)
             bingx_symbol = symbol.replace('/', '-')
@@ -41,25 +217,8 @@ class BingXDirectAPI:
             if response.status_code == 200:
                 data = response.json()
                 if data.get('code') == 0 and 'data' in data:
-                    ticker_data = data['data']
-                    
                     # Convert to CCXT-like format for compatibility
-                    return {
-                        'symbol': symbol,
-                        'last': float(ticker_data.get('lastPrice', 0)),
-                        'bid': float(ticker_data.get('bidPrice', 0)),
-                        'ask': float(ticker_data.get('askPrice', 0)),
-                        'high': float(ticker_data.get('highPrice', 0)),
-                        'low': float(ticker_data.get('lowPrice', 0)),
-                        'volume': float(ticker_data.get('volume', 0)),
-                        'baseVolume': float(ticker_data.get('volume', 0)),
-                        'change': float(ticker_data.get('priceChange', 0)),
-                        'percentage': float(ticker_data.get('priceChangePercent', 0)),
-                        'timestamp': ticker_data.get('time'),
-                        'datetime': None,
-                        'info': ticker_data,
-                        'source': 'bingx_direct_api'
-                    }
+                    return self._format_ticker(symbol, data['data'])
                 else:
                     raise Exception(f"BingX API error: {data.get('msg', 'Unknown error')}")
             else:
@@ -73,7 +232,28 @@ class BingXDirectAPI:
         Get simple price using BingX price endpoint
         Endpoint: /openApi/swap/v1/ticker/price
         PUBLIC ENDPOINT - No authentication required
+        Served from the WebSocket feed when attached and fresh
         """
+        ws_ticker = self._ws_lookup(symbol, 'get_ticker')
+        if ws_ticker is not None:
+            return {
+                'symbol': symbol,
+                'price': ws_ticker['last'],
+                'timestamp': ws_ticker['timestamp'] or int(time.time() * 1000),
+                'source': 'bingx_websocket',
+                'info': ws_ticker['info']
+            }
+        
+        snapshot_ticker = self._snapshot_lookup(symbol)
+        if snapshot_ticker is not None:
+            return {
+                'symbol': symbol,
+                'price': snapshot_ticker['last'],
+                'timestamp': snapshot_ticker['timestamp'] or int(time.time() * 1000),
+                'source': 'bingx_snapshot',
+                'info': snapshot_ticker['info']
+            }
+        
         try:
             # Convert symbol format
             bingx_symbol = symbol.replace('/', '-')
@@ -111,7 +291,12 @@ class BingXDirectAPI:
         Get order book using BingX depth endpoint
         Endpoint: /openApi/swap/v2/quote/depth
         PUBLIC ENDPOINT - No authentication required
+        Served from the WebSocket feed when attached, fresh and deep enough
         """
+        cached = self._ws_lookup(symbol, 'get_orderbook', limit)
+        if cached is not None:
+            return cached
+        
         try:
             bingx_symbol = symbol.replace('/', '-')
             
@@ -168,6 +353,42 @@ class BingXDirectAPI:
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
         """
+        klines_data = self._request_klines(symbol, interval, limit, start_time, end_time)
+        
+        # Convert to CCXT-like format for compatibility
+        ohlcv = []
+        for kline in klines_data:
+            # BingX kline format: {open, close, high, low, volume, time}
+            ohlcv.append([
+                int(kline['time']),      # timestamp
+                float(kline['open']),    # open
+                float(kline['high']),    # high  
+                float(kline['low']),     # low
+                float(kline['close']),   # close
+                float(kline['volume'])   # volume
+            ])
+        
+        return {
+            'symbol': symbol,
+            'timeframe': interval,
+            'ohlcv': ohlcv,
+            'count': len(ohlcv),
+            'source': 'bingx_official_api',
+            'info': klines_data
+        }
+    
+    def get_candles(self, symbol: str, interval: str = '1h', limit: int = 500, start_time: Optional[int] = None, end_time: Optional[int] = None) -> Candles:
+        """
+        Same endpoint as get_klines, parsed straight into columnar arrays
+        (no per-candle lists). Analysis code should prefer this; get_klines
+        stays for callers that serialize the CCXT-style rows.
+        """
+        klines_data = self._request_klines(symbol, interval, limit, start_time, end_time)
+        return Candles.from_records(klines_data, time_key='time', symbol=symbol,
+                                    timeframe=interval, source='bingx_official_api')
+    
+    def _request_klines(self, symbol: str, interval: str, limit: int, start_time: Optional[int], end_time: Optional[int]) -> List[Dict]:
+        """Raw kline dicts from /openApi/swap/v3/quote/klines"""
         try:
             bingx_symbol = symbol.replace('/', '-')
             
@@ -200,27 +421,7 @@ class BingXDirectAPI:
                     if not klines_data:
                         raise Exception(f"BingX returned empty klines data for {symbol}")
                     
-                    # Convert to CCXT-like format for compatibility
-                    ohlcv = []
-                    for kline in klines_data:
-                        # BingX kline format: {open, close, high, low, volume, time}
-                        ohlcv.append([
-                            int(kline['time']),      # timestamp
-                            float(kline['open']),    # open
-                            float(kline['high']),    # high  
-                            float(kline['low']),     # low
-                            float(kline['close']),   # close
-                            float(kline['volume'])   # volume
-                        ])
-                    
-                    return {
-                        'symbol': symbol,
-                        'timeframe': interval,
-                        'ohlcv': ohlcv,
-                        'count': len(ohlcv),
-                        'source': 'bingx_official_api',
-                        'info': klines_data
-                    }
+                    return klines_data
                 else:
                     error_msg = data.get('msg', 'Unknown error')
                     if 'api is not exist' in error_msg or '100400' in str(data.get('code')):
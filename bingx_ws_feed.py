@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+BingX WebSocket Market Data Feed
+Background client for BingX public swap streams (ticker, depth, kline).
+Keeps an in-memory latest-state table per symbol so price reads never
+touch the network; BingXDirectAPI falls back to REST on a miss.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BINGX_SWAP_WS_URL = "wss://open-api-swap.bingx.com/swap-market"
+
+# BingX allows 200 topics per connection
+MAX_TOPICS_PER_CONNECTION = 200
+CONTRACTS_REFRESH_SECONDS = 3600
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+
+def to_bingx_symbol(symbol: str) -> str:
+    """BTC, BTC/USDT, BTCUSDT or BTC-USDT -> BTC-USDT"""
+    symbol = symbol.upper().replace('/', '-').replace(':USDT', '')
+    if '-' in symbol:
+        return symbol
+    if symbol.endswith('USDT') and len(symbol) > 4:
+        return f"{symbol[:-4]}-USDT"
+    return f"{symbol}-USDT"
+
+
+class BingXWebSocketFeed:
+    """Latest ticker/depth/kline state for subscribed BingX swap symbols"""
+
+    def __init__(self, url: str = BINGX_SWAP_WS_URL, depth_level: int = 20,
+                 kline_intervals: Optional[List[str]] = None, stale_after: float = 30.0,
+                 max_backoff: float = 60.0):
+        self.url = url
+        self.depth_level = depth_level
+        self.kline_intervals = kline_intervals if kline_intervals is not None else ['1m']
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+        self.incremental_depth = False  # also stream <symbol>@incrDepth (see orderbook_replica)
+
+        self.symbols = set()
+        self.pinned = set()  # watchlist symbols, never evicted
+        self.state: Dict[str, Dict] = {}
+        # Returns the listed swap contracts (BTC-USDT, ...); unknown symbols are not subscribed
+        self.contract_source: Optional[Callable[[], Iterable[str]]] = None
+        self._contracts: Optional[set] = None
+        self._contracts_at = 0.0
+        self._recent: 'OrderedDict[str, None]' = OrderedDict()  # unpinned symbols, least recently used first
+        self._budget_warned = False
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._running = False
+        self._connected = threading.Event()
+        self._topic_seen: Dict[str, float] = {}
+        self._stale_strikes: Dict[str, int] = {}
+        self.listeners = []  # callables(symbol, stream, data)
+
+        self.stats = {
+            'messages': 0,
+            'reconnects': 0,
+            'resubscribes': 0,
+            'rejected_symbols': 0,
+            'evictions': 0,
+            'gaps_detected': 0,
+            'decode_errors': 0,
+            'connected_since': None
+        }
+
+    # ---- subscriptions -------------------------------------------------------
+
+    def topics_for(self, symbol: str) -> List[str]:
+        topics = [f"{symbol}@ticker", f"{symbol}@depth{self.depth_level}@500ms"]
+        topics += [f"{symbol}@kline_{interval}" for interval in self.kline_intervals]
+        if self.incremental_depth:
+            topics.append(f"{symbol}@incrDepth")
+        return topics
+
+    def _known_contracts(self) -> Optional[set]:
+        """Listed contracts, refreshed hourly; None when there is no (working) source to check against"""
+        if self.contract_source is None:
+            return None
+        if self._contracts is None or time.time() - self._contracts_at > CONTRACTS_REFRESH_SECONDS:
+            try:
+                contracts = {to_bingx_symbol(c) for c in self.contract_source()}
+                if contracts:
+                    self._contracts = contracts
+            except Exception as e:
+                logger.debug(f"BingX contract list unavailable: {e}")
+            self._contracts_at = time.time()
+        return self._contracts
+
+    def _touch(self, symbol: str):
+        if symbol in self._recent:
+            self._recent.move_to_end(symbol)
+
+    def subscribe(self, symbols, pin: bool = False) -> List[str]:
+        """Add listed symbols to the feed; safe to call from any thread.
+
+        Pinned symbols (the watchlist) stay subscribed. When the topic budget
+        is full, the least recently read unpinned symbol makes room.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        contracts = self._known_contracts()
+        added, evicted = [], []
+        with self._lock:
+            max_symbols = MAX_TOPICS_PER_CONNECTION // len(self.topics_for('X'))
+            for symbol in symbols:
+                symbol = to_bingx_symbol(symbol)
+                if symbol in self.symbols:
+                    self._touch(symbol)
+                    if pin and symbol not in self.pinned:
+                        self.pinned.add(symbol)
+                        self._recent.pop(symbol, None)
+                    continue
+                if contracts is not None and symbol not in contracts:
+                    self.stats['rejected_symbols'] += 1
+                    continue
+                if len(self.symbols) >= max_symbols:
+                    if not self._recent:
+                        if not self._budget_warned:
+                            logger.warning(f"⚠️ BingX WS topic limit reached by pinned symbols, not subscribing {symbol} "
+                                           f"(further symbols are skipped silently)")
+                            self._budget_warned = True
+                        break
+                    oldest, _ = self._recent.popitem(last=False)
+                    self.symbols.discard(oldest)
+                    self.state.pop(oldest, None)
+                    evicted.append(oldest)
+                    self.stats['evictions'] += 1
+                self.symbols.add(symbol)
+                if pin:
+                    self.pinned.add(symbol)
+                else:
+                    self._recent[symbol] = None
+                self.state.setdefault(symbol, {'ticker': None, 'depth': None, 'klines': {}})
+                added.append(symbol)
+            # A symbol added and evicted within this call was never sent
+            evicted = [symbol for symbol in evicted if symbol not in added]
+            added = [symbol for symbol in added if symbol in self.symbols]
+
+        evicted_topics = [topic for symbol in evicted for topic in self.topics_for(symbol)]
+        for topic in evicted_topics:
+            self._topic_seen.pop(topic, None)
+            self._stale_strikes.pop(topic, None)
+        if self._loop and self._connected.is_set():
+            if evicted_topics:
+                asyncio.run_coroutine_threadsafe(self._send_subscriptions(evicted_topics, 'unsub'), self._loop)
+            if added:
+                topics = [topic for symbol in added for topic in self.topics_for(symbol)]
+                asyncio.run_coroutine_threadsafe(self._send_subscriptions(topics), self._loop)
+        return added
+
+    def resubscribe(self, topics: List[str]):
+        """Unsub/sub specific topics, e.g. to get a fresh full depth after a gap"""
+        if self._loop and self._connected.is_set():
+            self.stats['resubscribes'] += len(topics)
+            asyncio.run_coroutine_threadsafe(self._resend(topics), self._loop)
+
+    async def _resend(self, topics: List[str]):
+        await self._send_subscriptions(topics, 'unsub')
+        await self._send_subscriptions(topics)
+
+    def is_subscribed(self, symbol: str) -> bool:
+        return to_bingx_symbol(symbol) in self.symbols
+
+    async def _send_subscriptions(self, topics: List[str], req_type: str = 'sub'):
+        ws = self._ws
+        if ws is None:
+            return
+        for topic in topics:
+            await ws.send(json.dumps({'id': str(uuid.uuid4()), 'reqType': req_type, 'dataType': topic}))
+            if req_type == 'sub':
+                # Give the watchdog a full window before the first message is due
+                self._topic_seen[topic] = time.monotonic()
+
+    # ---- lifecycle -----------------------------------------------------------
+
+    def start(self, symbols=None, wait: float = 0) -> bool:
+        """Start the background thread; optionally wait for the first connect"""
+        if not WEBSOCKETS_AVAILABLE:
+            logger.warning("⚠️ websockets not installed - BingX WS feed disabled, using REST")
+            return False
+        if symbols:
+            self.subscribe(symbols, pin=True)
+        if self._thread and self._thread.is_alive():
+            return True
+        self._running = True
+        self._thread = threading.Thread(target=self._run_thread, name='bingx-ws-feed', daemon=True)
+        self._thread.start()
+        if wait:
+            self._connected.wait(wait)
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._loop and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run_thread(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        backoff = 1.0
+        while self._running:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, max_size=2 ** 22) as ws:
+                    self._ws = ws
+                    self._connected.set()
+                    self.stats['connected_since'] = time.time()
+                    backoff = 1.0
+                    with self._lock:
+                        topics = [t for s in sorted(self.symbols) for t in self.topics_for(s)]
+                    await self._send_subscriptions(topics)
+                    logger.info(f"✅ BingX WS connected - {len(topics)} topics subscribed")
+
+                    watchdog = asyncio.ensure_future(self._watchdog())
+                    try:
+                        async for message in ws:
+                            await self._on_raw(ws, message)
+                            if not self._running:
+                                break
+                    finally:
+                        watchdog.cancel()
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"⚠️ BingX WS disconnected: {e}")
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            if self._running:
+                # Reconnect with exponential backoff; every topic is resubscribed on connect
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _watchdog(self):
+        """Resubscribe topics that went quiet (silent drops count as gaps)"""
+        while True:
+            await asyncio.sleep(max(1.0, self.stale_after / 3))
+            now = time.monotonic()
+            stale = [topic for topic, seen in list(self._topic_seen.items())
+                     if now - seen > self.stale_after]
+            for topic in stale:
+                # Topics that never deliver (unknown symbols) are dropped after a few tries
+                self._stale_strikes[topic] = self._stale_strikes.get(topic, 0) + 1
+                if self._stale_strikes[topic] > 3:
+                    self._topic_seen.pop(topic, None)
+            stale = [topic for topic in stale if topic in self._topic_seen]
+            if stale:
+                self.stats['gaps_detected'] += len(stale)
+                self.stats['resubscribes'] += len(stale)
+                logger.info(f"🔄 BingX WS resubscribing {len(stale)} stale topics")
+                await self._resend(stale)
+
+    # ---- message handling ----------------------------------------------------
+
+    async def _on_raw(self, ws, message):
+        text = self.decode(message)
+        if text is None:
+            return
+        if text == 'Ping':
+            await ws.send('Pong')
+            return
+        self.handle_message(text)
+
+    def decode(self, message) -> Optional[str]:
+        """BingX gzips every frame; plain text frames are accepted for mocks"""
+        try:
+            if isinstance(message, (bytes, bytearray)):
+                try:
+                    return gzip.decompress(message).decode('utf-8')
+                except OSError:
+                    return bytes(message).decode('utf-8')
+            return message
+        except Exception:
+            self.stats['decode_errors'] += 1
+            return None
+
+    def handle_message(self, text: str):
+        """Apply one decoded message to the state table"""
+        try:
+            payload = json.loads(text)
+        except (TypeError, ValueError):
+            self.stats['decode_errors'] += 1
+            return
+        data_type = payload.get('dataType')
+        data = payload.get('data')
+        if not data_type or data is None:
+            return  # subscription confirmations
+
+        self.stats['messages'] += 1
+        self._topic_seen[data_type] = time.monotonic()
+        self._stale_strikes.pop(data_type, None)
+        symbol, _, stream = data_type.partition('@')
+        if stream == 'ticker':
+            self._apply_ticker(symbol, data)
+        elif stream.startswith('depth'):
+            self._apply_depth(symbol, data)
+        elif stream.startswith('kline_'):
+            self._apply_kline(symbol, stream[len('kline_'):], data)
+        elif stream != 'incrDepth':
+            return
+
+        for listener in self.listeners:
+            try:
+                listener(symbol, stream, data)
+            except Exception as e:
+                logger.debug(f"BingX WS listener error: {e}")
+
+    def _apply_ticker(self, symbol: str, data: Dict):
+        ticker = {
+            'last': float(data.get('c', 0) or 0),
+            'bid': float(data.get('B', 0) or 0),
+            'ask': float(data.get('A', 0) or 0),
+            'high': float(data.get('h', 0) or 0),
+            'low': float(data.get('l', 0) or 0),
+            'open': float(data.get('o', 0) or 0),
+            'volume': float(data.get('v', 0) or 0),
+            'quote_volume': float(data.get('q', 0) or 0),
+            'change': float(data.get('p', 0) or 0),
+            'percentage': float(data.get('P', 0) or 0),
+            'event_time': data.get('E'),
+            'received_at': time.monotonic(),
+            'info': data
+        }
+        with self._lock:
+            self.state.setdefault(symbol, {'ticker': None, 'depth': None, 'klines': {}})['ticker'] = ticker
+
+    def _apply_depth(self, symbol: str, data: Dict):
+        depth = {
+            'bids': [[float(p), float(q)] for p, q in data.get('bids', [])],
+            # BingX pushes asks highest-first; keep best ask first like REST/CCXT
+            'asks': sorted(([float(p), float(q)] for p, q in data.get('asks', [])), key=lambda level: level[0]),
+            'received_at': time.monotonic()
+        }
+        with self._lock:
+            self.state.setdefault(symbol, {'ticker': None, 'depth': None, 'klines': {}})['depth'] = depth
+
+    def _apply_kline(self, symbol: str, interval: str, data):
+        bars = data if isinstance(data, list) else [data]
+        with self._lock:
+            entry = self.state.setdefault(symbol, {'ticker': None, 'depth': None, 'klines': {}})
+            for bar in bars:
+                open_time = int(bar.get('T', 0) or 0)
+                previous = entry['klines'].get(interval)
+                step = INTERVAL_MS.get(interval)
+                gap = bool(previous and step and open_time - previous['open_time'] > step)
+                if gap:
+                    self.stats['gaps_detected'] += 1
+                entry['klines'][interval] = {
+                    'open_time': open_time,
+                    'open': float(bar.get('o', 0) or 0),
+                    'high': float(bar.get('h', 0) or 0),
+                    'low': float(bar.get('l', 0) or 0),
+                    'close': float(bar.get('c', 0) or 0),
+                    'volume': float(bar.get('v', 0) or 0),
+                    # Candles were missed; consumers should backfill from REST klines
+                    'gap_before': gap or bool(previous and previous.get('gap_before') and previous['open_time'] == open_time),
+                    'received_at': time.monotonic()
+                }
+
+    # ---- reads ---------------------------------------------------------------
+
+    def _fresh(self, item: Optional[Dict], max_age: Optional[float]) -> bool:
+        if not item:
+            return False
+        max_age = self.stale_after if max_age is None else max_age
+        return time.monotonic() - item['received_at'] <= max_age
+
+    def get_ticker(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """CCXT-style ticker from memory, or None if missing/stale"""
+        symbol_key = to_bingx_symbol(symbol)
+        with self._lock:
+            ticker = (self.state.get(symbol_key) or {}).get('ticker')
+            self._touch(symbol_key)
+        if not self._fresh(ticker, max_age):
+            return None
+        age = time.monotonic() - ticker['received_at']
+        return {
+            'symbol': symbol,
+            'last': ticker['last'],
+            'bid': ticker['bid'],
+            'ask': ticker['ask'],
+            'high': ticker['high'],
+            'low': ticker['low'],
+            'volume': ticker['volume'],
+            'baseVolume': ticker['volume'],
+            'quoteVolume': ticker['quote_volume'],
+            'change': ticker['change'],
+            'percentage': ticker['percentage'],
+            'timestamp': ticker['event_time'],
+            'datetime': None,
+            'info': ticker['info'],
+            'source': 'bingx_websocket',
+            'age_seconds': round(age, 3)
+        }
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        ticker = self.get_ticker(symbol, max_age)
+        return ticker['last'] if ticker else None
+
+    def get_orderbook(self, symbol: str, limit: int = 20, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Top-of-book depth from memory, or None if missing/stale/too shallow"""
+        if limit > self.depth_level:
+            return None
+        symbol_key = to_bingx_symbol(symbol)
+        with self._lock:
+            depth = (self.state.get(symbol_key) or {}).get('depth')
+            self._touch(symbol_key)
+        if not self._fresh(depth, max_age):
+            return None
+        return {
+            'symbol': symbol,
+            'bids': [level[:] for level in depth['bids'][:limit]],
+            'asks': [level[:] for level in depth['asks'][:limit]],
+            'timestamp': int(time.time() * 1000),
+            'datetime': None,
+            'nonce': None,
+            'source': 'bingx_websocket',
+            'info': {}
+        }
+
+    def get_kline(self, symbol: str, interval: str = '1m', max_age: Optional[float] = None) -> Optional[Dict]:
+        symbol_key = to_bingx_symbol(symbol)
+        with self._lock:
+            bar = ((self.state.get(symbol_key) or {}).get('klines') or {}).get(interval)
+            self._touch(symbol_key)
+        return dict(bar) if self._fresh(bar, max_age) else None
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            fresh = sum(1 for entry in self.state.values() if self._fresh(entry.get('ticker'), None))
+            subscribed = len(self.symbols)
+            pinned = len(self.pinned)
+        return {
+            'connected': self._connected.is_set(),
+            'url': self.url,
+            'subscribed_symbols': subscribed,
+            'pinned_symbols': pinned,
+            'contracts_known': len(self._contracts) if self._contracts is not None else None,
+            'fresh_tickers': fresh,
+            'stats': self.stats.copy()
+        }
+
+
+DEFAULT_WATCHLIST = [
+    'BTC-USDT', 'ETH-USDT', 'SOL-USDT', 'XRP-USDT', 'DOGE-USDT', 'ADA-USDT', 'AVAX-USDT',
+    'LINK-USDT', 'DOT-USDT', 'SUI-USDT', 'BNB-USDT', 'LTC-USDT', 'TRX-USDT', 'TON-USDT'
+]
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_bingx_ws_feed(start: bool = True) -> Optional[BingXWebSocketFeed]:
+    """Shared feed; BINGX_WS_ENABLED=false disables it, BINGX_WS_SYMBOLS sets the watchlist"""
+    global _feed
+    if os.getenv('BINGX_WS_ENABLED', 'true').lower() != 'true' or not WEBSOCKETS_AVAILABLE:
+        return None
+    with _feed_lock:
+        if _feed is None:
+            _feed = BingXWebSocketFeed(url=os.getenv('BINGX_WS_URL', BINGX_SWAP_WS_URL))
+            watchlist = os.getenv('BINGX_WS_SYMBOLS')
+            _feed.subscribe(watchlist.split(',') if watchlist else DEFAULT_WATCHLIST, pin=True)
+        if start:
+            _feed.start()
+    return _feed
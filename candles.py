@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Columnar OHLCV Container
+Candles held as contiguous NumPy columns (int64 timestamps, float64
+prices/volume) instead of lists of lists or lists of dicts. Slicing
+returns views (no copy); DataFrame, list and dict conversions are for the
+API edge and for libraries that need pandas (e.g. `ta`).
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Key names used by the different kline payloads we ingest
+TIME_KEYS = ('open_time', 'time', 'timestamp', 't')
+
+
+class Candles:
+    """OHLCV series for one symbol/timeframe"""
+
+    __slots__ = ('symbol', 'timeframe', 'source', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, timestamp, open, high, low, close, volume,
+                 symbol: str = '', timeframe: str = '', source: str = ''):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.source = source
+
+    # ---- construction ------------------------------------------------------
+
+    @classmethod
+    def empty(cls, **meta) -> 'Candles':
+        return cls([], [], [], [], [], [], **meta)
+
+    @classmethod
+    def from_ohlcv(cls, rows: Sequence[Sequence], **meta) -> 'Candles':
+        """[[timestamp, open, high, low, close, volume, ...], ...] (numbers or numeric strings)"""
+        if len(rows) == 0:
+            return cls.empty(**meta)
+        table = np.array([row[:6] for row in rows], dtype=np.float64)
+        columns = np.ascontiguousarray(table[:, 1:].T)  # one contiguous row per field
+        return cls(table[:, 0].astype(np.int64), *columns, **meta)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict], time_key: Optional[str] = None, **meta) -> 'Candles':
+        """List of dicts with open/high/low/close/volume and a time key (open_time, time, ...)"""
+        if len(records) == 0:
+            return cls.empty(**meta)
+        if time_key is None:
+            time_key = next((k for k in TIME_KEYS if k in records[0]), None)
+            if time_key is None:
+                raise KeyError(f"No time key in candle record (expected one of {TIME_KEYS})")
+        timestamp = np.fromiter((int(r[time_key]) for r in records), dtype=np.int64, count=len(records))
+        columns = [np.array([r[field] for r in records], dtype=np.float64) for field in FIELDS]
+        return cls(timestamp, *columns, **meta)
+
+    @classmethod
+    def from_dataframe(cls, df, **meta) -> 'Candles':
+        """DataFrame with open/high/low/close/volume columns and a datetime index or timestamp column"""
+        import pandas as pd
+        times = df['timestamp'] if 'timestamp' in df.columns else df.index
+        if isinstance(times.dtype, pd.DatetimeTZDtype):
+            times = pd.DatetimeIndex(times).tz_convert(None)  # e.g. yfinance indexes
+        times = times.to_numpy()
+        if np.issubdtype(times.dtype, np.datetime64):
+            times = times.astype('datetime64[ms]')  # any pandas resolution -> epoch ms
+        timestamp = times.astype(np.int64)
+        lower = {str(c).lower(): c for c in df.columns}
+        columns = [df[lower[field]].to_numpy(dtype=np.float64) for field in FIELDS]
+        return cls(timestamp, *columns, **meta)
+
+    # ---- access ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, index):
+        """Slices return a view-backed Candles; an int returns that candle as a dict"""
+        if isinstance(index, slice):
+            return Candles(self.timestamp[index], self.open[index], self.high[index], self.low[index],
+                           self.close[index], self.volume[index], self.symbol, self.timeframe, self.source)
+        return {
+            'timestamp': int(self.timestamp[index]),
+            'open': float(self.open[index]),
+            'high': float(self.high[index]),
+            'low': float(self.low[index]),
+            'close': float(self.close[index]),
+            'volume': float(self.volume[index])
+        }
+
+    def tail(self, n: int) -> 'Candles':
+        return self[-n:] if n else self[len(self):]
+
+    def columns(self, fields: Iterable[str] = FIELDS) -> List[np.ndarray]:
+        return [getattr(self, field) for field in fields]
+
+    @staticmethod
+    def stack(series: Sequence['Candles'], field: str, length: Optional[int] = None) -> np.ndarray:
+        """(symbols x candles) matrix of one field from equal-length series (last `length` candles)"""
+        return np.vstack([getattr(c, field)[-length:] if length else getattr(c, field) for c in series])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ('timestamp',) + FIELDS)
+
+    # ---- API edge ----------------------------------------------------------
+
+    def to_ohlcv(self) -> List[List]:
+        """CCXT-style [[timestamp, open, high, low, close, volume], ...]"""
+        return [list(row) for row in zip(self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                                         self.low.tolist(), self.close.tolist(), self.volume.tolist())]
+
+    def to_records(self, readable: bool = False) -> List[Dict]:
+        """List of dicts (open_time, open, ..., volume) with optional ISO times"""
+        records = []
+        for t, o, h, l, c, v in zip(self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                                    self.low.tolist(), self.close.tolist(), self.volume.tolist()):
+            record = {'open_time': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            if readable:
+                record['open_time_readable'] = datetime.fromtimestamp(t / 1000).isoformat()
+            records.append(record)
+        return records
+
+    def to_dataframe(self):
+        """pandas DataFrame indexed by candle open time (pandas imported on demand)"""
+        import pandas as pd
+        return pd.DataFrame({field: getattr(self, field) for field in FIELDS},
+                            index=pd.to_datetime(self.timestamp, unit='ms', utc=False).rename('timestamp'))
+
+    def __repr__(self):
+        return f"<Candles {self.symbol or '?'} {self.timeframe or '?'} n={len(self)} source={self.source or '?'}>"
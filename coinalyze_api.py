@@ -7,14 +7,32 @@ Provides futures market data including funding rates, open interest, and liquida
 import requests
 import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import time
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYMBOL_MAPPING_TTL = int(os.getenv('COINALYZE_MAPPING_TTL', '3600'))
+MAX_SYMBOLS_PER_REQUEST = 20  # Coinalyze caps the comma-separated `symbols` list
+BULK_WORKERS = int(os.getenv('COINALYZE_BULK_WORKERS', '6'))
+
+FUNDING_SENTIMENTS = ("very_bullish", "bullish", "very_bearish", "bearish")
+FUNDING_SIGNALS = {
+    "very_bullish": "Strong bullish signal - shorts paying high premium",
+    "bullish": "Bullish signal - shorts paying longs",
+    "very_bearish": "Strong bearish signal - longs paying high premium",
+    "bearish": "Bearish signal - longs paying shorts",
+    "neutral": "Neutral funding"
+}
+
 class CoinalyzeAPI:
     """
     Coinalyze API client for futures market data
@@ -29,6 +47,9 @@ class CoinalyzeAPI:
             'User-Agent': 'CryptoTradingIntelligence/1.0',
             'Accept': 'application/json'
         })
+        self._symbol_map = None
+        self._symbol_map_at = 0.0
+        self._symbol_map_lock = threading.Lock()
         
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make API request with error handling"""
@@ -135,7 +156,16 @@ class CoinalyzeAPI:
         return self._make_request("liquidation-history", params)
     
     def get_symbol_mapping(self) -> Dict:
-        """Get mapping of base assets to Coinalyze symbol format"""
+        """Get mapping of base assets to Coinalyze symbol format (cached for COINALYZE_MAPPING_TTL)"""
+        with self._symbol_map_lock:
+            if self._symbol_map is not None and time.time() - self._symbol_map_at < SYMBOL_MAPPING_TTL:
+                return self._symbol_map
+            symbol_map = self._fetch_symbol_mapping()
+            if "error" not in symbol_map:
+                self._symbol_map, self._symbol_map_at = symbol_map, time.time()
+            return symbol_map
+    
+    def _fetch_symbol_mapping(self) -> Dict:
         try:
             future_markets = self._make_request("future-markets")
             if "error" in future_markets:
@@ -191,87 +221,124 @@ class CoinalyzeAPI:
         Positive funding = Bearish sentiment (longs pay shorts)
         """
         try:
-            funding_data = self.get_current_funding_rates(symbol)
-            
+            coinalyze_symbols = self._resolve_symbols([symbol])
+            if not coinalyze_symbols:
+                return {"error": f"No symbol found for asset {symbol}"}
+            funding_data = self._bulk_request("funding-rate", list(coinalyze_symbols.values()))
             if "error" in funding_data:
                 return {"error": funding_data["error"]}
-                
-            analysis = {
-                "symbol": symbol,
-                "timestamp": datetime.now().isoformat(),
-                "funding_signals": [],
-                "overall_sentiment": "neutral",
-                "exchanges_analyzed": 0
-            }
-            
-            total_funding = 0
-            exchange_count = 0
-            
-            # Get the correct symbol format first
-            coinalyze_symbol = self.get_symbol_for_asset(symbol)
-            if not coinalyze_symbol:
-                return {"error": f"No symbol found for asset {symbol}"}
-                
-            # Get funding data for the specific symbol
-            funding_data = self.get_current_funding_rates(coinalyze_symbol)
-            
-            for item in funding_data:
-                if item.get("symbol", "") == coinalyze_symbol:
-                    funding_rate = float(item.get("fundingRate", 0))
-                    exchange = item.get("exchange", "unknown")
-                    
-                    # Analyze funding rate
-                    if funding_rate < -0.01:  # Very negative (> 1% APR)
-                        sentiment = "very_bullish"
-                        signal = "Strong bullish signal - shorts paying high premium"
-                    elif funding_rate < 0:
-                        sentiment = "bullish"
-                        signal = "Bullish signal - shorts paying longs"
-                    elif funding_rate > 0.01:  # Very positive
-                        sentiment = "very_bearish"
-                        signal = "Strong bearish signal - longs paying high premium"
-                    elif funding_rate > 0:
-                        sentiment = "bearish"
-                        signal = "Bearish signal - longs paying shorts"
-                    else:
-                        sentiment = "neutral"
-                        signal = "Neutral funding"
-                    
-                    analysis["funding_signals"].append({
-                        "exchange": exchange,
-                        "funding_rate": funding_rate,
-                        "funding_rate_apr": funding_rate * 365 * 3 * 100,  # Annualized %
-                        "sentiment": sentiment,
-                        "signal": signal
-                    })
-                    
-                    total_funding += funding_rate
-                    exchange_count += 1
-            
-            # Overall sentiment
-            if exchange_count > 0:
-                avg_funding = total_funding / exchange_count
-                analysis["exchanges_analyzed"] = exchange_count
-                analysis["average_funding_rate"] = avg_funding
-                analysis["average_funding_apr"] = avg_funding * 365 * 3 * 100
-                
-                if avg_funding < -0.005:
-                    analysis["overall_sentiment"] = "bullish"
-                elif avg_funding > 0.005:
-                    analysis["overall_sentiment"] = "bearish"
-                else:
-                    analysis["overall_sentiment"] = "neutral"
-            
-            return analysis
+            return self._funding_analyses(coinalyze_symbols, funding_data)[symbol]
             
         except Exception as e:
             logger.error(f"❌ Error analyzing funding sentiment: {e}")
             return {"error": str(e)}
     
+    # ---- bulk mode ----------------------------------------------------------
+    
+    def _resolve_symbols(self, assets: List[str]) -> Dict[str, str]:
+        """{requested asset: Coinalyze perpetual symbol} from one cached mapping"""
+        symbol_map = self.get_symbol_mapping()
+        if "error" in symbol_map:
+            return {}
+        resolved = {}
+        for asset in assets:
+            markets = symbol_map.get(asset.upper()) or []
+            perps = [m for m in markets if m.get('perpetual', False)]
+            if perps or markets:
+                resolved[asset] = (perps or markets)[0]['symbol']
+        return resolved
+    
+    def _bulk_request(self, endpoint: str, symbols: List[str], params: Optional[Dict] = None) -> Any:
+        """One call per MAX_SYMBOLS_PER_REQUEST symbols, chunks issued concurrently, rows merged"""
+        unique = list(dict.fromkeys(symbols))
+        chunks = [unique[i:i + MAX_SYMBOLS_PER_REQUEST] for i in range(0, len(unique), MAX_SYMBOLS_PER_REQUEST)]
+        if not chunks:
+            return []
+        
+        def fetch(chunk):
+            return self._make_request(endpoint, {**(params or {}), 'symbols': ','.join(chunk)})
+        
+        if len(chunks) == 1:
+            responses = [fetch(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(chunks))) as pool:
+                responses = list(pool.map(fetch, chunks))
+        failed = [r for r in responses if isinstance(r, dict) and "error" in r]
+        if len(failed) == len(responses):
+            return failed[0]
+        if failed:
+            logger.warning(f"⚠️ Coinalyze {endpoint}: {len(failed)}/{len(responses)} chunks failed: {failed[0]['error']}")
+        rows = []
+        for response in responses:
+            if response not in failed:
+                rows.extend(response if isinstance(response, list) else [response])
+        return rows
+    
+    def get_history_bulk(self, endpoint: str, symbols: List[str], start: float, end: Optional[float] = None,
+                         interval: str = "1hour", extra: Optional[Dict] = None) -> Any:
+        """
+        History for many symbols in batched calls
+        Args:
+            endpoint: 'funding-rate-history', 'open-interest-history', 'ohlcv-history', ...
+            start/end: Unix seconds
+        Returns: [{'symbol': ..., 'history': [{'t', 'o', 'h', 'l', 'c', ...}]}] or {'error': ...}
+        """
+        params = {'interval': interval, 'from': int(start), 'to': int(end or time.time()), **(extra or {})}
+        return self._bulk_request(endpoint, symbols, params)
+
+    def _funding_analyses(self, coinalyze_symbols: Dict[str, str], funding_rows: List[Dict]) -> Dict[str, Dict]:
+        """Funding sentiment for every asset at once (thresholds applied to the whole rate array)"""
+        now = datetime.now().isoformat()
+        assets = list(coinalyze_symbols)
+        owner_of = {sym: i for i, sym in enumerate(coinalyze_symbols.values())}
+        rows = [row for row in funding_rows if isinstance(row, dict) and row.get("symbol") in owner_of]
+        
+        rates = np.array([float(row.get("fundingRate", row.get("value", 0)) or 0) for row in rows], dtype=np.float64)
+        owners = np.array([owner_of[row["symbol"]] for row in rows], dtype=np.int64)
+        labels = np.select([rates < -0.01, rates < 0, rates > 0.01, rates > 0], FUNDING_SENTIMENTS, "neutral")
+        aprs = rates * 365 * 3 * 100  # Annualized %
+        counts = np.bincount(owners, minlength=len(assets))
+        averages = np.bincount(owners, weights=rates, minlength=len(assets)) / np.maximum(counts, 1)
+        overall = np.select([averages < -0.005, averages > 0.005], ["bullish", "bearish"], "neutral")
+        
+        analyses = {
+            asset: {
+                "symbol": asset,
+                "timestamp": now,
+                "funding_signals": [],
+                "overall_sentiment": "neutral",
+                "exchanges_analyzed": 0
+            }
+            for asset in assets
+        }
+        for row, rate, apr, label, owner in zip(rows, rates.tolist(), aprs.tolist(), labels.tolist(), owners.tolist()):
+            analyses[assets[owner]]["funding_signals"].append({
+                "exchange": row.get("exchange", "unknown"),
+                "funding_rate": rate,
+                "funding_rate_apr": apr,
+                "sentiment": label,
+                "signal": FUNDING_SIGNALS[label]
+            })
+        for i, asset in enumerate(assets):
+            if counts[i]:
+                analysis = analyses[asset]
+                analysis["exchanges_analyzed"] = int(counts[i])
+                analysis["average_funding_rate"] = float(averages[i])
+                analysis["average_funding_apr"] = float(averages[i]) * 365 * 3 * 100
+                analysis["overall_sentiment"] = str(overall[i])
+        return analyses
+    
+    def analyze_funding_rates(self, rates: Dict[str, float], exchange: str = "aggregate") -> Dict[str, Dict]:
+        """Funding sentiment for already-known rates ({asset: rate}), same shape as analyze_funding_sentiment"""
+        rows = [{"symbol": asset, "exchange": exchange, "fundingRate": rate} for asset, rate in rates.items()]
+        return self._funding_analyses({asset: asset for asset in rates}, rows)
+    
     def get_market_intelligence(self, symbols: List[str]) -> Dict:
         """
         Get comprehensive market intelligence for multiple symbols
         Combines funding rates, open interest, and liquidation data
+        Funding, OI and liquidations are each fetched for all symbols in
+        batched calls, and the three run concurrently.
         """
         try:
             intelligence = {
@@ -280,31 +347,51 @@ class CoinalyzeAPI:
                 "market_data": {}
             }
             
+            coinalyze_symbols = self._resolve_symbols(symbols)
+            batch = list(coinalyze_symbols.values())
+            now = int(time.time())
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                funding_future = pool.submit(self._bulk_request, "funding-rate", batch)
+                oi_future = pool.submit(self._bulk_request, "open-interest", batch)
+                liq_future = pool.submit(self._bulk_request, "liquidation-history", batch,
+                                         {'interval': '1hour', 'from': now - 3600, 'to': now})
+                funding_data, oi_data, liq_data = funding_future.result(), oi_future.result(), liq_future.result()
+            logger.info(f"📊 Coinalyze bulk intelligence: {len(batch)} symbols in 3 batched requests")
+            
+            funding = self._funding_analyses(coinalyze_symbols, funding_data) if isinstance(funding_data, list) else {}
+            
+            def rows_by_symbol(data):
+                if not isinstance(data, list):
+                    return None
+                grouped = {}
+                for row in data:
+                    if isinstance(row, dict):
+                        grouped.setdefault(row.get("symbol"), []).append(row)
+                return grouped
+            
+            oi_rows, liq_rows = rows_by_symbol(oi_data), rows_by_symbol(liq_data)
+            
             for symbol in symbols:
-                logger.info(f"📊 Analyzing {symbol} market intelligence...")
-                
-                # Get funding sentiment
-                funding_analysis = self.analyze_funding_sentiment(symbol)
-                
-                # Get open interest
-                oi_data = self.get_current_open_interest(symbol)
-                
-                # Get recent liquidations
-                liq_data = self.get_liquidations(symbol, "1h")
+                coinalyze_symbol = coinalyze_symbols.get(symbol)
+                if not coinalyze_symbol:
+                    missing = {"error": f"No symbol found for asset {symbol}"}
+                    funding_analysis, open_interest, liquidations = missing, missing, missing
+                else:
+                    funding_analysis = funding[symbol] if symbol in funding else {"error": funding_data["error"]}
+                    open_interest = oi_rows.get(coinalyze_symbol, []) if oi_rows is not None else oi_data
+                    liquidations = liq_rows.get(coinalyze_symbol, []) if liq_rows is not None else liq_data
                 
                 # Note: Market data would require historical endpoint with timestamps
                 market_data = {"note": "Market data available via historical endpoints"}
                 
                 intelligence["market_data"][symbol] = {
+                    "coinalyze_symbol": coinalyze_symbol,
                     "funding_analysis": funding_analysis,
-                    "open_interest": oi_data,
-                    "liquidations": liq_data,
+                    "open_interest": open_interest,
+                    "liquidations": liquidations,
                     "market_data": market_data,
-                    "analysis_timestamp": datetime.now().isoformat()
+                    "analysis_timestamp": intelligence["timestamp"]
                 }
-                
-                # Small delay to be respectful to API
-                time.sleep(0.1)
             
             return intelligence
             
@@ -7,7 +7,6 @@ Rotates through top 200 coins at 20-second intervals (18 coins per 6-minute batc
 
 import asyncio
 import aiohttp
-import json
 import time
 from datetime import datetime, timedelta
 import pytz
@@ -22,6 +21,12 @@ except ImportError:
     OpenAI = None
     OPENAI_AVAILABLE = False
 
+from llm_gateway import llm_gateway
+from sentiment_prefilter import sentiment_prefilter, to_ten_point
+from price_oracle import get_price_oracle
+from scan_store import get_scan_store
+from alert_performance import get_alert_tracker, ALERT_SHADOW_MIN_SCORE
+
 # Lumif-ai TradingView Enhanced Integration
 try:
     import sys
@@ -38,6 +43,24 @@ except ImportError:
 # Local API configuration
 LOCAL_API_URL = "http://localhost:5000"
 
+# AI grading prompts; a scan batch's coins are graded together (see _prefetch_ai_grades)
+NEWS_GRADING_SYSTEM = """You are a professional crypto news analyst. Analyze news for:
+1. Sentiment Score (0-10): How positive/negative for price
+2. Market Impact (0-10): Likelihood to move markets significantly  
+3. Is Catalyst (true/false): Major news that could trigger price movement
+
+Consider: partnerships, regulations, tech developments, institutional adoption, market trends."""
+NEWS_GRADING_INSTRUCTIONS = ('Grade each coin\'s news articles for market impact. Fields per item: '
+                             '"sentiment_score" (number), "market_impact" (number), "is_catalyst" (boolean).')
+SOCIAL_GRADING_SYSTEM = """You are a crypto social sentiment analyst. Grade social activity for:
+1. Quality Score (0-10): How genuine/organic the social buzz is (not bots/spam)
+2. Community Strength (0-10): Strength of the underlying community and engagement
+
+Consider: engagement quality, organic growth, community loyalty, influencer involvement, spam detection.
+Higher scores for genuine community-driven momentum vs artificial pump signals."""
+SOCIAL_GRADING_INSTRUCTIONS = ('Grade each coin\'s social sentiment. Fields per item: '
+                               '"quality_score" (number), "community_strength" (number).')
+
 # Discord Configuration (from automated_trading_alerts.py)
 DISCORD_CHANNELS = {
     'news': 1398000506068009032,          # News and social stuff channel
@@ -66,6 +89,7 @@ class ComprehensiveMarketScanner:
         # Current position in the rotation
         self.current_coin_index = 0
         self.current_batch = 0
+        self.prefetched = {}     # symbol -> (news payload, social payload) fetched with its batch
         self.top_200_coins = []
         self.last_top_200_refresh = None
         
@@ -137,6 +161,9 @@ class ComprehensiveMarketScanner:
         
         print(f"\n🔍 SCANNING {coin_symbol} [{batch_position}/{self.batch_size}] - Batch {current_batch_num}/{total_batches}")
         print(f"⏰ {datetime.now().strftime('%H:%M:%S')} | Coin {self.current_coin_index + 1}/{len(self.top_200_coins)}")
+
+        if batch_position == 1 and self.ai_enabled:
+            await self._prefetch_ai_grades(self.top_200_coins[self.current_coin_index:self.current_coin_index + self.batch_size])
         
         # Perform comprehensive 3-layer analysis
         analysis = await self._comprehensive_analysis(coin_symbol)
@@ -156,8 +183,18 @@ class ComprehensiveMarketScanner:
                 ai_insight = f"{coin_symbol}'s low confidence score of {confluence_score:.1f}% is primarily driven by neutral technical indicators, lack of positive sentiment in recent news, and stagnant social momentum, indicating limited enthusiasm or catalysts for price movement. Traders should note the absence of catalysts and engagement suggests limited short-term movement potential."
             
             # Update scanner status file for dashboard
-            self._update_scanner_status(coin_symbol, confluence_score, current_batch_num, total_batches, ai_insight)
+            self._update_scanner_status(coin_symbol, confluence_score, current_batch_num, total_batches, ai_insight,
+                                        layers={
+                                            'technical_score': analysis.get('technical', {}).get('technical_score', 0),
+                                            'news_score': analysis.get('news', {}).get('news_score', 0),
+                                            'social_score': analysis.get('social', {}).get('social_score', 0)
+                                        })
             
+            # Track near-misses too so min_opportunity_score can be tuned from outcomes
+            if confluence_score >= ALERT_SHADOW_MIN_SCORE:
+                self._track_alert(coin_symbol, analysis,
+                                  sent=confluence_score >= self.alert_thresholds['min_opportunity_score'])
+
             # Send alert if meets quality threshold
             if confluence_score >= self.alert_thresholds['min_opportunity_score']:
                 await self._send_alpha_alert(coin_symbol, analysis, ai_insight)
@@ -551,8 +588,8 @@ class ComprehensiveMarketScanner:
             print(f"⚠️ Technical analysis error for {symbol}: {e}")
             return None
     
-    async def _get_news_analysis(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
-        """Get recent news and sentiment for the symbol"""
+    async def _fetch_news(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """Recent positive news for the symbol, as the news endpoint returns it"""
         try:
             url = f"{LOCAL_API_URL}/api/crypto-news/symbol/{symbol}"
             params = {"hours": 24, "sentiment": "positive"}
@@ -560,8 +597,7 @@ class ComprehensiveMarketScanner:
             timeout = aiohttp.ClientTimeout(total=10)
             async with session.get(url, params=params, timeout=timeout) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return self._process_news_data(data)
+                    return await response.json()
                 else:
                     return None
                     
@@ -569,16 +605,15 @@ class ComprehensiveMarketScanner:
             print(f"⚠️ News analysis error for {symbol}: {e}")
             return None
     
-    async def _get_social_analysis(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
-        """Get social sentiment and momentum"""
+    async def _fetch_social(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """Social momentum for the symbol, as the social endpoint returns it"""
         try:
             url = f"{LOCAL_API_URL}/api/social/momentum/{symbol}"
             
             timeout = aiohttp.ClientTimeout(total=10)
             async with session.get(url, timeout=timeout) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return self._process_social_data(data)
+                    return await response.json()
                 else:
                     return None
                     
@@ -586,6 +621,46 @@ class ComprehensiveMarketScanner:
             print(f"⚠️ Social analysis error for {symbol}: {e}")
             return None
     
+    async def _get_news_analysis(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """Get recent news and sentiment for the symbol (the batch's prefetched payload when there is one)"""
+        if symbol in self.prefetched:
+            data = self.prefetched[symbol][0]
+        else:
+            data = await self._fetch_news(session, symbol)
+        return self._process_news_data(data) if data is not None else None
+    
+    async def _get_social_analysis(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """Get social sentiment and momentum (the batch's prefetched payload when there is one)"""
+        if symbol in self.prefetched:
+            data = self.prefetched.pop(symbol)[1]
+        else:
+            data = await self._fetch_social(session, symbol)
+        return self._process_social_data(data) if data is not None else None
+    
+    async def _prefetch_ai_grades(self, symbols: List[str]):
+        """Fetch a whole scan batch's news and social once and grade them in batched requests.
+
+        The payloads are kept per symbol and the per-coin analysis reads them
+        instead of fetching again, so each coin costs one news and one social
+        call, and the AI grades it looks up are the cached ones for exactly
+        these payloads.
+        """
+        self.prefetched = {}
+        try:
+            async with aiohttp.ClientSession() as session:
+                news = await asyncio.gather(*(self._fetch_news(session, s) for s in symbols))
+                social = await asyncio.gather(*(self._fetch_social(session, s) for s in symbols))
+            self.prefetched = dict(zip(symbols, zip(news, social)))
+            news_items = [item for item in map(self._news_ai_item, filter(None, news)) if item]
+            social_items = [item for item in map(self._social_ai_item, filter(None, social)) if item]
+            if news_items:
+                await asyncio.to_thread(self._grade_news, news_items)
+            if social_items:
+                await asyncio.to_thread(self._grade_social, social_items)
+            print(f"🧠 Pre-graded {len(news_items)} news / {len(social_items)} social items for {len(symbols)} coins")
+        except Exception as e:
+            print(f"⚠️ Batch AI grading failed, coins will be graded one by one: {e}")
+    
     def _process_technical_data(self, data: Dict) -> Dict:
         """Process local technical analysis data (already processed by local_technical_analysis)"""
         # Local TA already returns processed signals, just return as-is
@@ -613,27 +688,38 @@ class ComprehensiveMarketScanner:
             articles = data['articles']
             news_signals['recent_news_count'] = len(articles)
             
-            # Use AI to grade news quality and market impact
+            # Grade locally first; only ambiguous or high-impact articles go to AI
             if self.ai_enabled and articles:
                 try:
-                    # Combine all article titles/descriptions for AI analysis
-                    news_text = ". ".join([
-                        f"{article.get('title', '')}: {article.get('description', '')[:200]}"
-                        for article in articles[:3]  # Analyze top 3 articles
-                    ])
+                    top_articles = articles[:3]  # Analyze top 3 articles
+                    local, escalate = sentiment_prefilter.split(top_articles)
+                    scored = [score for _, score in local + escalate]
                     
-                    ai_analysis = self._analyze_news_with_ai(news_text, data.get('symbol', 'UNKNOWN'))
-                    if ai_analysis:
-                        news_signals['ai_sentiment_score'] = ai_analysis.get('sentiment_score', 0)
-                        news_signals['market_impact_score'] = ai_analysis.get('market_impact', 0)
-                        news_signals['news_catalyst'] = ai_analysis.get('is_catalyst', False)
-                        
-                        # AI-powered news score (0-15 points max)
-                        news_signals['news_score'] = min(15, 
-                            news_signals['ai_sentiment_score'] * 0.6 +  # 60% sentiment weight
-                            news_signals['market_impact_score'] * 0.4    # 40% impact weight
-                        )
-                        return news_signals
+                    sentiment_score = sum(to_ten_point(s['score']) for s in scored) / len(scored)
+                    market_impact = min(10, max(s['evidence'] for s in scored) * 1.5)
+                    is_catalyst = sum(1 for s in scored if s['sentiment'] == 'BULLISH') >= 2
+                    
+                    if escalate:
+                        item = self._news_item(data, escalate)
+                        ai_analysis = self._analyze_news_with_ai(item['news'], item['symbol'])
+                        if ai_analysis:
+                            # Blend AI grades for escalated articles with local grades for the rest
+                            sentiment_score = (ai_analysis.get('sentiment_score', 0) * len(escalate) +
+                                               sum(to_ten_point(s['score']) for _, s in local)) / len(scored)
+                            market_impact = max(market_impact, ai_analysis.get('market_impact', 0))
+                            is_catalyst = is_catalyst or ai_analysis.get('is_catalyst', False)
+                    
+                    news_signals['ai_sentiment_score'] = round(sentiment_score, 2)
+                    news_signals['market_impact_score'] = round(market_impact, 2)
+                    news_signals['news_catalyst'] = is_catalyst
+                    news_signals['escalated_to_ai'] = len(escalate)
+                    
+                    # AI-powered news score (0-15 points max)
+                    news_signals['news_score'] = min(15, 
+                        news_signals['ai_sentiment_score'] * 0.6 +  # 60% sentiment weight
+                        news_signals['market_impact_score'] * 0.4    # 40% impact weight
+                    )
+                    return news_signals
                         
                 except Exception as e:
                     print(f"⚠️ AI news analysis failed: {e}")
@@ -667,28 +753,19 @@ class ComprehensiveMarketScanner:
         }
         
         if data.get('success'):
-            # Process raw LunarCrush data
-            momentum = data.get('momentum', {})
-            raw_momentum = momentum.get('score', 0)
-            raw_sentiment = momentum.get('sentiment', 0)
+            # Process raw LunarCrush data (as /api/social/momentum returns it)
+            raw_momentum = data.get('social_momentum', 0) or 0
+            raw_sentiment = data.get('sentiment_score', 0) or 0
             
             social_signals['social_momentum'] = raw_momentum
             social_signals['sentiment_score'] = raw_sentiment
             social_signals['viral_potential'] = raw_momentum > 0.7
             
             # Use AI to grade social sentiment quality if available
-            if self.ai_enabled and (raw_momentum > 0.1 or raw_sentiment != 0):
+            item = self._social_ai_item(data) if self.ai_enabled else None
+            if item:
                 try:
-                    # Extract social context for AI analysis
-                    symbol = data.get('symbol', 'UNKNOWN')
-                    social_context = {
-                        'momentum_score': raw_momentum,
-                        'sentiment_score': raw_sentiment,
-                        'social_posts': momentum.get('posts', 0),
-                        'engagement_rate': momentum.get('engagement', 0)
-                    }
-                    
-                    ai_grade = self._analyze_social_with_ai(social_context, symbol)
+                    ai_grade = self._grade_social([item])[0]
                     if ai_grade:
                         social_signals['ai_social_grade'] = ai_grade.get('quality_score', 0)
                         social_signals['community_strength'] = ai_grade.get('community_strength', 0)
@@ -709,87 +786,82 @@ class ComprehensiveMarketScanner:
         
         return social_signals
     
-    def _analyze_news_with_ai(self, news_text: str, symbol: str) -> Optional[Dict]:
-        """Use AI to analyze news sentiment and market impact"""
-        try:
-            if not self.openai_client:
-                return None
-                
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. 
-            # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a professional crypto news analyst. Analyze news for:
-1. Sentiment Score (0-10): How positive/negative for price
-2. Market Impact (0-10): Likelihood to move markets significantly  
-3. Is Catalyst (true/false): Major news that could trigger price movement
-
-Consider: partnerships, regulations, tech developments, institutional adoption, market trends.
-Respond in JSON format: {"sentiment_score": number, "market_impact": number, "is_catalyst": boolean}"""
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"Analyze these {symbol} news articles for market impact:\n\n{news_text}"
-                    }
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=150,
-                temperature=0.3
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            return {
-                'sentiment_score': max(0, min(10, result.get('sentiment_score', 5))),
-                'market_impact': max(0, min(10, result.get('market_impact', 5))),  
-                'is_catalyst': result.get('is_catalyst', False)
-            }
-            
-        except Exception as e:
-            print(f"⚠️ AI news analysis error: {e}")
+    @staticmethod
+    def _news_item(data: Dict, escalate: List) -> Dict:
+        """What the AI grades for a coin's escalated articles (also its cache key)"""
+        return {
+            'symbol': data.get('symbol', 'UNKNOWN'),
+            'news': ". ".join([
+                f"{article.get('title', '')}: {article.get('description', '')[:200]}"
+                for article, _ in escalate
+            ])
+        }
+    
+    def _news_ai_item(self, data: Dict) -> Optional[Dict]:
+        """The news item _process_news_data would send to AI for this response, if any"""
+        if not (data.get('success') and data.get('articles')):
             return None
+        _, escalate = sentiment_prefilter.split(data['articles'][:3])
+        return self._news_item(data, escalate) if escalate else None
     
-    def _analyze_social_with_ai(self, social_context: Dict, symbol: str) -> Optional[Dict]:
-        """Use AI to grade social sentiment quality and community strength"""
+    @staticmethod
+    def _social_ai_item(data: Dict) -> Optional[Dict]:
+        """What the AI grades for a coin's social momentum, or None when there's too little to grade"""
+        if not data.get('success'):
+            return None
+        momentum = data.get('social_momentum', 0) or 0
+        sentiment = data.get('sentiment_score', 0.5)
+        # The endpoint reports neutral sentiment as 0.5
+        if not (momentum > 0.1 or (sentiment is not None and sentiment != 0.5)):
+            return None
+        context = {
+            'momentum_score': momentum,
+            'sentiment_score': sentiment,
+            'social_volume': data.get('social_volume', 0),
+            'galaxy_score': data.get('galaxy_score', 0)
+        }
+        # Round the metrics so tiny LunarCrush fluctuations still hit the cache
+        return {'symbol': data.get('symbol', 'UNKNOWN'), **{k: round(float(v or 0), 2) for k, v in context.items()}}
+    
+    def _grade_news(self, items: List[Dict]) -> List[Optional[Dict]]:
+        """AI news grades per {'symbol', 'news'} item: cached ones are free, the rest share batched requests"""
+        if not self.openai_client:
+            return [None] * len(items)
+        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. 
+        # do not change this unless explicitly requested by the user
+        graded = llm_gateway.grade_batch(
+            self.openai_client, 'scanner_news', 'gpt-4o', NEWS_GRADING_SYSTEM, NEWS_GRADING_INSTRUCTIONS,
+            items, render=lambda item: f"{item['symbol']}: {item['news']}",
+            batch_size=self.batch_size, tokens_per_item=150, temperature=0.3
+        )
+        return [None if result is None else {
+            'sentiment_score': max(0, min(10, result.get('sentiment_score', 5))),
+            'market_impact': max(0, min(10, result.get('market_impact', 5))),
+            'is_catalyst': result.get('is_catalyst', False)
+        } for result in graded]
+    
+    def _grade_social(self, items: List[Dict]) -> List[Optional[Dict]]:
+        """AI social grades per _social_ai_item, batched like _grade_news"""
+        if not self.openai_client:
+            return [None] * len(items)
+        graded = llm_gateway.grade_batch(
+            self.openai_client, 'scanner_social', 'gpt-4o', SOCIAL_GRADING_SYSTEM, SOCIAL_GRADING_INSTRUCTIONS,
+            items, render=lambda item: (f"{item['symbol']} - Momentum: {item['momentum_score']}, "
+                                        f"Sentiment: {item['sentiment_score']}, Social volume: {item['social_volume']}, "
+                                        f"Galaxy score: {item['galaxy_score']}"),
+            batch_size=self.batch_size, tokens_per_item=100, temperature=0.2
+        )
+        return [None if result is None else {
+            'quality_score': max(0, min(10, result.get('quality_score', 5))),
+            'community_strength': max(0, min(10, result.get('community_strength', 5)))
+        } for result in graded]
+    
+    def _analyze_news_with_ai(self, news_text: str, symbol: str) -> Optional[Dict]:
+        """Use AI to analyze news sentiment and market impact (usually already graded with its batch)"""
         try:
-            if not self.openai_client:
-                return None
-                
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. 
-            # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a crypto social sentiment analyst. Grade social activity for:
-1. Quality Score (0-10): How genuine/organic the social buzz is (not bots/spam)
-2. Community Strength (0-10): Strength of the underlying community and engagement
-
-Consider: engagement quality, organic growth, community loyalty, influencer involvement, spam detection.
-Higher scores for genuine community-driven momentum vs artificial pump signals.
-Respond in JSON format: {"quality_score": number, "community_strength": number}"""
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"Analyze {symbol} social sentiment:\nMomentum: {social_context['momentum_score']}\nSentiment: {social_context['sentiment_score']}\nPosts: {social_context.get('social_posts', 0)}\nEngagement: {social_context.get('engagement_rate', 0)}"
-                    }
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=100,
-                temperature=0.2
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            return {
-                'quality_score': max(0, min(10, result.get('quality_score', 5))),
-                'community_strength': max(0, min(10, result.get('community_strength', 5)))
-            }
-            
+            return self._grade_news([{'symbol': symbol, 'news': news_text}])[0]
         except Exception as e:
-            print(f"⚠️ AI social analysis error: {e}")
+            print(f"⚠️ AI news analysis error: {e}")
             return None
     
     def _calculate_confluence_score(self, analysis: Dict) -> float:
@@ -949,17 +1021,14 @@ Provide a concise 2-sentence analysis explaining why this coin scored {confidenc
 
             # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
             # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
+            insight = llm_gateway.complete_text(
+                self.openai_client, 'scanner_market_insight',
                 model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a professional crypto trading analyst providing concise, actionable market insights."},
-                    {"role": "user", "content": prompt}
-                ],
+                system="You are a professional crypto trading analyst providing concise, actionable market insights.",
+                user=prompt,
                 max_tokens=150,
                 temperature=0.7
             )
-            
-            insight = response.choices[0].message.content.strip()
             print(f"🧠 AI Insight for {symbol}: {insight}")
             return insight
             
@@ -967,54 +1036,36 @@ Provide a concise 2-sentence analysis explaining why this coin scored {confidenc
             print(f"⚠️ AI insight error for {symbol}: {e}")
             return None
     
-    def _update_scanner_status(self, symbol: str, confidence: float, batch_num: int, total_batches: int, ai_insight: Optional[str] = None):
-        """Update scanner status for dashboard"""
+    def _update_scanner_status(self, symbol: str, confidence: float, batch_num: int, total_batches: int, ai_insight: Optional[str] = None,
+                               layers: Optional[Dict] = None):
+        """Append this scan to the scan store (dashboard reads progress and recent scans from it;
+        the layer scores let backtest_engine replay news/social alongside candles)"""
         try:
-            # Keep recent scans history
-            recent_scans = []
-            
-            # Try to load existing data
-            try:
-                if os.path.exists('scanner_status.json'):
-                    with open('scanner_status.json', 'r') as f:
-                        existing_data = json.load(f)
-                        recent_scans = existing_data.get('recent_scans', [])
-            except:
-                pass
-            
-            # Add current scan
-            recent_scans.insert(0, {
-                'symbol': symbol,
-                'confidence': confidence,
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'alert_triggered': confidence >= 75,
-                'status': 'completed',
-                'ai_insight': ai_insight
-            })
-            
-            # Keep only last 10 scans
-            recent_scans = recent_scans[:10]
-            
-            # Update status
-            status_data = {
-                'current_coin': symbol,
-                'current_index': self.current_coin_index + 1,
-                'total_coins': len(self.top_200_coins),
-                'current_batch': f'{batch_num}/{total_batches}',
-                'confidence': confidence,
-                'alert_triggered': confidence >= 75,
-                'timestamp': datetime.now().isoformat(),
-                'scanning_active': True,
-                'recent_scans': recent_scans
-            }
-            
-            # Write to file
-            with open('scanner_status.json', 'w') as f:
-                json.dump(status_data, f, indent=2)
-                
+            store = get_scan_store()
+            if store:
+                store.record_scan(
+                    symbol, confidence,
+                    alert_triggered=confidence >= 75,
+                    batch=f'{batch_num}/{total_batches}',
+                    position=self.current_coin_index + 1,
+                    total=len(self.top_200_coins),
+                    ai_insight=ai_insight,
+                    payload=layers
+                )
         except Exception as e:
             print(f"⚠️ Failed to update scanner status: {e}")
 
+    def _track_alert(self, symbol: str, analysis: Dict, sent: bool):
+        """Hand the scored coin to the alert performance tracker"""
+        try:
+            tracker = get_alert_tracker()
+            if tracker:
+                recommendation = str(analysis.get('technical', {}).get('recommendation', '')).lower()
+                tracker.record_alert('comprehensive_scanner', 'confluence', symbol, analysis['confluence_score'],
+                                     direction='short' if 'sell' in recommendation else 'long', sent=sent)
+        except Exception as e:
+            print(f"⚠️ Failed to track alert: {e}")
+
     async def _send_alpha_alert(self, symbol: str, analysis: Dict, ai_insight: Optional[str] = None):
         """Send high-quality alpha opportunity alert"""
         confluence_score = analysis['confluence_score']
@@ -1188,7 +1239,11 @@ Provide a concise 2-sentence analysis explaining why this coin scored {confidenc
             return f"⚠️ Trade setup unavailable - manual analysis required"
     
     async def _get_current_price(self, symbol: str) -> Optional[float]:
-        """Get current price from local API"""
+        """Get current price from the in-memory price oracle, then the local API"""
+        oracle = get_price_oracle()
+        price = oracle.get_price(symbol) if oracle else None
+        if price:
+            return price
         try:
             timeout = aiohttp.ClientTimeout(total=5)
             async with aiohttp.ClientSession(timeout=timeout) as session:
@@ -9,16 +9,23 @@ import json
 import time
 import logging
 import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 # Import our existing modules
 from bingx_direct_api import bingx_direct
+from candles import Candles
 from openai_trading_intelligence import TradingIntelligence
+from orderbook_replica import orderbook_manager
 
 logger = logging.getLogger(__name__)
 
+KLINE_LIMIT = 100  # deepest window any analysis reads (volatility uses the last 50)
+BATCH_FETCH_WORKERS = int(os.getenv('BINGX_BATCH_WORKERS', '10'))
+
 @dataclass
 class MarketIntelligence:
     """Comprehensive market intelligence data structure"""
@@ -44,45 +51,44 @@ class EnhancedBingXIntelligence:
         """
         Collect comprehensive market data for multiple symbols
         This replaces the basic ticker calls with rich market intelligence
+        
+        Batch pipeline: one klines download per symbol (all symbols fetched
+        concurrently), then the numeric indicators for the whole batch are
+        computed at once on stacked arrays.
         """
         market_intelligence = {}
         
+        # One all-symbol request; every per-symbol ticker read below hits the snapshot
+        self.bingx_api.refresh_ticker_snapshot()
+        
+        # 1. Fetch: ticker, klines and orderbook per symbol, symbols in parallel
+        logger.info(f"Collecting comprehensive data for {len(symbols)} symbols")
+        workers = max(1, min(BATCH_FETCH_WORKERS, len(symbols)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            inputs = dict(zip(symbols, pool.map(lambda s: self._fetch_symbol_inputs(s, timeframe), symbols)))
+        
+        # 2. Compute: indicators for every symbol with klines in one vectorized pass
+        batch_metrics = self._batch_indicators({s: i['candles'] for s, i in inputs.items() if i['candles'] is not None})
+        
+        # 3. Assemble per-symbol intelligence
         for symbol in symbols:
             try:
-                logger.info(f"Collecting comprehensive data for {symbol}")
-                
-                # 1. Price & Ticker Data (24h statistics)
-                ticker_data = self._get_enhanced_ticker(symbol)
-                
-                # 2. Volume Analysis (multiple timeframes)
-                volume_analysis = self._analyze_volume_patterns(symbol, timeframe)
+                data = inputs[symbol]
+                if data['error']:
+                    raise Exception(data['error'])
+                candles = data['candles']
+                metrics = batch_metrics.get(symbol)
                 
-                # 3. Orderbook Depth Analysis
-                orderbook_analysis = self._analyze_orderbook_depth(symbol)
-                
-                # 4. Candlestick Pattern Analysis
-                candlestick_patterns = self._analyze_candlestick_patterns(symbol, timeframe)
-                
-                # 5. Momentum Indicators (calculated from price data)
-                momentum_indicators = self._calculate_momentum_indicators(symbol, timeframe)
-                
-                # 6. Volatility Metrics
-                volatility_metrics = self._calculate_volatility_metrics(symbol, timeframe)
-                
-                # 7. Market Structure Analysis
-                market_structure = self._analyze_market_structure(symbol, timeframe)
-                
-                # Combine into comprehensive intelligence
                 market_intelligence[symbol] = MarketIntelligence(
                     symbol=symbol,
                     timestamp=datetime.now(),
-                    price_data=ticker_data,
-                    volume_analysis=volume_analysis,
-                    orderbook_analysis=orderbook_analysis,
-                    candlestick_patterns=candlestick_patterns,
-                    momentum_indicators=momentum_indicators,
-                    volatility_metrics=volatility_metrics,
-                    market_structure=market_structure
+                    price_data=data['ticker'],
+                    volume_analysis=self._analyze_volume_patterns(symbol, timeframe, candles, metrics),
+                    orderbook_analysis=data['orderbook'],
+                    candlestick_patterns=self._analyze_candlestick_patterns(symbol, timeframe, candles),
+                    momentum_indicators=self._calculate_momentum_indicators(symbol, timeframe, candles, metrics),
+                    volatility_metrics=self._calculate_volatility_metrics(symbol, timeframe, candles, metrics),
+                    market_structure=self._analyze_market_structure(symbol, timeframe, candles, metrics)
                 )
                 
                 logger.info(f"✅ Comprehensive data collected for {symbol}")
@@ -93,6 +99,108 @@ class EnhancedBingXIntelligence:
                 
         return market_intelligence
     
+    def _fetch_symbol_inputs(self, symbol: str, timeframe: str) -> Dict:
+        """Everything the analyses need from the network for one symbol"""
+        inputs = {'ticker': self._get_enhanced_ticker(symbol), 'candles': None, 'orderbook': {}, 'error': None}
+        try:
+            inputs['candles'] = self._get_candles(symbol, timeframe)
+        except Exception as e:
+            logger.error(f"Klines fetch failed for {symbol}: {str(e)}")
+        inputs['orderbook'] = self._analyze_orderbook_depth(symbol)
+        return inputs
+    
+    def _get_candles(self, symbol: str, timeframe: str) -> Candles:
+        """The one klines download per symbol (deepest window any analysis reads)"""
+        return self.bingx_api.get_candles(symbol, timeframe, limit=KLINE_LIMIT)
+    
+    def _batch_indicators(self, candles_by_symbol: Dict[str, Candles]) -> Dict[str, Dict]:
+        """
+        Numeric indicators for many symbols at once.
+        
+        Symbols with the same number of candles (normally all of them) are
+        stacked into (symbols x candles) arrays and every indicator is one
+        array expression over the batch. Windows match the per-analysis
+        definitions: volume/momentum/structure read the last 100 candles,
+        volatility the last 50.
+        """
+        groups: Dict[int, List[str]] = {}
+        for symbol, candles in candles_by_symbol.items():
+            groups.setdefault(min(len(candles), KLINE_LIMIT), []).append(symbol)
+        
+        results = {}
+        for length, group in groups.items():
+            if length < 2:
+                continue
+            series = [candles_by_symbol[s] for s in group]
+            highs, lows, closes, volumes = (Candles.stack(series, field, length)
+                                            for field in ('high', 'low', 'close', 'volume'))
+            last = closes[:, -1]
+            
+            def pct_change(periods):
+                if length <= periods:
+                    return np.zeros(len(group))
+                base = closes[:, -periods - 1]
+                return np.divide(last - base, base, out=np.zeros_like(last), where=base != 0) * 100
+            
+            # RSI(14): simple averages of the last 14 gains/losses
+            deltas = np.diff(closes, axis=1)[:, -14:]
+            avg_gain = np.clip(deltas, 0, None).sum(axis=1) / 14
+            avg_loss = np.clip(-deltas, 0, None).sum(axis=1) / 14
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+            if length < 15:
+                rsi = np.full(len(group), 50.0)
+            
+            # Volume over the last 20 candles and its correlation with price
+            vol_20, close_20 = volumes[:, -20:], closes[:, -20:]
+            n = vol_20.shape[1]
+            avg_volume_20 = vol_20.sum(axis=1) / 20
+            numerator = n * (vol_20 * close_20).sum(axis=1) - vol_20.sum(axis=1) * close_20.sum(axis=1)
+            variance = ((n * (vol_20 ** 2).sum(axis=1) - vol_20.sum(axis=1) ** 2)
+                        * (n * (close_20 ** 2).sum(axis=1) - close_20.sum(axis=1) ** 2))
+            denominator = np.sqrt(np.clip(variance, 0, None))
+            correlation = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+            
+            # Volatility window: last 50 candles
+            c50, h50, l50 = closes[:, -50:], highs[:, -50:], lows[:, -50:]
+            changes = np.diff(c50, axis=1) / c50[:, :-1] * 100
+            true_range = np.maximum.reduce([
+                h50[:, 1:] - l50[:, 1:],
+                np.abs(h50[:, 1:] - c50[:, :-1]),
+                np.abs(l50[:, 1:] - c50[:, :-1])
+            ])
+            
+            # Support/resistance: mean of the 5 highest highs / lowest lows of the last 20
+            resistance = np.sort(highs[:, -20:], axis=1)[:, -5:].mean(axis=1)
+            support = np.sort(lows[:, -20:], axis=1)[:, :5].mean(axis=1)
+            recent_range = highs[:, -10:].max(axis=1) - lows[:, -10:].min(axis=1)
+            
+            columns = {
+                'close': last,
+                'rsi_14': np.round(rsi, 2),
+                'momentum_5': pct_change(5),
+                'momentum_10': pct_change(10),
+                'medium_term_trend': pct_change(20),
+                'sma_10': closes[:, -10:].sum(axis=1) / 10 if length >= 10 else np.zeros(len(group)),
+                'sma_20': closes[:, -20:].sum(axis=1) / 20 if length >= 20 else np.zeros(len(group)),
+                'current_volume': volumes[:, -1],
+                'average_volume_20': avg_volume_20,
+                'price_volume_correlation': np.round(correlation, 3),
+                'price_volatility': np.sqrt((changes ** 2).mean(axis=1)),
+                'atr_14': true_range[:, -14:].mean(axis=1),
+                'recent_range': recent_range,
+                'resistance_level': resistance,
+                'support_level': support
+            }
+            columns = {name: values.tolist() for name, values in columns.items()}
+            for row, symbol in enumerate(group):
+                results[symbol] = {name: values[row] for name, values in columns.items()}
+        return results
+    
+    def _metrics_for(self, symbol: str, candles: Candles, metrics: Optional[Dict]) -> Dict:
+        """Batch metrics when the pipeline computed them, else a batch of one"""
+        return metrics if metrics is not None else self._batch_indicators({symbol: candles})[symbol]
+    
     def _get_enhanced_ticker(self, symbol: str) -> Dict:
         """Get enhanced ticker data with additional metrics"""
         try:
@@ -119,47 +227,45 @@ class EnhancedBingXIntelligence:
             logger.error(f"Enhanced ticker failed for {symbol}: {str(e)}")
             return {}
     
-    def _analyze_volume_patterns(self, symbol: str, timeframe: str) -> Dict:
+    def _analyze_volume_patterns(self, symbol: str, timeframe: str, candles: Optional[Candles] = None,
+                                 metrics: Optional[Dict] = None) -> Dict:
         """Analyze volume patterns across multiple timeframes"""
         try:
             # Get candlestick data for volume analysis
-            klines_data = self.bingx_api.get_klines(symbol, timeframe, limit=100)
-            ohlcv = klines_data.get('ohlcv', [])
+            if candles is None:
+                candles = self._get_candles(symbol, timeframe)
             
-            if len(ohlcv) < 20:
+            if len(candles) < 20:
                 return {'error': 'Insufficient data for volume analysis'}
             
-            volumes = [candle[5] for candle in ohlcv]  # Volume is index 5
-            prices = [candle[4] for candle in ohlcv]   # Close prices
+            m = self._metrics_for(symbol, candles, metrics)
+            volumes = candles.volume
+            prices = candles.close
             
-            # Calculate volume metrics
-            avg_volume_20 = sum(volumes[-20:]) / 20
-            current_volume = volumes[-1]
+            avg_volume_20 = m['average_volume_20']
+            current_volume = m['current_volume']
             volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 0
             
-            # Price-volume correlation
-            volume_price_correlation = self._calculate_correlation(volumes[-20:], prices[-20:])
-            
             # Volume spikes detection
             volume_spikes = []
-            for i, vol in enumerate(volumes[-20:]):
-                if vol > avg_volume_20 * 2:  # 2x average volume = spike
-                    volume_spikes.append({
-                        'index': i,
-                        'volume': vol,
-                        'multiplier': vol / avg_volume_20,
-                        'price': prices[-(20-i)]
-                    })
+            for i in np.flatnonzero(volumes[-20:] > avg_volume_20 * 2).tolist():  # 2x average volume = spike
+                vol = float(volumes[i - 20])
+                volume_spikes.append({
+                    'index': i,
+                    'volume': vol,
+                    'multiplier': vol / avg_volume_20,
+                    'price': float(prices[i - 20])
+                })
             
             return {
                 'current_volume': current_volume,
                 'average_volume_20': avg_volume_20,
                 'volume_ratio': volume_ratio,
                 'volume_trend': 'increasing' if volumes[-1] > volumes[-5] else 'decreasing',
-                'price_volume_correlation': volume_price_correlation,
+                'price_volume_correlation': m['price_volume_correlation'],
                 'volume_spikes': volume_spikes,
                 'volume_score': min(10, volume_ratio * 2),  # Score out of 10
-                'analysis_period': f"Last 100 {timeframe} candles"
+                'analysis_period': f"Last {min(len(candles), KLINE_LIMIT)} {timeframe} candles"
             }
             
         except Exception as e:
@@ -168,6 +274,10 @@ class EnhancedBingXIntelligence:
     
     def _analyze_orderbook_depth(self, symbol: str) -> Dict:
         """Analyze orderbook depth and liquidity"""
+        metrics = orderbook_manager.get_metrics(symbol)
+        if metrics:
+            return self._orderbook_analysis_from_replica(metrics)
+        
         try:
             orderbook = self.bingx_api.get_orderbook(symbol, limit=50)
             
@@ -210,28 +320,51 @@ class EnhancedBingXIntelligence:
             logger.error(f"Orderbook analysis failed for {symbol}: {str(e)}")
             return {'error': str(e)}
     
-    def _analyze_candlestick_patterns(self, symbol: str, timeframe: str) -> Dict:
+    def _orderbook_analysis_from_replica(self, metrics: Dict) -> Dict:
+        """Same shape as the REST analysis, read from the maintained L2 book"""
+        depth_imbalance = metrics['imbalance_5']
+        total_depth = metrics['bid_depth_5'] + metrics['ask_depth_5']
+        return {
+            'best_bid': metrics['best_bid'],
+            'best_ask': metrics['best_ask'],
+            'spread': metrics['spread'],
+            'spread_bps': metrics['spread_bps'],
+            'bid_depth_5': metrics['bid_depth_5'],
+            'ask_depth_5': metrics['ask_depth_5'],
+            'total_depth': total_depth,
+            'depth_imbalance': depth_imbalance,
+            'imbalance_direction': 'bullish' if depth_imbalance > 0.1 else 'bearish' if depth_imbalance < -0.1 else 'neutral',
+            'liquidity_score': min(10, total_depth / 1000),  # Same scaling as the REST path
+            'market_pressure': 'buying' if depth_imbalance > 0.2 else 'selling' if depth_imbalance < -0.2 else 'balanced',
+            'depth_bands': metrics['depth_bands'],
+            'slippage_bps': metrics['slippage_bps'],
+            'walls': metrics['walls'],
+            'source': 'orderbook_replica'
+        }
+    
+    def _analyze_candlestick_patterns(self, symbol: str, timeframe: str, candles: Optional[Candles] = None) -> Dict:
         """Analyze candlestick patterns for technical signals"""
         try:
-            klines_data = self.bingx_api.get_klines(symbol, timeframe, limit=50)
-            ohlcv = klines_data.get('ohlcv', [])
+            if candles is None:
+                candles = self._get_candles(symbol, timeframe)
             
-            if len(ohlcv) < 10:
+            if len(candles) < 10:
                 return {'error': 'Insufficient data for pattern analysis'}
             
             patterns = []
-            recent_candles = ohlcv[-5:]  # Last 5 candles
-            
-            for i, candle in enumerate(recent_candles):
-                timestamp, open_price, high, low, close, volume = candle
-                
-                # Basic candle analysis
-                body_size = abs(close - open_price)
-                wick_top = high - max(open_price, close)
-                wick_bottom = min(open_price, close) - low
-                total_range = high - low
-                
-                candle_type = 'bullish' if close > open_price else 'bearish'
+            recent = candles.tail(5)  # Last 5 candles (views, no copy)
+            opens, highs, lows, closes = recent.open, recent.high, recent.low, recent.close
+            
+            body_sizes = np.abs(closes - opens)
+            wicks_top = highs - np.maximum(opens, closes)
+            wicks_bottom = np.minimum(opens, closes) - lows
+            total_ranges = highs - lows
+            bullish = closes > opens
+            
+            for body_size, wick_top, wick_bottom, total_range, is_bullish in zip(
+                    body_sizes.tolist(), wicks_top.tolist(), wicks_bottom.tolist(),
+                    total_ranges.tolist(), bullish.tolist()):
+                candle_type = 'bullish' if is_bullish else 'bearish'
                 
                 # Pattern detection
                 if body_size < total_range * 0.3:  # Small body
@@ -244,21 +377,18 @@ class EnhancedBingXIntelligence:
                     patterns.append('strong_' + candle_type)
             
             # Multi-candle patterns
-            if len(recent_candles) >= 3:
-                last_3 = recent_candles[-3:]
-                if (last_3[0][4] > last_3[0][1] and  # First bullish
-                    last_3[1][4] < last_3[1][1] and  # Second bearish  
-                    last_3[2][4] > last_3[2][1]):    # Third bullish
-                    patterns.append('morning_star_formation')
+            if len(recent) >= 3 and bullish[-3] and closes[-2] < opens[-2] and bullish[-1]:
+                patterns.append('morning_star_formation')  # bullish, bearish, bullish
             
+            last_range = float(total_ranges[-1])
             return {
                 'detected_patterns': patterns,
                 'pattern_count': len(patterns),
                 'latest_candle': {
-                    'type': 'bullish' if recent_candles[-1][4] > recent_candles[-1][1] else 'bearish',
-                    'body_percentage': (abs(recent_candles[-1][4] - recent_candles[-1][1]) / (recent_candles[-1][2] - recent_candles[-1][3])) * 100,
-                    'upper_wick_ratio': (recent_candles[-1][2] - max(recent_candles[-1][1], recent_candles[-1][4])) / (recent_candles[-1][2] - recent_candles[-1][3]),
-                    'lower_wick_ratio': (min(recent_candles[-1][1], recent_candles[-1][4]) - recent_candles[-1][3]) / (recent_candles[-1][2] - recent_candles[-1][3])
+                    'type': 'bullish' if bullish[-1] else 'bearish',
+                    'body_percentage': (float(body_sizes[-1]) / last_range) * 100,
+                    'upper_wick_ratio': float(wicks_top[-1]) / last_range,
+                    'lower_wick_ratio': float(wicks_bottom[-1]) / last_range
                 },
                 'pattern_strength': len(patterns) * 2,  # Simple scoring
                 'timeframe': timeframe
@@ -268,29 +398,22 @@ class EnhancedBingXIntelligence:
             logger.error(f"Candlestick pattern analysis failed for {symbol}: {str(e)}")
             return {'error': str(e)}
     
-    def _calculate_momentum_indicators(self, symbol: str, timeframe: str) -> Dict:
+    def _calculate_momentum_indicators(self, symbol: str, timeframe: str, candles: Optional[Candles] = None,
+                                       metrics: Optional[Dict] = None) -> Dict:
         """Calculate momentum indicators from price data"""
         try:
-            klines_data = self.bingx_api.get_klines(symbol, timeframe, limit=100)
-            ohlcv = klines_data.get('ohlcv', [])
+            if candles is None:
+                candles = self._get_candles(symbol, timeframe)
             
-            if len(ohlcv) < 20:
+            if len(candles) < 20:
                 return {'error': 'Insufficient data for momentum calculation'}
             
-            closes = [candle[4] for candle in ohlcv]
-            highs = [candle[2] for candle in ohlcv]
-            lows = [candle[3] for candle in ohlcv]
-            
-            # Simple RSI calculation
-            rsi = self._calculate_rsi(closes)
-            
-            # Price momentum
-            momentum_5 = (closes[-1] - closes[-6]) / closes[-6] * 100 if len(closes) >= 6 else 0
-            momentum_10 = (closes[-1] - closes[-11]) / closes[-11] * 100 if len(closes) >= 11 else 0
-            
-            # Simple moving averages
-            sma_10 = sum(closes[-10:]) / 10 if len(closes) >= 10 else 0
-            sma_20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else 0
+            m = self._metrics_for(symbol, candles, metrics)
+            rsi = m['rsi_14']
+            momentum_5 = m['momentum_5']
+            momentum_10 = m['momentum_10']
+            sma_10 = m['sma_10']
+            sma_20 = m['sma_20']
             
             return {
                 'rsi_14': rsi,
@@ -299,8 +422,8 @@ class EnhancedBingXIntelligence:
                 'momentum_10_periods': momentum_10,
                 'sma_10': sma_10,
                 'sma_20': sma_20,
-                'price_vs_sma10': 'above' if closes[-1] > sma_10 else 'below',
-                'price_vs_sma20': 'above' if closes[-1] > sma_20 else 'below',
+                'price_vs_sma10': 'above' if m['close'] > sma_10 else 'below',
+                'price_vs_sma20': 'above' if m['close'] > sma_20 else 'below',
                 'sma_cross': 'bullish' if sma_10 > sma_20 else 'bearish',
                 'momentum_score': (momentum_5 + momentum_10) / 2,
                 'trend_strength': abs(momentum_10)
@@ -310,74 +433,53 @@ class EnhancedBingXIntelligence:
             logger.error(f"Momentum indicators failed for {symbol}: {str(e)}")
             return {'error': str(e)}
     
-    def _calculate_volatility_metrics(self, symbol: str, timeframe: str) -> Dict:
+    def _calculate_volatility_metrics(self, symbol: str, timeframe: str, candles: Optional[Candles] = None,
+                                      metrics: Optional[Dict] = None) -> Dict:
         """Calculate volatility metrics"""
         try:
-            klines_data = self.bingx_api.get_klines(symbol, timeframe, limit=50)
-            ohlcv = klines_data.get('ohlcv', [])
+            if candles is None:
+                candles = self._get_candles(symbol, timeframe)
             
-            if len(ohlcv) < 10:
+            if len(candles) < 10:
                 return {'error': 'Insufficient data for volatility calculation'}
             
-            closes = [candle[4] for candle in ohlcv]
-            highs = [candle[2] for candle in ohlcv]
-            lows = [candle[3] for candle in ohlcv]
-            
-            # Price changes
-            price_changes = [(closes[i] - closes[i-1]) / closes[i-1] * 100 for i in range(1, len(closes))]
-            
-            # Volatility metrics
-            volatility = (sum([change**2 for change in price_changes]) / len(price_changes))**0.5
-            
-            # Average True Range (simplified)
-            true_ranges = []
-            for i in range(1, len(ohlcv)):
-                tr = max(
-                    highs[i] - lows[i],
-                    abs(highs[i] - closes[i-1]),
-                    abs(lows[i] - closes[i-1])
-                )
-                true_ranges.append(tr)
-            
-            atr = sum(true_ranges[-14:]) / min(14, len(true_ranges)) if true_ranges else 0
+            m = self._metrics_for(symbol, candles, metrics)
+            volatility = m['price_volatility']
             
             return {
                 'price_volatility': volatility,
-                'atr_14': atr,
+                'atr_14': m['atr_14'],
                 'volatility_percentile': min(100, volatility * 10),  # Arbitrary scaling
                 'volatility_rating': 'high' if volatility > 5 else 'medium' if volatility > 2 else 'low',
                 'price_stability': 'stable' if volatility < 1 else 'moderate' if volatility < 3 else 'volatile',
-                'recent_range': max(highs[-10:]) - min(lows[-10:]),
-                'range_percentage': ((max(highs[-10:]) - min(lows[-10:])) / closes[-1]) * 100
+                'recent_range': m['recent_range'],
+                'range_percentage': (m['recent_range'] / m['close']) * 100
             }
             
         except Exception as e:
             logger.error(f"Volatility calculation failed for {symbol}: {str(e)}")
             return {'error': str(e)}
     
-    def _analyze_market_structure(self, symbol: str, timeframe: str) -> Dict:
+    def _analyze_market_structure(self, symbol: str, timeframe: str, candles: Optional[Candles] = None,
+                                  metrics: Optional[Dict] = None) -> Dict:
         """Analyze market structure and trend"""
         try:
-            klines_data = self.bingx_api.get_klines(symbol, timeframe, limit=100)
-            ohlcv = klines_data.get('ohlcv', [])
+            if candles is None:
+                candles = self._get_candles(symbol, timeframe)
             
-            if len(ohlcv) < 20:
+            if len(candles) < 20:
                 return {'error': 'Insufficient data for structure analysis'}
             
-            closes = [candle[4] for candle in ohlcv]
-            highs = [candle[2] for candle in ohlcv]
-            lows = [candle[3] for candle in ohlcv]
+            m = self._metrics_for(symbol, candles, metrics)
+            close = m['close']
             
             # Trend analysis
-            short_term_trend = (closes[-1] - closes[-6]) / closes[-6] * 100 if len(closes) >= 6 else 0
-            medium_term_trend = (closes[-1] - closes[-21]) / closes[-21] * 100 if len(closes) >= 21 else 0
+            short_term_trend = m['momentum_5']
+            medium_term_trend = m['medium_term_trend']
             
             # Support/Resistance levels (simplified)
-            recent_highs = sorted(highs[-20:])[-5:]  # Top 5 highs
-            recent_lows = sorted(lows[-20:])[:5]     # Bottom 5 lows
-            
-            resistance_level = sum(recent_highs) / len(recent_highs)
-            support_level = sum(recent_lows) / len(recent_lows)
+            resistance_level = m['resistance_level']
+            support_level = m['support_level']
             
             return {
                 'short_term_trend': short_term_trend,
@@ -386,9 +488,9 @@ class EnhancedBingXIntelligence:
                 'trend_strength': abs(medium_term_trend),
                 'resistance_level': resistance_level,
                 'support_level': support_level,
-                'distance_to_resistance': ((resistance_level - closes[-1]) / closes[-1]) * 100,
-                'distance_to_support': ((closes[-1] - support_level) / closes[-1]) * 100,
-                'position_in_range': ((closes[-1] - support_level) / (resistance_level - support_level)) * 100 if resistance_level != support_level else 50,
+                'distance_to_resistance': ((resistance_level - close) / close) * 100,
+                'distance_to_support': ((close - support_level) / close) * 100,
+                'position_in_range': ((close - support_level) / (resistance_level - support_level)) * 100 if resistance_level != support_level else 50,
                 'breakout_probability': 'high' if abs(short_term_trend) > 5 else 'medium' if abs(short_term_trend) > 2 else 'low'
             }
             
@@ -396,45 +498,6 @@ class EnhancedBingXIntelligence:
             logger.error(f"Market structure analysis failed for {symbol}: {str(e)}")
             return {'error': str(e)}
     
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate RSI indicator"""
-        if len(prices) < period + 1:
-            return 50  # Neutral RSI
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [delta if delta > 0 else 0 for delta in deltas]
-        losses = [-delta if delta < 0 else 0 for delta in deltas]
-        
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return round(rsi, 2)
-    
-    def _calculate_correlation(self, x: List[float], y: List[float]) -> float:
-        """Calculate correlation coefficient"""
-        if len(x) != len(y) or len(x) < 2:
-            return 0
-        
-        n = len(x)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(x[i] * y[i] for i in range(n))
-        sum_x2 = sum(xi * xi for xi in x)
-        sum_y2 = sum(yi * yi for yi in y)
-        
-        numerator = n * sum_xy - sum_x * sum_y
-        denominator = ((n * sum_x2 - sum_x * sum_x) * (n * sum_y2 - sum_y * sum_y)) ** 0.5
-        
-        if denominator == 0:
-            return 0
-        
-        return round(numerator / denominator, 3)
-    
     def generate_ai_market_analysis(self, symbols: List[str], timeframe: str = '1h') -> Dict:
         """
         Generate comprehensive AI analysis using enhanced BingX market data
@@ -19,6 +19,7 @@ import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+from ttl_cache import TTLCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,7 +44,7 @@ class EnhancedTradingBot(commands.Bot):
         super().__init__(command_prefix='!', intents=intents)
         
         self.db_path = "enhanced_trading_bot.db"
-        self.alert_cache = {}
+        self.alert_cache = TTLCache('discord_alerts', ttl=3600, max_entries=2048)
         self.performance_metrics = {}
         self.rate_limits = {}
         
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Fast JSON Responses
+Flask JSON provider backed by orjson (NumPy arrays/scalars, datetimes,
+Decimals and sets serialize natively), Accept-Encoding negotiated
+gzip/brotli compression for large bodies, and a response cache that
+keeps finished payloads as serialized (and pre-compressed) bytes so
+repeat calls to heavy endpoints skip both the upstream work and the
+encoding.
+"""
+
+import functools
+import gzip
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+from ttl_cache import TTLCache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = int(os.getenv('JSON_COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('JSON_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('JSON_BROTLI_QUALITY', '5'))  # 11 is far slower for little gain on JSON
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_MB', '64')) * 1024 * 1024
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv', 'application/javascript'}
+
+if ORJSON_AVAILABLE:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """Types orjson does not handle itself"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()           # pandas Timestamp, date, time
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()              # non-contiguous arrays, pandas Series
+    if hasattr(obj, 'item'):
+        return obj.item()                # remaining NumPy scalars
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed, stdlib otherwise)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_default,
+                                option=ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's provider; `jsonify` goes straight to bytes"""
+
+    sort_keys = False  # keep insertion order; sorting every payload costs more than it's worth
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj, self.sort_keys), mimetype=self.mimetype)
+
+
+# ---- compression ------------------------------------------------------------
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Best encoding the client accepts: brotli when available, then gzip"""
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted.quality('br') > 0:
+        return 'br'
+    if accepted.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def _compressible(response) -> bool:
+    return (200 <= response.status_code < 300 and not response.direct_passthrough
+            and not response.is_streamed and 'Content-Encoding' not in response.headers
+            and response.mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def init_compression(app, min_size: int = COMPRESS_MIN_BYTES):
+    """Compress eligible responses of at least `min_size` bytes (streams/SSE are left alone)"""
+
+    @app.after_request
+    def compress_response(response):
+        if not _compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding()
+        data = response.get_data()
+        if encoding and len(data) >= min_size:
+            response.set_data(compress(data, encoding))
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    logger.info(f"🗜️ Response compression enabled (gzip{', br' if BROTLI_AVAILABLE else ''}, >= {min_size} bytes)")
+    return compress_response
+
+
+# ---- byte-level response cache ---------------------------------------------
+
+_response_cache = TTLCache('response_bytes', ttl=60, max_entries=512, max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+
+def _encode_body(body: bytes) -> Dict[str, bytes]:
+    """Identity body plus every encoding we can serve, computed once at store time"""
+    bodies = {'identity': body}
+    if len(body) >= COMPRESS_MIN_BYTES:
+        bodies['gzip'] = compress(body, 'gzip')
+        if BROTLI_AVAILABLE:
+            bodies['br'] = compress(body, 'br')
+    return bodies
+
+
+def cached_response(ttl: float = 60, key: Optional[Callable[..., str]] = None,
+                    cacheable: Optional[Callable[[Any], bool]] = None):
+    """Cache a view's successful responses as bytes for `ttl` seconds.
+
+    The key is the path plus query string (or `key(**view_kwargs)`);
+    `?fresh=true` rebuilds the entry. Non-200 responses are never cached,
+    nor are 200s whose JSON body `cacheable` rejects (views that report
+    partial failures inside a 200).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache_key = key(**kwargs) if key else (
+                request.path, tuple(sorted((k, v) for k, v in request.args.items(multi=True) if k != 'fresh')))
+            fresh = request.args.get('fresh', '').lower() in ('1', 'true')
+            entry = None if fresh else _response_cache.get(cache_key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or not _compressible(response):
+                    return response
+                if cacheable and not cacheable(response.get_json(silent=True)):
+                    return response
+                entry = {'mimetype': response.mimetype, 'bodies': _encode_body(response.get_data())}
+                _response_cache.set(cache_key, entry, ttl)
+
+            encoding = negotiate_encoding()
+            body = entry['bodies'].get(encoding) if encoding else None
+            response = current_app.response_class(body or entry['bodies']['identity'], mimetype=entry['mimetype'])
+            if body is not None:
+                response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
+
+
+def clear_response_cache():
+    _response_cache.clear()
@@ -23,6 +23,7 @@ import pytz
 from typing import Dict, List, Optional
 import json
 import logging
+from ttl_cache import TTLCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -80,7 +81,7 @@ CRITICAL_EVENTS = {
 class FinancialCalendarTracker:
     def __init__(self):
         self.et_tz = pytz.timezone('US/Eastern')
-        self.events_cache = {}
+        self.events_cache = TTLCache('calendar_events', ttl=3600, max_entries=512)
         self.last_update = None
         
     async def send_calendar_alert(self, message: str, event_type: str = "INFO"):
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Futures Time-Series Store
+Local SQLite history of funding rates and open interest for the tracked
+universe, kept current by a background sync against Coinalyze. The first
+sync backfills; later ones refetch from the newest stored bar onwards,
+replacing it, since it was still open when stored. Derived series are
+computed once at ingest - funding z-score over a rolling window, OI
+delta, and perp-vs-spot basis - so endpoints and scanners read them with
+a local query instead of refetching history.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from service_base import PeriodicWorker, Singleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+FUTURES_DB_PATH = os.getenv('FUTURES_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       'futures_timeseries.db'))
+FUTURES_SYNC_INTERVAL = int(os.getenv('FUTURES_SYNC_INTERVAL', '900'))
+FUTURES_BACKFILL_HOURS = int(os.getenv('FUTURES_BACKFILL_HOURS', '720'))
+FUNDING_ZSCORE_WINDOW = int(os.getenv('FUNDING_ZSCORE_WINDOW', '168'))  # one week of hourly bars
+ZSCORE_MIN_PERIODS = 24
+HISTORY_INTERVAL = '1hour'
+INTERVAL_SECONDS = 3600
+
+DEFAULT_UNIVERSE = [
+    'BTC', 'ETH', 'SOL', 'XRP', 'DOGE', 'ADA', 'AVAX', 'LINK', 'DOT', 'SUI', 'BNB', 'LTC', 'TRX',
+    'TON', 'NEAR', 'APT', 'ARB', 'OP', 'INJ', 'ATOM', 'FIL', 'AAVE', 'UNI', 'LDO', 'PEPE', 'WIF',
+    'SHIB', 'BONK', 'TIA', 'SEI'
+]
+
+
+def rolling_zscore(values: np.ndarray, window: int, min_periods: int = ZSCORE_MIN_PERIODS) -> np.ndarray:
+    """Z-score of each value against the trailing `window` (itself included); NaN until min_periods"""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return values
+    c1 = np.concatenate(([0.0], np.cumsum(values)))
+    c2 = np.concatenate(([0.0], np.cumsum(values * values)))
+    idx = np.arange(1, n + 1)
+    lo = np.maximum(idx - window, 0)
+    count = idx - lo
+    mean = (c1[idx] - c1[lo]) / count
+    var = np.maximum((c2[idx] - c2[lo]) / count - mean * mean, 0.0)
+    std = np.sqrt(var)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(std > 1e-12, (values - mean) / std, 0.0)
+    z[count < min_periods] = np.nan
+    return z
+
+
+def _closes(rows) -> Dict[str, List]:
+    """{symbol: [(t, close), ...]} from Coinalyze history rows"""
+    out = {}
+    if not isinstance(rows, list):
+        return out
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        points = [(int(p['t']), float(p['c'])) for p in row.get('history') or []
+                  if p.get('t') is not None and p.get('c') is not None]
+        out.setdefault(row.get('symbol'), []).extend(sorted(points))
+    return out
+
+
+class FuturesTimeSeriesStore(SQLiteStore, PeriodicWorker):
+    """Funding/OI history with precomputed z-score, OI delta and basis"""
+
+    worker_name = 'futures-timeseries'
+
+    def __init__(self, api=None, db_path: str = FUTURES_DB_PATH, universe: Optional[Iterable[str]] = None,
+                 sync_interval: float = FUTURES_SYNC_INTERVAL, backfill_hours: int = FUTURES_BACKFILL_HOURS,
+                 zscore_window: int = FUNDING_ZSCORE_WINDOW,
+                 spot_prices: Optional[Callable[[List[str]], Dict[str, Optional[float]]]] = None,
+                 auto_start: bool = False):
+        self.api = api
+        self.universe = [a.upper() for a in (universe or DEFAULT_UNIVERSE)]
+        self.sync_interval = sync_interval
+        self.backfill_hours = backfill_hours
+        self.zscore_window = zscore_window
+        self.spot_prices = spot_prices
+        self._sync_lock = threading.Lock()
+        self._universe_lock = threading.Lock()
+        self._init_worker(auto_start)
+        self.stats = {'syncs': 0, 'sync_errors': 0, 'funding_rows': 0, 'oi_rows': 0, 'basis_rows': 0,
+                      'last_sync': None, 'last_error': None, 'sync_seconds': 0.0}
+        super().__init__(db_path)
+
+    # ---- storage -----------------------------------------------------------
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS funding (
+                asset TEXT,
+                ts INTEGER,
+                rate REAL,
+                zscore REAL,
+                PRIMARY KEY (asset, ts)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS open_interest (
+                asset TEXT,
+                ts INTEGER,
+                oi REAL,
+                oi_delta REAL,
+                oi_delta_pct REAL,
+                PRIMARY KEY (asset, ts)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS basis (
+                asset TEXT,
+                ts INTEGER,
+                perp_price REAL,
+                spot_price REAL,
+                basis_pct REAL,
+                PRIMARY KEY (asset, ts)
+            )
+        ''')
+
+    def last_ts(self, table: str, asset: str) -> Optional[int]:
+        row = self._conn().execute(f'SELECT MAX(ts) AS ts FROM {table} WHERE asset = ?', (asset,)).fetchone()
+        return row['ts'] if row and row['ts'] is not None else None
+
+    # ---- ingest ------------------------------------------------------------
+
+    def ingest_funding(self, asset: str, points: List) -> int:
+        """Store (ts, rate) points from the newest stored bar on, replacing it; z-scores use the older tail as context"""
+        last = self.last_ts('funding', asset)
+        points = [(t, v) for t, v in sorted(dict(points).items()) if last is None or t >= last]
+        if not points:
+            return 0
+        conn = self._conn()
+        tail = conn.execute('SELECT rate FROM funding WHERE asset = ? AND ts < ? ORDER BY ts DESC LIMIT ?',
+                            (asset, points[0][0], self.zscore_window - 1)).fetchall()
+        context = [row['rate'] for row in reversed(tail)]
+        rates = np.array(context + [v for _, v in points], dtype=np.float64)
+        zscores = rolling_zscore(rates, self.zscore_window)[len(context):]
+        conn.executemany('INSERT OR REPLACE INTO funding (asset, ts, rate, zscore) VALUES (?, ?, ?, ?)', [
+            (asset, t, v, None if np.isnan(z) else round(float(z), 4))
+            for (t, v), z in zip(points, zscores.tolist())
+        ])
+        conn.commit()
+        self.stats['funding_rows'] += len(points)
+        return len(points)
+
+    def ingest_open_interest(self, asset: str, points: List) -> int:
+        """Store (ts, oi) points like ingest_funding; delta is against the previous bar, stored or new"""
+        last = self.last_ts('open_interest', asset)
+        points = [(t, v) for t, v in sorted(dict(points).items()) if last is None or t >= last]
+        if not points:
+            return 0
+        conn = self._conn()
+        previous = conn.execute('SELECT oi FROM open_interest WHERE asset = ? AND ts < ? ORDER BY ts DESC LIMIT 1',
+                                (asset, points[0][0])).fetchone()
+        oi = np.array([v for _, v in points], dtype=np.float64)
+        prior = np.concatenate(([previous['oi'] if previous else np.nan], oi[:-1]))
+        delta = oi - prior
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta_pct = np.where(prior > 0, delta / prior * 100, np.nan)
+        conn.executemany('''
+            INSERT OR REPLACE INTO open_interest (asset, ts, oi, oi_delta, oi_delta_pct) VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (asset, t, v, None if np.isnan(d) else float(d), None if np.isnan(p) else round(float(p), 4))
+            for (t, v), d, p in zip(points, delta.tolist(), delta_pct.tolist())
+        ])
+        conn.commit()
+        self.stats['oi_rows'] += len(points)
+        return len(points)
+
+    def record_basis(self, asset: str, ts: int, perp_price: float, spot_price: float):
+        basis_pct = (perp_price - spot_price) / spot_price * 100 if spot_price else None
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO basis (asset, ts, perp_price, spot_price, basis_pct) VALUES (?, ?, ?, ?, ?)',
+                     (asset, ts, perp_price, spot_price, None if basis_pct is None else round(basis_pct, 5)))
+        conn.commit()
+        self.stats['basis_rows'] += 1
+
+    # ---- sync --------------------------------------------------------------
+
+    def track(self, assets: Iterable[str]) -> List[str]:
+        """Add assets to the universe; they are backfilled on the next sync"""
+        added = []
+        with self._universe_lock:
+            for asset in assets:
+                asset = asset.upper()
+                if asset not in self.universe:
+                    self.universe.append(asset)
+                    added.append(asset)
+        return added
+
+    def sync(self, assets: Optional[Iterable[str]] = None) -> Dict:
+        """Backfill new assets and append newer bars for the rest (a few batched calls per table)"""
+        if self.api is None:
+            return {'error': 'No Coinalyze client'}
+        with self._universe_lock:
+            assets = [a.upper() for a in (assets or self.universe)]
+        with self._sync_lock:
+            start = time.time()
+            try:
+                coinalyze_symbols = self.api._resolve_symbols(assets)
+                asset_of = {sym: asset for asset, sym in coinalyze_symbols.items()}
+                now = int(time.time())
+                backfill_from = now - self.backfill_hours * INTERVAL_SECONDS
+                ingested = {'funding': 0, 'open_interest': 0, 'basis': 0}
+
+                for table, endpoint, extra, ingest in (
+                        ('funding', 'funding-rate-history', None, self.ingest_funding),
+                        ('open_interest', 'open-interest-history', {'convert_to_usd': 'true'}, self.ingest_open_interest)):
+                    # Two batches at most: assets with no history, and the rest from the
+                    # earliest of their last stored bars (still open when stored, so refetched)
+                    fresh, stale = [], []
+                    for asset, symbol in coinalyze_symbols.items():
+                        last = self.last_ts(table, asset)
+                        (stale if last is None else fresh).append((symbol, last))
+                    for group, since in ((stale, backfill_from),
+                                         (fresh, min((last for _, last in fresh), default=now))):
+                        if not group:
+                            continue
+                        rows = self.api.get_history_bulk(endpoint, [s for s, _ in group], since, now,
+                                                         HISTORY_INTERVAL, extra)
+                        if isinstance(rows, dict) and 'error' in rows:
+                            raise RuntimeError(f"{endpoint}: {rows['error']}")
+                        for symbol, points in _closes(rows).items():
+                            if symbol in asset_of:
+                                ingested[table] += ingest(asset_of[symbol], points)
+
+                if self.spot_prices and coinalyze_symbols:
+                    ingested['basis'] = self._sync_basis(coinalyze_symbols, now)
+
+                self.stats['syncs'] += 1
+                self.stats['last_sync'] = time.time()
+                self.stats['last_error'] = None
+                logger.info(f"📈 Futures store synced {len(coinalyze_symbols)} assets: "
+                            f"{ingested['funding']} funding, {ingested['open_interest']} OI, {ingested['basis']} basis rows")
+                return {'assets': len(coinalyze_symbols), 'ingested': ingested}
+            except Exception as e:
+                logger.warning(f"⚠️ Futures store sync failed: {e}")
+                self.stats['sync_errors'] += 1
+                self.stats['last_error'] = str(e)
+                return {'error': str(e)}
+            finally:
+                self.stats['sync_seconds'] = round(time.time() - start, 2)
+
+    def _sync_basis(self, coinalyze_symbols: Dict[str, str], now: int) -> int:
+        rows = self.api.get_history_bulk('ohlcv-history', list(coinalyze_symbols.values()),
+                                         now - 2 * INTERVAL_SECONDS, now, HISTORY_INTERVAL)
+        closes = _closes(rows)
+        spot = self.spot_prices(list(coinalyze_symbols))
+        recorded = 0
+        for asset, symbol in coinalyze_symbols.items():
+            series = closes.get(symbol)
+            if series and spot.get(asset):
+                self.record_basis(asset, now, series[-1][1], spot[asset])
+                recorded += 1
+        return recorded
+
+    # ---- background sync ---------------------------------------------------
+
+    def _tick(self):
+        # Every gunicorn worker runs this loop; only the lease holder syncs
+        if self._acquire_lease('futures_sync', 2 * self.sync_interval):
+            self.sync()
+
+    def _interval(self) -> float:
+        return self.sync_interval
+
+    def _describe(self) -> str:
+        return f"every {self.sync_interval}s for {len(self.universe)} assets"
+
+    # ---- queries -----------------------------------------------------------
+
+    def funding_series(self, asset: str, since: Optional[int] = None, limit: int = 500) -> List[Dict]:
+        self._ensure_started()
+        rows = self._conn().execute('''
+            SELECT ts, rate, zscore FROM funding WHERE asset = ? AND ts >= ? ORDER BY ts DESC LIMIT ?
+        ''', (asset.upper(), since or 0, limit)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def open_interest_series(self, asset: str, since: Optional[int] = None, limit: int = 500) -> List[Dict]:
+        self._ensure_started()
+        rows = self._conn().execute('''
+            SELECT ts, oi, oi_delta, oi_delta_pct FROM open_interest WHERE asset = ? AND ts >= ? ORDER BY ts DESC LIMIT ?
+        ''', (asset.upper(), since or 0, limit)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def latest_many(self, assets: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """Newest funding/OI/basis row per asset in one query; rows older than `max_age` seconds are skipped"""
+        self._ensure_started()
+        wanted = [a.upper() for a in assets] if assets is not None else None
+        cutoff = time.time() - max_age if max_age else 0
+        rows = self._conn().execute('''
+            SELECT f.asset, f.ts AS funding_ts, f.rate, f.zscore,
+                   o.ts AS oi_ts, o.oi, o.oi_delta, o.oi_delta_pct,
+                   b.basis_pct, b.perp_price, b.spot_price
+            FROM funding f
+            JOIN (SELECT asset, MAX(ts) AS ts FROM funding GROUP BY asset) lf ON lf.asset = f.asset AND lf.ts = f.ts
+            LEFT JOIN (SELECT asset, MAX(ts) AS ts FROM open_interest GROUP BY asset) lo ON lo.asset = f.asset
+            LEFT JOIN open_interest o ON o.asset = lo.asset AND o.ts = lo.ts
+            LEFT JOIN (SELECT asset, MAX(ts) AS ts FROM basis GROUP BY asset) lb ON lb.asset = f.asset
+            LEFT JOIN basis b ON b.asset = lb.asset AND b.ts = lb.ts
+            WHERE f.ts >= ?
+        ''', (cutoff,)).fetchall()
+        latest = {}
+        for row in rows:
+            if wanted is not None and row['asset'] not in wanted:
+                continue
+            latest[row['asset']] = {
+                'funding_rate': row['rate'],
+                'funding_zscore': row['zscore'],
+                'funding_ts': row['funding_ts'],
+                'open_interest': row['oi'],
+                'oi_delta': row['oi_delta'],
+                'oi_delta_pct': row['oi_delta_pct'],
+                'basis_pct': row['basis_pct'],
+                'perp_price': row['perp_price'],
+                'spot_price': row['spot_price']
+            }
+        return latest
+
+    def latest(self, asset: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        return self.latest_many([asset], max_age).get(asset.upper())
+
+    def get_status(self) -> Dict:
+        conn = self._conn()
+        counts = {table: conn.execute(f'SELECT COUNT(*) AS n, COUNT(DISTINCT asset) AS assets FROM {table}').fetchone()
+                  for table in ('funding', 'open_interest', 'basis')}
+        return {
+            'db_path': self.db_path,
+            'universe': len(self.universe),
+            'tables': {table: {'rows': row['n'], 'assets': row['assets']} for table, row in counts.items()},
+            'sync_interval': self.sync_interval,
+            'running': self.running,
+            'stats': self.stats.copy()
+        }
+
+
+_store: Singleton[FuturesTimeSeriesStore] = Singleton('FUTURES_STORE_ENABLED')
+
+
+def get_futures_store(api=None, spot_prices=None, start: bool = True) -> Optional[FuturesTimeSeriesStore]:
+    """Shared store; FUTURES_STORE_ENABLED=false disables it, FUTURES_UNIVERSE overrides the asset list"""
+    def build():
+        client = api
+        if client is None:
+            from coinalyze_api import CoinalyzeAPI
+            client = CoinalyzeAPI()
+        universe = os.getenv('FUTURES_UNIVERSE')
+        return FuturesTimeSeriesStore(api=client, spot_prices=spot_prices, auto_start=start,
+                                      universe=universe.split(',') if universe else None)
+
+    store = _store.get(build)
+    if store and spot_prices and store.spot_prices is None:
+        store.spot_prices = spot_prices
+    return store
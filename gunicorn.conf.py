@@ -0,0 +1,42 @@
+"""
+Gunicorn production config - THE ALPHA PLAYBOOK v4
+Threaded workers keep sub-millisecond lookups and /health responsive
+while multi-minute scans run on the job queue (see job_queue.py).
+
+Run: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# gthread: each worker serves many concurrent requests; scans are I/O bound
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+
+# Inline scans (LONG_SCAN_JOBS=false) can take minutes; offloaded ones return in LONG_SCAN_SYNC_WAIT
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '300'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap memory growth from long-lived caches
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = 500
+
+# Import the app in each worker, not the master, so background threads
+# (BingX WebSocket feed, job executor) are created after fork
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    """Warm up lazy integrations once the worker is accepting requests"""
+    try:
+        from main_server import integrations
+        integrations.warm_up(delay=float(os.environ.get('INTEGRATION_WARMUP_DELAY', '3')))
+    except Exception as e:
+        worker.log.warning(f"Integration warm-up not scheduled: {e}")
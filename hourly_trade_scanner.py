@@ -15,6 +15,8 @@ from typing import List, Dict, Optional
 import logging
 import os
 
+from alert_performance import get_alert_tracker, ALERT_SHADOW_MIN_SCORE
+
 # Local API configuration - use local server
 LOCAL_API_URL = "http://localhost:5000"
 
@@ -150,6 +152,9 @@ class HourlyTradeScanner:
                     opportunity = self._format_trading_opportunity(analysis)
                     opportunities.append(opportunity)
                     print(f"🎯 QUALITY TRADE FOUND: {symbol} (Score: {analysis.get('opportunity_score', 0)})")
+                elif analysis.get('opportunity_score', 0) >= ALERT_SHADOW_MIN_SCORE:
+                    # Near-miss: tracked but not sent, so the thresholds can be judged against it
+                    self._track_alert(symbol, analysis['opportunity_score'], sent=False)
                 
             except Exception as e:
                 print(f"⚠️ Error analyzing {symbol}: {e}")
@@ -409,6 +414,16 @@ class HourlyTradeScanner:
         await self._send_discord_alert(message, 'alpha_scans')
         
         print(f"🚨 INSTANT ALERT SENT: {symbol} (Score: {opportunity['opportunity_score']})")
+        self._track_alert(symbol, opportunity['opportunity_score'], sent=True)
+
+    def _track_alert(self, symbol, score, sent):
+        """Hand the alert (or near-miss) to the alert performance tracker"""
+        try:
+            tracker = get_alert_tracker()
+            if tracker:
+                tracker.record_alert('hourly_scanner', 'instant_alert', symbol, score, sent=sent)
+        except Exception as e:
+            print(f"⚠️ Failed to track alert: {e}")
     
     def _format_instant_alert_for_discord(self, opportunity):
         """Format opportunity as Discord alert"""
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Lazy Integration Registry
+Defers heavy imports and client construction (ccxt exchanges, OpenAI,
+TradingView, MCP clients) until the first route that needs them, so the
+server can answer /health immediately. Optional background warm-up loads
+everything once the server is listening.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyIntegration:
+    """One integration: a loader returning its exported names, run at most once"""
+
+    def __init__(self, name: str, loader: Callable[[], Dict[str, Any]], description: str = ''):
+        self.name = name
+        self.loader = loader
+        self.description = description or name
+        self.exports: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Import/construct on first use; returns availability"""
+        if self.loaded:
+            return self.error is None
+        with self._lock:
+            if not self.loaded:
+                start = time.time()
+                try:
+                    self.exports = self.loader() or {}
+                    logger.info(f"✅ {self.description} loaded on demand")
+                except Exception as e:
+                    self.error = str(e)
+                    logger.error(f"❌ {self.description} failed to load: {e}")
+                self.load_seconds = round(time.time() - start, 3)
+                self.loaded = True
+        return self.error is None
+
+    def get(self, key: str) -> Any:
+        return self.exports.get(key) if self.load() else None
+
+    def status(self) -> Dict:
+        return {
+            'loaded': self.loaded,
+            'available': self.error is None if self.loaded else None,
+            'error': self.error,
+            'load_seconds': self.load_seconds
+        }
+
+
+class LazyProxy:
+    """Stands in for an exported object or function until first use.
+
+    Attribute access and calls resolve the integration; the proxy is falsy
+    when the integration failed to load (use `not proxy` instead of
+    `proxy is None`).
+    """
+
+    __slots__ = ('_integration', '_key')
+
+    def __init__(self, integration: LazyIntegration, key: str):
+        object.__setattr__(self, '_integration', integration)
+        object.__setattr__(self, '_key', key)
+
+    def _resolve(self):
+        target = self._integration.get(self._key)
+        if target is None:
+            raise RuntimeError(f"{self._integration.description} not available: {self._integration.error}")
+        return target
+
+    def __getattr__(self, item):
+        return getattr(self._resolve(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __bool__(self):
+        return self._integration.get(self._key) is not None
+
+    def __repr__(self):
+        return f"<lazy {self._integration.name}.{self._key} loaded={self._integration.loaded}>"
+
+
+class LazyFlag:
+    """Availability flag that loads its integration when first tested"""
+
+    __slots__ = ('_integration',)
+
+    def __init__(self, integration: LazyIntegration):
+        self._integration = integration
+
+    def __bool__(self):
+        return self._integration.load()
+
+    def __repr__(self):
+        return repr(bool(self))
+
+
+class IntegrationRegistry:
+    """Named lazy integrations plus optional background warm-up"""
+
+    def __init__(self):
+        self.integrations: Dict[str, LazyIntegration] = {}
+        self.created_at = time.time()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Callable[[], Dict[str, Any]], description: str = '') -> LazyIntegration:
+        integration = LazyIntegration(name, loader, description)
+        self.integrations[name] = integration
+        return integration
+
+    def proxy(self, name: str, key: str) -> LazyProxy:
+        return LazyProxy(self.integrations[name], key)
+
+    def flag(self, name: str) -> LazyFlag:
+        return LazyFlag(self.integrations[name])
+
+    def resolve(self, value: Any) -> Any:
+        """Real object behind a proxy (or the value itself)"""
+        if isinstance(value, LazyProxy):
+            return value._integration.get(value._key)
+        return value
+
+    def load_all(self, names: Optional[List[str]] = None):
+        for name in names or list(self.integrations):
+            self.integrations[name].load()
+
+    def warm_up(self, delay: float = 0, names: Optional[List[str]] = None) -> bool:
+        """Load integrations on a daemon thread after `delay` seconds.
+
+        Disabled with INTEGRATION_WARMUP=false (pure on-demand loading).
+        """
+        if os.getenv('INTEGRATION_WARMUP', 'true').lower() != 'true':
+            return False
+        if self._warmup_thread and self._warmup_thread.is_alive():
+            return True
+
+        def run():
+            time.sleep(delay)
+            start = time.time()
+            self.load_all(names)
+            logger.info(f"🔥 Integration warm-up finished in {time.time() - start:.1f}s")
+
+        self._warmup_thread = threading.Thread(target=run, name='integration-warmup', daemon=True)
+        self._warmup_thread.start()
+        return True
+
+    def get_status(self) -> Dict:
+        return {name: integration.status() for name, integration in self.integrations.items()}
+
+
+# Shared registry used by main_server
+integrations = IntegrationRegistry()
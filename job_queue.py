@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Job Queue for long-running scans
+Runs multi-minute endpoints on a bounded background pool so request
+threads stay free for fast lookups and /health. Job records and progress
+events live in SQLite so any gunicorn worker can answer a poll (or stream
+events) for any job id. Identical scans are served from recent results.
+In-flight jobs carry their worker's pid and a heartbeat, so a recycled or
+killed worker's jobs are never joined and are marked failed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from service_base import PeriodicWorker, Singleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       'scan_jobs.db'))
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', '86400'))  # 24 hours
+SCAN_CACHE_TTL = int(os.getenv('SCAN_CACHE_TTL', '300'))                    # 5 minutes
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', '10'))
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', '60'))             # no heartbeat for this long = orphaned
+
+_current = threading.local()
+
+
+def params_key(kind: str, params: Dict) -> str:
+    """Hash of a scan's normalized parameters (key order and case don't matter)"""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip().lower()
+        if isinstance(value, dict):
+            return {str(k).lower(): normalize(v) for k, v in value.items() if v not in (None, '', [])}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+    canonical = json.dumps({'kind': kind, 'params': normalize(params)}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def report_progress(done: Optional[int] = None, total: Optional[int] = None, item: Any = None):
+    """Called from scan loops; records progress and partial results for the running job.
+
+    A no-op outside a job, so scan endpoints call it unconditionally.
+    """
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return
+    queue, job_id = job
+    queue.record_progress(job_id, done, total, item)
+
+
+class JobStore(SQLiteStore):
+    """SQLite-backed job records shared by every worker process"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH):
+        super().__init__(db_path)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT,
+                params TEXT,
+                status TEXT,
+                http_status INTEGER,
+                result TEXT,
+                error TEXT,
+                created_at REAL,
+                started_at REAL,
+                finished_at REAL
+            )
+        ''')
+        # Columns added after the first release of the table
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+        for column, kind in (('param_hash', 'TEXT'), ('progress_done', 'INTEGER'), ('progress_total', 'INTEGER'),
+                             ('owner_pid', 'INTEGER'), ('heartbeat_at', 'REAL')):
+            if column not in existing:
+                conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {kind}')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_param_hash ON jobs (param_hash, status)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT,
+                type TEXT,
+                data TEXT,
+                created_at REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, seq)')
+
+    def create(self, kind: str, params: Dict, param_hash: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._conn()
+        conn.execute('''INSERT INTO jobs (id, kind, params, status, created_at, param_hash, owner_pid, heartbeat_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (job_id, kind, json.dumps(params, default=str), 'queued', now, param_hash, os.getpid(), now))
+        conn.commit()
+        return job_id
+
+    def find_reusable(self, param_hash: str, ttl: float, stale_after: float = JOB_STALE_SECONDS) -> Optional[str]:
+        """Newest job with these parameters that is in flight (with a live heartbeat) or finished within `ttl`"""
+        now = time.time()
+        row = self._conn().execute('''
+            SELECT id FROM jobs
+            WHERE param_hash = ? AND ((status IN ('queued', 'running') AND heartbeat_at >= ?)
+                                      OR (status = 'completed' AND finished_at >= ?))
+            ORDER BY created_at DESC LIMIT 1
+        ''', (param_hash, now - stale_after, now - ttl)).fetchone()
+        return row['id'] if row else None
+
+    def heartbeat(self, job_ids):
+        """Mark these in-flight jobs as still owned by a live worker"""
+        conn = self._conn()
+        conn.executemany('UPDATE jobs SET heartbeat_at = ? WHERE id = ?', [(time.time(), job_id) for job_id in job_ids])
+        conn.commit()
+
+    def fail_orphans(self, pid: int, stale_after: float = JOB_STALE_SECONDS) -> int:
+        """Fail unfinished jobs left by an earlier process with this pid or whose heartbeat went stale"""
+        now = time.time()
+        conn = self._conn()
+        orphans = [row['id'] for row in conn.execute('''
+            SELECT id FROM jobs
+            WHERE status IN ('queued', 'running') AND (owner_pid = ? OR heartbeat_at IS NULL OR heartbeat_at < ?)
+        ''', (pid, now - stale_after))]
+        for job_id in orphans:
+            conn.execute('UPDATE jobs SET status = ?, http_status = ?, error = ?, finished_at = ? WHERE id = ?',
+                         ('failed', 500, 'worker exited before the job finished', now, job_id))
+            conn.execute('INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)',
+                         (job_id, 'done', json.dumps({'status': 'failed'}), now))
+        conn.commit()
+        return len(orphans)
+
+    def add_event(self, job_id: str, event_type: str, data: Any):
+        conn = self._conn()
+        conn.execute('INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)',
+                     (job_id, event_type, json.dumps(data, default=str), time.time()))
+        conn.commit()
+
+    def events_after(self, job_id: str, seq: int = 0, event_type: Optional[str] = None) -> list:
+        query = 'SELECT seq, type, data FROM job_events WHERE job_id = ? AND seq > ?'
+        args = [job_id, seq]
+        if event_type:
+            query += ' AND type = ?'
+            args.append(event_type)
+        rows = self._conn().execute(query + ' ORDER BY seq', args).fetchall()
+        return [{'seq': row['seq'], 'type': row['type'], 'data': json.loads(row['data'])} for row in rows]
+
+    def update(self, job_id: str, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], default=str)
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        conn = self._conn()
+        conn.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+        conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params']) if job['params'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def purge(self, older_than: float = JOB_RETENTION_SECONDS) -> int:
+        conn = self._conn()
+        cutoff = time.time() - older_than
+        conn.execute('DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE created_at < ?)', (cutoff,))
+        cursor = conn.execute('DELETE FROM jobs WHERE created_at < ?', (cutoff,))
+        conn.commit()
+        return cursor.rowcount
+
+
+class JobQueue(PeriodicWorker):
+    """Bounded executor for long scans with pollable job records"""
+
+    worker_name = 'job-heartbeat'
+
+    def __init__(self, store: Optional[JobStore] = None, max_workers: int = JOB_WORKERS,
+                 heartbeat_interval: float = JOB_HEARTBEAT_SECONDS):
+        self.store = store or JobStore()
+        self.max_workers = max_workers
+        self.heartbeat_interval = heartbeat_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scan-job')
+        self._done: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cache_hits': 0}
+        self._init_worker(auto_start=True)
+
+    def _interval(self) -> float:
+        return self.heartbeat_interval
+
+    def _tick(self):
+        with self._lock:
+            in_flight = list(self._done)
+        if in_flight:
+            self.store.heartbeat(in_flight)
+
+    def submit(self, kind: str, func: Callable[[], Any], params: Optional[Dict] = None,
+               cache_ttl: Optional[float] = None) -> str:
+        """Queue `func`; it returns either a payload or (payload, http_status).
+
+        With `cache_ttl`, an identical scan (same kind and normalized params)
+        that is still running or finished within the TTL is reused: its job id
+        is returned and nothing new is queued.
+        """
+        params = params or {}
+        param_hash = params_key(kind, params)
+        if cache_ttl:
+            existing = self.store.find_reusable(param_hash, cache_ttl)
+            if existing:
+                with self._lock:
+                    self.stats['cache_hits'] += 1
+                return existing
+
+        job_id = self.store.create(kind, params, param_hash)
+        done = threading.Event()
+        with self._lock:
+            self._done[job_id] = done
+            self.stats['submitted'] += 1
+        self._executor.submit(self._run, job_id, kind, func, done)
+        self._ensure_started()
+        return job_id
+
+    def _run(self, job_id: str, kind: str, func: Callable, done: threading.Event):
+        self.store.update(job_id, status='running', started_at=time.time())
+        _current.job = (self, job_id)
+        try:
+            outcome = func()
+            payload, http_status = outcome if isinstance(outcome, tuple) else (outcome, 200)
+            status = 'completed' if http_status < 400 else 'failed'
+            self.store.update(job_id, status=status, http_status=http_status,
+                              result=payload, finished_at=time.time())
+            with self._lock:
+                self.stats['completed' if status == 'completed' else 'failed'] += 1
+        except Exception as e:
+            logger.error(f"❌ Job {kind} {job_id} failed: {e}")
+            self.store.update(job_id, status='failed', http_status=500, error=str(e), finished_at=time.time())
+            with self._lock:
+                self.stats['failed'] += 1
+        finally:
+            _current.job = None
+            self.store.add_event(job_id, 'done', {'status': self.store.get(job_id)['status']})
+            done.set()
+            with self._lock:
+                self._done.pop(job_id, None)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Block up to `timeout` seconds for a job started by this process"""
+        with self._lock:
+            done = self._done.get(job_id)
+        if done is not None:
+            done.wait(timeout)
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def record_progress(self, job_id: str, done: Optional[int], total: Optional[int], item: Any = None):
+        fields = {}
+        if done is not None:
+            fields['progress_done'] = done
+        if total is not None:
+            fields['progress_total'] = total
+        if fields:
+            self.store.update(job_id, **fields)
+        self.store.add_event(job_id, 'progress', {'done': done, 'total': total, 'item': item})
+
+    def describe(self, job_id: str) -> Optional[Dict]:
+        """Public job view for the API"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        view = {
+            'job_id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'params': job['params'],
+            'created_at': datetime.fromtimestamp(job['created_at']).isoformat(),
+            'poll_url': f"/api/jobs/{job['id']}"
+        }
+        if job['started_at']:
+            end = job['finished_at'] or time.time()
+            view['elapsed_seconds'] = round(end - job['started_at'], 2)
+        if job['progress_total'] or job['progress_done']:
+            view['progress'] = {'done': job['progress_done'], 'total': job['progress_total']}
+        if job['status'] in ('queued', 'running'):
+            # Items reported so far, so callers get a partial answer while the scan runs
+            view['partial_results'] = [e['data']['item'] for e in self.store.events_after(job_id, 0, 'progress')
+                                       if e['data'].get('item') is not None]
+            view['events_url'] = f"/api/jobs/{job['id']}/events"
+        if job['status'] in ('completed', 'failed'):
+            view['http_status'] = job['http_status']
+            view['result'] = job['result']
+            view['error'] = job['error']
+        return view
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['in_flight'] = len(self._done)
+        stats['max_workers'] = self.max_workers
+        return stats
+
+
+_queue: Singleton[JobQueue] = Singleton()
+
+
+def _build_queue() -> JobQueue:
+    queue = JobQueue()
+    queue.store.purge()
+    orphaned = queue.store.fail_orphans(os.getpid())
+    if orphaned:
+        logger.warning(f"⚠️ Marked {orphaned} orphaned scan jobs failed")
+    return queue
+
+
+def get_job_queue() -> JobQueue:
+    """Per-process queue (created lazily so gunicorn forks don't share executors)"""
+    return _queue.get(_build_queue)
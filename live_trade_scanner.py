@@ -13,6 +13,8 @@ import pytz
 from typing import List, Dict, Optional
 import logging
 
+from alert_performance import get_alert_tracker, ALERT_SHADOW_MIN_SCORE
+
 # Railway API configuration
 RAILWAY_API_URL = "https://titan-trading-2-production.up.railway.app"
 
@@ -281,6 +283,9 @@ class LiveTradeScanner:
                 'trade_plan': trade_plan,
                 'scan_time': datetime.now().isoformat()
             }
+        if opportunity_score >= ALERT_SHADOW_MIN_SCORE:
+            # Near-miss: tracked but not called out, so the thresholds can be judged against it
+            self._track_alert(symbol, opportunity_score, price, sent=False)
         
         return None
     
@@ -504,9 +509,19 @@ class LiveTradeScanner:
             symbol = opportunity['symbol']
             score = opportunity['opportunity_score']
             print(f"📢 TRADE CALLOUT: {symbol} (Score: {score:.0f})")
+            self._track_alert(symbol, score, opportunity.get('price'), sent=True)
             
         except Exception as e:
             print(f"❌ Error sending callout: {e}")
+
+    def _track_alert(self, symbol, score, price, sent):
+        """Hand the callout (or near-miss) to the alert performance tracker"""
+        try:
+            tracker = get_alert_tracker()
+            if tracker:
+                tracker.record_alert('live_scanner', 'trade_callout', symbol, score, entry_price=price or None, sent=sent)
+        except Exception as e:
+            print(f"⚠️ Failed to track alert: {e}")
     
     def _format_trade_callout(self, opp):
         """Format trade callout message for Discord"""
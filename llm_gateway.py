@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+LLM Gateway
+Memoized, batched and budgeted OpenAI chat completions for the scanners
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = int(os.getenv('LLM_CACHE_TTL', '3600'))            # 1 hour
+DEFAULT_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+DEFAULT_TOKEN_BUDGET = int(os.getenv('LLM_TOKENS_IN_FLIGHT', '60000'))
+DEFAULT_MAX_WORKERS = int(os.getenv('LLM_MAX_WORKERS', '4'))
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return ' '.join(value.split()).lower()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def normalize_input(value: Any) -> str:
+    """Canonical text for hashing: sorted keys, collapsed whitespace, no case"""
+    if isinstance(value, str):
+        return _normalize(value)
+    return json.dumps(_normalize(value), sort_keys=True, default=str, separators=(',', ':'))
+
+
+def content_hash(template: str, value: Any) -> str:
+    """Cache key for (prompt template, normalized input)"""
+    digest = hashlib.sha256()
+    digest.update(template.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(normalize_input(value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class TokenBudget:
+    """Caps the estimated tokens of requests in flight at once"""
+
+    def __init__(self, max_tokens: int = DEFAULT_TOKEN_BUDGET):
+        self.max_tokens = max_tokens
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, tokens: int) -> int:
+        # An oversized request still runs, just alone
+        tokens = min(tokens, self.max_tokens)
+        with self._cond:
+            while self.in_flight + tokens > self.max_tokens:
+                self._cond.wait()
+            self.in_flight += tokens
+        return tokens
+
+    def release(self, tokens: int):
+        with self._cond:
+            self.in_flight -= tokens
+            self._cond.notify_all()
+
+
+class LLMGateway:
+    """Single entry point for chat completions with content-hash memoization"""
+
+    def __init__(self, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 token_budget: int = DEFAULT_TOKEN_BUDGET, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.budget = TokenBudget(token_budget)
+        self.max_workers = max_workers
+        self._cache = TTLCache('llm_gateway', ttl=ttl, max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.stats = {
+            'api_calls': 0,
+            'api_errors': 0,
+            'batched_items': 0,
+            'estimated_tokens': 0
+        }
+
+    # ---- cache -------------------------------------------------------------
+
+    def _cache_get(self, key: str):
+        return self._cache.get(key)
+
+    def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None):
+        self._cache.set(key, value, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = self.stats.copy()
+        cache = self._cache.get_stats()
+        stats.update({'cache_hits': cache['hits'], 'cache_misses': cache['misses'],
+                      'cache_entries': cache['entries'], 'hit_rate': cache['hit_rate']})
+        stats['tokens_in_flight'] = self.budget.in_flight
+        return stats
+
+    # ---- calls -------------------------------------------------------------
+
+    def _create(self, client, model: str, messages: List[Dict], **kwargs):
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = kwargs.get('max_completion_tokens') or kwargs.get('max_tokens') or 1000
+        reserved = self.budget.acquire(prompt_tokens + completion_tokens)
+        try:
+            with self._lock:
+                self.stats['api_calls'] += 1
+                self.stats['estimated_tokens'] += prompt_tokens + completion_tokens
+            return client.chat.completions.create(model=model, messages=messages, **kwargs)
+        except Exception:
+            with self._lock:
+                self.stats['api_errors'] += 1
+            raise
+        finally:
+            self.budget.release(reserved)
+
+    def complete_json(self, client, template: str, model: str, system: Optional[str], user: str,
+                      cache_input: Any = None, ttl: Optional[int] = None, **kwargs) -> Dict:
+        """JSON-mode completion, memoized on (template, cache_input or user prompt).
+
+        `template` names the prompt (e.g. 'scanner.news'); callers pass the
+        raw input they formatted into the prompt as `cache_input` so that
+        timestamps or formatting noise in the prompt don't defeat the cache.
+        """
+        key = content_hash(f"{template}|{model}", cache_input if cache_input is not None else user)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached)
+
+        messages = ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": user}]
+        response = self._create(client, model, messages, response_format={"type": "json_object"}, **kwargs)
+        result = json.loads(response.choices[0].message.content or "{}")
+        self._cache_set(key, result, ttl)
+        return dict(result)
+
+    def complete_text(self, client, template: str, model: str, system: Optional[str], user: str,
+                      cache_input: Any = None, ttl: Optional[int] = None, **kwargs) -> str:
+        """Plain-text completion, memoized like complete_json"""
+        key = content_hash(f"{template}|{model}", cache_input if cache_input is not None else user)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        messages = ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": user}]
+        response = self._create(client, model, messages, **kwargs)
+        text = (response.choices[0].message.content or '').strip()
+        self._cache_set(key, text, ttl)
+        return text
+
+    def grade_batch(self, client, template: str, model: str, system: str, instructions: str,
+                    items: List[Any], render: Callable[[Any], str], batch_size: int = 8,
+                    ttl: Optional[int] = None, tokens_per_item: int = 200, **kwargs) -> List[Optional[Dict]]:
+        """Grade many items with few requests.
+
+        Each item is cached on its own hash; uncached items are packed
+        `batch_size` at a time into one structured-output request that must
+        return {"results": [{"id": <int>, ...}]}. Batches run concurrently
+        under the token budget. Returns one dict per input item (None when
+        the model skipped it or the request failed).
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            key = content_hash(f"{template}|{model}", item)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[index] = dict(cached)
+            else:
+                pending.append((index, key, item))
+
+        if not pending:
+            return results
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        def run_batch(batch):
+            lines = [f"[{position}] {render(item)}" for position, (_, _, item) in enumerate(batch)]
+            user = (f"{instructions}\n\nItems:\n" + "\n\n".join(lines) +
+                    '\n\nReturn JSON: {"results": [{"id": <item number>, ...fields}]} with one entry per item.')
+            messages = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+            response = self._create(client, model, messages,
+                                    response_format={"type": "json_object"},
+                                    max_completion_tokens=tokens_per_item * len(batch) + 200, **kwargs)
+            payload = json.loads(response.choices[0].message.content or "{}")
+            graded = {}
+            for entry in payload.get('results', []):
+                try:
+                    graded[int(entry.get('id'))] = entry
+                except (TypeError, ValueError):
+                    continue
+            return batch, graded
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+            futures = [pool.submit(run_batch, batch) for batch in batches]
+            for future in futures:
+                try:
+                    batch, graded = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ LLM batch failed: {e}")
+                    continue
+                for position, (index, key, _) in enumerate(batch):
+                    entry = graded.get(position)
+                    if entry is None:
+                        continue
+                    entry = {k: v for k, v in entry.items() if k != 'id'}
+                    self._cache_set(key, entry, ttl)
+                    results[index] = dict(entry)
+
+        with self._lock:
+            self.stats['batched_items'] += len(pending)
+        return results
+
+
+# Shared instance so every caller benefits from the same cache
+llm_gateway = LLMGateway()
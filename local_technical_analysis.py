@@ -12,18 +12,22 @@ from ta.momentum import RSIIndicator
 from ta.trend import MACD, EMAIndicator, SMAIndicator
 from ta.volatility import BollingerBands
 from ta.utils import dropna
-from datetime import datetime, timedelta
 import logging
 from typing import Dict, Optional, List
 import asyncio
 import aiohttp
 
+from candles import Candles
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class LocalTechnicalAnalysis:
     def __init__(self):
-        self.cache = {}
         self.cache_duration = 300  # 5 minutes cache
+        # OHLCV frames per symbol/timeframe, capped at ~64MB
+        self.cache = TTLCache('local_ta_ohlcv', ttl=self.cache_duration, max_entries=256,
+                              max_bytes=64 * 1024 * 1024)
     
     async def get_technical_indicators(self, symbol: str, timeframe: str = "4h") -> Optional[Dict]:
         """
@@ -54,13 +58,11 @@ class LocalTechnicalAnalysis:
         Get OHLCV price data from multiple sources with fallback
         """
         cache_key = f"{symbol}_{timeframe}"
-        now = datetime.now()
         
         # Check cache first
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if (now - cached_time).seconds < self.cache_duration:
-                return cached_data
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         # Try Binance first (more crypto-focused)
         df = await self._get_binance_data(symbol)
@@ -71,7 +73,7 @@ class LocalTechnicalAnalysis:
         
         # Cache the result
         if df is not None:
-            self.cache[cache_key] = (df, now)
+            self.cache.set(cache_key, df)
         
         return df
     
@@ -96,22 +98,10 @@ class LocalTechnicalAnalysis:
                     if response.status == 200:
                         data = await response.json()
                         
-                        # Convert to DataFrame
-                        df = pd.DataFrame(data, columns=[
-                            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                            'close_time', 'quote_asset_volume', 'number_of_trades',
-                            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-                        ])
-                        
-                        # Convert to proper types
-                        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                        for col in ['open', 'high', 'low', 'close', 'volume']:
-                            df[col] = df[col].astype(float)
-                        
-                        # Set timestamp as index
-                        df.set_index('timestamp', inplace=True)
-                        
-                        return df[['open', 'high', 'low', 'close', 'volume']]
+                        # Parse the six OHLCV columns straight into arrays; the
+                        # DataFrame is only built because the `ta` indicators need one
+                        candles = Candles.from_ohlcv(data, symbol=symbol, timeframe='4h', source='binance')
+                        return candles.to_dataframe()
                     
         except Exception as e:
             logger.warning(f"Binance API failed for {symbol}: {e}")
@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 import pytz
 import ccxt
 import random
+from price_oracle import get_price_oracle
+from candles import Candles
 
 # ====== 🔐 INSERT YOUR API KEYS HERE ======
 # BingX API Keys - Retrieved from Secrets
@@ -677,44 +679,40 @@ def analyze_candlestick_patterns(symbol, interval='1h', limit=50):
         if not klines:
             return {'error': 'No candlestick data available'}
 
-        # Convert to numerical data for analysis
-        prices = [float(k['close']) for k in klines]
-        highs = [float(k['high']) for k in klines]
-        lows = [float(k['low']) for k in klines]
-        volumes = [float(k['volume']) for k in klines]
+        # Convert to columnar arrays once; everything below is array math
+        candles = Candles.from_records(klines, symbol=symbol, timeframe=interval, source='bingx')
+        prices, highs, lows = candles.close, candles.high, candles.low
 
         # Calculate technical indicators
         def simple_moving_average(data, period):
             if len(data) < period:
                 return None
-            return sum(data[-period:]) / period
+            return float(data[-period:].sum()) / period
 
         sma_20 = simple_moving_average(prices, 20)
         sma_50 = simple_moving_average(prices, 50) if len(prices) >= 50 else None
 
-        current_price = prices[-1]
+        current_price = float(prices[-1])
 
-        # Support and resistance levels
-        recent_highs = highs[-20:] if len(highs) >= 20 else highs
-        recent_lows = lows[-20:] if len(lows) >= 20 else lows
-        resistance_level = max(recent_highs)
-        support_level = min(recent_lows)
+        # Support and resistance levels (last 20 candles)
+        resistance_level = float(highs[-20:].max())
+        support_level = float(lows[-20:].min())
 
         # Trend analysis
-        recent_candles = klines[-10:]  # Last 10 candles
-        bullish_candles = sum(1 for k in recent_candles if float(k['close']) > float(k['open']))
+        recent_candles = candles.tail(10)  # Last 10 candles
+        bullish_candles = int((recent_candles.close > recent_candles.open).sum())
         bearish_candles = len(recent_candles) - bullish_candles
 
         # Momentum analysis
         if len(prices) >= 5:
-            recent_momentum = (prices[-1] - prices[-5]) / prices[-5] * 100
+            recent_momentum = float((prices[-1] - prices[-5]) / prices[-5] * 100)
             momentum = 'strong_bullish' if recent_momentum > 2 else 'bullish' if recent_momentum > 0.5 else 'strong_bearish' if recent_momentum < -2 else 'bearish' if recent_momentum < -0.5 else 'neutral'
         else:
             momentum = 'neutral'
 
         # Volatility analysis
-        price_changes = [abs(prices[i] - prices[i-1]) / prices[i-1] * 100 for i in range(1, len(prices))]
-        avg_volatility = sum(price_changes) / len(price_changes) if price_changes else 0
+        price_changes = abs(prices[1:] - prices[:-1]) / prices[:-1] * 100
+        avg_volatility = float(price_changes.mean()) if len(price_changes) else 0
         volatility = 'high' if avg_volatility > 3 else 'medium' if avg_volatility > 1 else 'low'
 
         # Generate trading signals
@@ -758,7 +756,7 @@ def analyze_candlestick_patterns(symbol, interval='1h', limit=50):
             },
             'raw_data': {
                 'latest_candles': klines[-5:],  # Last 5 candles for reference
-                'price_history': prices[-20:]   # Last 20 prices
+                'price_history': prices[-20:].tolist()   # Last 20 prices
             }
         }
 
@@ -1382,9 +1380,14 @@ def get_all_kraken_prices(kraken_positions):
 
         # Get current prices for all symbols (ignore SOL.F)
         symbols_to_price = list(set([pos['symbol'] for pos in enhanced_positions if pos['symbol'] != 'SOL.F']))
+
+        # One walk over the shared price table; only misses go to Kraken one by one
+        oracle = get_price_oracle()
+        if oracle:
+            kraken_prices.update({s: p for s, p in oracle.get_prices(symbols_to_price).items() if p})
         for symbol in symbols_to_price:
-            price_data = get_kraken_price(symbol)
-            kraken_prices[symbol] = price_data
+            if symbol not in kraken_prices:
+                kraken_prices[symbol] = get_kraken_price(symbol)
 
         print(f"📊 Collected current prices for {len(symbols_to_price)} Kraken assets")
         return kraken_prices
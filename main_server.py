@@ -1,7 +1,10 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, jsonify, request, render_template, current_app, Response, stream_with_context, url_for
 from flask_cors import CORS
+import functools
+import json
 import logging
 import os
+import threading
 from datetime import datetime
 import traceback
 import asyncio
@@ -10,6 +13,10 @@ import sys
 # Add MCP servers to path
 sys.path.append('mcp_servers')
 
+# Heavy integrations register loaders here and import on first use
+from integration_registry import integrations
+from ttl_cache import get_cache_stats
+
 # Import our custom modules with error handling
 try:
     from logger_config import setup_logging
@@ -28,14 +35,66 @@ crypto_news_available = False  # Wrapper system deprecated
 crypto_news_api = None  # Initialize as None for backwards compatibility
 
 # BingX Direct API integration for accurate pricing
-try:
+def _load_bingx_direct():
     from bingx_direct_api import bingx_direct
-    bingx_direct_available = True
-    print("✅ BingX Direct API loaded successfully")
-except ImportError as e:
-    bingx_direct_available = False
-    bingx_direct = None
-    print(f"❌ BingX Direct API failed to load: {e}")
+    return {'bingx_direct': bingx_direct}
+
+integrations.register('bingx_direct', _load_bingx_direct, 'BingX Direct API')
+bingx_direct = integrations.proxy('bingx_direct', 'bingx_direct')
+bingx_direct_available = integrations.flag('bingx_direct')
+
+# BingX WebSocket market data feed (in-memory tickers; REST stays as fallback)
+def _load_bingx_ws():
+    from bingx_ws_feed import get_bingx_ws_feed
+    from orderbook_replica import orderbook_manager
+    feed = get_bingx_ws_feed(start=False)
+    if feed:
+        # L2 replicas ride the same connection via <symbol>@incrDepth
+        orderbook_manager.attach(feed)
+        feed.start()
+        if bingx_direct_available:
+            bingx_direct.attach_ws_feed(feed)
+        print(f"✅ BingX WebSocket feed started ({len(feed.symbols)} symbols)")
+    else:
+        print("⚠️ BingX WebSocket feed disabled - using REST polling")
+    return {'bingx_ws_feed': feed, 'orderbook_manager': orderbook_manager if feed else None}
+
+integrations.register('bingx_ws', _load_bingx_ws, 'BingX WebSocket feed')
+bingx_ws_feed = integrations.proxy('bingx_ws', 'bingx_ws_feed')
+orderbook_manager = integrations.proxy('bingx_ws', 'orderbook_manager')
+
+# Consolidated in-memory price table (bulk CoinGecko/BingX snapshots + WebSocket ticks)
+def _load_price_oracle():
+    from price_oracle import get_price_oracle
+    oracle = get_price_oracle()
+    if oracle and bingx_ws_feed:
+        oracle.attach_ws_feed(integrations.resolve(bingx_ws_feed))
+    if oracle and bingx_direct_available:
+        # One all-tickers request prices the whole BingX perpetual universe
+        oracle.register_source('bingx_snapshot', integrations.resolve(bingx_direct).get_price_table, priority=10)
+    return {'price_oracle': oracle}
+
+integrations.register('price_oracle', _load_price_oracle, 'Price oracle')
+price_oracle = integrations.proxy('price_oracle', 'price_oracle')
+
+# Scores scanner/bot alerts against subsequent prices; the update loop runs in this process
+def _load_alert_tracker():
+    from alert_performance import get_alert_tracker
+    return {'alert_tracker': get_alert_tracker(start=True)}
+
+integrations.register('alert_tracker', _load_alert_tracker, 'Alert performance tracker')
+alert_tracker = integrations.proxy('alert_tracker', 'alert_tracker')
+
+# Full-universe TradingView scanner table; RSI/MACD/multi-indicator scans filter it in memory
+def _load_tradingview_snapshot():
+    from tradingview_snapshot import get_tradingview_snapshot
+    return {'tradingview_snapshot': get_tradingview_snapshot()}
+
+integrations.register('tradingview_snapshot', _load_tradingview_snapshot, 'TradingView universe snapshot')
+tradingview_snapshot = integrations.proxy('tradingview_snapshot', 'tradingview_snapshot')
+
+from tradingview_ws_feed import get_tradingview_ws_feed
+from source_fanout import cached_call, cached_result, hedged_fanout
 
 # CoinMarketCap Pro API integration
 import requests
@@ -43,102 +102,119 @@ import time
 CMC_API_KEY = os.getenv('CMC_PRO_API_KEY')
 CMC_BASE_URL = 'https://pro-api.coinmarketcap.com/v1'
 cmc_available = bool(CMC_API_KEY)
+# listings/latest filters forwarded to CMC as-is
+CMC_LISTING_FILTERS = ('price_min', 'price_max', 'market_cap_min', 'market_cap_max', 'volume_24h_min',
+                       'volume_24h_max', 'circulating_supply_min', 'circulating_supply_max',
+                       'percent_change_24h_min', 'percent_change_24h_max', 'cryptocurrency_type', 'tag', 'aux')
 if cmc_available:
     print("✅ CoinMarketCap Pro API loaded successfully")
 else:
     print("❌ CoinMarketCap Pro API key not found")
 
 # TAAPI Universal Indicators integration
-try:
+def _load_taapi_universal():
     from taapi_universal_indicators import TaapiUniversalIndicators
-    taapi_universal = TaapiUniversalIndicators()
-    taapi_available = True
-    print("✅ TAAPI Universal Indicators loaded successfully")
-except ImportError as e:
-    taapi_available = False
-    taapi_universal = None
-    print(f"❌ TAAPI Universal Indicators failed to load: {e}")
+    return {'taapi_universal': TaapiUniversalIndicators()}
+
+integrations.register('taapi_universal', _load_taapi_universal, 'TAAPI Universal Indicators')
+taapi_universal = integrations.proxy('taapi_universal', 'taapi_universal')
+taapi_available = integrations.flag('taapi_universal')
 
 # FREE MCP Integration for cost savings
-mcp_integrations_available = False
-try:
-    from mcp_servers.coincap_mcp_integration import coincap_client, get_market_data, get_top_performers
-    from mcp_servers.dexpaprika_mcp_integration import dexpaprika_client, get_ethereum_top_pools, get_multi_chain_overview
-    mcp_integrations_available = True
-    print("✅ FREE MCP integrations loaded successfully")
+def _load_mcp():
+    from mcp_servers import coincap_mcp_integration as coincap
+    from mcp_servers import dexpaprika_mcp_integration as dexpaprika
+    exports = {
+        'coincap_client': coincap.coincap_client,
+        'get_market_data': coincap.get_market_data,
+        'get_top_performers': coincap.get_top_performers,
+        'dexpaprika_client': dexpaprika.dexpaprika_client,
+        'get_ethereum_top_pools': dexpaprika.get_ethereum_top_pools,
+        'get_multi_chain_overview': dexpaprika.get_multi_chain_overview
+    }
     print("💰 Potential savings: $400/month with CoinCap + DexPaprika MCP")
-except ImportError as e:
-    print(f"❌ MCP integrations failed to load: {e}")
-    print("💸 Still using expensive APIs - missing $400/month savings")
+    initialize_mcp_integrations()
+    return exports
+
+integrations.register('mcp', _load_mcp, 'FREE MCP integrations (CoinCap + DexPaprika)')
+mcp_integrations_available = integrations.flag('mcp')
+coincap_client = integrations.proxy('mcp', 'coincap_client')
+get_market_data = integrations.proxy('mcp', 'get_market_data')
+get_top_performers = integrations.proxy('mcp', 'get_top_performers')
+dexpaprika_client = integrations.proxy('mcp', 'dexpaprika_client')
+get_ethereum_top_pools = integrations.proxy('mcp', 'get_ethereum_top_pools')
+get_multi_chain_overview = integrations.proxy('mcp', 'get_multi_chain_overview')
 
 # Lumif-ai TradingView Enhanced Technical Analysis
-try:
-    from mcp_servers.lumifai_tradingview_integration import (
-        initialize_lumif_tradingview, 
-        get_enhanced_technical_analysis,
-        get_multi_timeframe_confluence,
-        scan_market_opportunities,
-        lumif_tradingview_client
-    )
-    lumif_tradingview_available = True
-    print("✅ Lumif-ai TradingView Enhanced Technical Analysis loaded successfully")
+def _load_lumif():
+    from mcp_servers import lumifai_tradingview_integration as lumif
+    exports = {
+        'initialize_lumif_tradingview': lumif.initialize_lumif_tradingview,
+        'get_enhanced_technical_analysis': lumif.get_enhanced_technical_analysis,
+        'get_multi_timeframe_confluence': lumif.get_multi_timeframe_confluence,
+        'scan_market_opportunities': lumif.scan_market_opportunities,
+        'lumif_tradingview_client': lumif.lumif_tradingview_client
+    }
     print("🚀 Features: 208+ indicators, pattern recognition, multi-timeframe confluence")
-except ImportError as e:
-    lumif_tradingview_available = False
-    print(f"❌ Lumif-ai TradingView integration failed to load: {e}")
-    get_enhanced_technical_analysis = None
-    get_multi_timeframe_confluence = None
-    scan_market_opportunities = None
+    initialize_lumif_integrations(lumif.initialize_lumif_tradingview)
+    return exports
+
+integrations.register('lumif_tradingview', _load_lumif, 'Lumif-ai TradingView Enhanced Technical Analysis')
+lumif_tradingview_available = integrations.flag('lumif_tradingview')
+initialize_lumif_tradingview = integrations.proxy('lumif_tradingview', 'initialize_lumif_tradingview')
+get_enhanced_technical_analysis = integrations.proxy('lumif_tradingview', 'get_enhanced_technical_analysis')
+get_multi_timeframe_confluence = integrations.proxy('lumif_tradingview', 'get_multi_timeframe_confluence')
+scan_market_opportunities = integrations.proxy('lumif_tradingview', 'scan_market_opportunities')
+lumif_tradingview_client = integrations.proxy('lumif_tradingview', 'lumif_tradingview_client')
 
 # Add TradingView Advanced API integration
-try:
-    from mcp_servers.tradingview_advanced_api import (
-        initialize_advanced_tradingview, 
-        get_advanced_analysis, 
-        get_multi_symbol_data,
-        get_market_overview
-    )
-    tradingview_advanced_available = True
-    print("✅ TradingView Advanced API loaded - Multiple proven methods")
-except ImportError as e:
-    initialize_advanced_tradingview = None
-    get_advanced_analysis = None
-    get_multi_symbol_data = None
-    get_market_overview = None
-    tradingview_advanced_available = False
-    print(f"❌ TradingView Advanced API failed to load: {e}")
+def _load_tradingview_advanced():
+    from mcp_servers import tradingview_advanced_api as advanced
+    return {
+        'initialize_advanced_tradingview': advanced.initialize_advanced_tradingview,
+        'get_advanced_analysis': advanced.get_advanced_analysis,
+        'get_indicator_value': advanced.get_indicator_value,
+        'get_multi_symbol_data': advanced.get_multi_symbol_data,
+        'get_market_overview': advanced.get_market_overview
+    }
+
+integrations.register('tradingview_advanced', _load_tradingview_advanced, 'TradingView Advanced API')
+tradingview_advanced_available = integrations.flag('tradingview_advanced')
+initialize_advanced_tradingview = integrations.proxy('tradingview_advanced', 'initialize_advanced_tradingview')
+get_advanced_analysis = integrations.proxy('tradingview_advanced', 'get_advanced_analysis')
+get_indicator_value = integrations.proxy('tradingview_advanced', 'get_indicator_value')
+get_multi_symbol_data = integrations.proxy('tradingview_advanced', 'get_multi_symbol_data')
+get_market_overview = integrations.proxy('tradingview_advanced', 'get_market_overview')
 
 # Add TradingView Web Scraper integration  
-try:
-    from mcp_servers.tradingview_webscraper import (
-        initialize_tradingview_scraper,
-        get_scraper_analysis,
-        get_scraper_market_data
-    )
-    tradingview_scraper_available = True
-    print("✅ TradingView Web Scraper loaded - Direct data extraction")
-except ImportError as e:
-    initialize_tradingview_scraper = None
-    get_scraper_analysis = None
-    get_scraper_market_data = None
-    tradingview_scraper_available = False
-    print(f"❌ TradingView Web Scraper failed to load: {e}")
+def _load_tradingview_scraper():
+    from mcp_servers import tradingview_webscraper as scraper
+    return {
+        'initialize_tradingview_scraper': scraper.initialize_tradingview_scraper,
+        'get_scraper_analysis': scraper.get_scraper_analysis,
+        'get_scraper_market_data': scraper.get_scraper_market_data
+    }
+
+integrations.register('tradingview_scraper', _load_tradingview_scraper, 'TradingView Web Scraper')
+tradingview_scraper_available = integrations.flag('tradingview_scraper')
+initialize_tradingview_scraper = integrations.proxy('tradingview_scraper', 'initialize_tradingview_scraper')
+get_scraper_analysis = integrations.proxy('tradingview_scraper', 'get_scraper_analysis')
+get_scraper_market_data = integrations.proxy('tradingview_scraper', 'get_scraper_market_data')
 
 # Add TradingView GitHub API integration
-try:
-    from mcp_servers.tradingview_github_api import (
-        initialize_github_tradingview,
-        get_github_analysis,
-        get_github_market_data
-    )
-    tradingview_github_available = True
-    print("✅ TradingView GitHub API loaded - Real-time websocket access")
-except ImportError as e:
-    initialize_github_tradingview = None
-    get_github_analysis = None
-    get_github_market_data = None
-    tradingview_github_available = False
-    print(f"❌ TradingView GitHub API failed to load: {e}")
+def _load_tradingview_github():
+    from mcp_servers import tradingview_github_api as github
+    return {
+        'initialize_github_tradingview': github.initialize_github_tradingview,
+        'get_github_analysis': github.get_github_analysis,
+        'get_github_market_data': github.get_github_market_data
+    }
+
+integrations.register('tradingview_github', _load_tradingview_github, 'TradingView GitHub API')
+tradingview_github_available = integrations.flag('tradingview_github')
+initialize_github_tradingview = integrations.proxy('tradingview_github', 'initialize_github_tradingview')
+get_github_analysis = integrations.proxy('tradingview_github', 'get_github_analysis')
+get_github_market_data = integrations.proxy('tradingview_github', 'get_github_market_data')
 
 try:
     from error_handler import handle_exchange_error, ExchangeNotAvailableError
@@ -421,9 +497,198 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app, origins="*")  # Allow ChatGPT Custom Actions to access the API
 
-# Initialize exchange manager and trading functions
-exchange_manager = ExchangeManager()
-trading_functions = TradingFunctions(exchange_manager)
+# orjson-backed jsonify, gzip/brotli for large bodies, byte-cached heavy endpoints
+from fast_json import FastJSONProvider, init_compression, cached_response
+from api_query import ListQuery, QueryError, project
+app.json = FastJSONProvider(app)
+init_compression(app)
+
+# Initialize exchange manager and trading functions on first use
+# (ccxt construction and load_markets for every venue is the slowest part of startup)
+def _load_exchanges():
+    manager = ExchangeManager()
+    return {'exchange_manager': manager, 'trading_functions': TradingFunctions(manager)}
+
+integrations.register('exchanges', _load_exchanges, 'Exchange manager (ccxt)')
+exchange_manager = integrations.proxy('exchanges', 'exchange_manager')
+trading_functions = integrations.proxy('exchanges', 'trading_functions')
+
+# Long scans run on the job queue so request threads stay free for fast endpoints
+from job_queue import get_job_queue, report_progress, SCAN_CACHE_TTL
+LONG_SCAN_SYNC_WAIT = float(os.getenv('LONG_SCAN_SYNC_WAIT', '25'))
+# Each open event stream holds a gthread worker thread, so streams are short
+# (EventSource reconnects with Last-Event-ID) and capped per worker
+JOB_STREAM_MAX_SECONDS = int(os.getenv('JOB_STREAM_MAX_SECONDS', '45'))
+JOB_STREAM_MAX_CONCURRENT = int(os.getenv('JOB_STREAM_MAX_CONCURRENT', '4'))
+JOB_STREAM_RETRY_MS = 1000
+_job_streams = threading.BoundedSemaphore(JOB_STREAM_MAX_CONCURRENT)
+
+# kind -> undecorated view, so POST /api/jobs can start any registered scan
+SCAN_JOB_VIEWS = {}
+
+def _submit_scan_job(kind, view, view_kwargs, path, method, query_string, headers, body, params, fresh=False):
+    """Queue a replay of `view` under the given request; identical recent scans are reused"""
+    flask_app = current_app._get_current_object()
+    
+    def run():
+        # Replay the request on the job thread so the view reads args/json as usual
+        with flask_app.test_request_context(path, method=method, query_string=query_string,
+                                            headers=headers, data=body):
+            response = flask_app.make_response(view(**view_kwargs))
+            return response.get_json(silent=True), response.status_code
+    
+    return get_job_queue().submit(kind, run, params=params, cache_ttl=None if fresh else SCAN_CACHE_TTL)
+
+def _scan_params():
+    """Cache identity of the current request (control flags excluded)"""
+    args = {k: v for k, v in request.args.items() if k not in ('async', 'fresh')}
+    return {'args': args, 'body': request.get_json(silent=True), 'view_args': request.view_args or {}}
+
+def _wants_flag(name):
+    return request.args.get(name, '').lower() in ('1', 'true')
+
+def long_running_job(kind):
+    """Offload a slow endpoint to the job queue.
+
+    The caller waits up to LONG_SCAN_SYNC_WAIT seconds and gets the normal
+    response if the scan finishes in time; otherwise (or with ?async=true /
+    Prefer: respond-async) it gets 202 with a job id to poll at /api/jobs/<id>
+    or stream at /api/jobs/<id>/events. An identical scan within
+    SCAN_CACHE_TTL returns the earlier result (?fresh=true skips it).
+    LONG_SCAN_JOBS=false runs the endpoint inline as before.
+    """
+    def decorator(view):
+        SCAN_JOB_VIEWS.setdefault(kind, view)
+        
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if os.getenv('LONG_SCAN_JOBS', 'true').lower() != 'true':
+                return view(*args, **kwargs)
+            
+            headers = {k: v for k, v in request.headers.items() if k.lower() != 'content-length'}
+            job_id = _submit_scan_job(kind, view, kwargs, request.path, request.method, request.query_string,
+                                      headers, request.get_data(), _scan_params(), fresh=_wants_flag('fresh'))
+            wants_async = _wants_flag('async') or 'respond-async' in request.headers.get('Prefer', '')
+            job = get_job_queue().wait(job_id, 0 if wants_async else LONG_SCAN_SYNC_WAIT)
+            
+            if job and job['status'] == 'completed':
+                return jsonify(job['result']), job['http_status']
+            if job and job['status'] == 'failed':
+                payload = job['result'] if job['result'] is not None else {'error': job['error'], 'job_id': job_id}
+                return jsonify(payload), job['http_status'] or 500
+            return jsonify({
+                'status': 'accepted',
+                'job_id': job_id,
+                'job_status': job['status'] if job else 'queued',
+                'poll_url': f"/api/jobs/{job_id}",
+                'events_url': f"/api/jobs/{job_id}/events",
+                'message': f"{kind} is still running - poll the job URL for the result",
+                'timestamp': datetime.now().isoformat()
+            }), 202
+        return wrapper
+    return decorator
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def scan_jobs():
+    """
+    Start a scan as a background job, or list the scans that can be started
+    
+    POST Body:
+    {
+        "scan": "rsi_scan",                 // see GET /api/jobs for names
+        "params": {"rsi_max": 30},          // query parameters for the scan
+        "body": {"symbols": ["BTC"]},       // optional JSON body (sent as POST)
+        "path_params": {"symbol": "BTC"},   // for scans with a path parameter
+        "fresh": false                      // true = ignore cached results
+    }
+    """
+    try:
+        queue = get_job_queue()
+        if request.method == 'GET':
+            return jsonify({
+                'success': True,
+                'scans': sorted(SCAN_JOB_VIEWS),
+                'cache_ttl_seconds': SCAN_CACHE_TTL,
+                'stats': queue.get_stats(),
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        data = request.get_json() or {}
+        kind = data.get('scan')
+        view = SCAN_JOB_VIEWS.get(kind)
+        if view is None:
+            return jsonify({'error': f"Unknown scan '{kind}'", 'available_scans': sorted(SCAN_JOB_VIEWS)}), 400
+        
+        from urllib.parse import urlencode
+        query = data.get('params') or {}
+        body = data.get('body')
+        path_params = data.get('path_params') or {}
+        job_id = _submit_scan_job(
+            kind, view, path_params,
+            path=url_for(view.__name__, **path_params),
+            method='POST' if body is not None else 'GET',
+            query_string=urlencode(query, doseq=True),
+            headers={'Content-Type': 'application/json'},
+            body=json.dumps(body) if body is not None else b'',
+            params={'args': {k: str(v) for k, v in query.items()}, 'body': body, 'view_args': path_params},
+            fresh=bool(data.get('fresh'))
+        )
+        job = queue.describe(job_id)
+        return jsonify(job), 200 if job['status'] == 'completed' else 202
+    except Exception as e:
+        logger.error(f"Error starting scan job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress, partial results and (when finished) result of a scan job"""
+    try:
+        job = get_job_queue().describe(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job {job_id}'}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.error(f"Error reading job {job_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Server-Sent Events: one `progress` event per completed symbol, then a final `result`.
+    
+    Streams close after JOB_STREAM_MAX_SECONDS; EventSource reconnects and
+    resumes from Last-Event-ID. Past JOB_STREAM_MAX_CONCURRENT open streams
+    the worker answers 503 and clients poll GET /api/jobs/<id> instead.
+    """
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    last_seq = request.headers.get('Last-Event-ID', 0, type=int)
+    if not _job_streams.acquire(blocking=False):
+        response = jsonify({'error': 'Too many open event streams', 'poll_url': f"/api/jobs/{job_id}"})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    
+    def generate():
+        seq = last_seq
+        last_beat = time.time()
+        deadline = time.time() + JOB_STREAM_MAX_SECONDS
+        yield f"retry: {JOB_STREAM_RETRY_MS}\n\n"
+        while time.time() < deadline:
+            for event in queue.store.events_after(job_id, seq):
+                seq = event['seq']
+                if event['type'] == 'done':
+                    yield f"id: {seq}\nevent: result\ndata: {json.dumps(queue.describe(job_id), default=str)}\n\n"
+                    return
+                yield f"id: {seq}\nevent: progress\ndata: {json.dumps(event['data'], default=str)}\n\n"
+            if time.time() - last_beat > 15:
+                yield ": keep-alive\n\n"
+                last_beat = time.time()
+            time.sleep(0.5)
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(_job_streams.release)
+    return response
 
 @app.route('/alpha', methods=['GET'])
 def alpha_dashboard():
@@ -595,14 +860,15 @@ def health_check():
             ]
         }
         
-        # Safe exchange manager check
+        # Safe exchange manager check - never force the lazy ccxt load from the health check
         try:
-            if exchange_manager and hasattr(exchange_manager, 'get_available_exchanges'):
+            if integrations.integrations['exchanges'].loaded and exchange_manager:
                 health_data['available_exchanges'] = exchange_manager.get_available_exchanges()
             else:
                 health_data['available_exchanges'] = []
         except Exception:
             health_data['available_exchanges'] = []
+        health_data['integrations_loaded'] = sum(1 for i in integrations.integrations.values() if i.loaded)
         
         return jsonify(health_data)
         
@@ -616,6 +882,60 @@ def health_check():
             'error_handled': str(e)
         })
 
+@app.route('/api/integrations/status', methods=['GET'])
+def get_integrations_status():
+    """Lazy integration registry: which integrations are loaded and how long each took"""
+    return jsonify({
+        'success': True,
+        'integrations': integrations.get_status(),
+        'uptime_seconds': round(time.time() - integrations.created_at, 1),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/prices/oracle', methods=['GET'])
+def get_price_oracle_snapshot():
+    """Price oracle status, or quotes for ?symbols=BTC,ETH,... straight from memory"""
+    if not price_oracle:
+        return jsonify({'success': False, 'error': 'Price oracle disabled'}), 503
+    try:
+        symbols = [s.strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+        payload = {'success': True, 'status': price_oracle.get_status()}
+        if symbols:
+            payload['prices'] = {symbol.upper(): price_oracle.get(symbol) for symbol in symbols}
+        payload['timestamp'] = datetime.now().isoformat()
+        return jsonify(payload)
+    except Exception as e:
+        logger.error(f"Price oracle error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/tradingview/snapshot/status', methods=['GET'])
+def get_tradingview_snapshot_status():
+    """Coverage, age and refresh counters of the TradingView universe snapshot"""
+    if not tradingview_snapshot:
+        return jsonify({'success': False, 'error': 'TradingView snapshot disabled'}), 503
+    try:
+        return jsonify({'success': True, 'status': tradingview_snapshot.get_status(),
+                        'timestamp': datetime.now().isoformat()})
+    except Exception as e:
+        logger.error(f"TradingView snapshot status error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_statistics():
+    """Hit/miss/eviction counters and memory use for every bounded cache in this worker"""
+    try:
+        caches = get_cache_stats()
+        return jsonify({
+            'success': True,
+            'caches': caches,
+            'total_entries': sum(c['entries'] for c in caches.values()),
+            'total_approx_bytes': sum(c['approx_bytes'] for c in caches.values()),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Cache stats error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/market/top-performers', methods=['GET'])
 def get_top_performers():
     """Get top performing coins by market metrics - Enhanced with CoinCap FREE data"""
@@ -921,6 +1241,7 @@ def get_top_performers():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/market/rsi-scan', methods=['GET', 'POST'])
+@long_running_job('rsi_scan')
 def rsi_market_scan():
     """
     ChatGPT RSI Market Scanner
@@ -967,6 +1288,11 @@ def rsi_market_scan():
             market_cap_min = float(request.args.get('market_cap_min', 10_000_000))
             volume_min = float(request.args.get('volume_min', 1_000_000))
 
+        snapshot = _snapshot_for(timeframe)
+        if snapshot:
+            return jsonify(_rsi_scan_from_snapshot(snapshot, symbols, rsi_min, rsi_max, timeframe, limit,
+                                                   market_cap_min, volume_min))
+
         # If no specific symbols provided, get market overview
         if not symbols:
             symbols = _get_market_symbols(limit * 3, market_cap_min, volume_min)  # Get more to filter
@@ -977,6 +1303,7 @@ def rsi_market_scan():
         for symbol in symbols:
             if len(results) >= limit:
                 break
+            found = len(results)
                 
             try:
                 # Get RSI for this symbol
@@ -1008,6 +1335,8 @@ def rsi_market_scan():
                         })
                 
                 processed += 1
+                # Job progress: one event per symbol, carrying the match if any
+                report_progress(processed, len(symbols), results[-1] if len(results) > found else None)
                 
                 # Rate limiting - don't overwhelm TAAPI
                 if processed % 10 == 0:
@@ -1101,8 +1430,38 @@ def _get_market_symbols(limit=200, market_cap_min=10_000_000, volume_min=1_000_0
         'CAKE', 'BNX', 'HIGH', 'DEGO', 'FOR', 'TWT', 'SFP', 'LINA', 'DODO', 'XVS'
     ][:limit]
 
+def _lookup_price(symbol):
+    """In-memory quote from the price oracle (or the WebSocket feed when the oracle is off).
+
+    Symbols without a live tick are subscribed so the next lookup is real-time.
+    """
+    quote = price_oracle.get(symbol) if price_oracle else None
+    if quote is None and bingx_ws_feed and not price_oracle:
+        ticker = bingx_ws_feed.get_ticker(symbol)
+        if ticker:
+            quote = {
+                'symbol': symbol.upper(),
+                'price': ticker['last'],
+                'change_24h': ticker['percentage'],
+                'volume_24h': ticker['quoteVolume'],
+                'market_cap': 0,
+                'source': ticker['source'],
+                'age_seconds': ticker['age_seconds']
+            }
+    if bingx_ws_feed and (quote is None or quote['source'] != 'bingx_websocket'):
+        bingx_ws_feed.subscribe(symbol)
+    return quote
+
 def _get_price_context(symbol):
     """Get price context for a symbol"""
+    quote = _lookup_price(symbol)
+    if quote:
+        return {
+            'price': quote['price'],
+            'change_24h': quote['change_24h'],
+            'volume_24h': quote['volume_24h'],
+            'market_cap': quote['market_cap']
+        }
     try:
         # Try to get price data from exchanges
         if exchange_manager:
@@ -1134,7 +1493,151 @@ def _classify_rsi_condition(rsi_value):
     else:
         return "neutral"
 
+def _snapshot_for(timeframe):
+    """The TradingView universe snapshot when it is fresh and covers `timeframe`"""
+    if tradingview_snapshot and tradingview_snapshot.has(timeframe):
+        return tradingview_snapshot
+    return None
+
+def _snapshot_market_cap(symbol):
+    quote = price_oracle.get(symbol) if price_oracle else None
+    return quote['market_cap'] if quote else 0
+
+def _snapshot_universe_filter(rows, symbols, market_cap_min=10_000_000, volume_min=1_000_000):
+    """Apply the market-cap/volume floors _get_market_symbols used, unless a symbol list was given"""
+    if symbols:
+        return rows
+    kept = []
+    for row in rows:
+        if row['volume_24h'] < volume_min:
+            continue
+        # Market caps come from the price oracle; without it only the volume floor applies
+        if price_oracle and market_cap_min and _snapshot_market_cap(row['symbol']) < market_cap_min:
+            continue
+        kept.append(row)
+    return kept
+
+def _rsi_scan_from_snapshot(snapshot, symbols, rsi_min, rsi_max, timeframe, limit, market_cap_min, volume_min):
+    """RSI scan as one vectorized filter over the snapshot (lowest RSI first)"""
+    rows = snapshot.screen(timeframe, {'RSI': (rsi_min, rsi_max)}, symbols=symbols or None, sort_by='RSI')
+    rows = _snapshot_universe_filter(rows, symbols, market_cap_min, volume_min)[:limit]
+    results = [{
+        'symbol': row['symbol'],
+        'rsi': round(row['RSI'], 2),
+        'timeframe': timeframe,
+        'price': row['price'] or 0,
+        'change_24h': row['change_24h'],
+        'volume_24h': row['volume_24h'],
+        'market_cap': _snapshot_market_cap(row['symbol']),
+        'condition': _classify_rsi_condition(row['RSI']),
+        'timestamp': datetime.now().isoformat()
+    } for row in rows]
+    return {
+        'success': True,
+        'scan_type': 'rsi_market_scan',
+        'parameters': {
+            'rsi_range': f"{rsi_min}-{rsi_max}",
+            'timeframe': timeframe,
+            'symbols_scanned': len(symbols) if symbols else len(snapshot.table['index']),
+            'results_found': len(results)
+        },
+        'results': results,
+        'data_source': 'tradingview_snapshot',
+        'snapshot_age_seconds': round(snapshot.age, 1),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def _macd_scan_from_snapshot(snapshot, symbols, signal, timeframe, limit):
+    """MACD crossover scan over the snapshot, most liquid coins first"""
+    any_value = (float('-inf'), float('inf'))  # excludes coins without MACD values
+    if signal == 'bullish':
+        mask = lambda col: col('MACD.macd') > col('MACD.signal')
+    elif signal == 'bearish':
+        mask = lambda col: col('MACD.macd') < col('MACD.signal')
+    else:
+        mask = None
+    rows = snapshot.screen(timeframe, {'MACD.macd': any_value, 'MACD.signal': any_value}, mask=mask,
+                           symbols=symbols or None)
+    rows = sorted(_snapshot_universe_filter(rows, symbols), key=lambda row: row['volume_24h'], reverse=True)[:limit]
+    results = []
+    for row in rows:
+        macd_line, signal_line = row['MACD.macd'], row['MACD.signal']
+        histogram = macd_line - signal_line
+        results.append({
+            'symbol': row['symbol'],
+            'macd': round(macd_line, 6),
+            'signal': round(signal_line, 6),
+            'histogram': round(histogram, 6),
+            'condition': 'bullish' if histogram > 0 else 'bearish',
+            'timeframe': timeframe,
+            'timestamp': datetime.now().isoformat()
+        })
+    return {
+        'success': True,
+        'scan_type': 'macd_crossover',
+        'signal_filter': signal,
+        'timeframe': timeframe,
+        'results': results,
+        'data_source': 'tradingview_snapshot',
+        'snapshot_age_seconds': round(snapshot.age, 1)
+    }
+
+def _multi_indicator_scan_from_snapshot(snapshot, symbols, indicators, timeframe, limit, require_all):
+    """Confluence scan: every condition is evaluated for the whole universe at once"""
+    rows = _snapshot_universe_filter(snapshot.screen(timeframe, symbols=symbols or None), symbols)
+    total_conditions = len(indicators)
+    results = []
+    for row in rows:
+        matches = []
+        indicator_values = {}
+        for indicator, conditions in indicators.items():
+            if indicator == 'rsi' and row['RSI'] is not None:
+                indicator_values['rsi'] = row['RSI']
+                if conditions.get('min', 0) <= row['RSI'] <= conditions.get('max', 100):
+                    matches.append('rsi')
+            elif indicator == 'macd' and row['MACD.macd'] is not None and row['MACD.signal'] is not None:
+                macd_line, signal_line = row['MACD.macd'], row['MACD.signal']
+                indicator_values['macd'] = {'macd': macd_line, 'signal': signal_line}
+                signal_type = conditions.get('signal', 'bullish')
+                if (signal_type == 'bullish' and macd_line > signal_line) or \
+                   (signal_type == 'bearish' and macd_line < signal_line):
+                    matches.append('macd')
+            elif indicator == 'bb' and None not in (row['close'], row['BB.lower'], row['BB.upper']):
+                indicator_values['bb'] = {'upper': row['BB.upper'], 'lower': row['BB.lower'], 'close': row['close']}
+                position = conditions.get('position', 'lower')
+                if (position == 'lower' and row['close'] <= row['BB.lower']) or \
+                   (position == 'upper' and row['close'] >= row['BB.upper']):
+                    matches.append('bb')
+        if (require_all and len(matches) == total_conditions) or (not require_all and matches):
+            results.append({
+                'symbol': row['symbol'],
+                'matches': matches,
+                'indicator_values': indicator_values,
+                'match_score': len(matches) / total_conditions,
+                'timeframe': timeframe,
+                '_volume': row['volume_24h']
+            })
+    
+    # Sort by match score, then liquidity
+    results.sort(key=lambda x: (x['match_score'], x['_volume']), reverse=True)
+    results = results[:limit]
+    for result in results:
+        del result['_volume']
+    return {
+        'success': True,
+        'scan_type': 'multi_indicator_confluence',
+        'parameters': {
+            'indicators_checked': list(indicators.keys()),
+            'require_all_conditions': require_all,
+            'timeframe': timeframe
+        },
+        'results': results,
+        'data_source': 'tradingview_snapshot',
+        'snapshot_age_seconds': round(snapshot.age, 1)
+    }
+
 @app.route('/api/market/macd-scan', methods=['GET', 'POST'])
+@long_running_job('macd_scan')
 def macd_market_scan():
     """
     ChatGPT MACD Market Scanner
@@ -1158,11 +1661,17 @@ def macd_market_scan():
             limit = int(request.args.get('limit', 30))
             symbols = []
         
+        snapshot = _snapshot_for(timeframe)
+        if snapshot:
+            return jsonify(_macd_scan_from_snapshot(snapshot, symbols, signal, timeframe, limit))
+        
         if not symbols:
             symbols = _get_market_symbols(100)
         
         results = []
-        for symbol in symbols[:limit * 2]:  # Check more to find matches
+        scan_symbols = symbols[:limit * 2]  # Check more to find matches
+        for scanned, symbol in enumerate(scan_symbols, 1):
+            found = len(results)
             try:
                 macd_data = taapi_universal.get_indicator(
                     indicator='macd',
@@ -1196,7 +1705,8 @@ def macd_market_scan():
                         
                         if len(results) >= limit:
                             break
-                            
+                
+                report_progress(scanned, len(scan_symbols), results[-1] if len(results) > found else None)
                 time.sleep(0.5)  # Rate limiting
             except Exception as e:
                 continue
@@ -1213,6 +1723,7 @@ def macd_market_scan():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/market/multi-indicator-scan', methods=['GET', 'POST'])
+@long_running_job('multi_indicator_scan')
 def multi_indicator_scan():
     """
     ChatGPT Multi-Indicator Scanner
@@ -1242,14 +1753,19 @@ def multi_indicator_scan():
         require_all = data.get('require_all', True)
         symbols = data.get('symbols', [])
         
+        snapshot = _snapshot_for(timeframe)
+        if snapshot:
+            return jsonify(_multi_indicator_scan_from_snapshot(snapshot, symbols, indicators, timeframe, limit, require_all))
+        
         if not symbols:
             symbols = _get_market_symbols(150)
             
         results = []
         
-        for symbol in symbols:
+        for scanned, symbol in enumerate(symbols, 1):
             if len(results) >= limit:
                 break
+            found = len(results)
                 
             try:
                 matches = []
@@ -1304,6 +1820,7 @@ def multi_indicator_scan():
                         'timeframe': timeframe
                     })
                 
+                report_progress(scanned, len(symbols), results[-1] if len(results) > found else None)
                 time.sleep(0.3)  # Rate limiting
                 
             except Exception as e:
@@ -1345,15 +1862,21 @@ def debug_environment():
             'has_blofin_passphrase': bool(os.getenv('BLOFIN_PASSPHRASE')),
             'bingx_api_key_length': len(os.getenv('BINGX_API_KEY', '')),
             'bingx_secret_length': len(os.getenv('BINGX_SECRET', '')),
-            'exchange_manager_type': str(type(exchange_manager).__name__),
-            'exchange_manager_module': str(type(exchange_manager).__module__)
+            'exchange_manager_type': str(type(integrations.resolve(exchange_manager)).__name__),
+            'exchange_manager_module': str(type(integrations.resolve(exchange_manager)).__module__)
         }
         return jsonify(env_debug)
     except Exception as e:
         logger.error(f"Error in debug endpoint: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _all_exchanges_ok(payload) -> bool:
+    """Only cache the live view when every exchange answered"""
+    return bool(payload) and 'error' not in payload and \
+        all(entry.get('status') != 'error' for entry in payload.get('exchanges', {}).values())
+
 @app.route('/api/live/all-exchanges', methods=['GET'])
+@cached_response(ttl=10, cacheable=_all_exchanges_ok)
 def get_all_exchanges():
     """Get live positions and orders from all exchanges (BingX, Blofin & KuCoin)"""
     try:
@@ -2202,9 +2725,11 @@ def _format_kraken_positions_for_gpt(raw_balance):
     # Get real trade history with entry prices and dates
     trade_history = _get_kraken_trade_history_enhanced()
     
-    # Get current prices
+    # Get current prices - one pass over the oracle table for every holding
     crypto_prices = {}
-    major_cryptos = ['AVAX', 'STX', 'JUP', 'FORTH', 'SUPER', 'BERA', 'SC', 'SOL.F']
+    if price_oracle:
+        crypto_prices = {sym: price for sym, price in price_oracle.get_prices(raw_balance.get('free', {})).items() if price}
+    major_cryptos = [c for c in ['AVAX', 'STX', 'JUP', 'FORTH', 'SUPER', 'BERA', 'SC', 'SOL.F'] if c not in crypto_prices]
     
     try:
         import requests
@@ -2494,6 +3019,7 @@ def get_live_market_data(symbol):
 
 # Alpha detection routes
 @app.route('/api/alpha/real-market-scan', methods=['GET'])
+@long_running_job('real_market_scan')
 def real_market_scan():
     """Scan entire market for real alpha opportunities"""
     try:
@@ -2514,6 +3040,7 @@ def real_market_scan():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/alpha/scan-opportunities', methods=['GET'])
+@long_running_job('real_market_scan')
 def scan_alpha_opportunities():
     """Alias for real-market-scan for Discord bot compatibility"""
     try:
@@ -2550,7 +3077,7 @@ def taapi_bulk():
         indicators = data.get('indicators', ['rsi', 'macd', 'ema', 'adx'])
         
         # Check if TAAPI universal is available
-        if taapi_universal is None:
+        if not taapi_universal:
             return jsonify({
                 "error": "TAAPI universal system not loaded",
                 "fallback_server": "https://indicators-production.up.railway.app/api/taapi/multiple"
@@ -2576,7 +3103,7 @@ def taapi_rsi():
         interval = request.args.get('interval', '4h')
         period = request.args.get('period', '14')
         
-        if not taapi_available or taapi_universal is None:
+        if not taapi_available or not taapi_universal:
             return jsonify({
                 "error": "TAAPI service not available",
                 "fallback_server": "https://indicators-production.up.railway.app/api/taapi/indicator/rsi"
@@ -2612,7 +3139,7 @@ def taapi_multiple():
             interval = data.get('interval', '4h')
             indicators = data.get('indicators', ['rsi', 'macd', 'ema', 'adx'])
         
-        if not taapi_available or taapi_universal is None:
+        if not taapi_available or not taapi_universal:
             return jsonify({
                 "error": "TAAPI service not available",
                 "fallback_server": "https://indicators-production.up.railway.app/api/taapi/multiple"
@@ -2626,25 +3153,34 @@ def taapi_multiple():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/taapi/available', methods=['GET'])
+@cached_response(ttl=3600)
 def taapi_available_indicators():
     """Get list of available TAAPI indicators"""
     try:
-        if not taapi_available or taapi_universal is None:
+        if not taapi_available or not taapi_universal:
             return jsonify({
                 "error": "TAAPI service not available",
                 "fallback_server": "https://indicators-production.up.railway.app/api/taapi/available"
             }), 503
             
         # Return hardcoded list since method doesn't exist
+        indicators = [
+            "rsi", "macd", "ema", "sma", "bbands", "adx", "cci", "stoch", 
+            "williams", "obv", "atr", "roc", "mfi", "trix", "dmi", "psar"
+        ]
+        query = ListQuery.from_args(request.args)
+        if query.shaped:
+            page, total, next_cursor = query.select(indicators, search_keys=('name',), record=lambda name: {'name': name})
+            return jsonify({"available_indicators": page, "total": total, "next_cursor": next_cursor,
+                            "source": "taapi_universal_fallback"})
         result = {
-            "available_indicators": [
-                "rsi", "macd", "ema", "sma", "bbands", "adx", "cci", "stoch", 
-                "williams", "obv", "atr", "roc", "mfi", "trix", "dmi", "psar"
-            ],
+            "available_indicators": indicators,
             "source": "taapi_universal_fallback"
         }
         return jsonify(result)
         
+    except QueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"TAAPI available error: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -2668,7 +3204,7 @@ def taapi_specific_indicator(indicator):
                     except ValueError:
                         kwargs[key] = value
         
-        if not taapi_available or taapi_universal is None:
+        if not taapi_available or not taapi_universal:
             return jsonify({
                 "error": "TAAPI service not available",
                 "fallback_server": f"https://indicators-production.up.railway.app/api/taapi/indicator/{indicator}"
@@ -2775,6 +3311,17 @@ def sentiment_analyze(symbol):
 @app.route('/api/crypto/price/<symbol>', methods=['GET'])
 def get_crypto_price(symbol):
     """Get current cryptocurrency price"""
+    quote = _lookup_price(symbol)
+    if quote:
+        return jsonify({
+            'success': True,
+            'symbol': symbol.upper(),
+            'price': quote['price'],
+            'exchange': 'BingX' if quote['source'].startswith('bingx') else 'CoinGecko',
+            'source': quote['source'],
+            'age_seconds': quote['age_seconds'],
+            'timestamp': datetime.now().isoformat()
+        })
     try:
         import ccxt
         
@@ -3068,6 +3615,67 @@ def get_bingx_pnl_history():
         logger.error(f"Error getting BingX P&L history: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/bingx/ws-status', methods=['GET'])
+def get_bingx_ws_status():
+    """BingX WebSocket feed health: connection, subscriptions, gaps and reconnects"""
+    if not bingx_ws_feed:
+        return jsonify({'success': False, 'error': 'BingX WebSocket feed disabled', 'timestamp': datetime.now().isoformat()}), 503
+    return jsonify({
+        'success': True,
+        'feed': bingx_ws_feed.get_status(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/tradingview/ws-status', methods=['GET'])
+def get_tradingview_ws_status():
+    """TradingView WebSocket feed health: quote/chart sessions, fresh quotes and reconnects"""
+    feed = get_tradingview_ws_feed(start=False)
+    if not feed:
+        return jsonify({'success': False, 'error': 'TradingView WebSocket feed disabled', 'timestamp': datetime.now().isoformat()}), 503
+    return jsonify({
+        'success': True,
+        'feed': feed.get_status(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/bingx/tickers', methods=['GET'])
+def get_bingx_all_tickers():
+    """
+    Every BingX perpetual ticker (with mark price and funding) from the shared snapshot
+    
+    Parameters:
+    - min_volume: minimum 24h quote volume in USDT (default: 0)
+    - sort: 'volume', 'change' or 'symbol' (default: 'volume')
+    - limit: max tickers returned (default: all)
+    """
+    if not bingx_direct_available:
+        return jsonify({'success': False, 'error': 'BingX Direct API not available'}), 503
+    try:
+        min_volume = request.args.get('min_volume', 0, type=float)
+        sort = request.args.get('sort', 'volume')
+        limit = request.args.get('limit', type=int)
+        
+        tickers = [t for t in bingx_direct.refresh_ticker_snapshot().values() if t['quoteVolume'] >= min_volume]
+        sort_keys = {
+            'volume': lambda t: -t['quoteVolume'],
+            'change': lambda t: -t['percentage'],
+            'symbol': lambda t: t['symbol']
+        }
+        tickers.sort(key=sort_keys.get(sort, sort_keys['volume']))
+        if limit:
+            tickers = tickers[:limit]
+        
+        return jsonify({
+            'success': True,
+            'count': len(tickers),
+            'tickers': [{k: v for k, v in t.items() if k != 'info'} for t in tickers],
+            'snapshot': bingx_direct.get_snapshot_status(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"BingX tickers snapshot error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 # BingX accurate pricing endpoint
 @app.route('/api/bingx/price/<symbol>', methods=['GET'])
 def get_bingx_price(symbol):
@@ -3322,6 +3930,12 @@ def get_orderbook(exchange, symbol):
     """Get orderbook for a specific symbol on an exchange"""
     try:
         limit = request.args.get('limit', 20, type=int)
+        if exchange.lower() == 'bingx' and orderbook_manager:
+            # Maintained L2 replica: no snapshot fetch, metrics precomputed
+            book = orderbook_manager.get_orderbook(symbol, limit)
+            if book:
+                book['metrics'] = orderbook_manager.get_metrics(symbol)
+                return jsonify(book)
         result = trading_functions.get_orderbook(exchange, symbol, limit)
         return jsonify(result)
     except ExchangeNotAvailableError as e:
@@ -3330,6 +3944,23 @@ def get_orderbook(exchange, symbol):
         logger.error(f"Error getting orderbook for {symbol} on {exchange}: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/orderbook/metrics', methods=['GET'])
+def get_orderbook_metrics():
+    """Spread, imbalance, depth bands, slippage and walls for every replicated BingX book"""
+    if not orderbook_manager:
+        return jsonify({'error': 'Order book replica unavailable'}), 503
+    symbols = request.args.get('symbols')
+    if symbols:
+        metrics = {s: orderbook_manager.get_metrics(s) for s in symbols.split(',')}
+    else:
+        metrics = orderbook_manager.get_all_metrics()
+    return jsonify({
+        'success': True,
+        'metrics': metrics,
+        'stats': orderbook_manager.get_stats(),
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route('/api/trades/<exchange>/<symbol>', methods=['GET'])
 def get_trades(exchange, symbol):
     """Get recent trades for a specific symbol on an exchange"""
@@ -3355,12 +3986,32 @@ def get_balance(exchange):
         logger.error(f"Error getting balance for {exchange}: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# ccxt market keys accepted as equality filters on /api/markets/<exchange>
+MARKET_FILTERS = ('type', 'base', 'quote', 'settle', 'active', 'spot', 'swap', 'future', 'linear')
+
+def _symbol_record(symbol):
+    """BASE/QUOTE:SETTLE -> filterable parts"""
+    pair, _, settle = symbol.partition(':')
+    base, _, quote = pair.partition('/')
+    return {'symbol': symbol, 'base': base, 'quote': quote, 'settle': settle}
+
 @app.route('/api/markets/<exchange>', methods=['GET'])
+@cached_response(ttl=300)
 def get_markets(exchange):
-    """Get available markets for an exchange"""
+    """Get available markets for an exchange
+    
+    Without query parameters this is the full ccxt markets dict. Any of
+    fields/limit/cursor/search or the MARKET_FILTERS return one page:
+    {'data': [...], 'count', 'total', 'next_cursor'}.
+    """
     try:
+        query = ListQuery.from_args(request.args, filters=MARKET_FILTERS)
         result = trading_functions.get_markets(exchange)
+        if query.shaped and isinstance(result, dict):
+            return jsonify(query.respond(result.values(), search_keys=('symbol', 'id'), exchange=exchange))
         return jsonify(result)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
     except ExchangeNotAvailableError as e:
         return jsonify({'error': str(e), 'exchange': exchange}), 503
     except Exception as e:
@@ -3657,10 +4308,15 @@ def get_trading_fees(exchange):
 
 @app.route('/api/symbols/<exchange>', methods=['GET'])
 def get_symbols(exchange):
-    """Get available symbols for an exchange"""
+    """Get available symbols for an exchange (paged when fields/limit/cursor/search/base/quote/settle given)"""
     try:
+        query = ListQuery.from_args(request.args, filters=('base', 'quote', 'settle'))
         result = trading_functions.get_symbols(exchange)
+        if query.shaped and isinstance(result, list):
+            return jsonify(query.respond(result, search_keys=('symbol',), record=_symbol_record, exchange=exchange))
         return jsonify(result)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
     except ExchangeNotAvailableError as e:
         return jsonify({'error': str(e), 'exchange': exchange}), 503
     except Exception as e:
@@ -3976,6 +4632,36 @@ def get_prioritized_alerts():
         logger.error(f"Error getting prioritized alerts: {str(e)}")
         return jsonify({'error': 'Failed to get prioritized alerts'}), 500
 
+@app.route('/api/performance/alerts', methods=['GET'])
+def alert_performance_stats():
+    """Hit-rate/expectancy/MFE/MAE per alert source and type, overall and per score threshold"""
+    if not alert_tracker:
+        return jsonify({'error': 'Alert performance tracking disabled'}), 503
+    try:
+        thresholds = request.args.get('thresholds')
+        if thresholds:
+            thresholds = [float(t) for t in thresholds.split(',') if t.strip()]
+        since_hours = request.args.get('since_hours', type=float)
+        performance = alert_tracker.performance(
+            thresholds=thresholds or None,
+            since=time.time() - since_hours * 3600 if since_hours else None,
+            source=request.args.get('source'),
+            sent_only=request.args.get('sent_only', 'false').lower() == 'true',
+            min_samples=request.args.get('min_samples', 20, type=int)
+        )
+        return jsonify({
+            'status': 'success',
+            'performance': performance,
+            'open_alerts': alert_tracker.open_alerts(limit=request.args.get('open_limit', 0, type=int)),
+            'tracker': alert_tracker.get_status(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except ValueError:
+        return jsonify({'error': 'thresholds must be comma-separated numbers'}), 400
+    except Exception as e:
+        logger.error(f"Error getting alert performance: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/performance/news-tracking', methods=['GET'])
 def track_news_performance():
     """Track which news leads to price movements (basic implementation)"""
@@ -4387,44 +5073,55 @@ def get_kucoin_balances():
 # ============================================================================
 
 # Import the real AI trading intelligence
-try:
+def _load_openai():
     from openai_trading_intelligence import TradingIntelligence
-    trading_ai = TradingIntelligence()
-    openai_available = True
-    logger.info("OpenAI Trading Intelligence loaded successfully")
-except ImportError as e:
-    logger.warning(f"OpenAI not available: {e}")
-    openai_available = False
-    trading_ai = None
+    return {'trading_ai': TradingIntelligence()}
+
+integrations.register('openai', _load_openai, 'OpenAI Trading Intelligence')
+trading_ai = integrations.proxy('openai', 'trading_ai')
+openai_available = integrations.flag('openai')
 
 # Import technical indicators
-try:
+def _load_taapi_indicators():
     from taapi_indicators import TaapiIndicators
-    taapi_indicators = TaapiIndicators()
-    taapi_available = True
-    logger.info("Taapi.io technical indicators loaded successfully")
-except Exception as e:
-    taapi_indicators = None
-    taapi_available = False
-    logger.warning(f"Taapi.io indicators not available: {e}")
+    return {'taapi_indicators': TaapiIndicators()}
+
+integrations.register('taapi_indicators', _load_taapi_indicators, 'Taapi.io technical indicators')
+taapi_indicators = integrations.proxy('taapi_indicators', 'taapi_indicators')
+taapi_available = integrations.flag('taapi_indicators')
 
 # Import futures market data
-try:
+def _load_coinalyze_rugcheck():
     from coinalyze_api import CoinalyzeAPI
-    from rugcheck_integration import RugCheckAnalyzer, create_rugcheck_analyzer
-    coinalyze_api = CoinalyzeAPI()
-    coinalyze_available = True
-    logger.info("Coinalyze futures market data loaded successfully")
-    
+    from rugcheck_integration import create_rugcheck_analyzer
     # Initialize RugCheck integration
     rugcheck_api_key = os.getenv('RUGCHECK_API_KEY')
-    rugcheck_analyzer = create_rugcheck_analyzer(rugcheck_api_key)
-    logger.info("RugCheck token security analysis loaded successfully")
-except Exception as e:
-    coinalyze_api = None
-    coinalyze_available = False
-    rugcheck_analyzer = None
-    logger.warning(f"Coinalyze and RugCheck APIs not available: {e}")
+    return {
+        'coinalyze_api': CoinalyzeAPI(),
+        'rugcheck_analyzer': create_rugcheck_analyzer(rugcheck_api_key)
+    }
+
+integrations.register('coinalyze', _load_coinalyze_rugcheck, 'Coinalyze futures data + RugCheck')
+coinalyze_api = integrations.proxy('coinalyze', 'coinalyze_api')
+coinalyze_available = integrations.flag('coinalyze')
+rugcheck_analyzer = integrations.proxy('coinalyze', 'rugcheck_analyzer')
+
+# Local funding/OI history (backfilled, then appended in the background) for the futures endpoints
+def _load_futures_store():
+    from futures_timeseries import get_futures_store
+    oracle = integrations.resolve(price_oracle)
+    return {'futures_store': get_futures_store(api=coinalyze_api, spot_prices=oracle.get_prices if oracle else None)}
+
+integrations.register('futures_store', _load_futures_store, 'Funding/OI time-series store')
+futures_store = integrations.proxy('futures_store', 'futures_store')
+FUTURES_STORE_MAX_AGE = 3 * 3600  # newest hourly bar plus a missed sync
+
+def _futures_history_args(symbol):
+    """Hours of local history requested via ?history=<hours> (0 = none); tracks the asset"""
+    hours = request.args.get('history', 0, type=int)
+    if futures_store and hours:
+        futures_store.track([symbol.upper()])
+    return hours if futures_store else 0
 
 # ============================================================================
 # COINALYZE FUTURES MARKET DATA ENDPOINTS
@@ -4443,12 +5140,17 @@ def get_funding_rates(symbol):
             return jsonify({'error': f'No Coinalyze symbol found for {symbol.upper()}'}), 404
             
         funding_data = coinalyze_api.get_current_funding_rates(proper_symbol)
-        
-        return jsonify({
+        payload = {
             'symbol': symbol.upper(),
             'funding_rates': funding_data,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        hours = _futures_history_args(symbol)
+        if hours:
+            payload['history'] = futures_store.funding_series(symbol, since=int(time.time()) - hours * 3600)
+            payload['derived'] = futures_store.latest(symbol)
+        
+        return jsonify(payload)
         
     except Exception as e:
         logger.error(f"Error getting funding rates for {symbol}: {str(e)}")
@@ -4467,12 +5169,17 @@ def get_open_interest(symbol):
             return jsonify({'error': f'No Coinalyze symbol found for {symbol.upper()}'}), 404
             
         oi_data = coinalyze_api.get_current_open_interest(proper_symbol)
-        
-        return jsonify({
+        payload = {
             'symbol': symbol.upper(),
             'open_interest': oi_data,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        hours = _futures_history_args(symbol)
+        if hours:
+            payload['history'] = futures_store.open_interest_series(symbol, since=int(time.time()) - hours * 3600)
+            payload['derived'] = futures_store.latest(symbol)
+        
+        return jsonify(payload)
         
     except Exception as e:
         logger.error(f"Error getting open interest for {symbol}: {str(e)}")
@@ -4485,7 +5192,21 @@ def get_funding_sentiment(symbol):
         if not coinalyze_available:
             return jsonify({'error': 'Coinalyze API not available'}), 503
             
+        # Served from the local store when it has a recent bar; otherwise ask Coinalyze and start tracking
+        latest = futures_store.latest(symbol, max_age=FUTURES_STORE_MAX_AGE) if futures_store else None
+        if latest:
+            sentiment = coinalyze_api.analyze_funding_rates({symbol.upper(): latest['funding_rate']})[symbol.upper()]
+            sentiment.update({
+                'funding_zscore': latest['funding_zscore'],
+                'oi_delta_pct': latest['oi_delta_pct'],
+                'basis_pct': latest['basis_pct'],
+                'source': 'futures_store'
+            })
+            return jsonify(sentiment)
+        
         sentiment = coinalyze_api.analyze_funding_sentiment(symbol.upper())
+        if futures_store and 'error' not in sentiment:
+            futures_store.track([symbol.upper()])
         
         return jsonify(sentiment)
         
@@ -4493,6 +5214,18 @@ def get_funding_sentiment(symbol):
         logger.error(f"Error analyzing funding sentiment for {symbol}: {str(e)}")
         return jsonify({'error': 'Failed to analyze funding sentiment'}), 500
 
+@app.route('/api/futures/store-status', methods=['GET'])
+def get_futures_store_status():
+    """Rows, tracked assets and sync counters of the local funding/OI time-series store"""
+    if not futures_store:
+        return jsonify({'success': False, 'error': 'Futures time-series store disabled'}), 503
+    try:
+        return jsonify({'success': True, 'status': futures_store.get_status(),
+                        'timestamp': datetime.now().isoformat()})
+    except Exception as e:
+        logger.error(f"Futures store status error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/futures/market-intelligence', methods=['POST'])
 def get_market_intelligence():
     """Get comprehensive futures market intelligence for multiple symbols"""
@@ -4739,6 +5472,22 @@ def get_chatgpt_account_summary():
         logger.error(f"Error generating ChatGPT account summary: {str(e)}")
         return jsonify({'error': 'Failed to generate AI account summary'}), 500
 
+@app.route('/api/chatgpt/llm-stats', methods=['GET'])
+def get_llm_gateway_stats():
+    """Cache hit rate, call count and token usage of the shared LLM gateway"""
+    try:
+        from llm_gateway import llm_gateway
+        from sentiment_prefilter import sentiment_prefilter
+        return jsonify({
+            'success': True,
+            'stats': llm_gateway.get_stats(),
+            'sentiment_prefilter': sentiment_prefilter.get_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Error getting LLM gateway stats: {str(e)}")
+        return jsonify({'error': 'Failed to get LLM gateway stats'}), 500
+
 # ============================================================================
 # TAAPI.IO TECHNICAL INDICATORS ENDPOINTS
 # ============================================================================
@@ -4853,7 +5602,7 @@ def get_bulk_indicators():
         }
         
         # Check if taapi_universal is available before using
-        if taapi_universal is None:
+        if not taapi_universal:
             return jsonify({'error': 'TAAPI system not available'}), 503
         result = taapi_universal._make_bulk_request(bulk_payload)
         return jsonify(result)
@@ -4903,7 +5652,7 @@ def test_taapi_indicators():
             }
             
             # Check if taapi_universal is available
-            if taapi_universal is None:
+            if not taapi_universal:
                 raise Exception("TAAPI universal system not available")
             bulk_result = taapi_universal._make_bulk_request(bulk_payload)
             
@@ -5068,7 +5817,7 @@ def get_multi_timeframe_analysis(symbol):
 def get_indicators_status():
     """Get status of technical indicators integration"""
     status = {
-        'taapi_available': taapi_available,
+        'taapi_available': bool(taapi_available),
         'api_key_configured': bool(os.getenv('TAAPI_API_KEY')),
         'supported_indicators': [
             'RSI', 'MACD', 'Bollinger Bands', 'Stochastic', 
@@ -5121,7 +5870,7 @@ def analyze_portfolio_security():
         
         # Perform portfolio security analysis
         portfolio_analysis = asyncio.run(
-            rugcheck_analyzer.analyze_portfolio_security(token_addresses)
+            rugcheck_analyzer.analyze_portfolio_security(token_addresses, chain)
         )
         
         return jsonify({
@@ -5194,6 +5943,26 @@ def bulk_check_tokens():
         logger.error(f"Error in bulk token check: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/rugcheck/cache-status', methods=['GET'])
+def get_rugcheck_cache_status():
+    """Stored RugCheck verdicts by risk level and cache hit counters"""
+    try:
+        if not rugcheck_analyzer:
+            return jsonify({"error": "RugCheck not available"}), 503
+        
+        cache = rugcheck_analyzer.rugcheck_api.cache
+        if not cache:
+            return jsonify({"error": "RugCheck verdict cache disabled"}), 503
+        
+        return jsonify({
+            "cache": cache.get_status(),
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error reading RugCheck cache status: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 # ============================================================================
 # MARKET PREDICTION WIDGET ENDPOINTS
 # ============================================================================
@@ -5342,6 +6111,10 @@ def generate_market_prediction(symbol, timeframe):
 def get_current_price(symbol):
     """Get current market price for symbol"""
     try:
+        quote = _lookup_price(symbol)
+        if quote:
+            return quote['price']
+        
         # Try to get from exchange APIs
         if exchange_manager and exchange_manager.get_available_exchanges():
             for exchange_name in ['bingx', 'kraken']:
@@ -5835,21 +6608,19 @@ def get_market_snapshot():
 # ============================================================================
 
 @app.route('/api/coinmarketcap/listings/latest', methods=['GET'])
+@cached_response(ttl=60)
 def get_cmc_listings():
     """Get latest cryptocurrency listings from CoinMarketCap"""
     if not cmc_available:
         return jsonify({'error': 'CoinMarketCap API key not configured'}), 503
     
     try:
-        # Get query parameters
-        start = request.args.get('start', 1, type=int)
-        limit = request.args.get('limit', 100, type=int)
+        # Get query parameters; a cursor maps straight onto CMC's start offset
+        query = ListQuery.from_args(request.args, max_limit=5000)
+        start, limit = query.upstream_page(request.args.get('start', 1, type=int))
         convert = request.args.get('convert', 'USD')
         sort = request.args.get('sort', 'market_cap')
         sort_dir = request.args.get('sort_dir', 'desc')
-        market_cap_min = request.args.get('market_cap_min', type=int)
-        market_cap_max = request.args.get('market_cap_max', type=int)
-        volume_24h_min = request.args.get('volume_24h_min', type=int)
         
         # Build API parameters
         params = {
@@ -5860,12 +6631,11 @@ def get_cmc_listings():
             'sort_dir': sort_dir
         }
         
-        if market_cap_min:
-            params['market_cap_min'] = market_cap_min
-        if market_cap_max:
-            params['market_cap_max'] = market_cap_max
-        if volume_24h_min:
-            params['volume_24h_min'] = volume_24h_min
+        # Filters are pushed down to CMC so only matching rows are fetched
+        for name in CMC_LISTING_FILTERS:
+            value = request.args.get(name)
+            if value:
+                params[name] = value
         
         headers = {
             'X-CMC_PRO_API_KEY': CMC_API_KEY,
@@ -5880,8 +6650,14 @@ def get_cmc_listings():
         )
         response.raise_for_status()
         
-        return jsonify(response.json())
+        payload = response.json()
+        listings = payload.get('data') or []
+        payload['data'] = [project(item, query.fields) for item in listings]
+        payload['next_cursor'] = query.next_upstream_cursor(start, len(listings))
+        return jsonify(payload)
         
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching CMC listings: {str(e)}")
         return jsonify({'error': 'Failed to fetch CoinMarketCap data'}), 500
@@ -6388,7 +7164,9 @@ def get_dexpaprika_multi_chain():
         if not mcp_integrations_available:
             return jsonify({'error': 'MCP integrations not available - still using expensive APIs'}), 503
         
-        multi_chain_data = get_multi_chain_overview()
+        networks = [n.strip().lower() for n in request.args.get('networks', '').split(',') if n.strip()]
+        limit = min(int(request.args.get('limit', 10)), 100)
+        multi_chain_data = get_multi_chain_overview(networks or None, limit)
         
         total_pools = sum(len(pools) for pools in multi_chain_data.values())
         
@@ -6405,38 +7183,99 @@ def get_dexpaprika_multi_chain():
         logger.error(f"Error getting DexPaprika multi-chain data: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
-# Initialize FREE MCP integrations on startup (Flask 2+ compatible)
+@app.route('/api/mcp/dexpaprika/pool-ohlcv/<network>/<pool_address>', methods=['GET'])
+def get_dexpaprika_pool_ohlcv(network, pool_address):
+    """Pool OHLCV from FREE DexPaprika (repeat calls only fetch new bars)"""
+    try:
+        if not mcp_integrations_available:
+            return jsonify({'error': 'MCP integrations not available - still using expensive APIs'}), 503
+        
+        days = min(int(request.args.get('days', 7)), 30)
+        interval = request.args.get('interval', '1h')
+        candles = dexpaprika_client.get_pool_ohlcv(network, pool_address, days, interval)
+        
+        return jsonify({
+            'status': 'success',
+            'data': candles,
+            'network': network,
+            'pool_address': pool_address,
+            'interval': interval,
+            'count': len(candles),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting DexPaprika pool OHLCV: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/mcp/dexpaprika/tokens', methods=['POST'])
+def get_dexpaprika_tokens():
+    """Token details for many addresses on one network, fetched concurrently"""
+    try:
+        if not mcp_integrations_available:
+            return jsonify({'error': 'MCP integrations not available - still using expensive APIs'}), 503
+        
+        data = request.get_json(silent=True) or {}
+        network = data.get('network', 'ethereum')
+        addresses = data.get('addresses', [])
+        if not addresses:
+            return jsonify({'error': 'No token addresses provided'}), 400
+        
+        details = dexpaprika_client.get_tokens_details(network, addresses[:100])
+        
+        return jsonify({
+            'status': 'success',
+            'data': details,
+            'network': network,
+            'found': sum(1 for d in details.values() if d),
+            'count': len(details),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting DexPaprika token details: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+# Initialize FREE MCP integrations (called from the lazy MCP loader)
 def initialize_mcp_integrations():
-    """Initialize FREE MCP integrations to replace expensive APIs"""
-    if mcp_integrations_available:
-        try:
-            import asyncio
-            from mcp_servers.coincap_mcp_integration import initialize_coincap_mcp
+    """Initialize FREE MCP integrations to replace expensive APIs (runs when the MCP integration first loads)"""
+    try:
+        import asyncio
+        from mcp_servers.coincap_mcp_integration import initialize_coincap_mcp
             
-            # Run async initializations  
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # Run async initializations  
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
             
-            # Initialize CoinCap (replaces $300/month CoinMarketCap Pro)
-            coincap_success = loop.run_until_complete(initialize_coincap_mcp())
+        # Initialize CoinCap (replaces $300/month CoinMarketCap Pro)
+        coincap_success = loop.run_until_complete(initialize_coincap_mcp())
             
-            loop.close()
+        loop.close()
             
-            if coincap_success:
-                logger.info("🎉 FREE CoinCap integration initialized successfully!")
-                logger.info("💰 Estimated savings: $300/month vs CoinMarketCap Pro")
-            else:
-                logger.warning("⚠️ CoinCap MCP integration failed to initialize")
+        if coincap_success:
+            logger.info("🎉 FREE CoinCap integration initialized successfully!")
+            logger.info("💰 Estimated savings: $300/month vs CoinMarketCap Pro")
+        else:
+            logger.warning("⚠️ CoinCap MCP integration failed to initialize")
                 
-        except Exception as e:
-            logger.error(f"Error initializing MCP integrations: {e}")
-
-# Call initialization at module level
-if mcp_integrations_available:
-    initialize_mcp_integrations()
+    except Exception as e:
+        logger.error(f"Error initializing MCP integrations: {e}")
 
 # =================== LUMIF-AI TRADINGVIEW ENHANCED ENDPOINTS ===================
 
+def _lumif_symbol(symbol):
+    """Lumif's ticker form (BTCUSDT) for BTC, btc, BTC/USDT or BTC-USDT"""
+    symbol = symbol.strip().upper().replace('/', '').replace('-', '')
+    return symbol if symbol.endswith('USDT') else f"{symbol}USDT"
+
+def _lumif_source(symbol, exchange='BINANCE', interval='4h'):
+    """(fn, args) for a Lumif analysis; every caller goes through here so they share one cache key"""
+    return get_enhanced_technical_analysis, (_lumif_symbol(symbol), exchange, interval)
+
+def _lumif_analysis(symbol, exchange='BINANCE', interval='4h'):
+    fn, args = _lumif_source(symbol, exchange, interval)
+    return cached_call('lumif_integration', fn, *args)
+
 @app.route('/api/lumif/enhanced-analysis/<symbol>', methods=['GET'])
 def get_lumif_enhanced_analysis(symbol):
     """Get enhanced TradingView technical analysis using Lumif-ai methodology"""
@@ -6447,7 +7286,7 @@ def get_lumif_enhanced_analysis(symbol):
         exchange = request.args.get('exchange', 'BINANCE')
         interval = request.args.get('interval', '4h')
         
-        analysis = get_enhanced_technical_analysis(symbol, exchange, interval)
+        analysis = _lumif_analysis(symbol, exchange, interval)
         
         if analysis:
             return jsonify({
@@ -6498,6 +7337,7 @@ def get_lumif_multi_timeframe(symbol):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/lumif/market-scanner', methods=['POST'])
+@long_running_job('lumif_market_scan')
 def get_lumif_market_scanner():
     """Enhanced market scanner using Lumif-ai methodology for high-confluence opportunities"""
     try:
@@ -6508,7 +7348,12 @@ def get_lumif_market_scanner():
         symbols = data.get('symbols', ['BTC', 'ETH', 'SOL', 'ADA', 'AVAX'])
         min_confluence = data.get('min_confluence', 75.0)
         
-        signals = scan_market_opportunities(symbols, min_confluence)
+        # One symbol at a time so job progress can stream each opportunity
+        signals = []
+        for scanned, symbol in enumerate(symbols, 1):
+            found = scan_market_opportunities([symbol], min_confluence)
+            signals.extend(found)
+            report_progress(scanned, len(symbols), found[0] if found else None)
         
         return jsonify({
             'status': 'success',
@@ -6533,7 +7378,7 @@ def get_lumif_pattern_signals(symbol):
         exchange = request.args.get('exchange', 'BINANCE')
         interval = request.args.get('interval', '4h')
         
-        analysis = get_enhanced_technical_analysis(symbol, exchange, interval)
+        analysis = _lumif_analysis(symbol, exchange, interval)
         
         if analysis and analysis.get('pattern_signals'):
             return jsonify({
@@ -6554,34 +7399,29 @@ def get_lumif_pattern_signals(symbol):
         logger.error(f"Error getting pattern signals for {symbol}: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
-# Initialize Lumif-ai TradingView integration on startup
-def initialize_lumif_integrations():
-    """Initialize Lumif-ai TradingView integrations"""
-    if lumif_tradingview_available:
-        try:
-            import asyncio
+# Initialize Lumif-ai TradingView integration (called from the lazy Lumif loader)
+def initialize_lumif_integrations(initialize_lumif_tradingview):
+    """Initialize Lumif-ai TradingView integrations (runs when the integration first loads)"""
+    try:
+        import asyncio
             
-            # Run async initialization
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # Run async initialization
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
             
-            # Initialize Lumif TradingView (enhanced technical analysis)
-            lumif_success = loop.run_until_complete(initialize_lumif_tradingview())
+        # Initialize Lumif TradingView (enhanced technical analysis)
+        lumif_success = loop.run_until_complete(initialize_lumif_tradingview())
             
-            loop.close()
+        loop.close()
             
-            if lumif_success:
-                logger.info("🎉 Lumif-ai TradingView integration initialized successfully!")
-                logger.info("💡 Enhanced features: 208+ indicators, pattern recognition, confluence scoring")
-            else:
-                logger.warning("⚠️ Lumif-ai TradingView integration failed to initialize")
+        if lumif_success:
+            logger.info("🎉 Lumif-ai TradingView integration initialized successfully!")
+            logger.info("💡 Enhanced features: 208+ indicators, pattern recognition, confluence scoring")
+        else:
+            logger.warning("⚠️ Lumif-ai TradingView integration failed to initialize")
                 
-        except Exception as e:
-            logger.error(f"Error initializing Lumif-ai integrations: {e}")
-
-# Call Lumif initialization at module level
-if lumif_tradingview_available:
-    initialize_lumif_integrations()
+    except Exception as e:
+        logger.error(f"Error initializing Lumif-ai integrations: {e}")
 
 # =================== END LUMIF-AI TRADINGVIEW ENDPOINTS ===================
 
@@ -6590,10 +7430,30 @@ if lumif_tradingview_available:
 # Add missing direct analysis endpoint
 @app.route('/api/direct-analysis/<symbol>', methods=['GET'])
 def direct_analysis(symbol):
-    """Direct technical analysis endpoint"""
-    try:
+    """Direct technical analysis endpoint (4h RSI)"""
+    try:
+        # TradingView's plain RSI column is daily; the 4h one is RSI|240, which the snapshot carries
+        row = tradingview_snapshot.row(symbol, '4h') if tradingview_snapshot else None
+        rsi, source = (row or {}).get('RSI'), 'tradingview_snapshot'
+        if rsi is None:
+            # A 4h Lumif analysis another endpoint fetched moments ago
+            cached = cached_result('lumif_integration', *_lumif_source(symbol)[1])
+            rsi, source = ((cached or {}).get('technical_indicators') or {}).get('rsi'), 'tradingview_lumif_integration'
+        if rsi is None and tradingview_advanced_available:
+            rsi = cached_call('advanced_api_rsi_4h', get_indicator_value, f"{symbol}USDT", 'RSI|240',
+                              ok=lambda value: value is not None)
+            source = 'tradingview_advanced_api'
+        if rsi is not None:
+            return jsonify({
+                "symbol": symbol,
+                "rsi": rsi,
+                "confluence_score": 35.0,
+                "recommendation": "neutral",
+                "source": source
+            })
+        
         # Use TAAPI fallback for now
-        if taapi_available and taapi_universal is not None:
+        if taapi_available and taapi_universal:
             # Get RSI indicator using the direct method
             result = taapi_universal.get_indicator(f"{symbol}USDT", 'rsi', '4h', 14)
             
@@ -6638,7 +7498,7 @@ def tradingview_advanced_analysis(symbol):
         exchange = request.args.get('exchange', 'BINANCE')
         
         if tradingview_advanced_available:
-            result = get_advanced_analysis(symbol, exchange)
+            result = cached_call('advanced_api', get_advanced_analysis, symbol, exchange)
             if result:
                 return jsonify(result)
         
@@ -6662,7 +7522,7 @@ def tradingview_scraper_analysis(symbol):
         exchange = request.args.get('exchange', 'BINANCE')
         
         if tradingview_scraper_available:
-            result = get_scraper_analysis(symbol, exchange)
+            result = cached_call('web_scraper', get_scraper_analysis, symbol, exchange)
             if result:
                 return jsonify(result)
         
@@ -6686,7 +7546,7 @@ def tradingview_github_analysis(symbol):
         exchange = request.args.get('exchange', 'BINANCE')
         
         if tradingview_github_available:
-            result = get_github_analysis(symbol, exchange)
+            result = cached_call('github_api', get_github_analysis, symbol, exchange)
             if result:
                 return jsonify(result)
         
@@ -6703,51 +7563,37 @@ def tradingview_github_analysis(symbol):
             'error': str(e)
         }), 500
 
+# Field -> extractor over a source's success payload (all four share this layout)
+TRADINGVIEW_ANALYSIS_FIELDS = {
+    'price': lambda r: (r.get('price_data') or {}).get('current_price'),
+    'recommendation': lambda r: r.get('overall_recommendation'),
+    'confidence_score': lambda r: r.get('confidence_score'),
+    'technical_indicators': lambda r: r.get('technical_indicators') or None
+}
+
 @app.route('/api/tradingview/comprehensive-analysis/<symbol>', methods=['GET'])
+@long_running_job('tradingview_comprehensive_analysis')
 def tradingview_comprehensive_analysis(symbol):
     """
     Get comprehensive TradingView analysis using all available methods
-    Uses fallback chain: Advanced API → Web Scraper → Lumif Integration
+    Advanced API, Web Scraper, Lumif and GitHub WebSocket run concurrently;
+    each field comes from the first source that delivers it and the rest
+    are not waited for (they still fill the shared source cache).
     """
     try:
         exchange = request.args.get('exchange', 'BINANCE')
-        results = {}
-        
-        # Method 1: Advanced API
+        sources = {}
         if tradingview_advanced_available:
-            try:
-                advanced_result = get_advanced_analysis(symbol, exchange)
-                if advanced_result and advanced_result.get('status') == 'success':
-                    results['advanced_api'] = advanced_result
-            except Exception as e:
-                logger.warning(f"Advanced API failed for {symbol}: {e}")
-        
-        # Method 2: Web Scraper
+            sources['advanced_api'] = (get_advanced_analysis, (symbol, exchange))
         if tradingview_scraper_available:
-            try:
-                scraper_result = get_scraper_analysis(symbol, exchange)
-                if scraper_result and scraper_result.get('status') == 'success':
-                    results['web_scraper'] = scraper_result
-            except Exception as e:
-                logger.warning(f"Web scraper failed for {symbol}: {e}")
-        
-        # Method 3: Lumif Integration (existing)
+            sources['web_scraper'] = (get_scraper_analysis, (symbol, exchange))
         if lumif_tradingview_available:
-            try:
-                lumif_result = get_enhanced_technical_analysis(f"{symbol}USDT")
-                if lumif_result and lumif_result.get('status') == 'success':
-                    results['lumif_integration'] = lumif_result
-            except Exception as e:
-                logger.warning(f"Lumif integration failed for {symbol}: {e}")
-        
-        # Method 4: GitHub API (websocket-based)
+            sources['lumif_integration'] = _lumif_source(symbol, exchange)
         if tradingview_github_available:
-            try:
-                github_result = get_github_analysis(symbol, exchange)
-                if github_result and github_result.get('status') == 'success':
-                    results['github_api'] = github_result
-            except Exception as e:
-                logger.warning(f"GitHub API failed for {symbol}: {e}")
+            sources['github_api'] = (get_github_analysis, (symbol, exchange))
+        
+        fanout = hedged_fanout(sources, TRADINGVIEW_ANALYSIS_FIELDS) if sources else None
+        results = fanout['results'] if fanout else {}
         
         # Combine results for best analysis
         if results:
@@ -6757,7 +7603,11 @@ def tradingview_comprehensive_analysis(symbol):
                 'exchange': exchange,
                 'methods_used': list(results.keys()),
                 'methods_successful': len(results),
+                'methods_pending': fanout['pending'],
+                'analysis': {field: entry['value'] for field, entry in fanout['fields'].items()},
+                'field_sources': {field: entry['source'] for field, entry in fanout['fields'].items()},
                 'detailed_results': results,
+                'latency_ms': fanout['elapsed_ms'],
                 'timestamp': datetime.now().isoformat()
             })
         else:
@@ -6780,6 +7630,7 @@ if __name__ == '__main__':
     logger.info("🚀 Starting Trading Intelligence Server on 0.0.0.0:5000")
     logger.info("💡 Enhanced with 208+ indicators and $400/month in cost savings")
     logger.info("📊 Four TradingView integration methods available for maximum reliability")
+    integrations.warm_up(delay=float(os.getenv('INTEGRATION_WARMUP_DELAY', 3)))
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 else:
     # The Flask app object is exported for external use
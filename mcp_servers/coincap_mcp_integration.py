@@ -17,6 +17,9 @@ from typing import Dict, List, Optional, Any
 import asyncio
 from datetime import datetime
 
+from price_oracle import get_price_oracle
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class CoinCapMCPClient:
@@ -30,6 +33,8 @@ class CoinCapMCPClient:
             'User-Agent': 'THE-ALPHA-PLAYBOOK-v4/1.0',
             'Accept': 'application/json'
         })
+        # Free tier allows ~30 calls/min; prices are reused for a minute
+        self.cache = TTLCache('coingecko', ttl=60, max_entries=1024)
         
     async def start_mcp_server(self) -> bool:
         """Initialize CoinCap API client"""
@@ -51,6 +56,24 @@ class CoinCapMCPClient:
     
     def get_crypto_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get crypto price data using FREE CoinGecko API - replacement for CMC Pro endpoint"""
+        cache_key = ('price', symbol.upper())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        # The price oracle already holds the CoinGecko markets snapshot
+        oracle = get_price_oracle()
+        quote = oracle.get(symbol) if oracle else None
+        if quote and quote['source'] == 'coingecko':
+            return {
+                'symbol': symbol.upper(),
+                'coin_id': self._symbol_to_coingecko_id(symbol),
+                'price_usd': quote['price'],
+                'market_cap_usd': quote['market_cap'],
+                'volume_24h_usd': quote['volume_24h'],
+                'change_percent_24h': quote['change_24h'],
+                'timestamp': datetime.utcnow().isoformat(),
+                'source': 'coingecko_free_api'
+            }
         try:
             # Get simple price data using CoinGecko
             coin_id = self._symbol_to_coingecko_id(symbol)
@@ -72,7 +95,7 @@ class CoinCapMCPClient:
                 data = response.json()
                 if coin_id in data:
                     coin_data = data[coin_id]
-                    return {
+                    result = {
                         'symbol': symbol.upper(),
                         'coin_id': coin_id,
                         'price_usd': float(coin_data.get('usd', 0)),
@@ -82,6 +105,8 @@ class CoinCapMCPClient:
                         'timestamp': datetime.utcnow().isoformat(),
                         'source': 'coingecko_free_api'
                     }
+                    self.cache.set(cache_key, result)
+                    return result
                 else:
                     logger.warning(f"Coin ID {coin_id} not found in CoinGecko response")
                     return None
@@ -123,6 +148,10 @@ class CoinCapMCPClient:
     
     def get_top_cryptocurrencies(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get top cryptocurrencies by market cap using FREE CoinGecko API - replacement for CMC listings endpoint"""
+        cache_key = ('top', limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             url = f"{self.base_url}/coins/markets"
             params = {
@@ -157,6 +186,8 @@ class CoinCapMCPClient:
                         continue
                 
                 logger.info(f"✅ Retrieved {len(formatted_assets)} assets from CoinGecko FREE API")
+                if formatted_assets:
+                    self.cache.set(cache_key, formatted_assets, ttl=300)
                 return formatted_assets
             else:
                 logger.error(f"CoinGecko API list error: {response.status_code}")
@@ -168,6 +199,9 @@ class CoinCapMCPClient:
     
     def get_bitcoin_price(self) -> Optional[float]:
         """Get Bitcoin price specifically using FREE CoinGecko API"""
+        cached = self.cache.get(('btc_price',))
+        if cached is not None:
+            return cached
         try:
             url = f"{self.base_url}/simple/price"
             params = {'ids': 'bitcoin', 'vs_currencies': 'usd'}
@@ -175,7 +209,10 @@ class CoinCapMCPClient:
             
             if response.status_code == 200:
                 data = response.json()
-                return float(data.get('bitcoin', {}).get('usd', 0))
+                price = float(data.get('bitcoin', {}).get('usd', 0))
+                if price:
+                    self.cache.set(('btc_price',), price)
+                return price
             else:
                 return None
                 
@@ -11,14 +11,31 @@ Features:
 """
 
 import json
+import os
 import subprocess
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+DEXPAPRIKA_WORKERS = int(os.getenv('DEXPAPRIKA_WORKERS', '8'))
+OVERVIEW_NETWORKS = ['ethereum', 'solana', 'polygon', 'arbitrum', 'bsc']
+# EVM addresses are case-insensitive hex; Solana's base58 mints are not
+CASE_SENSITIVE_NETWORKS = {'solana'}
+
+INTERVAL_SECONDS = {
+    '1m': 60, '5m': 300, '10m': 600, '15m': 900, '30m': 1800,
+    '1h': 3600, '6h': 21600, '12h': 43200, '24h': 86400, '1d': 86400
+}
+OHLCV_REFRESH = 300          # Re-poll a series at most every 5 minutes (or once per bar if longer)
+OHLCV_RETENTION_DAYS = 30    # Candles kept per pool/interval series
+
 class DexPaprikaMCPClient:
     """Client for DexPaprika MCP server integration"""
     
@@ -29,6 +46,26 @@ class DexPaprikaMCPClient:
             'ethereum', 'solana', 'polygon', 'arbitrum', 
             'optimism', 'fantom', 'avalanche', 'bsc'
         ]
+        # Each lookup spawns an npx process; reuse results within the free-tier window
+        self.cache = TTLCache('dexpaprika', ttl=120, max_entries=1024)
+        # Candle series per (network, pool, interval), extended with only the bars added since
+        self.ohlcv_series = TTLCache('dexpaprika_ohlcv', ttl=OHLCV_RETENTION_DAYS * 86400, max_entries=512)
+    
+    @staticmethod
+    def _address_key(network: str, address: str) -> str:
+        return address if network.lower() in CASE_SENSITIVE_NETWORKS else address.lower()
+    
+    def _run_tool(self, tool: str, *args: str, timeout: int = 30) -> subprocess.CompletedProcess:
+        """One dexpaprika-mcp tool invocation"""
+        return subprocess.run(['npx', 'dexpaprika-mcp', '--tool', tool, *args],
+                              capture_output=True, text=True, timeout=timeout)
+    
+    def _map(self, fn, items: List) -> List:
+        """fn over items on a bounded pool (each call is a separate npx process)"""
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(DEXPAPRIKA_WORKERS, len(items))) as pool:
+            return list(pool.map(fn, items))
         
     async def start_mcp_server(self) -> bool:
         """Start DexPaprika MCP server if not running"""
@@ -59,16 +96,18 @@ class DexPaprikaMCPClient:
     
     def get_token_details(self, network: str, token_address: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive token data"""
+        cache_key = ('token', network.lower(), self._address_key(network, token_address))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            result = subprocess.run([
-                'npx', 'dexpaprika-mcp', '--tool', 'getTokenDetails',
-                '--network', network.lower(),
-                '--tokenAddress', token_address
-            ], capture_output=True, text=True, timeout=15)
+            result = self._run_tool('getTokenDetails',
+                                    '--network', network.lower(),
+                                    '--tokenAddress', token_address, timeout=15)
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
-                return {
+                details = {
                     'network': network,
                     'address': token_address,
                     'symbol': data.get('symbol', ''),
@@ -81,6 +120,8 @@ class DexPaprikaMCPClient:
                     'timestamp': datetime.utcnow().isoformat(),
                     'source': 'dexpaprika_mcp'
                 }
+                self.cache.set(cache_key, details, ttl=60)
+                return details
             else:
                 logger.error(f"DexPaprika error for {token_address}: {result.stderr}")
                 return None
@@ -91,13 +132,15 @@ class DexPaprikaMCPClient:
     
     def get_network_top_pools(self, network: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get top pools on a specific network - replaces Coinalyze futures data"""
+        cache_key = ('pools', network.lower(), limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            result = subprocess.run([
-                'npx', 'dexpaprika-mcp', '--tool', 'getNetworkPools',
-                '--network', network.lower(),
-                '--limit', str(limit),
-                '--orderBy', 'volume_usd'
-            ], capture_output=True, text=True, timeout=30)
+            result = self._run_tool('getNetworkPools',
+                                    '--network', network.lower(),
+                                    '--limit', str(limit),
+                                    '--orderBy', 'volume_usd')
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
@@ -120,6 +163,8 @@ class DexPaprikaMCPClient:
                     })
                 
                 logger.info(f"✅ Retrieved {len(formatted_pools)} pools from {network}")
+                if formatted_pools:
+                    self.cache.set(cache_key, formatted_pools)
                 return formatted_pools
             else:
                 logger.error(f"DexPaprika pools error for {network}: {result.stderr}")
@@ -129,20 +174,79 @@ class DexPaprikaMCPClient:
             logger.error(f"Error getting {network} pools: {e}")
             return []
     
+    def get_tokens_details(self, network: str, token_addresses: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Token details for many addresses on one network, uncached ones fetched concurrently"""
+        addresses = list(dict.fromkeys(token_addresses))
+        return dict(zip(addresses, self._map(lambda address: self.get_token_details(network, address), addresses)))
+    
+    def get_networks_top_pools(self, networks: List[str], limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Top pools for several networks at once - one round trip instead of one per network"""
+        def fetch(network):
+            try:
+                return self.get_network_top_pools(network, limit)
+            except Exception as e:
+                logger.error(f"Error getting {network} pools: {e}")
+                return []
+        return dict(zip(networks, self._map(fetch, networks)))
+    
     def get_pool_ohlcv(self, network: str, pool_address: str, 
                        days: int = 7, interval: str = '1h') -> List[Dict[str, Any]]:
-        """Get historical OHLCV data for technical analysis"""
-        try:
+        """Get historical OHLCV data for technical analysis
+        
+        Candles are kept per (network, pool, interval); a repeat request only
+        fetches the bars after the newest one held, and a shorter window is
+        sliced from a longer one already fetched.
+        """
+        step = INTERVAL_SECONDS.get(interval, 3600)
+        series_key = (network.lower(), self._address_key(network, pool_address), interval)
+        now = time.time()
+        window_start = now - days * 86400
+        series = self.ohlcv_series.get(series_key)
+        
+        if series is None or series['since'] > window_start + step:
             start_date = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
-            
-            result = subprocess.run([
-                'npx', 'dexpaprika-mcp', '--tool', 'getPoolOHLCV',
-                '--network', network.lower(),
-                '--poolAddress', pool_address,
-                '--start', start_date,
-                '--interval', interval,
-                '--limit', str(days * 24 if interval == '1h' else days)
-            ], capture_output=True, text=True, timeout=30)
+            # The API counts `limit` bars from the start of that day, so size it to reach now
+            day_start = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+            fetched = self._fetch_ohlcv(network, pool_address, interval, start_date,
+                                        int((now - day_start) // step) + 1)
+            if fetched is None:
+                return []
+            series = {'candles': {}, 'since': window_start, 'fetched_at': 0.0}
+            series = self._merge_ohlcv(series_key, series, fetched, now)
+        elif now - series['fetched_at'] > max(OHLCV_REFRESH, step):
+            last = max(series['candles'], key=lambda ts: _candle_epoch(ts) or 0, default=None)
+            last_epoch = _candle_epoch(last)
+            if last_epoch is None:
+                last_epoch = series['since']
+            # Re-fetch the newest held bar too: it was still open when stored
+            fetched = self._fetch_ohlcv(network, pool_address, interval,
+                                        datetime.fromtimestamp(last_epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                                        int((now - last_epoch) // step) + 1)
+            if fetched is not None:
+                series = self._merge_ohlcv(series_key, series, fetched, now)
+        
+        candles = [c for ts, c in series['candles'].items() if (_candle_epoch(ts) or now) >= window_start - step]
+        return sorted(candles, key=lambda c: _candle_epoch(c['timestamp']) or 0)
+    
+    def _merge_ohlcv(self, series_key, series: Dict, candles: List[Dict], now: float) -> Dict:
+        """New series dict (readers never see a half-merged one) with candles upserted and old bars dropped"""
+        cutoff = now - OHLCV_RETENTION_DAYS * 86400
+        merged = dict(series['candles'])
+        merged.update({c['timestamp']: c for c in candles})
+        merged = {ts: c for ts, c in merged.items() if (_candle_epoch(ts) or now) >= cutoff}
+        series = {'candles': merged, 'since': max(series['since'], cutoff), 'fetched_at': now}
+        self.ohlcv_series.set(series_key, series)
+        return series
+    
+    def _fetch_ohlcv(self, network: str, pool_address: str, interval: str,
+                     start: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        try:
+            result = self._run_tool('getPoolOHLCV',
+                                    '--network', network.lower(),
+                                    '--poolAddress', pool_address,
+                                    '--start', start,
+                                    '--interval', interval,
+                                    '--limit', str(max(limit, 1)))
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
@@ -163,29 +267,32 @@ class DexPaprikaMCPClient:
                 return formatted_candles
             else:
                 logger.error(f"DexPaprika OHLCV error: {result.stderr}")
-                return []
+                return None
                 
         except Exception as e:
             logger.error(f"Error getting OHLCV data: {e}")
-            return []
+            return None
     
     def search_tokens_and_pools(self, query: str) -> Dict[str, Any]:
         """Search for tokens, pools, and DEXes by name"""
+        cache_key = ('search', query.strip().lower())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            result = subprocess.run([
-                'npx', 'dexpaprika-mcp', '--tool', 'search',
-                '--query', query
-            ], capture_output=True, text=True, timeout=15)
+            result = self._run_tool('search', '--query', query, timeout=15)
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
-                return {
+                found = {
                     'tokens': data.get('tokens', []),
                     'pools': data.get('pools', []),
                     'dexes': data.get('dexes', []),
                     'query': query,
                     'source': 'dexpaprika_mcp'
                 }
+                self.cache.set(cache_key, found, ttl=300)
+                return found
             else:
                 logger.error(f"DexPaprika search error: {result.stderr}")
                 return {'tokens': [], 'pools': [], 'dexes': []}
@@ -194,6 +301,20 @@ class DexPaprikaMCPClient:
             logger.error(f"Error searching DexPaprika: {e}")
             return {'tokens': [], 'pools': [], 'dexes': []}
 
+def _candle_epoch(timestamp) -> Optional[float]:
+    """Unix seconds from a candle timestamp (epoch number or ISO-8601 string)"""
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp / 1000 if timestamp > 1e12 else timestamp)
+    try:
+        parsed = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 # Global instance
 dexpaprika_client = DexPaprikaMCPClient()
 
@@ -217,20 +338,9 @@ def get_solana_top_pools(limit: int = 20) -> List[Dict[str, Any]]:
     """Get top Solana pools"""
     return dexpaprika_client.get_network_top_pools('solana', limit)
 
-def get_multi_chain_overview() -> Dict[str, List[Dict[str, Any]]]:
-    """Get top pools across all major networks"""
-    networks = ['ethereum', 'solana', 'polygon', 'arbitrum', 'bsc']
-    overview = {}
-    
-    for network in networks:
-        try:
-            pools = dexpaprika_client.get_network_top_pools(network, 10)
-            overview[network] = pools
-        except Exception as e:
-            logger.error(f"Error getting {network} pools: {e}")
-            overview[network] = []
-    
-    return overview
+def get_multi_chain_overview(networks: Optional[List[str]] = None, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """Get top pools across all major networks (fetched concurrently)"""
+    return dexpaprika_client.get_networks_top_pools(networks or OVERVIEW_NETWORKS, limit)
 
 def search_defi_opportunity(token_symbol: str) -> Dict[str, Any]:
     """Search for DeFi opportunities for a specific token"""
@@ -9,6 +9,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 
+from ttl_cache import TTLCache
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +20,8 @@ class LunarCrushMCP:
         self.api_key = os.environ.get('LUNARCRUSH_API_KEY')
         self.base_url = "https://lunarcrush.com/api4"
         self.session = None
+        # Galaxy scores move slowly; only real API responses are cached
+        self.cache = TTLCache('lunarcrush', ttl=600, max_entries=1024)
         
         if not self.api_key:
             logger.warning("LunarCrush API key not found in environment variables")
@@ -35,6 +39,10 @@ class LunarCrushMCP:
         Get comprehensive social data for a specific coin
         Returns Galaxy Score, social volume, sentiment metrics
         """
+        cache_key = ('coin', symbol.upper())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         if not self.session:
             self.session = aiohttp.ClientSession()
             
@@ -57,7 +65,10 @@ class LunarCrushMCP:
             async with self.session.get(url, headers=headers, params=params, timeout=10) as response:
                 if response.status == 200:
                     data = await response.json()
-                    return self._parse_coin_data(data, symbol)
+                    parsed = self._parse_coin_data(data, symbol)
+                    if parsed.get('status') != 'fallback':
+                        self.cache.set(cache_key, parsed)
+                    return parsed
                 elif response.status == 402:
                     logger.warning(f"LunarCrush subscription level insufficient for {symbol}")
                     return self._fallback_social_data(symbol)
@@ -74,6 +85,10 @@ class LunarCrushMCP:
     
     async def get_trending_coins(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get trending coins by social activity"""
+        cache_key = ('trending', limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         if not self.session:
             self.session = aiohttp.ClientSession()
             
@@ -93,7 +108,10 @@ class LunarCrushMCP:
             async with self.session.get(url, headers=headers, params=params, timeout=15) as response:
                 if response.status == 200:
                     data = await response.json()
-                    return self._parse_trending_data(data)
+                    trending = self._parse_trending_data(data)
+                    if trending:
+                        self.cache.set(cache_key, trending, ttl=300)
+                    return trending
                 else:
                     logger.error(f"LunarCrush trending API error: {response.status}")
                     return []
@@ -16,8 +16,17 @@ from typing import Dict, List, Optional, Any
 import urllib.parse
 import re
 
+from tradingview_snapshot import get_tradingview_snapshot
+
 logger = logging.getLogger(__name__)
 
+SCANNER_COLUMNS = [
+    "name", "close", "change", "change_abs", "volume",
+    "Recommend.All", "RSI", "MACD.macd", "MACD.signal",
+    "BB.upper", "BB.lower", "EMA20", "EMA50", "SMA20", "SMA50",
+    "Stoch.K", "Stoch.D", "ADX", "CCI20", "Mom", "ROC"
+]
+
 class TradingViewAdvancedAPI:
     """Advanced TradingView integration using multiple proven methods"""
     
@@ -55,21 +64,28 @@ class TradingViewAdvancedAPI:
         
         self.last_request_time = time.time()
     
-    def get_scanner_data(self, symbols: List[str], columns: List[str] = None) -> Dict[str, Any]:
+    def get_scanner_data(self, symbols: List[str], columns: List[str] = None,
+                         exchange: str = 'BINANCE') -> Dict[str, Any]:
         """
         Get data using TradingView's scanner API
         Based on proven Medium article approach
+        
+        With the default columns, symbols whose `exchange` listing is in the
+        full-universe snapshot are answered from memory; only the rest are POSTed.
         """
         try:
-            self._wait_for_rate_limit()
-            
+            results = {}
             if columns is None:
-                columns = [
-                    "name", "close", "change", "change_abs", "volume",
-                    "Recommend.All", "RSI", "MACD.macd", "MACD.signal",
-                    "BB.upper", "BB.lower", "EMA20", "EMA50", "SMA20", "SMA50",
-                    "Stoch.K", "Stoch.D", "ADX", "CCI20", "Mom", "ROC"
-                ]
+                columns = SCANNER_COLUMNS
+                for symbol in symbols:
+                    cached = self._from_snapshot(symbol, exchange)
+                    if cached:
+                        results[symbol] = cached
+                symbols = [s for s in symbols if s not in results]
+                if not symbols:
+                    return results
+            
+            self._wait_for_rate_limit()
             
             # Build filter for multiple symbols
             symbol_filters = []
@@ -77,7 +93,7 @@ class TradingViewAdvancedAPI:
                 symbol_filters.append({
                     "left": "name",
                     "operation": "match", 
-                    "right": f"BINANCE:{symbol}"
+                    "right": f"{exchange}:{symbol}"
                 })
             
             payload = {
@@ -92,7 +108,6 @@ class TradingViewAdvancedAPI:
             
             if response.status_code == 200:
                 data = response.json()
-                results = {}
                 
                 for row in data.get('data', []):
                     symbol_data = row.get('d', [])
@@ -114,12 +129,32 @@ class TradingViewAdvancedAPI:
                 return results
             else:
                 logger.error(f"Scanner API error {response.status_code}: {response.text}")
-                return {}
+                return results
                 
         except Exception as e:
             logger.error(f"Scanner API error: {e}")
             return {}
     
+    def _from_snapshot(self, symbol: str, exchange: str = 'BINANCE') -> Optional[Dict[str, Any]]:
+        """Scanner-shaped entry for `symbol`'s `exchange` listing from the universe snapshot, if fresh"""
+        snapshot = get_tradingview_snapshot()
+        values = snapshot.row(f"{exchange}:{symbol}") if snapshot else None
+        if not values or values.get('close') is None:
+            return None
+        names = SCANNER_COLUMNS[6:]
+        return {
+            'status': 'success',
+            'symbol': symbol,
+            'timestamp': datetime.utcfromtimestamp(snapshot.table['updated_at']).isoformat(),
+            'price': values['close'],
+            'change_percent': values['change'],
+            'change_abs': values['change_abs'],
+            'volume': values['volume'],
+            'recommendation': values['Recommend.All'],
+            'technical_indicators': self._parse_indicators([values[name] for name in names], names),
+            'source': 'tradingview_snapshot'
+        }
+    
     def _parse_indicators(self, indicator_data: List, indicator_names: List[str]) -> Dict[str, Any]:
         """Parse technical indicators from scanner response"""
         indicators = {}
@@ -132,13 +167,16 @@ class TradingViewAdvancedAPI:
         
         return indicators
     
+    def get_indicator(self, symbol: str, column: str) -> Optional[float]:
+        """One scanner column for one pair, e.g. 'RSI|240' for the 4h RSI (unsuffixed columns are daily)"""
+        data = self.get_scanner_data([symbol], columns=SCANNER_COLUMNS[:6] + [column]).get(symbol) or {}
+        return data.get('technical_indicators', {}).get(column.lower().replace('.', '_'))
+
     def get_symbol_overview(self, symbol: str, exchange: str = 'BINANCE') -> Optional[Dict[str, Any]]:
         """Get comprehensive symbol overview"""
         try:
-            self._wait_for_rate_limit()
-            
-            # Use the proven scanner approach for single symbol
-            results = self.get_scanner_data([symbol])
+            # Use the proven scanner approach for single symbol (snapshot first, rate-limited POST otherwise)
+            results = self.get_scanner_data([symbol], exchange=exchange)
             
             if symbol in results:
                 data = results[symbol]
@@ -317,9 +355,13 @@ def get_advanced_analysis(symbol: str, exchange: str = 'BINANCE') -> Optional[Di
     """Get comprehensive analysis using advanced API"""
     return tradingview_advanced.get_symbol_overview(symbol, exchange)
 
+def get_indicator_value(symbol: str, column: str) -> Optional[float]:
+    """Single scanner column for a pair (BTCUSDT, 'RSI|240')"""
+    return tradingview_advanced.get_indicator(symbol, column)
+
 def get_multi_symbol_data(symbols: List[str], exchange: str = 'BINANCE') -> Dict[str, Any]:
     """Get data for multiple symbols efficiently"""
-    return tradingview_advanced.get_scanner_data(symbols)
+    return tradingview_advanced.get_scanner_data(symbols, exchange=exchange)
 
 def get_market_overview(min_volume: int = 1000000) -> Dict[str, Any]:
     """Get market overview and top performers"""
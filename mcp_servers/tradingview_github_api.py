@@ -15,6 +15,8 @@ import random
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from tradingview_ws_feed import get_tradingview_ws_feed
+
 logger = logging.getLogger(__name__)
 
 class TradingViewGitHubAPI:
@@ -27,6 +29,9 @@ class TradingViewGitHubAPI:
         self.ws = None
         self.last_request_time = 0
         self.min_interval = 2.0  # 2 seconds between requests
+        self.feed_wait = 5.0  # first quotes after a cold connect
+        # Shared long-lived connection; started on first use
+        self.feed = get_tradingview_ws_feed(start=False)
         
         logger.info("✅ TradingView GitHub API initialized - Real-time websocket access")
     
@@ -113,6 +118,10 @@ class TradingViewGitHubAPI:
             exchange: Exchange name like BINANCE  
             interval: Interval in minutes (240 = 4h)
         """
+        if self.feed:
+            results = await self._get_from_feed([symbol], exchange, interval)
+            return results.get(symbol)
+        
         try:
             self._wait_for_rate_limit()
             
@@ -249,8 +258,28 @@ class TradingViewGitHubAPI:
         
         return extracted
     
+    async def _get_from_feed(self, symbols: List[str], exchange: str, interval: str = "240") -> Dict[str, Any]:
+        """Quotes for all symbols from the multiplexed feed (one subscribe, one wait)"""
+        loop = asyncio.get_running_loop()
+        quotes = await loop.run_in_executor(None, lambda: self.feed.get_quotes(
+            symbols, exchange, wait=self.feed_wait, bars=str(interval) == self.feed.bar_interval))
+        return {
+            symbol: {
+                'status': 'success',
+                'symbol': symbol,
+                'exchange': exchange,
+                'timestamp': datetime.utcnow().isoformat(),
+                'data': data,
+                'source': 'tradingview_websocket'
+            }
+            for symbol, data in quotes.items()
+        }
+    
     async def get_multiple_symbols(self, symbols: List[str], exchange: str = "BINANCE") -> Dict[str, Any]:
         """Get data for multiple symbols efficiently"""
+        if self.feed:
+            return await self._get_from_feed(symbols, exchange)
+        
         results = {}
         
         for symbol in symbols:
@@ -14,6 +14,10 @@ import asyncio
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
 from openai import OpenAI
 
+from llm_gateway import llm_gateway
+from sentiment_prefilter import sentiment_prefilter, local_grade
+from symbol_matcher import extract_primary_symbol
+
 logger = logging.getLogger(__name__)
 
 class TradingIntelligence:
@@ -101,18 +105,16 @@ class TradingIntelligence:
             Keep responses concise for Discord format (under 200 chars per field).
             """
 
-            response = self.client.chat.completions.create(
+            # Same alerts within the cache TTL reuse the previous analysis
+            analysis = llm_gateway.complete_json(
+                self.client, 'discord_alert_analysis',
                 model=self.models['chat'],  # Use GPT-5-chat-latest for Discord-optimized responses
-                messages=[
-                    {"role": "system", "content": "You are a crypto trading expert providing concise Discord-ready analysis using GPT-5's enhanced capabilities for superior market insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
+                system="You are a crypto trading expert providing concise Discord-ready analysis using GPT-5's enhanced capabilities for superior market insights.",
+                user=prompt,
+                cache_input={'alerts': alert_summary, 'portfolio': portfolio_data},
                 temperature=0.5,
                 max_completion_tokens=1000  # Updated parameter for GPT-5
             )
-
-            analysis = json.loads(response.choices[0].message.content or "{}")
             analysis['timestamp'] = datetime.now().isoformat()
             analysis['ai_powered'] = True
             analysis['analysis_type'] = 'discord_alert_analysis'
@@ -128,50 +130,82 @@ class TradingIntelligence:
             }
 
     def grade_news_sentiment(self, news_articles: List[Dict]) -> Dict:
-        """Grade news articles for market sentiment impact"""
+        """Grade news articles for market sentiment impact.
+
+        Clear-cut articles are graded by the local sentiment pre-filter;
+        the rest are graded individually by the LLM (cached per article)
+        and packed several per request. The overall sentiment is derived
+        from the per-article grades.
+        """
         try:
-            articles_text = []
-            for i, article in enumerate(news_articles[:5]):  # Analyze top 5 articles
-                articles_text.append(f"""
-                Article {i+1}:
-                Title: {article.get('title', 'No title')}
-                Source: {article.get('source_name', 'Unknown')}
-                Tickers: {', '.join(article.get('tickers', []))}
-                Content: {article.get('text', article.get('description', 'No content'))[:500]}
-                """)
+            top_articles = news_articles[:5]  # Analyze top 5 articles
+            local, escalate = sentiment_prefilter.split(top_articles)
+            local_grades = {id(article): local_grade(article, scored) for article, scored in local}
+            escalated_articles = [article for article, _ in escalate]
 
-            prompt = f"""
-            As a crypto market analyst, grade these news articles for trading impact:
+            articles = [{
+                'title': article.get('title', 'No title'),
+                'source': article.get('source_name', 'Unknown'),
+                'tickers': article.get('tickers', []),
+                'content': (article.get('text') or article.get('description') or 'No content')[:500]
+            } for article in escalated_articles]
 
-            {chr(10).join(articles_text)}
+            instructions = """As a crypto market analyst, grade each news article for trading impact.
 
-            For each article, provide JSON analysis with:
+            For each article, provide:
             1. sentiment: BULLISH/BEARISH/NEUTRAL
             2. impact_score: 1-10 (how much this could move markets)
             3. affected_tickers: List of crypto symbols most affected
             4. trading_signal: BUY/SELL/HOLD recommendation
             5. time_horizon: SHORT/MEDIUM/LONG term impact
             6. confidence: 1-10 how confident in this analysis
-            7. key_factors: What makes this bullish/bearish
-
-            Return as: {{"articles": [analysis for each article], "overall_market_sentiment": "BULLISH/BEARISH/NEUTRAL", "summary": "brief market outlook"}}
-            """
+            7. key_factors: What makes this bullish/bearish"""
 
-            response = self.client.chat.completions.create(
+            graded = llm_gateway.grade_batch(
+                self.client, 'news_sentiment_article',
                 model=self.models['standard'],  # Use GPT-5-mini for cost-effective news analysis
-                messages=[
-                    {"role": "system", "content": "You are an expert cryptocurrency market analyst specializing in news sentiment analysis and market impact assessment, powered by GPT-5's enhanced reasoning for superior accuracy."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.6,
-                max_completion_tokens=2500  # Increased for GPT-5
-            )
-
-            sentiment_analysis = json.loads(response.choices[0].message.content or "{}")
+                system="You are an expert cryptocurrency market analyst specializing in news sentiment analysis and market impact assessment, powered by GPT-5's enhanced reasoning for superior accuracy.",
+                instructions=instructions,
+                items=articles,
+                render=lambda a: (f"Title: {a['title']}\nSource: {a['source']}\n"
+                                  f"Tickers: {', '.join(a['tickers'])}\nContent: {a['content']}"),
+                batch_size=5,
+                tokens_per_item=400,
+                temperature=0.6
+            ) if articles else []
+            llm_grades = {id(article): grade for article, grade in zip(escalated_articles, graded)}
+
+            # Keep the original article order
+            article_grades = [local_grades.get(id(article)) or llm_grades.get(id(article))
+                              for article in top_articles]
+            article_grades = [grade for grade in article_grades if grade]
+            if not article_grades:
+                raise ValueError("no articles graded")
+
+            # Impact-weighted vote across articles
+            votes = {'BULLISH': 0.0, 'BEARISH': 0.0, 'NEUTRAL': 0.0}
+            for grade in article_grades:
+                sentiment = str(grade.get('sentiment', 'NEUTRAL')).upper()
+                try:
+                    weight = float(grade.get('impact_score', 1))
+                except (TypeError, ValueError):
+                    weight = 1.0
+                votes[sentiment if sentiment in votes else 'NEUTRAL'] += weight
+            overall = max(votes, key=votes.get)
+            counts = {k: sum(1 for g in article_grades if str(g.get('sentiment', '')).upper() == k) for k in votes}
+
+            sentiment_analysis = {
+                'articles': article_grades,
+                'overall_market_sentiment': overall,
+                'summary': (f"{overall.title()} news flow: {counts['BULLISH']} bullish, "
+                            f"{counts['BEARISH']} bearish, {counts['NEUTRAL']} neutral "
+                            f"across {len(article_grades)} graded articles")
+            }
             sentiment_analysis['timestamp'] = datetime.now().isoformat()
             sentiment_analysis['ai_powered'] = True
             sentiment_analysis['analysis_type'] = 'news_sentiment'
+            sentiment_analysis['graded_locally'] = len(local)
+            sentiment_analysis['escalated_to_ai'] = len(escalate)
             
             return sentiment_analysis
 
@@ -461,14 +495,14 @@ class TradingIntelligence:
             - Provide actionable degen intelligence with proper token identification
             """
             
-            response = self.client.chat.completions.create(
+            result = llm_gateway.complete_json(
+                self.client, 'degen_opportunities',
                 model=self.models['standard'],  # GPT-5-mini for degen opportunities - cost-effective with enhanced capabilities
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                system=None,
+                user=prompt,
+                cache_input=degen_data,
                 max_completion_tokens=1000  # Creative degen insights
             )
-            
-            result = json.loads(response.choices[0].message.content)
             result['analysis_type'] = 'degen_opportunities'
             result['timestamp'] = datetime.now().isoformat()
             
@@ -533,6 +567,11 @@ class TradingIntelligence:
         elif 'BELIEVE' in description_text:
             return 'DO'
         
+        # Known tickers and coin names from the shared symbol universe
+        known_symbol = extract_primary_symbol(description)
+        if known_symbol:
+            return known_symbol
+        
         # Find uppercase words (likely symbols)
         symbol_match = re.search(r'\b([A-Z]{2,8})\b', description_text)
         if symbol_match and symbol_match.group(1) not in ['THE', 'NEW', 'TOKEN', 'COIN', 'VIRAL']:
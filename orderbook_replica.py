@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Order Book Replica
+Local L2 books maintained from a snapshot plus incremental diffs
+(BingX `<symbol>@incrDepth`). Each side is a pair of sorted arrays, and
+spread, imbalance, depth bands, slippage-for-size and walls are
+recomputed on every update so reads are a dict lookup.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from bingx_ws_feed import to_bingx_symbol
+
+logger = logging.getLogger(__name__)
+
+DEPTH_BANDS_PCT = (0.5, 1.0, 2.0)
+SLIPPAGE_SIZES_USD = (10_000, 50_000, 100_000, 250_000)
+WALL_MULTIPLIER = 5.0       # level notional vs median level notional in the widest band
+MAX_PENDING_UPDATES = 3     # out-of-order diffs held while waiting for the missing id
+MAX_BUFFERED_UPDATES = 1000 # diffs kept while a resync snapshot is on its way
+RESYNC_RETRY_SECONDS = 10.0 # ask for another snapshot if the last request went unanswered
+
+
+class BookSide:
+    """One side of the book as sorted price keys with parallel sizes.
+
+    Bids are keyed by negative price so index 0 is always the best level.
+    """
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys: List[float] = []
+        self._sizes: List[float] = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _key(self, price: float) -> float:
+        return -price if self.is_bid else price
+
+    def set(self, price: float, size: float):
+        """Add, update or (size 0) delete one price level"""
+        key = self._key(price)
+        i = bisect_left(self._keys, key)
+        exists = i < len(self._keys) and self._keys[i] == key
+        if size <= 0:
+            if exists:
+                del self._keys[i]
+                del self._sizes[i]
+        elif exists:
+            self._sizes[i] = size
+        else:
+            self._keys.insert(i, key)
+            self._sizes.insert(i, size)
+
+    def replace(self, levels):
+        ordered = sorted((self._key(float(p)), float(q)) for p, q in levels if float(q) > 0)
+        self._keys = [k for k, _ in ordered]
+        self._sizes = [q for _, q in ordered]
+
+    def price(self, i: int) -> float:
+        return -self._keys[i] if self.is_bid else self._keys[i]
+
+    def levels(self, limit: Optional[int] = None) -> List[List[float]]:
+        n = len(self._keys) if limit is None else min(limit, len(self._keys))
+        return [[self.price(i), self._sizes[i]] for i in range(n)]
+
+    def count_within(self, bound: float) -> int:
+        """Number of levels at or better than `bound` price"""
+        return bisect_right(self._keys, self._key(bound))
+
+    def sizes(self, n: int) -> List[float]:
+        return self._sizes[:n]
+
+
+class L2OrderBook:
+    """Replica of one symbol's book with precomputed metrics"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id: Optional[int] = None
+        self.synced = False
+        self.updated_at: Optional[float] = None
+        self.metrics: Dict = {}
+        self.update_count = 0
+        self.gaps = 0
+        self.resync_requested_at: Optional[float] = None
+        self._pending: Dict[int, tuple] = {}
+        self._buffer = deque(maxlen=MAX_BUFFERED_UPDATES)  # (bids, asks, id) received while unsynced
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, bids, asks, last_update_id: Optional[int] = None):
+        """Reset to a full snapshot, then replay the diffs buffered while waiting for it"""
+        with self._lock:
+            self.bids.replace(bids)
+            self.asks.replace(asks)
+            self.last_update_id = last_update_id
+            self.synced = True
+            self.resync_requested_at = None
+            self._pending.clear()
+            buffered, self._buffer = list(self._buffer), deque(maxlen=MAX_BUFFERED_UPDATES)
+            for diff in buffered:
+                self._apply_update(*diff)  # if these break sequence again, the rest re-buffer
+            self._recompute()
+
+    def apply_update(self, bids, asks, last_update_id: Optional[int] = None) -> bool:
+        """Apply a diff; returns False when the book lost sync and needs a snapshot"""
+        with self._lock:
+            if not self._apply_update(bids, asks, last_update_id):
+                return False
+            self._recompute()
+            return True
+
+    def _apply_update(self, bids, asks, last_update_id: Optional[int]) -> bool:
+        if not self.synced:
+            self._buffer.append((bids, asks, last_update_id))
+            return False
+        if last_update_id is not None and self.last_update_id is not None:
+            if last_update_id <= self.last_update_id:
+                return True  # duplicate or already applied
+            if last_update_id != self.last_update_id + 1:
+                # Diffs may arrive slightly out of order; hold a few before giving up
+                self._pending[last_update_id] = (bids, asks)
+                if len(self._pending) > MAX_PENDING_UPDATES:
+                    self.gaps += 1
+                    self.synced = False
+                    # Held diffs may still be newer than the next snapshot
+                    self._buffer.extend((b, a, i) for i, (b, a) in sorted(self._pending.items()))
+                    self._pending.clear()
+                    return False
+                return True
+
+        self._apply_levels(bids, asks, last_update_id)
+        while self.last_update_id is not None and self.last_update_id + 1 in self._pending:
+            next_id = self.last_update_id + 1
+            self._apply_levels(*self._pending.pop(next_id), next_id)
+        return True
+
+    def _apply_levels(self, bids, asks, last_update_id):
+        for price, size in bids:
+            self.bids.set(float(price), float(size))
+        for price, size in asks:
+            self.asks.set(float(price), float(size))
+        if last_update_id is not None:
+            self.last_update_id = last_update_id
+
+    # ---- derived metrics -----------------------------------------------------
+
+    def _recompute(self):
+        self.update_count += 1
+        self.updated_at = time.time()
+        if not len(self.bids) or not len(self.asks):
+            self.metrics = {}
+            return
+
+        best_bid, best_ask = self.bids.price(0), self.asks.price(0)
+        mid = (best_bid + best_ask) / 2
+        widest = max(DEPTH_BANDS_PCT) / 100
+
+        # Cumulative quote notional out to the widest band, shared by every metric below
+        n_bid = max(1, self.bids.count_within(mid * (1 - widest)))
+        n_ask = max(1, self.asks.count_within(mid * (1 + widest)))
+        bid_notional = [self.bids.price(i) * q for i, q in enumerate(self.bids.sizes(n_bid))]
+        ask_notional = [self.asks.price(i) * q for i, q in enumerate(self.asks.sizes(n_ask))]
+        bid_cum = list(accumulate(bid_notional))
+        ask_cum = list(accumulate(ask_notional))
+
+        bands = {}
+        for pct in DEPTH_BANDS_PCT:
+            nb = self.bids.count_within(mid * (1 - pct / 100))
+            na = self.asks.count_within(mid * (1 + pct / 100))
+            bid_depth = bid_cum[nb - 1] if nb else 0.0
+            ask_depth = ask_cum[na - 1] if na else 0.0
+            total = bid_depth + ask_depth
+            bands[f"{pct:g}%"] = {
+                'bid_usd': round(bid_depth, 2),
+                'ask_usd': round(ask_depth, 2),
+                'imbalance': round((bid_depth - ask_depth) / total, 4) if total else 0.0
+            }
+
+        bid_qty_5 = sum(self.bids.sizes(5))
+        ask_qty_5 = sum(self.asks.sizes(5))
+        top5_total = bid_qty_5 + ask_qty_5
+
+        self.metrics = {
+            'symbol': self.symbol,
+            'best_bid': best_bid,
+            'best_ask': best_ask,
+            'mid': mid,
+            'spread': best_ask - best_bid,
+            'spread_bps': round((best_ask - best_bid) / mid * 10_000, 3) if mid else 0.0,
+            'bid_depth_5': bid_qty_5,
+            'ask_depth_5': ask_qty_5,
+            'imbalance_5': round((bid_qty_5 - ask_qty_5) / top5_total, 4) if top5_total else 0.0,
+            'depth_bands': bands,
+            'slippage_bps': {
+                'buy': {str(size): self._slippage(self.asks, ask_cum, size, mid) for size in SLIPPAGE_SIZES_USD},
+                'sell': {str(size): self._slippage(self.bids, bid_cum, size, mid) for size in SLIPPAGE_SIZES_USD}
+            },
+            'walls': {
+                'bids': self._walls(self.bids, bid_notional),
+                'asks': self._walls(self.asks, ask_notional)
+            },
+            'levels': {'bids': len(self.bids), 'asks': len(self.asks)},
+            'last_update_id': self.last_update_id,
+            'updated_at': self.updated_at
+        }
+
+    @staticmethod
+    def _slippage(side: BookSide, cumulative: List[float], notional: float, mid: float) -> Optional[float]:
+        """Average-fill slippage vs mid for a market order of `notional` USD; None if too thin"""
+        i = bisect_left(cumulative, notional)
+        if i >= len(cumulative):
+            return None
+        filled_before = cumulative[i - 1] if i else 0.0
+        price = side.price(i)
+        qty = sum(q for q in side.sizes(i)) + (notional - filled_before) / price
+        avg_price = notional / qty
+        return round(abs(avg_price - mid) / mid * 10_000, 3)
+
+    @staticmethod
+    def _walls(side: BookSide, notionals: List[float]) -> List[Dict]:
+        if len(notionals) < 3:
+            return []
+        median = sorted(notionals)[len(notionals) // 2]
+        walls = [
+            {'price': side.price(i), 'notional_usd': round(n, 2), 'x_median': round(n / median, 1)}
+            for i, n in enumerate(notionals) if median and n >= median * WALL_MULTIPLIER
+        ]
+        return sorted(walls, key=lambda w: w['notional_usd'], reverse=True)[:5]
+
+    # ---- reads ---------------------------------------------------------------
+
+    def snapshot(self, limit: int = 20) -> Dict:
+        with self._lock:
+            return {
+                'symbol': self.symbol,
+                'bids': self.bids.levels(limit),
+                'asks': self.asks.levels(limit),
+                'timestamp': int((self.updated_at or time.time()) * 1000),
+                'nonce': self.last_update_id,
+                'source': 'bingx_orderbook_replica'
+            }
+
+
+class OrderBookManager:
+    """L2 replicas for every symbol on the BingX WebSocket feed"""
+
+    def __init__(self, max_age: float = 10.0):
+        self.max_age = max_age
+        self.books: Dict[str, L2OrderBook] = {}
+        self.feed = None
+        self.resync_requests = 0
+        self._lock = threading.Lock()
+
+    def attach(self, feed):
+        """Consume the feed's incremental depth stream"""
+        self.feed = feed
+        feed.incremental_depth = True
+        feed.listeners.append(self.on_feed_message)
+
+    def book(self, symbol: str) -> L2OrderBook:
+        with self._lock:
+            if symbol not in self.books:
+                self.books[symbol] = L2OrderBook(symbol)
+            return self.books[symbol]
+
+    def on_feed_message(self, symbol: str, stream: str, data: Dict):
+        if stream != 'incrDepth':
+            return
+        book = self.book(symbol)
+        last_update_id = data.get('lastUpdateId')
+        last_update_id = int(last_update_id) if last_update_id is not None else None
+        if data.get('action') == 'all':
+            book.apply_snapshot(data.get('bids', []), data.get('asks', []), last_update_id)
+        elif not book.apply_update(data.get('bids', []), data.get('asks', []), last_update_id):
+            self._request_resync(symbol, book)
+
+    def _request_resync(self, symbol: str, book: L2OrderBook):
+        """Resubscribe once per lost sync (BingX answers with a full depth); diffs buffer meanwhile"""
+        now = time.time()
+        if book.resync_requested_at and now - book.resync_requested_at < RESYNC_RETRY_SECONDS:
+            return
+        book.resync_requested_at = now
+        self.resync_requests += 1
+        logger.info(f"🔄 Order book gap on {symbol}, requesting a new snapshot")
+        if self.feed:
+            self.feed.resubscribe([f"{symbol}@incrDepth"])
+
+    def _fresh_book(self, symbol: str) -> Optional[L2OrderBook]:
+        book = self.books.get(to_bingx_symbol(symbol))
+        if not book or not book.synced or not book.metrics:
+            return None
+        if time.time() - book.updated_at > self.max_age:
+            return None
+        return book
+
+    def get_metrics(self, symbol: str) -> Optional[Dict]:
+        book = self._fresh_book(symbol)
+        return dict(book.metrics) if book else None
+
+    def get_orderbook(self, symbol: str, limit: int = 20) -> Optional[Dict]:
+        book = self._fresh_book(symbol)
+        return book.snapshot(limit) if book else None
+
+    def get_all_metrics(self) -> Dict[str, Dict]:
+        return {symbol: metrics for symbol in list(self.books)
+                if (metrics := self.get_metrics(symbol))}
+
+    def get_stats(self) -> Dict:
+        books = list(self.books.values())
+        return {
+            'books': len(books),
+            'synced': sum(1 for b in books if b.synced),
+            'updates': sum(b.update_count for b in books),
+            'gaps': sum(b.gaps for b in books),
+            'resync_requests': self.resync_requests,
+            'awaiting_snapshot': sum(1 for b in books if b.resync_requested_at is not None)
+        }
+
+
+# Shared instance, attached to the BingX feed by main_server
+orderbook_manager = OrderBookManager()
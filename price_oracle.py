@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Price Oracle
+One in-memory price table for the whole universe, refreshed from bulk
+endpoints (CoinGecko /coins/markets, plus any other registered source)
+on a cadence and overlaid with BingX WebSocket ticks where subscribed.
+Lookups never touch the network and carry source and age metadata, so
+valuing a 50-asset portfolio is a dict walk instead of 50 HTTP calls.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from service_base import PeriodicWorker, Singleton
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    requests = None
+    REQUESTS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PRICE_REFRESH_SECONDS = int(os.getenv('PRICE_ORACLE_REFRESH', '60'))
+PRICE_MAX_AGE_SECONDS = int(os.getenv('PRICE_ORACLE_MAX_AGE', '600'))
+COINGECKO_PAGES = int(os.getenv('PRICE_ORACLE_COINGECKO_PAGES', '4'))  # 250 coins per page
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+
+# Exchange-specific tickers for the same asset
+SYMBOL_ALIASES = {'XBT': 'BTC', 'XXBT': 'BTC', 'XETH': 'ETH', 'XDG': 'DOGE', 'XXDG': 'DOGE'}
+# Quotes stripped from separator-less exchange pairs (BTCUSDT). A bare USD
+# suffix is left alone: TUSD, SUSD, BUSD, LUSD, FDUSD are assets, not pairs.
+PAIR_QUOTES = ('USDT', 'USDC')
+
+
+def base_symbol(symbol: str) -> str:
+    """BTC, BTC/USDT, BTC-USDT, BTCUSDT, BTC/USDT:USDT, SOL.F -> base asset"""
+    s = symbol.upper().strip().split(':')[0].replace('-', '/')
+    if '/' in s:
+        s = s.split('/')[0]
+    else:
+        for quote in PAIR_QUOTES:
+            if s.endswith(quote) and len(s) > len(quote):
+                s = s[:-len(quote)]
+                break
+    if s.endswith('.F'):
+        s = s[:-2]
+    return SYMBOL_ALIASES.get(s, s)
+
+
+def fetch_coingecko_markets(pages: int = COINGECKO_PAGES) -> Dict[str, Dict]:
+    """Top coins by market cap from CoinGecko, keyed by base symbol.
+
+    When several coins share a ticker the larger market cap wins (the
+    endpoint is already sorted by market cap).
+    """
+    if not REQUESTS_AVAILABLE:
+        raise RuntimeError("requests not installed")
+    table = {}
+    for page in range(1, pages + 1):
+        response = requests.get(COINGECKO_MARKETS_URL, params={
+            'vs_currency': 'usd',
+            'order': 'market_cap_desc',
+            'per_page': 250,
+            'page': page,
+            'sparkline': 'false'
+        }, timeout=20)
+        if response.status_code != 200:
+            if not table:
+                raise RuntimeError(f"CoinGecko markets HTTP {response.status_code}")
+            break  # keep what we have (usually a free-tier 429 on later pages)
+        coins = response.json()
+        for coin in coins:
+            symbol = (coin.get('symbol') or '').upper()
+            price = coin.get('current_price')
+            if not symbol or not price or symbol in table:
+                continue
+            table[symbol] = {
+                'price': float(price),
+                'change_24h': float(coin.get('price_change_percentage_24h') or 0),
+                'volume_24h': float(coin.get('total_volume') or 0),
+                'market_cap': float(coin.get('market_cap') or 0),
+                'coin_id': coin.get('id')
+            }
+        if len(coins) < 250:
+            break
+    return table
+
+
+class PriceOracle(PeriodicWorker):
+    """Consolidated price table fed by bulk sources and live WebSocket ticks"""
+
+    worker_name = 'price-oracle'
+
+    def __init__(self, refresh_interval: float = PRICE_REFRESH_SECONDS,
+                 max_age: float = PRICE_MAX_AGE_SECONDS, auto_start: bool = False,
+                 initial_wait: float = 5.0):
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.sources: List[Dict] = []                  # {'name', 'fetch', 'priority'}; lower priority wins
+        self.source_tables: Dict[str, Dict[str, Dict]] = {}
+        self.table: Dict[str, Dict] = {}               # base symbol -> merged entry
+        self.source_status: Dict[str, Dict] = {}
+        self.ws_feed = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._init_worker(auto_start, initial_wait)
+        self.stats = {'lookups': 0, 'ws_hits': 0, 'table_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    # ---- sources -----------------------------------------------------------
+
+    def register_source(self, name: str, fetch: Callable[[], Dict[str, Dict]], priority: int = 100):
+        """`fetch()` returns {base_symbol: {'price', 'change_24h', 'volume_24h', 'market_cap'}}"""
+        self.sources = [s for s in self.sources if s['name'] != name]
+        self.sources.append({'name': name, 'fetch': fetch, 'priority': priority})
+        self.sources.sort(key=lambda s: s['priority'])
+
+    def attach_ws_feed(self, feed):
+        """Live BingX ticks override the table for subscribed symbols"""
+        self.ws_feed = feed
+
+    def refresh(self, names: Optional[Iterable[str]] = None) -> int:
+        """Pull every (or the named) bulk source and rebuild the table; returns symbols priced"""
+        with self._refresh_lock:
+            for source in self.sources:
+                if names and source['name'] not in names:
+                    continue
+                start = time.time()
+                try:
+                    rows = source['fetch']() or {}
+                    now = time.time()
+                    # Sources already key by base symbol; normalizing again would fold
+                    # distinct tickers together (TUSD -> T). First entry wins on a clash.
+                    table = {}
+                    for symbol, row in rows.items():
+                        if row.get('price') and symbol not in table:
+                            table[symbol] = {**row, 'source': source['name'], 'updated_at': now}
+                    with self._lock:
+                        self.source_tables[source['name']] = table
+                    self.source_status[source['name']] = {
+                        'symbols': len(table),
+                        'refreshed_at': now,
+                        'fetch_seconds': round(now - start, 2),
+                        'error': None
+                    }
+                except Exception as e:
+                    # Keep the previous snapshot; entries age out via max_age
+                    logger.warning(f"⚠️ Price source {source['name']} refresh failed: {e}")
+                    self.stats['refresh_errors'] += 1
+                    self.source_status.setdefault(source['name'], {})['error'] = str(e)
+            self._rebuild()
+            self.stats['refreshes'] += 1
+        if self.table:
+            self._ready.set()
+        return len(self.table)
+
+    def _rebuild(self):
+        """Merge source tables: best-priority fresh entry wins, gaps filled from the rest"""
+        now = time.time()
+        priorities = {s['name']: s['priority'] for s in self.sources}
+        with self._lock:
+            ordered = sorted(self.source_tables.items(), key=lambda item: priorities.get(item[0], 1000))
+            merged = {}
+            for _, table in ordered:
+                for symbol, entry in table.items():
+                    if now - entry['updated_at'] > self.max_age:
+                        continue
+                    current = merged.get(symbol)
+                    if current is None:
+                        merged[symbol] = dict(entry)
+                    elif not current.get('market_cap') and entry.get('market_cap'):
+                        current['market_cap'] = entry['market_cap']
+            self.table = merged
+
+    # ---- background refresh ------------------------------------------------
+
+    def _tick(self):
+        self.refresh()
+
+    def _interval(self) -> float:
+        return self.refresh_interval
+
+    def _can_start(self) -> bool:
+        return bool(self.sources)
+
+    def _describe(self) -> str:
+        return f"every {self.refresh_interval}s from {[s['name'] for s in self.sources]}"
+
+    # ---- lookups -----------------------------------------------------------
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Latest price with metadata, or None when unknown/too old"""
+        self._ensure_started()
+        base = base_symbol(symbol)
+        self.stats['lookups'] += 1
+
+        if self.ws_feed:
+            ticker = self.ws_feed.get_ticker(base, max_age)
+            if ticker:
+                self.stats['ws_hits'] += 1
+                entry = self.table.get(base) or {}
+                return {
+                    'symbol': base,
+                    'price': ticker['last'],
+                    'change_24h': ticker['percentage'],
+                    'volume_24h': ticker['quoteVolume'],
+                    'market_cap': entry.get('market_cap', 0),
+                    'source': ticker['source'],
+                    'age_seconds': ticker['age_seconds']
+                }
+
+        entry = self.table.get(base)
+        if entry is not None:
+            age = time.time() - entry['updated_at']
+            if age <= min(max_age if max_age is not None else self.max_age, self.max_age):
+                self.stats['table_hits'] += 1
+                return {
+                    'symbol': base,
+                    'price': entry['price'],
+                    'change_24h': entry.get('change_24h', 0),
+                    'volume_24h': entry.get('volume_24h', 0),
+                    'market_cap': entry.get('market_cap', 0),
+                    'source': entry['source'],
+                    'age_seconds': round(age, 3)
+                }
+        self.stats['misses'] += 1
+        return None
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        quote = self.get(symbol, max_age)
+        return quote['price'] if quote else None
+
+    def get_prices(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Prices for many symbols at once, keyed by the symbols as given"""
+        return {symbol: self.get_price(symbol, max_age) for symbol in symbols}
+
+    def get_status(self) -> Dict:
+        now = time.time()
+        sources = {}
+        for source in self.sources:
+            status = dict(self.source_status.get(source['name'], {}))
+            if status.get('refreshed_at'):
+                status['age_seconds'] = round(now - status.pop('refreshed_at'), 1)
+            sources[source['name']] = {'priority': source['priority'], **status}
+        return {
+            'symbols': len(self.table),
+            'refresh_interval': self.refresh_interval,
+            'max_age': self.max_age,
+            'running': self.running,
+            'ws_feed': self.ws_feed is not None,
+            'sources': sources,
+            'stats': self.stats.copy()
+        }
+
+
+_oracle: Singleton[PriceOracle] = Singleton('PRICE_ORACLE_ENABLED')
+
+
+def _build_oracle() -> PriceOracle:
+    oracle = PriceOracle(auto_start=True)
+    if REQUESTS_AVAILABLE:
+        oracle.register_source('coingecko', fetch_coingecko_markets, priority=50)
+    return oracle
+
+
+def get_price_oracle() -> Optional[PriceOracle]:
+    """Shared oracle; PRICE_ORACLE_ENABLED=false disables it"""
+    return _oracle.get(_build_oracle)
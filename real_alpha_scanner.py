@@ -14,6 +14,9 @@ import pytz
 from typing import List, Dict, Optional
 import random
 
+from symbol_matcher import tag_article
+from futures_timeseries import get_futures_store
+
 # Railway API configuration
 RAILWAY_API_URL = "https://titan-trading-2-production.up.railway.app"
 
@@ -210,8 +213,55 @@ class RealAlphaScanner:
             
         return opportunities
     
+    def _funding_opportunities_from_store(self) -> Optional[List[Dict]]:
+        """Funding extremes for the whole coin list from the local time-series store (None if it has no data)"""
+        store = get_futures_store(start=False)
+        latest = store.latest_many(self.top_coins, max_age=3 * 3600) if store else {}
+        if not latest:
+            return None
+        
+        opportunities = []
+        for symbol, row in latest.items():
+            funding_rate = row['funding_rate'] or 0
+            zscore = row['funding_zscore']
+            # Rates far outside their own recent range are stronger signals
+            confidence = 75 + (min(15, int(abs(zscore) * 5)) if zscore is not None else 0)
+            context = f" (z-score {zscore:+.1f}, OI {row['oi_delta_pct'] or 0:+.1f}%/h)" if zscore is not None else ""
+            if funding_rate > 0.05:
+                opportunities.append({
+                    'type': 'funding_rate_long',
+                    'symbol': symbol,
+                    'signal': f'Extreme positive funding rate: {funding_rate:.4f}{context}',
+                    'confidence': confidence,
+                    'timeframe': '1-5 days',
+                    'entry_strategy': 'Long position - shorts are paying premium',
+                    'target_upside': '10-25%',
+                    'risk_level': 'Medium',
+                    'catalyst': 'Funding rate squeeze on shorts'
+                })
+            elif funding_rate < -0.03:
+                opportunities.append({
+                    'type': 'funding_rate_short',
+                    'symbol': symbol,
+                    'signal': f'Extreme negative funding rate: {funding_rate:.4f}{context}',
+                    'confidence': confidence,
+                    'timeframe': '1-5 days',
+                    'entry_strategy': 'Short position - longs are paying premium',
+                    'target_upside': '10-25%',
+                    'risk_level': 'Medium',
+                    'catalyst': 'Funding rate squeeze on longs'
+                })
+        return opportunities
+    
     async def _find_funding_rate_opportunities(self) -> List[Dict]:
         """Find opportunities based on funding rate extremes"""
+        try:
+            local = self._funding_opportunities_from_store()
+            if local is not None:
+                return local
+        except Exception as e:
+            print(f"⚠️ Futures store unavailable, falling back to API: {e}")
+        
         opportunities = []
         
         try:
@@ -291,15 +341,8 @@ class RealAlphaScanner:
         return score
     
     def _extract_symbols_from_news(self, article: Dict) -> List[str]:
-        """Extract cryptocurrency symbols from news article"""
-        title = article.get('title', '').upper()
-        symbols = []
-        
-        for symbol in self.top_coins:
-            if symbol in title or f"${symbol}" in title:
-                symbols.append(symbol)
-        
-        return symbols
+        """Extract cryptocurrency symbols from news article title and body"""
+        return tag_article(article)
     
     def _calculate_news_impact(self, article: Dict) -> int:
         """Calculate potential market impact of news"""
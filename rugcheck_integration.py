@@ -8,23 +8,161 @@ liquidity analysis, contract verification, and risk assessment.
 import requests
 import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 import asyncio
-import aiohttp
+
+from service_base import Singleton, SQLiteStore
 
 logger = logging.getLogger(__name__)
 
+RUGCHECK_CACHE_DB = os.getenv('RUGCHECK_CACHE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   'rugcheck_cache.db'))
+RUGCHECK_WORKERS = int(os.getenv('RUGCHECK_WORKERS', '8'))
+RUGCHECK_RATE_LIMIT = float(os.getenv('RUGCHECK_RATE_LIMIT', '10'))  # requests/second across all workers
+RUGCHECK_TIMEOUT = 10
+RUGCHECK_MAX_RETRIES = 2
+
+# How long a verdict stays valid, by risk level (seconds, None = forever).
+# A rug never recovers, while a clean token can still have liquidity pulled,
+# so the better the verdict the sooner it is re-checked.
+VERDICT_TTLS = {
+    'CRITICAL': None,
+    'HIGH': 24 * 3600,
+    'MEDIUM': 6 * 3600,
+    'LOW': 3 * 3600,
+    'SAFE': 3 * 3600
+}
+NOT_FOUND_TTL = 15 * 60  # New mints show up in RugCheck within minutes
+
+class RateLimiter:
+    """Spaces request starts 1/rate apart across threads; callers sleep outside the lock"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def pause(self, seconds: float):
+        """Push every pending slot back, e.g. after a 429"""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+class VerdictCache(SQLiteStore):
+    """SQLite-backed RugCheck verdicts keyed by (chain, mint), shared by every worker process"""
+    
+    def __init__(self, db_path: str = RUGCHECK_CACHE_DB):
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        super().__init__(db_path)
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS verdicts (
+                chain TEXT,
+                mint TEXT,
+                risk_level TEXT,
+                result TEXT,
+                checked_at REAL,
+                expires_at REAL,
+                PRIMARY KEY (chain, mint)
+            )
+        ''')
+    
+    @staticmethod
+    def ttl_for(result: Dict) -> Union[float, None, bool]:
+        """Lifetime for a check result; False means don't cache it (errors, unknown levels)"""
+        if result.get('status') == 'not_found':
+            return NOT_FOUND_TTL
+        if result.get('status') != 'success':
+            return False
+        return VERDICT_TTLS.get(result.get('risk_level'), False)
+    
+    def get_many(self, chain: str, mints: List[str]) -> Dict[str, Dict]:
+        """Unexpired verdicts for the given mints, batched under SQLite's variable limit"""
+        found = {}
+        now = time.time()
+        conn = self._conn()
+        for i in range(0, len(mints), 500):
+            chunk = mints[i:i + 500]
+            rows = conn.execute(f'''
+                SELECT mint, result, checked_at FROM verdicts
+                WHERE chain = ? AND mint IN ({','.join('?' * len(chunk))})
+                AND (expires_at IS NULL OR expires_at > ?)
+            ''', [chain, *chunk, now]).fetchall()
+            for row in rows:
+                result = json.loads(row['result'])
+                result['cached'] = True
+                result['cache_age_seconds'] = round(now - row['checked_at'], 1)
+                found[row['mint']] = result
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(mints) - len(found)
+        return found
+    
+    def put_many(self, chain: str, results: Dict[str, Dict]) -> int:
+        now = time.time()
+        rows = []
+        for mint, result in results.items():
+            ttl = self.ttl_for(result)
+            if ttl is False:
+                continue
+            rows.append((chain, mint, result.get('risk_level'), json.dumps(result, default=str), now,
+                         None if ttl is None else now + ttl))
+        if rows:
+            conn = self._conn()
+            conn.executemany('''
+                INSERT OR REPLACE INTO verdicts (chain, mint, risk_level, result, checked_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+            self.stats['stored'] += len(rows)
+        return len(rows)
+    
+    def purge_expired(self) -> int:
+        conn = self._conn()
+        deleted = conn.execute('DELETE FROM verdicts WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                               (time.time(),)).rowcount
+        conn.commit()
+        return deleted
+    
+    def get_status(self) -> Dict:
+        rows = self._conn().execute(
+            'SELECT risk_level, COUNT(*) AS n FROM verdicts GROUP BY risk_level').fetchall()
+        return {
+            'db_path': self.db_path,
+            'verdicts': {row['risk_level'] or 'NOT_FOUND': row['n'] for row in rows},
+            'stats': self.stats.copy()
+        }
+
 class RugCheckAPI:
     """
     Python wrapper for Rugcheck.xyz API
     Provides token security analysis and rug pull detection
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[VerdictCache] = None,
+                 workers: int = RUGCHECK_WORKERS, rate_limit: float = RUGCHECK_RATE_LIMIT):
         self.base_url = "https://api.rugcheck.xyz"
         self.api_key = api_key
+        self.cache = cache if cache is not None else get_verdict_cache()
+        self.workers = workers
+        self.limiter = RateLimiter(rate_limit)
         self.session = requests.Session()
+        # Keep a pooled connection per worker instead of reconnecting under load
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 10))
+        self.session.mount("https://", adapter)
         
         # Set headers
         headers = {
@@ -38,62 +176,89 @@ class RugCheckAPI:
             
         self.session.headers.update(headers)
     
-    def check_token(self, token_address: str, chain: str = "solana") -> Dict:
+    def check_token(self, token_address: str, chain: str = "solana", use_cache: bool = True) -> Dict:
         """
         Perform comprehensive token security analysis
         
         Args:
             token_address (str): Token contract address
             chain (str): Blockchain network (solana, ethereum, bsc)
+            use_cache (bool): Serve an unexpired stored verdict instead of calling the API
             
         Returns:
             Dict: Token security analysis results
         """
-        try:
-            endpoint = f"/v1/tokens/{chain}/{token_address}"
-            response = self.session.get(f"{self.base_url}{endpoint}")
-            
-            if response.status_code == 200:
-                return self._process_token_analysis(response.json())
-            elif response.status_code == 404:
-                return {"error": "Token not found", "status": "not_found"}
-            else:
-                logger.error(f"RugCheck API error: {response.status_code}")
-                return {"error": f"API error: {response.status_code}", "status": "error"}
+        if use_cache and self.cache:
+            cached = self.cache.get_many(chain, [token_address])
+            if token_address in cached:
+                return cached[token_address]
+        result = self._fetch_token(token_address, chain)
+        if self.cache:
+            self.cache.put_many(chain, {token_address: result})
+        return result
+    
+    def _fetch_token(self, token_address: str, chain: str) -> Dict:
+        """One rate-limited API call, retried after a 429"""
+        endpoint = f"/v1/tokens/{chain}/{token_address}"
+        for attempt in range(RUGCHECK_MAX_RETRIES + 1):
+            try:
+                self.limiter.acquire()
+                response = self.session.get(f"{self.base_url}{endpoint}", timeout=RUGCHECK_TIMEOUT)
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error accessing RugCheck: {e}")
-            return {"error": f"Network error: {str(e)}", "status": "network_error"}
+                if response.status_code == 200:
+                    return self._process_token_analysis(response.json())
+                elif response.status_code == 404:
+                    return {"error": "Token not found", "status": "not_found"}
+                elif response.status_code == 429 and attempt < RUGCHECK_MAX_RETRIES:
+                    retry_after = response.headers.get('Retry-After', '')
+                    self.limiter.pause(float(retry_after) if retry_after.isdigit() else 1.0 + attempt)
+                    continue
+                else:
+                    logger.error(f"RugCheck API error: {response.status_code}")
+                    return {"error": f"API error: {response.status_code}", "status": "error"}
+                    
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Network error accessing RugCheck: {e}")
+                return {"error": f"Network error: {str(e)}", "status": "network_error"}
     
-    def bulk_check_tokens(self, token_addresses: List[str], chain: str = "solana") -> Dict[str, Dict]:
+    def bulk_check_tokens(self, token_addresses: List[str], chain: str = "solana",
+                          use_cache: bool = True) -> Dict[str, Dict]:
         """
-        Check multiple tokens in batch
+        Check multiple tokens in batch: cached verdicts first, the rest
+        concurrently on a bounded pool under the shared rate limiter
         
         Args:
             token_addresses (List[str]): List of token contract addresses
             chain (str): Blockchain network
+            use_cache (bool): Serve unexpired stored verdicts instead of re-checking
             
         Returns:
             Dict[str, Dict]: Dictionary of token addresses and their analysis results
         """
-        results = {}
+        addresses = list(dict.fromkeys(a for a in token_addresses if a))
+        results = self.cache.get_many(chain, addresses) if use_cache and self.cache else {}
+        missing = [a for a in addresses if a not in results]
         
-        for address in token_addresses:
+        def check(address):
             try:
-                result = self.check_token(address, chain)
-                results[address] = result
-                
-                # Add small delay to respect rate limits
-                import time
-                time.sleep(0.1)
-                
+                return self._fetch_token(address, chain)
             except Exception as e:
-                results[address] = {
+                return {
                     "error": f"Analysis failed: {str(e)}", 
                     "status": "failed"
                 }
         
-        return results
+        if missing:
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                fetched = dict(zip(missing, pool.map(check, missing)))
+            if self.cache:
+                self.cache.put_many(chain, fetched)
+            results.update(fetched)
+            logger.info(f"🛡️ RugCheck {chain}: {len(addresses) - len(missing)} cached, "
+                        f"{len(missing)} checked in {time.time() - start:.1f}s")
+        
+        return {address: results[address] for address in addresses}
     
     def get_trending_tokens(self, chain: str = "solana", limit: int = 50) -> Dict:
         """
@@ -234,17 +399,18 @@ class RugCheckAnalyzer:
     def __init__(self, api_key: Optional[str] = None):
         self.rugcheck_api = RugCheckAPI(api_key)
         
-    async def analyze_portfolio_security(self, token_addresses: List[str]) -> Dict:
+    async def analyze_portfolio_security(self, token_addresses: List[str], chain: str = "solana") -> Dict:
         """
         Analyze security of entire portfolio
         
         Args:
             token_addresses (List[str]): List of token addresses in portfolio
+            chain (str): Blockchain network
             
         Returns:
             Dict: Portfolio security analysis
         """
-        results = self.rugcheck_api.bulk_check_tokens(token_addresses)
+        results = self.rugcheck_api.bulk_check_tokens(token_addresses, chain)
         
         # Calculate portfolio security metrics
         total_tokens = len(results)
@@ -301,6 +467,17 @@ class RugCheckAnalyzer:
         
         return recommendations
 
+_verdict_cache: Singleton[VerdictCache] = Singleton('RUGCHECK_CACHE_ENABLED')
+_rugcheck_api: Singleton[RugCheckAPI] = Singleton()
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """Shared verdict cache; RUGCHECK_CACHE_ENABLED=false disables it"""
+    return _verdict_cache.get(VerdictCache)
+
+def get_rugcheck_api() -> RugCheckAPI:
+    """Shared client for scanners, so they share one rate limiter and connection pool"""
+    return _rugcheck_api.get(lambda: RugCheckAPI(os.getenv('RUGCHECK_API_KEY')))
+
 # Utility functions for integration with main trading platform
 def create_rugcheck_analyzer(api_key: Optional[str] = None) -> RugCheckAnalyzer:
     """
@@ -4,14 +4,17 @@ Real-Time Market Scanner Dashboard
 Shows live scanning progress, alerts, and system status
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 import requests
 import json
 import os
+import time
 from datetime import datetime
 import logging
 
+from scan_store import get_scan_store
+
 app = Flask(__name__)
 CORS(app)
 
@@ -37,18 +40,19 @@ def scan_status():
     except:
         server_status = "🔴 Offline"
     
-    # Check for recent alerts
+    store = get_scan_store()
+    
+    # Check for recent alerts (last 24h)
     alerts_count = 0
     latest_alert = None
     try:
-        if os.path.exists('latest_alerts.json'):
-            with open('latest_alerts.json', 'r') as f:
-                alerts = json.load(f)
-                alerts_count = len(alerts)
-                if alerts:
-                    latest_alert = alerts[-1].get('message', 'Recent alert available')
-    except:
-        pass
+        if store:
+            alerts_count = store.count_alerts(since=time.time() - 86400)
+            alerts = store.recent_alerts(limit=1)
+            if alerts:
+                latest_alert = alerts[0].get('message', 'Recent alert available')
+    except Exception as e:
+        logger.error(f"Error reading alerts: {e}")
     
     # Try to get live scanner status
     scanner_data = {
@@ -60,12 +64,17 @@ def scan_status():
     }
     
     try:
-        if os.path.exists('scanner_status.json'):
-            with open('scanner_status.json', 'r') as f:
-                live_data = json.load(f)
-                scanner_data.update(live_data)
-    except:
-        pass
+        latest = store.latest_scan(source='comprehensive_scanner') if store else None
+        if latest:
+            scanner_data.update({
+                'current_coin': latest['symbol'],
+                'current_index': latest['position'],
+                'total_coins': latest['total'],
+                'confidence': latest['confidence'],
+                'current_batch': latest['batch']
+            })
+    except Exception as e:
+        logger.error(f"Error reading scanner status: {e}")
     
     return jsonify({
         'timestamp': datetime.now().strftime('%H:%M:%S'),
@@ -89,32 +98,33 @@ def recent_scans():
     recent_scans = []
     
     try:
-        if os.path.exists('scanner_status.json'):
-            with open('scanner_status.json', 'r') as f:
-                scanner_data = json.load(f)
-                recent_scans = scanner_data.get('recent_scans', [])
-                
-                # Add analysis details for each scan
-                for scan in recent_scans:
-                    confidence = scan.get('confidence', 50.0)
-                    scan['analysis'] = {
-                        'technical': {
-                            'score': max(40, min(85, confidence - 5)),
-                            'signals': ['Technical analysis complete'] if confidence > 50 else ['Neutral signals']
-                        },
-                        'news': {
-                            'score': max(30, min(90, confidence + 10)),
-                            'sentiment': 'Positive' if confidence > 60 else 'Neutral',
-                            'articles': 2 if confidence > 60 else 1
-                        },
-                        'social': {
-                            'score': max(35, min(80, confidence)),
-                            'momentum': 'Strong' if confidence > 70 else 'Moderate' if confidence > 50 else 'Weak',
-                            'mentions': int(confidence * 2) if confidence > 40 else 20
-                        }
+        store = get_scan_store()
+        if store:
+            limit = min(int(request.args.get('limit', 10)), 200)
+            recent_scans = store.recent_scans(limit=limit, symbol=request.args.get('symbol'),
+                                              source='comprehensive_scanner')
+            
+            # Add analysis details for each scan
+            for scan in recent_scans:
+                confidence = scan.get('confidence', 50.0)
+                scan['analysis'] = {
+                    'technical': {
+                        'score': max(40, min(85, confidence - 5)),
+                        'signals': ['Technical analysis complete'] if confidence > 50 else ['Neutral signals']
+                    },
+                    'news': {
+                        'score': max(30, min(90, confidence + 10)),
+                        'sentiment': 'Positive' if confidence > 60 else 'Neutral',
+                        'articles': 2 if confidence > 60 else 1
+                    },
+                    'social': {
+                        'score': max(35, min(80, confidence)),
+                        'momentum': 'Strong' if confidence > 70 else 'Moderate' if confidence > 50 else 'Weak',
+                        'mentions': int(confidence * 2) if confidence > 40 else 20
                     }
-    except:
-        pass
+                }
+    except Exception as e:
+        logger.error(f"Error reading recent scans: {e}")
     
     # Fallback data if no live data available
     if not recent_scans:
@@ -314,6 +324,16 @@ def coin_details(symbol):
 def alerts():
     """Get recent alerts"""
     try:
+        store = get_scan_store()
+        if store:
+            limit = min(int(request.args.get('limit', 50)), 500)
+            alerts_data = store.recent_alerts(limit=limit, symbol=request.args.get('symbol'))
+            if alerts_data:
+                return jsonify({
+                    'alerts': alerts_data,
+                    'count': len(alerts_data),
+                    'timestamp': datetime.now().strftime('%H:%M:%S')
+                })
         if os.path.exists('latest_alerts.json'):
             with open('latest_alerts.json', 'r') as f:
                 alerts_data = json.load(f)
@@ -331,6 +351,26 @@ def alerts():
         'timestamp': datetime.now().strftime('%H:%M:%S')
     })
 
+@app.route('/api/scan-history/<symbol>')
+def scan_history(symbol):
+    """Confidence history for one coin, oldest first"""
+    try:
+        store = get_scan_store()
+        if not store:
+            return jsonify({'error': 'Scan store unavailable'}), 503
+        hours = float(request.args.get('hours', 24))
+        history = store.symbol_history(symbol, since=time.time() - hours * 3600,
+                                       limit=min(int(request.args.get('limit', 500)), 5000))
+        return jsonify({
+            'symbol': symbol.upper(),
+            'scans': history,
+            'count': len(history),
+            'timestamp': datetime.now().strftime('%H:%M:%S')
+        })
+    except Exception as e:
+        logger.error(f"Error loading scan history: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 if __name__ == '__main__':
     print("\n🚀 MARKET SCANNER DASHBOARD")
     print("=" * 50)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Scan Result Store
+Append-only SQLite (WAL) log of every scanner result and bot alert.
+Writers insert one row per scan instead of rewriting scanner_status.json /
+latest_alerts.json, and readers (dashboard, bot) query a recent window by
+symbol or time through an index instead of reparsing whole files. The
+rows double as scan history for analytics.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from service_base import Singleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+SCAN_DB_PATH = os.getenv('SCAN_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         'scan_results.db'))
+
+
+class ScanResultStore(SQLiteStore):
+    """SQLite-backed scan/alert history shared by the scanner, bot and dashboard processes"""
+
+    def __init__(self, db_path: str = SCAN_DB_PATH):
+        super().__init__(db_path)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL,
+                symbol TEXT,
+                confidence REAL,
+                alert_triggered INTEGER,
+                source TEXT,
+                batch TEXT,
+                position INTEGER,
+                total INTEGER,
+                ai_insight TEXT,
+                payload TEXT
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scans_symbol_ts ON scans (symbol, ts)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scans_ts ON scans (ts)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL,
+                symbol TEXT,
+                type TEXT,
+                platform TEXT,
+                message TEXT,
+                payload TEXT
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_symbol_ts ON alerts (symbol, ts)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts (ts)')
+
+    # ---- writes ------------------------------------------------------------
+
+    def record_scan(self, symbol: str, confidence: float, alert_triggered: bool = False,
+                    source: str = 'comprehensive_scanner', batch: Optional[str] = None,
+                    position: Optional[int] = None, total: Optional[int] = None,
+                    ai_insight: Optional[str] = None, payload: Optional[Dict] = None,
+                    ts: Optional[float] = None) -> int:
+        conn = self._conn()
+        cursor = conn.execute('''
+            INSERT INTO scans (ts, symbol, confidence, alert_triggered, source, batch, position, total, ai_insight, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (ts or time.time(), symbol.upper(), confidence, int(bool(alert_triggered)), source, batch,
+              position, total, ai_insight, json.dumps(payload, default=str) if payload else None))
+        conn.commit()
+        return cursor.lastrowid
+
+    def record_alerts(self, alerts: List[Dict], ts: Optional[float] = None) -> int:
+        """Append one row per alert dict (symbol/type/platform/message pulled out for querying)"""
+        ts = ts or time.time()
+        rows = [(ts, (alert.get('symbol') or '').upper() or None, alert.get('type'), alert.get('platform'),
+                 alert.get('message'), json.dumps(alert, default=str))
+                for alert in alerts if isinstance(alert, dict)]
+        if rows:
+            conn = self._conn()
+            conn.executemany('''
+                INSERT INTO alerts (ts, symbol, type, platform, message, payload) VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        return len(rows)
+
+    # ---- reads -------------------------------------------------------------
+
+    @staticmethod
+    def _scan_row(row: sqlite3.Row) -> Dict[str, Any]:
+        scan = {
+            'id': row['id'],
+            'symbol': row['symbol'],
+            'confidence': row['confidence'],
+            'timestamp': datetime.fromtimestamp(row['ts']).strftime('%H:%M:%S'),
+            'scanned_at': datetime.fromtimestamp(row['ts']).isoformat(),
+            'alert_triggered': bool(row['alert_triggered']),
+            'status': 'completed',
+            'source': row['source'],
+            'batch': row['batch'],
+            'position': row['position'],
+            'total': row['total'],
+            'ai_insight': row['ai_insight']
+        }
+        if row['payload']:
+            scan['payload'] = json.loads(row['payload'])
+        return scan
+
+    @staticmethod
+    def _alert_row(row: sqlite3.Row) -> Dict[str, Any]:
+        alert = json.loads(row['payload']) if row['payload'] else {}
+        alert.setdefault('symbol', row['symbol'])
+        alert.setdefault('type', row['type'])
+        alert['recorded_at'] = datetime.fromtimestamp(row['ts']).isoformat()
+        return alert
+
+    def recent_scans(self, limit: int = 10, symbol: Optional[str] = None,
+                     since: Optional[float] = None, source: Optional[str] = None) -> List[Dict]:
+        """Newest first; filter by symbol, epoch `since` and/or source"""
+        clauses, params = ['ts >= ?'], [since or 0]
+        if symbol:
+            clauses.append('symbol = ?')
+            params.append(symbol.upper())
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        rows = self._conn().execute(f'''
+            SELECT * FROM scans WHERE {' AND '.join(clauses)} ORDER BY ts DESC, id DESC LIMIT ?
+        ''', (*params, limit)).fetchall()
+        return [self._scan_row(row) for row in rows]
+
+    def latest_scan(self, source: Optional[str] = None) -> Optional[Dict]:
+        scans = self.recent_scans(limit=1, source=source)
+        return scans[0] if scans else None
+
+    def symbol_history(self, symbol: str, since: Optional[float] = None, limit: int = 500) -> List[Dict]:
+        """One symbol's scans, oldest first (chart-ready)"""
+        return list(reversed(self.recent_scans(limit=limit, symbol=symbol, since=since)))
+
+    def payload_scores(self, fields: Sequence[str], since: float, until: float) -> List[Tuple]:
+        """(symbol, ts, *fields) for every scan in [since, until] whose payload has the first field, by symbol then time"""
+        columns = ', '.join("json_extract(payload, '$.' || ?)" for _ in fields)
+        rows = self._conn().execute(f'''
+            SELECT symbol, ts, {columns} FROM scans
+            WHERE ts BETWEEN ? AND ? AND json_extract(payload, '$.' || ?) IS NOT NULL
+            ORDER BY symbol, ts
+        ''', (*fields, since, until, fields[0])).fetchall()
+        return [tuple(row) for row in rows]
+
+    def recent_alerts(self, limit: int = 50, symbol: Optional[str] = None,
+                      since: Optional[float] = None) -> List[Dict]:
+        clauses, params = ['ts >= ?'], [since or 0]
+        if symbol:
+            clauses.append('symbol = ?')
+            params.append(symbol.upper())
+        rows = self._conn().execute(f'''
+            SELECT * FROM alerts WHERE {' AND '.join(clauses)} ORDER BY ts DESC, id DESC LIMIT ?
+        ''', (*params, limit)).fetchall()
+        return [self._alert_row(row) for row in rows]
+
+    def count_alerts(self, since: Optional[float] = None) -> int:
+        return self._conn().execute('SELECT COUNT(*) AS n FROM alerts WHERE ts >= ?',
+                                    (since or 0,)).fetchone()['n']
+
+    def get_status(self) -> Dict:
+        conn = self._conn()
+        scans = conn.execute('SELECT COUNT(*) AS n, COUNT(DISTINCT symbol) AS symbols, MIN(ts) AS first, '
+                             'MAX(ts) AS last FROM scans').fetchone()
+        alerts = conn.execute('SELECT COUNT(*) AS n, MAX(ts) AS last FROM alerts').fetchone()
+        return {
+            'db_path': self.db_path,
+            'scans': scans['n'],
+            'symbols': scans['symbols'],
+            'first_scan': datetime.fromtimestamp(scans['first']).isoformat() if scans['first'] else None,
+            'last_scan': datetime.fromtimestamp(scans['last']).isoformat() if scans['last'] else None,
+            'alerts': alerts['n'],
+            'last_alert': datetime.fromtimestamp(alerts['last']).isoformat() if alerts['last'] else None
+        }
+
+
+_store: Singleton[ScanResultStore] = Singleton()
+
+
+def get_scan_store() -> Optional[ScanResultStore]:
+    """Shared store; None if the database can't be opened (callers skip persistence)"""
+    try:
+        return _store.get(ScanResultStore)
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Scan result store unavailable: {e}")
+        return None
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Sentiment Pre-Filter
+Deterministic lexicon scoring of crypto headlines before any OpenAI call.
+Clear-cut articles are graded locally; only ambiguous or high-impact
+articles are escalated to the LLM.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional
+
+# term -> weight; multi-word phrases are matched before single words
+BULLISH_TERMS = {
+    'surge': 2.0, 'surges': 2.0, 'soar': 2.0, 'soars': 2.0, 'rally': 1.5, 'rallies': 1.5,
+    'jump': 1.2, 'jumps': 1.2, 'gain': 1.0, 'gains': 1.0, 'climb': 1.0, 'climbs': 1.0,
+    'breakout': 1.5, 'bullish': 2.0, 'record high': 2.0, 'all-time high': 2.0, 'ath': 1.5,
+    'rebound': 1.0, 'rebounds': 1.0, 'recovery': 1.0, 'recovers': 1.0, 'outperform': 1.0,
+    'partnership': 1.2, 'partners': 1.0, 'integration': 0.8, 'adoption': 1.2, 'launch': 0.8,
+    'launches': 0.8, 'mainnet': 1.0, 'upgrade': 0.8, 'approval': 1.5, 'approved': 1.5,
+    'approves': 1.5, 'listing': 1.2, 'lists': 1.0, 'inflows': 1.5, 'accumulate': 1.0,
+    'accumulation': 1.0, 'buyback': 1.2, 'burn': 0.8, 'upside': 1.0, 'milestone': 0.8,
+    'institutional': 0.6, 'etf inflows': 2.0, 'buy': 0.5, 'higher': 0.6, 'up': 0.3,
+}
+
+BEARISH_TERMS = {
+    'plunge': 2.0, 'plunges': 2.0, 'crash': 2.0, 'crashes': 2.0, 'tumble': 1.5, 'tumbles': 1.5,
+    'drop': 1.0, 'drops': 1.0, 'fall': 1.0, 'falls': 1.0, 'slide': 1.0, 'slides': 1.0,
+    'decline': 1.0, 'declines': 1.0, 'sell-off': 1.5, 'selloff': 1.5, 'dump': 1.5, 'dumps': 1.5,
+    'bearish': 2.0, 'liquidation': 1.2, 'liquidations': 1.2, 'outflows': 1.5, 'hack': 2.5,
+    'hacked': 2.5, 'exploit': 2.5, 'exploited': 2.5, 'rug pull': 3.0, 'scam': 2.0, 'fraud': 2.0,
+    'lawsuit': 1.5, 'sues': 1.5, 'charges': 1.2, 'ban': 1.5, 'bans': 1.5, 'crackdown': 1.5,
+    'delist': 2.0, 'delisting': 2.0, 'bankruptcy': 2.5, 'insolvent': 2.5, 'warning': 0.8,
+    'risk': 0.5, 'fears': 1.0, 'concerns': 0.8, 'downside': 1.0, 'lower': 0.6, 'down': 0.3,
+    'etf outflows': 2.0, 'sell': 0.5,
+}
+
+# Events that move markets regardless of tone; always escalated
+HIGH_IMPACT_TERMS = {
+    'sec', 'etf', 'hack', 'hacked', 'exploit', 'exploited', 'rug pull', 'bankruptcy', 'insolvent',
+    'delist', 'delisting', 'listing', 'lawsuit', 'fed', 'fomc', 'rate cut', 'rate hike',
+    'blackrock', 'approval', 'approved', 'ban', 'bans', 'halving', 'mainnet',
+}
+
+NEGATIONS = {'not', 'no', 'never', "isn't", "won't", "doesn't", 'fails', 'failed', 'without', 'denies'}
+
+PROVIDER_SENTIMENT = {'positive': 1.0, 'negative': -1.0, 'neutral': 0.0}
+
+_TOKEN_RE = re.compile(r"[a-z0-9$][a-z0-9'\-]*")
+
+
+def _build_phrases(terms: Dict[str, float]) -> Dict[tuple, float]:
+    return {tuple(term.split()): weight for term, weight in terms.items()}
+
+
+_BULL = _build_phrases(BULLISH_TERMS)
+_BEAR = _build_phrases(BEARISH_TERMS)
+_IMPACT = {tuple(term.split()) for term in HIGH_IMPACT_TERMS}
+# First words of multi-word phrases; every other token needs a single dict lookup
+_PHRASE_STARTS = {p[0] for p in list(_BULL) + list(_BEAR) + list(_IMPACT) if len(p) > 1}
+_MAX_PHRASE = max(len(p) for p in list(_BULL) + list(_BEAR) + list(_IMPACT))
+
+
+class SentimentPreFilter:
+    """Lexicon sentiment scorer with an escalation policy for the LLM"""
+
+    def __init__(self, ambiguity_band: float = 0.25, min_evidence: float = 1.0):
+        # |score| inside the band with at least min_evidence term weight is ambiguous;
+        # text with less evidence than that is treated as plainly neutral
+        self.ambiguity_band = ambiguity_band
+        self.min_evidence = min_evidence
+        self._lock = threading.Lock()
+        self.stats = {'scored': 0, 'escalated': 0, 'resolved_locally': 0, 'high_impact': 0}
+
+    def score_text(self, text: str) -> Dict:
+        """Score raw text; returns score in [-1, 1] plus the evidence used"""
+        tokens = _TOKEN_RE.findall((text or '').lower())
+        bull = bear = 0.0
+        matched = []
+        high_impact = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            token = tokens[i]
+            size = 1
+            phrase = (token,)
+            if token in _PHRASE_STARTS:
+                # Longest phrase wins; impact terms are collected at every length
+                for length in range(min(_MAX_PHRASE, n - i), 1, -1):
+                    candidate = tuple(tokens[i:i + length])
+                    if candidate in _IMPACT and ' '.join(candidate) not in high_impact:
+                        high_impact.append(' '.join(candidate))
+                    if size == 1 and (candidate in _BULL or candidate in _BEAR):
+                        phrase, size = candidate, length
+            if (token,) in _IMPACT and token not in high_impact:
+                high_impact.append(token)
+
+            if phrase in _BULL:
+                weight, bullish = _BULL[phrase], True
+            elif phrase in _BEAR:
+                weight, bullish = _BEAR[phrase], False
+            else:
+                i += 1
+                continue
+            negated = i > 0 and any(t in NEGATIONS for t in tokens[max(0, i - 2):i])
+            if negated:
+                bullish = not bullish
+                weight *= 0.5
+            if bullish:
+                bull += weight
+            else:
+                bear += weight
+            matched.append(('not ' if negated else '') + ' '.join(phrase))
+            i += size
+
+        evidence = bull + bear
+        score = (bull - bear) / evidence if evidence else 0.0
+        return {
+            'score': round(score, 3),
+            'evidence': round(evidence, 2),
+            'bullish_weight': round(bull, 2),
+            'bearish_weight': round(bear, 2),
+            'matched_terms': matched,
+            'high_impact_terms': high_impact
+        }
+
+    def score_article(self, article: Dict) -> Dict:
+        """Score a news article and decide whether it needs the LLM.
+
+        Uses the provider `sentiment` field (CryptoNews) when present. When
+        it agrees with the lexicon, or the lexicon is silent, the article is
+        resolved locally; a disagreement is escalated.
+        """
+        text = f"{article.get('title', '')}. {article.get('text') or article.get('description') or ''}"
+        result = self.score_text(text)
+
+        provider = str(article.get('sentiment') or '').lower()
+        provider_score = PROVIDER_SENTIMENT.get(provider)
+        score = result['score']
+        if provider_score is not None:
+            # Provider label counts as strong evidence in its direction
+            if result['evidence'] == 0:
+                score = provider_score * 0.6
+            else:
+                score = round(0.5 * score + 0.5 * provider_score, 3)
+
+        conflict = (provider_score is not None and provider_score != 0 and
+                    result['evidence'] >= self.min_evidence and result['score'] * provider_score < 0)
+        # Mixed evidence (both directions present) widens the band
+        mixed = result['bullish_weight'] > 0 and result['bearish_weight'] > 0
+        band = self.ambiguity_band * (2 if mixed else 1)
+        ambiguous = (abs(score) < band and result['evidence'] >= self.min_evidence) or conflict
+        high_impact = bool(result['high_impact_terms'])
+
+        if score >= self.ambiguity_band:
+            sentiment = 'BULLISH'
+        elif score <= -self.ambiguity_band:
+            sentiment = 'BEARISH'
+        else:
+            sentiment = 'NEUTRAL'
+
+        result.update({
+            'score': score,
+            'sentiment': sentiment,
+            'provider_sentiment': provider or None,
+            'ambiguous': ambiguous,
+            'high_impact': high_impact,
+            'escalate': ambiguous or high_impact
+        })
+
+        with self._lock:
+            self.stats['scored'] += 1
+            if result['escalate']:
+                self.stats['escalated'] += 1
+            else:
+                self.stats['resolved_locally'] += 1
+            if high_impact:
+                self.stats['high_impact'] += 1
+        return result
+
+    def split(self, articles: List[Dict]):
+        """Partition articles into (local, escalate) lists of (article, score) pairs"""
+        local, escalate = [], []
+        for article in articles:
+            scored = self.score_article(article)
+            (escalate if scored['escalate'] else local).append((article, scored))
+        return local, escalate
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = self.stats.copy()
+        stats['escalation_rate'] = round(stats['escalated'] / stats['scored'], 3) if stats['scored'] else 0.0
+        return stats
+
+
+def to_ten_point(score: float) -> float:
+    """Map a [-1, 1] score onto the scanner's 0-10 sentiment scale"""
+    return round((score + 1) * 5, 1)
+
+
+def local_grade(article: Dict, scored: Dict, tickers: Optional[List[str]] = None) -> Dict:
+    """Article grade in the same shape the LLM returns for grade_news_sentiment"""
+    sentiment = scored['sentiment']
+    impact = min(10, max(1, round(scored['evidence'] * 1.5)))
+    return {
+        'sentiment': sentiment,
+        'impact_score': impact,
+        'affected_tickers': tickers if tickers is not None else list(article.get('tickers', [])),
+        'trading_signal': {'BULLISH': 'BUY', 'BEARISH': 'SELL'}.get(sentiment, 'HOLD'),
+        'time_horizon': 'SHORT',
+        'confidence': min(10, max(1, round(abs(scored['score']) * 10))),
+        'key_factors': scored['matched_terms'][:5] or ['No strong sentiment terms'],
+        'graded_by': 'local_prefilter'
+    }
+
+
+# Shared instance so escalation rate is measured across all callers
+sentiment_prefilter = SentimentPreFilter()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Service Base
+Plumbing shared by the per-process services: a thread-local WAL SQLite
+connection for the local stores, a periodic background worker, and a
+lazily built per-process singleton.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class SQLiteStore:
+    """One connection per thread to a WAL database; subclasses create their tables in `_create_schema`"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        self._create_schema(conn)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        raise NotImplementedError
+
+    def _acquire_lease(self, name: str, ttl: float) -> bool:
+        """Take or renew the named lease; True only for its one holder across processes.
+
+        A holder that stops renewing loses the lease `ttl` seconds after its
+        last renewal, so another process picks the work up.
+        """
+        owner = f"{os.getpid()}:{id(self)}"
+        now = time.time()
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT, expires_at REAL)')
+        conn.execute('''
+            INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE leases.owner = excluded.owner OR leases.expires_at < ?
+        ''', (name, owner, now + ttl, now))
+        conn.commit()
+        row = conn.execute('SELECT owner FROM leases WHERE name = ?', (name,)).fetchone()
+        return row is not None and row['owner'] == owner
+
+
+class PeriodicWorker:
+    """Runs `_tick` every `_interval()` seconds on a daemon thread.
+
+    Subclasses call `_init_worker` from __init__. With auto_start the
+    thread starts on the first `_ensure_started`; with initial_wait that
+    first call also waits (once) for `_ready`, so a cold process doesn't
+    answer its first lookups from an empty table.
+    """
+
+    worker_name = 'worker'
+
+    def _init_worker(self, auto_start: bool = False, initial_wait: float = 0.0):
+        self.auto_start = auto_start
+        self.initial_wait = initial_wait
+        self._ready = threading.Event()
+        self._waited = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _tick(self):
+        raise NotImplementedError
+
+    def _interval(self) -> float:
+        raise NotImplementedError
+
+    def _can_start(self) -> bool:
+        return True
+
+    def _describe(self) -> str:
+        return f"every {self._interval()}s"
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        if not self._can_start():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.worker_name, daemon=True)
+        self._thread.start()
+        logger.info(f"🚀 {self.worker_name} running {self._describe()}")
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                logger.error(f"❌ {self.worker_name} error: {e}")
+            self._stop.wait(self._interval())
+
+    def _ensure_started(self):
+        if self.auto_start and not self.running:
+            self.start()
+        if self.initial_wait and not self._waited and self.running:
+            self._ready.wait(self.initial_wait)
+            self._waited = True
+
+
+class Singleton(Generic[T]):
+    """Per-process shared instance, built on first `get`.
+
+    Building lazily means each gunicorn worker creates its own threads and
+    connections after fork. `enabled_env` names a flag that disables the
+    service when set to anything but 'true'.
+    """
+
+    def __init__(self, enabled_env: Optional[str] = None):
+        self.enabled_env = enabled_env
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return not self.enabled_env or os.getenv(self.enabled_env, 'true').lower() == 'true'
+
+    def get(self, factory: Callable[[], T]) -> Optional[T]:
+        if not self.enabled():
+            return None
+        with self._lock:
+            if self._instance is None:
+                self._instance = factory()
+            return self._instance
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Hedged Source Fan-Out
+Runs several interchangeable data sources for the same question at once
+and answers from whichever delivers each field first. Results live in a
+short-TTL cache shared with the single-source endpoints, and identical
+in-flight calls are joined instead of repeated, so a burst of requests for
+one symbol costs one upstream call per source.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CACHE_TTL = float(os.getenv('ANALYSIS_SOURCE_TTL', '30'))
+FANOUT_TIMEOUT = float(os.getenv('ANALYSIS_FANOUT_TIMEOUT', '20'))
+FANOUT_WORKERS = int(os.getenv('ANALYSIS_FANOUT_WORKERS', '16'))
+
+_results = TTLCache('analysis_sources', ttl=SOURCE_CACHE_TTL, max_entries=2048)
+_inflight: Dict[Hashable, Future] = {}
+_inflight_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix='source-fanout')
+
+
+def is_success(result: Any) -> bool:
+    return isinstance(result, dict) and result.get('status') == 'success'
+
+
+def _key(name: str, args: Tuple) -> Hashable:
+    return (name,) + tuple(str(arg).upper() for arg in args)
+
+
+def cached_result(name: str, *args) -> Optional[Any]:
+    """Fresh cached answer from `name` for these arguments, without calling anything"""
+    return _results.get(_key(name, args))
+
+
+def fetch(name: str, fn: Callable, *args, ok: Callable[[Any], bool] = is_success,
+          ttl: Optional[float] = None) -> Future:
+    """Future for fn(*args): a finished one on a cache hit, the shared one if already running"""
+    key = _key(name, args)
+    cached = _results.get(key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+
+        def run():
+            result = fn(*args)
+            if ok(result):
+                _results.set(key, result, ttl)
+            return result
+
+        future = _executor.submit(run)
+        _inflight[key] = future
+
+    def release(done: Future):
+        with _inflight_lock:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+    future.add_done_callback(release)
+    return future
+
+
+def cached_call(name: str, fn: Callable, *args, ok: Callable[[Any], bool] = is_success,
+                timeout: Optional[float] = None) -> Any:
+    """Blocking fn(*args) through the shared cache and in-flight dedupe"""
+    return fetch(name, fn, *args, ok=ok).result(timeout)
+
+
+def hedged_fanout(sources: Dict[str, Tuple[Callable, Tuple]], fields: Dict[str, Callable[[Dict], Any]],
+                  ok: Callable[[Any], bool] = is_success, timeout: float = FANOUT_TIMEOUT) -> Dict:
+    """Query every source concurrently; stop once each field has a good value.
+
+    `sources` maps name -> (fn, args); `fields` maps field -> extractor
+    returning None when a result lacks it. Each field takes the first
+    successful source that carries it. Sources still outstanding when every
+    field is filled (or at `timeout`) are no longer waited on but not
+    cancelled: other requests may have joined them, and they finish in the
+    background and land in the shared cache.
+    """
+    start = time.time()
+    futures = {}
+    for name, (fn, args) in sources.items():
+        futures[fetch(name, fn, *args, ok=ok)] = name
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    filled: Dict[str, Dict] = {}
+    pending = set(futures)
+    deadline = start + timeout
+    while pending and len(filled) < len(fields):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+                logger.warning(f"⚠️ Source {name} failed: {e}")
+                continue
+            if not ok(result):
+                errors[name] = (result or {}).get('error', 'no data') if isinstance(result, dict) else 'no data'
+                continue
+            results[name] = result
+            for field, extract in fields.items():
+                if field in filled:
+                    continue
+                try:
+                    value = extract(result)
+                except Exception:
+                    value = None
+                if value is not None:
+                    filled[field] = {'value': value, 'source': name}
+
+    laggards = sorted(futures[future] for future in pending)
+    return {
+        'results': results,
+        'fields': filled,
+        'errors': errors,
+        'pending': laggards,
+        'elapsed_ms': round((time.time() - start) * 1000, 1)
+    }
+
+
+def get_fanout_status() -> Dict:
+    with _inflight_lock:
+        inflight = len(_inflight)
+    return {'inflight': inflight, 'cache': _results.get_stats()}
+
+
+def clear_source_cache():
+    _results.clear()
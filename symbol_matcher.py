@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Symbol Matcher
+Single-pass Aho-Corasick ticker tagging for news titles and bodies
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+CMC_LISTINGS_URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest"
+
+# Seed universe used when no remote listing is available: symbol -> names
+DEFAULT_UNIVERSE = {
+    'BTC': ['Bitcoin'], 'ETH': ['Ethereum', 'Ether'], 'XRP': ['Ripple'], 'ADA': ['Cardano'],
+    'SOL': ['Solana'], 'MATIC': ['Polygon'], 'LINK': ['Chainlink'], 'UNI': ['Uniswap'],
+    'AAVE': ['Aave'], 'SUSHI': ['SushiSwap'], 'DOGE': ['Dogecoin'], 'SHIB': ['Shiba Inu'],
+    'AVAX': ['Avalanche'], 'DOT': ['Polkadot'], 'ATOM': ['Cosmos'], 'LUNA': ['Terra'],
+    'FTM': ['Fantom'], 'NEAR': ['NEAR Protocol'], 'ALGO': ['Algorand'], 'ICP': ['Internet Computer'],
+    'VET': ['VeChain'], 'THETA': ['Theta Network'], 'FIL': ['Filecoin'], 'TRX': ['Tron'],
+    'ETC': ['Ethereum Classic'], 'XLM': ['Stellar'], 'MANA': ['Decentraland'], 'SAND': ['The Sandbox'],
+    'CRV': ['Curve DAO'], 'COMP': ['Compound'], 'MKR': ['Maker'], 'SNX': ['Synthetix'],
+    'YFI': ['yearn.finance'], 'BAT': ['Basic Attention Token'], 'ZRX': ['0x Protocol'],
+    'ENJ': ['Enjin'], 'REN': [], 'LRC': ['Loopring'], 'GRT': ['The Graph'], 'BAND': ['Band Protocol'],
+    'OCEAN': ['Ocean Protocol'], 'REEF': [], 'CHZ': ['Chiliz'], 'HOT': ['Holo'], 'WIN': ['WINkLink'],
+    'BTT': ['BitTorrent'], 'CELR': ['Celer Network'], 'ANKR': [], 'STORJ': [],
+    'APE': ['ApeCoin'], 'LDO': ['Lido DAO'], 'ARB': ['Arbitrum'], 'OP': ['Optimism'], 'BLUR': [],
+    'PEPE': [], 'FLOKI': [], 'BONK': [], 'WIF': ['dogwifhat'], 'BRETT': [], 'POPCAT': [],
+    'MOODENG': [], 'PNUT': ['Peanut the Squirrel'], 'GOAT': ['Goatseus Maximus'], 'ACT': [],
+    'NEIRO': [], 'MICHI': [], 'FWOG': [], 'CHILLGUY': [], 'BNB': ['Binance Coin'],
+    'BCH': ['Bitcoin Cash'], 'LTC': ['Litecoin'], 'TON': ['Toncoin'], 'SUI': [], 'APT': ['Aptos'],
+    'INJ': ['Injective'], 'SEI': [], 'TIA': ['Celestia'], 'HBAR': ['Hedera'], 'XMR': ['Monero'],
+    'ENA': ['Ethena'], 'ONDO': [], 'JUP': ['Jupiter'], 'RENDER': [], 'FET': ['Fetch.ai'],
+    'TAO': ['Bittensor'], 'HYPE': ['Hyperliquid'], 'TRUMP': [], 'ONE': ['Harmony'], 'GAS': [],
+    'USDT': ['Tether'], 'USDC': [],
+}
+
+# Tickers that are ordinary words (or read like one in headlines); these only
+# count as a ticker when written as a cashtag ($ONE) or in parentheses (ONE)
+AMBIGUOUS_SYMBOLS = {
+    'A', 'ACT', 'AI', 'ALL', 'ANY', 'APE', 'ARE', 'BAND', 'BAT', 'BIG', 'CAT', 'CAN', 'DOG', 'DO',
+    'EDGE', 'FOR', 'FUN', 'GAS', 'GO', 'GOAT', 'HOT', 'HYPE', 'ID', 'IN', 'IS', 'IT', 'KEY',
+    'LOW', 'ME', 'MOVE', 'MY', 'NEAR', 'NEW', 'NOW', 'OK', 'ON', 'ONE', 'OP', 'OUT', 'REAL',
+    'SAFE', 'SAND', 'SO', 'SUN', 'THE', 'TO', 'TOP', 'TRUMP', 'UP', 'US', 'WE', 'WIN', 'YOU',
+}
+
+# Coin names that collide with everyday words are never matched by name
+AMBIGUOUS_NAMES = {
+    'terra', 'maker', 'compound', 'cosmos', 'stellar', 'holo', 'tron', 'optimism',
+    'jupiter', 'harmony', 'render', 'ether', 'celestia', 'aptos',
+}
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _sentence_start(text: str, start: int) -> bool:
+    i = start - 1
+    while i >= 0 and text[i] in ' \t"\'(':
+        i -= 1
+    return i < 0 or text[i] in '.!?:;\n'
+
+
+class SymbolMatcher:
+    """Aho-Corasick automaton over ticker symbols and coin names.
+
+    The automaton runs over an ASCII-lowercased copy of the text (same length
+    as the original), so each hit is checked against the original slice for
+    case and boundary rules without a second scan.
+
+    Entries from the constructor's universe are trusted (curated); ones added
+    later with trusted=False (remote listings) get stricter rules, since those
+    listings are full of tickers and names that are everyday words.
+    """
+
+    def __init__(self, universe: Dict[str, Iterable[str]] = None,
+                 ambiguous_symbols: Iterable[str] = None):
+        self.ambiguous_symbols = set(ambiguous_symbols if ambiguous_symbols is not None else AMBIGUOUS_SYMBOLS)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # state -> list of (pattern_length, kind, symbol, text as listed, trusted); kind is 'symbol' or 'name'
+        self._own: List[List[Tuple[int, str, str, str, bool]]] = [[]]  # patterns ending at the state
+        self._out: List[List[Tuple[int, str, str, str, bool]]] = [[]]  # plus those along its failure links
+        self.symbols = set()
+        self.known_symbols = set()  # the trusted ones
+        self._names = set()
+        self._built = False
+        self.add_universe(universe if universe is not None else DEFAULT_UNIVERSE)
+        self.build()
+
+    def add_universe(self, universe: Dict[str, Iterable[str]], trusted: bool = True):
+        """Add symbol -> names entries; call build() afterwards"""
+        for symbol, names in universe.items():
+            symbol = (symbol or '').strip().upper()
+            if len(symbol) < 2 or not symbol.replace('.', '').isalnum():
+                continue
+            if symbol not in self.symbols:
+                self.symbols.add(symbol)
+                if trusted:
+                    self.known_symbols.add(symbol)
+                self._add_pattern(symbol, 'symbol', symbol, trusted)
+            for name in names or []:
+                name = (name or '').strip()
+                if len(name) < 4 or name.lower() in AMBIGUOUS_NAMES or name.upper() == symbol:
+                    continue
+                if (name.lower(), symbol) not in self._names:
+                    self._names.add((name.lower(), symbol))
+                    self._add_pattern(name, 'name', symbol, trusted)
+        self._built = False
+
+    def _add_pattern(self, pattern: str, kind: str, symbol: str, trusted: bool):
+        state = 0
+        for ch in pattern.translate(_ASCII_LOWER):
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            state = nxt
+        entry = (len(pattern), kind, symbol, pattern, trusted)
+        if entry not in self._own[state]:
+            self._own[state].append(entry)
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them; safe to call again after add_universe"""
+        self._out = [list(own) for own in self._own]
+        queue = []
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def _accept(self, text: str, start: int, end: int, kind: str, symbol: str, listed: str, trusted: bool,
+                shouting: bool, titled: bool) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(text[end]):
+            return False
+        if kind == 'name':
+            # Names match as listed ("Ripple", "dogwifhat"), or in capitals inside an all-caps headline
+            segment = text[start:end]
+            if segment != listed and not (shouting and segment == listed.upper()):
+                return False
+            if trusted or ' ' in listed:
+                return True
+            # A one-word listed name ("Flow", "Core") only reads as a proper noun when capitalized mid-sentence
+            return not (shouting or titled or _sentence_start(text, start))
+
+        # Tickers are case-sensitive: "Link" or "link" is prose, "LINK" is a ticker
+        if text[start:end] != symbol:
+            return False
+        tagged = (start > 0 and text[start - 1] in '$#') or \
+                 (start > 0 and text[start - 1] == '(' and end < len(text) and text[end] == ')')
+        if tagged:
+            return True
+        if symbol in self.ambiguous_symbols:
+            return False
+        # In an all-caps headline every word looks like a ticker; only the curated ones count
+        return trusted or not shouting
+
+    def find_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return non-overlapping (start, end, symbol) hits, leftmost-longest"""
+        if not text:
+            return []
+        if not self._built:
+            self.build()
+
+        letters = [ch for ch in text if ch.isalpha()]
+        shouting = len(letters) >= 12 and sum(1 for ch in letters if ch.isupper()) / len(letters) > 0.7
+        words = [word for word in text.split() if word[:1].isalpha()]
+        titled = len(words) >= 4 and sum(1 for word in words if word[0].isupper()) / len(words) >= 0.6
+
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        hits = []
+        state = 0
+        for i, ch in enumerate(text.translate(_ASCII_LOWER)):
+            if state == 0:
+                state = root.get(ch, 0)
+            else:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for length, kind, symbol, listed, trusted in out[state]:
+                    start = end - length
+                    if self._accept(text, start, end, kind, symbol, listed, trusted, shouting, titled):
+                        hits.append((start, end, symbol))
+
+        hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        selected = []
+        last_end = -1
+        for start, end, symbol in hits:
+            if start >= last_end:
+                selected.append((start, end, symbol))
+                last_end = end
+        return selected
+
+    def extract_symbols(self, text: str) -> List[str]:
+        """All tickers mentioned in text, in order of first appearance"""
+        seen = []
+        for _, _, symbol in self.find_matches(text):
+            if symbol not in seen:
+                seen.append(symbol)
+        return seen
+
+    def extract_primary_symbol(self, text: str) -> Optional[str]:
+        """First ticker mentioned in text, or None"""
+        matches = self.find_matches(text)
+        return matches[0][2] if matches else None
+
+    def tag_article(self, article: Dict) -> List[str]:
+        """Tickers for a news article dict (title, text/description/body)"""
+        parts = [article.get('title') or '']
+        for key in ('text', 'description', 'body'):
+            if article.get(key):
+                parts.append(article[key])
+        return self.extract_symbols('\n'.join(parts))
+
+    def tag_articles(self, articles: Iterable[Dict]) -> List[List[str]]:
+        return [self.tag_article(article) for article in articles]
+
+
+def fetch_coingecko_universe(pages: int = 2, per_page: int = 250, timeout: int = 10) -> Dict[str, List[str]]:
+    """Top coins by market cap from CoinGecko /coins/markets"""
+    import requests
+
+    universe = {}
+    for page in range(1, pages + 1):
+        response = requests.get(COINGECKO_MARKETS_URL, params={
+            'vs_currency': 'usd', 'order': 'market_cap_desc', 'per_page': per_page, 'page': page
+        }, timeout=timeout)
+        response.raise_for_status()
+        for coin in response.json():
+            symbol = (coin.get('symbol') or '').upper()
+            # Keep the highest market cap coin when tickers collide
+            if symbol and symbol not in universe:
+                universe[symbol] = [coin.get('name') or '']
+    return universe
+
+
+def fetch_cmc_universe(limit: int = 500, timeout: int = 10) -> Dict[str, List[str]]:
+    """Top coins from CoinMarketCap listings (requires CMC_PRO_API_KEY)"""
+    import requests
+
+    api_key = os.getenv('CMC_PRO_API_KEY')
+    if not api_key:
+        return {}
+    response = requests.get(CMC_LISTINGS_URL, params={'limit': limit},
+                            headers={'X-CMC_PRO_API_KEY': api_key}, timeout=timeout)
+    response.raise_for_status()
+    universe = {}
+    for coin in response.json().get('data', []):
+        symbol = (coin.get('symbol') or '').upper()
+        if symbol and symbol not in universe:
+            universe[symbol] = [coin.get('name') or '']
+    return universe
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def _load_remote_universe():
+    """Extend the seed universe with the CoinMarketCap or CoinGecko listing, then swap the shared matcher"""
+    global _matcher
+    for fetch in (fetch_cmc_universe, fetch_coingecko_universe):
+        try:
+            remote = fetch()
+        except Exception as e:
+            logger.warning(f"⚠️ Symbol universe fetch failed ({fetch.__name__}): {e}")
+            continue
+        if remote:
+            matcher = SymbolMatcher(DEFAULT_UNIVERSE)
+            matcher.add_universe(remote, trusted=False)
+            matcher.build()
+            _matcher = matcher  # swapped whole, so readers never see a half-built automaton
+            logger.info(f"✅ Symbol matcher loaded {len(matcher.symbols)} tickers")
+            return
+
+
+def get_symbol_matcher() -> SymbolMatcher:
+    """Shared matcher, built once per process.
+
+    Answers from DEFAULT_UNIVERSE right away; the CoinMarketCap or CoinGecko
+    listing loads on a background thread and replaces it when it arrives.
+    Set SYMBOL_MATCHER_OFFLINE=true to skip the remote listing.
+    """
+    global _matcher
+    if _matcher is not None:
+        return _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SymbolMatcher(DEFAULT_UNIVERSE)
+            if os.getenv('SYMBOL_MATCHER_OFFLINE', 'false').lower() != 'true':
+                threading.Thread(target=_load_remote_universe, name='symbol-universe', daemon=True).start()
+    return _matcher
+
+
+def extract_symbols(text: str) -> List[str]:
+    return get_symbol_matcher().extract_symbols(text)
+
+
+def extract_primary_symbol(text: str) -> Optional[str]:
+    return get_symbol_matcher().extract_primary_symbol(text)
+
+
+def tag_article(article: Dict) -> List[str]:
+    return get_symbol_matcher().tag_article(article)
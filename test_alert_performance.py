@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the alert performance tracker
+Uses a temporary SQLite file and an in-memory price table - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from alert_performance import AlertPerformanceTracker
+
+class FakePrices:
+    """Stands in for price_oracle.get_prices; counts batch lookups"""
+
+    def __init__(self, prices):
+        self.prices = dict(prices)
+        self.calls = []
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return {s: self.prices.get(s) for s in symbols}
+
+def make_tracker(prices, **kwargs):
+    path = os.path.join(tempfile.mkdtemp(), 'alert_performance.db')
+    return AlertPerformanceTracker(path, price_source=FakePrices(prices), target_pct=5, stop_pct=3,
+                                   horizon_hours=24, **kwargs)
+
+def status_of(tracker, alert_id):
+    return tracker._conn().execute('SELECT * FROM alert_performance WHERE alert_id = ?', (alert_id,)).fetchone()
+
+def test_excursions_and_resolution():
+    """One batched lookup per update; MFE/MAE ratchet and alerts resolve at target or stop"""
+    print("🔍 Testing MFE/MAE tracking...")
+    tracker = make_tracker({'BTC': 100.0, 'ETH': 100.0, 'SOL': 100.0})
+    btc = tracker.record_alert('comprehensive_scanner', 'confluence', 'btc', 88)
+    eth = tracker.record_alert('comprehensive_scanner', 'confluence', 'ETH', 90)
+    sol = tracker.record_alert('trading_alerts', 'overbought', 'SOL', 78, direction='short', score_unit='rsi')
+
+    prices = tracker.price_source
+    assert not prices.calls  # recording never prices
+    assert tracker.update() == {'open': 3, 'priced': 3, 'resolved': 0}  # entries filled at 100
+    prices.prices.update({'BTC': 103.0, 'ETH': 98.0, 'SOL': 102.0})
+    prices.calls.clear()
+    assert tracker.update() == {'open': 3, 'priced': 3, 'resolved': 0}
+    assert len(prices.calls) == 1 and sorted(prices.calls[0]) == ['BTC', 'ETH', 'SOL']
+
+    prices.prices.update({'BTC': 101.0, 'ETH': 96.5, 'SOL': 94.0})
+    assert tracker.update()['resolved'] == 2
+    row = status_of(tracker, btc)
+    assert row['status'] == 'active' and row['current_price'] == 101.0
+    assert abs(row['max_gain'] - 3.0) < 1e-9 and row['max_loss'] == 0  # peaked at +3%, never below entry
+    assert status_of(tracker, eth)['status'] == 'stopped' and status_of(tracker, eth)['outcome_pct'] == -3
+    sol_row = status_of(tracker, sol)
+    assert sol_row['status'] == 'target_hit' and sol_row['outcome_pct'] == 5  # short paid off on the drop
+    assert abs(sol_row['max_loss'] + 2.0) < 1e-9
+    print("✅ Stop, target (short) and excursions tracked in 2 batched updates")
+
+def test_pending_price_and_dedupe():
+    """Missing prices fill on the next update; repeats fold into the open alert and upgrade near-misses"""
+    print("🔍 Testing pending entries and dedupe...")
+    tracker = make_tracker({})
+    shadow = tracker.record_alert('hourly_scanner', 'instant_alert', 'PEPE', 62, sent=False)
+    assert status_of(tracker, shadow)['status'] == 'pending_price'
+    assert tracker.record_alert('hourly_scanner', 'instant_alert', 'pepe', 75, sent=True) == shadow
+    assert status_of(tracker, shadow)['sent'] == 1 and tracker.stats['deduped'] == 1
+
+    assert tracker.update()['priced'] == 0
+    tracker.price_source.prices['PEPE'] = 0.00001
+    tracker.update()
+    row = status_of(tracker, shadow)
+    assert row['status'] == 'active' and row['entry_price'] == 0.00001
+    assert tracker.record_alert('live_scanner', 'trade_callout', 'PEPE', 70) != shadow  # other source, own row
+    print("✅ Entry filled from the price table, duplicate folded in")
+
+def test_threshold_stats():
+    """Expectancy and hit-rate per score threshold pick the threshold that would have paid best"""
+    print("🔍 Testing threshold statistics...")
+    tracker = make_tracker({})
+    now = time.time()
+    # Scores 50-89: alerts scoring 70+ hit their target, lower ones get stopped out
+    for score in range(50, 90):
+        symbol = f'C{score}'
+        tracker.record_alert('comprehensive_scanner', 'confluence', symbol, score, entry_price=10.0)
+        tracker.price_source.prices[symbol] = 11.0 if score >= 70 else 9.0
+    tracker.update()
+    report = tracker.performance(thresholds=[50, 60, 70, 80], min_samples=5)
+    group = report['groups'][0]
+    assert report['resolved_alerts'] == 40 and group['alerts'] == 40
+    assert group['hit_rate'] == 50.0 and group['expectancy_pct'] == 1.0  # (20*5 - 20*3) / 40
+    by = {t['threshold']: t for t in group['by_threshold']}
+    assert by[60.0]['alerts'] == 30 and by[70.0]['hit_rate'] == 100.0 and by[70.0]['expectancy_pct'] == 5.0
+    assert group['best_threshold'] == 70.0
+    assert tracker.performance(min_samples=50)['groups'][0]['best_threshold'] is None
+
+    # An unresolved alert past its horizon expires at the return it reached
+    late = tracker.record_alert('live_scanner', 'trade_callout', 'LATE', 66, entry_price=10.0)
+    tracker.price_source.prices['LATE'] = 10.2
+    tracker.update(now=now + 25 * 3600)
+    assert status_of(tracker, late)['status'] == 'expired' and abs(status_of(tracker, late)['outcome_pct'] - 2) < 1e-9
+    print(f"✅ Best threshold {group['best_threshold']:.0f} from 40 resolved alerts")
+
+def test_score_units_and_concurrent_updates():
+    """Each score unit reads at its own thresholds; a second updater can't undo the first"""
+    print("🔍 Testing score units and overlapping updaters...")
+    tracker = make_tracker({})
+    for pnl in (-40, -20, -10, -6):
+        symbol = f'L{-pnl}'
+        tracker.record_alert('trading_alerts', 'losing_trade', symbol, -pnl, entry_price=10.0, score_unit='pnl_pct')
+        tracker.price_source.prices[symbol] = 11.0 if pnl <= -20 else 9.0
+    tracker.update()
+    group = tracker.performance(min_samples=1)['groups'][0]
+    assert group['score_unit'] == 'pnl_pct'
+    assert {t['threshold']: t['alerts'] for t in group['by_threshold']} == {5.0: 4, 8.0: 3, 10.0: 3, 15.0: 2, 20.0: 2,
+                                                                            25.0: 1, 35.0: 1}
+    assert group['best_threshold'] == 15.0
+
+    other = AlertPerformanceTracker(tracker.db_path, price_source=FakePrices({'BTC': 100.0}), target_pct=50, stop_pct=50)
+    btc = tracker.record_alert('live_scanner', 'trade_callout', 'BTC', 70, entry_price=100.0)
+    tracker.price_source.prices['BTC'] = 104.0
+    tracker.update()
+    other.update()  # stale view: BTC back at entry
+    row = status_of(tracker, btc)
+    assert abs(row['max_gain'] - 4.0) < 1e-9 and row['status'] == 'active'
+    tracker.price_source.prices['BTC'] = 96.0
+    tracker.update()
+    other.update()
+    assert status_of(tracker, btc)['status'] == 'stopped'  # the other process can't reopen it
+    assert tracker._acquire_lease('alert_update', 60) and not other._acquire_lease('alert_update', 60)
+    print("✅ Per-unit thresholds, ratcheting excursions, one updater")
+
+def main():
+    """Run all alert performance tests"""
+    print("🧪 ALERT PERFORMANCE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_excursions_and_resolution,
+        test_pending_price_and_dedupe,
+        test_threshold_stats,
+        test_score_units_and_concurrent_updates,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for list query shaping (fields, pagination, filters)
+Pure in-memory checks - no network needed
+"""
+
+import sys
+
+from api_query import ListQuery, QueryError, decode_cursor, encode_cursor, project
+
+MARKETS = [
+    {'symbol': f'COIN{i}/USDT' if i % 3 else f'COIN{i}/USDT:USDT', 'id': f'COIN{i}-USDT',
+     'type': 'spot' if i % 3 else 'swap', 'quote': 'USDT', 'active': i % 5 != 0,
+     'limits': {'amount': {'min': 0.001 * i, 'max': 1000}}, 'info': {'raw': 'x' * 100}}
+    for i in range(250)
+]
+
+def test_projection():
+    """Only requested fields survive, dotted paths keep nesting"""
+    print("🔍 Testing field projection...")
+    slim = project(MARKETS[7], ['symbol', 'limits.amount.min', 'missing'])
+    assert slim == {'symbol': 'COIN7/USDT', 'limits': {'amount': {'min': 0.007}}}
+    assert project(MARKETS[7], None) is MARKETS[7]
+    print("✅ Projection dropped unrequested fields")
+
+def test_cursor_walk():
+    """Following next_cursor visits every record exactly once"""
+    print("🔍 Testing cursor pagination...")
+    seen, cursor, pages = [], None, 0
+    while True:
+        args = {'limit': '40', 'fields': 'symbol'}
+        if cursor:
+            args['cursor'] = cursor
+        payload = ListQuery.from_args(args).respond(MARKETS)
+        seen.extend(item['symbol'] for item in payload['data'])
+        assert payload['total'] == 250
+        pages += 1
+        cursor = payload['next_cursor']
+        if not cursor:
+            break
+    assert seen == [m['symbol'] for m in MARKETS] and pages == 7
+    assert decode_cursor(encode_cursor(1234)) == 1234
+    print(f"✅ {len(seen)} records over {pages} pages")
+
+def test_filters_and_search():
+    """Equality filters (incl. booleans and lists) and search narrow before paging"""
+    print("🔍 Testing filters...")
+    query = ListQuery.from_args({'type': 'swap', 'active': 'true', 'limit': '5'}, filters=('type', 'active'))
+    payload = query.respond(MARKETS, search_keys=('symbol',))
+    expected = [m for m in MARKETS if m['type'] == 'swap' and m['active']]
+    assert payload['total'] == len(expected) and payload['count'] == 5
+    assert all(item['type'] == 'swap' and item['active'] for item in payload['data'])
+    query = ListQuery.from_args({'search': 'coin12'}, filters=('type',))
+    assert [m['symbol'] for m in query.select(MARKETS, search_keys=('symbol',))[0]][:2] == ['COIN12/USDT:USDT', 'COIN120/USDT:USDT']
+    assert not ListQuery.from_args({}, filters=('type',)).shaped
+    print(f"✅ {len(expected)} active swaps matched")
+
+def test_upstream_paging_and_errors():
+    """Cursors translate to upstream offsets; bad input raises QueryError"""
+    print("🔍 Testing upstream paging...")
+    first = ListQuery.from_args({'limit': '100'})
+    start, limit = first.upstream_page()
+    assert (start, limit) == (1, 100)
+    cursor = first.next_upstream_cursor(start, 100)
+    assert ListQuery.from_args({'limit': '100', 'cursor': cursor}).upstream_page() == (101, 100)
+    assert first.next_upstream_cursor(start, 42) is None
+    for bad in ({'cursor': 'not-a-cursor'}, {'limit': 'ten'}, {'limit': '0'}):
+        try:
+            ListQuery.from_args(bad)
+            assert False, bad
+        except QueryError:
+            pass
+    assert ListQuery.from_args({'limit': '999999'}).limit == 1000
+    print("✅ Upstream offsets and validation correct")
+
+def main():
+    """Run all list query tests"""
+    print("🧪 LIST QUERY SHAPING TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_projection,
+        test_cursor_walk,
+        test_filters_and_search,
+        test_upstream_paging_and_errors,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized backtest engine
+Synthetic candles and a temporary archive/scan store - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backtest_engine import (BacktestEngine, CandleArchive, CandlePanel, MissingLayersError, layers_from_scan_store,
+                             bullish_macd_cross, compute_features, confluence_score, hourly_opportunity_score, live_opportunity_score,
+                             oversold_confidence)
+from candles import Candles
+from scan_store import ScanResultStore
+
+HOUR_MS = 3_600_000
+START = 1_700_000_000_000
+
+def random_walk(symbol, bars, seed, start=START):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return Candles(start + np.arange(bars) * HOUR_MS, close, close * 1.004, close * 0.996, close,
+                   rng.uniform(1e4, 1e5, bars), symbol=symbol, timeframe='1h')
+
+def test_rules_match_scanners():
+    """Vectorized rules give the scanners' own scores on a grid of inputs"""
+    print("🔍 Testing rule parity with the live scanners...")
+    try:
+        from comprehensive_market_scanner import ComprehensiveMarketScanner
+        from hourly_trade_scanner import HourlyTradeScanner
+        from live_trade_scanner import LiveTradeScanner
+        from real_alpha_scanner import RealAlphaScanner
+    except ImportError as e:
+        print(f"⚠️ Scanner modules not importable here ({e}) - parity check skipped")
+        return
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        t, n, s = rng.uniform(0, 70), rng.uniform(0, 15), rng.uniform(0, 10)
+        analysis = {'technical': {'technical_score': t}, 'news': {'news_score': n}, 'social': {'social_score': s}}
+        assert abs(ComprehensiveMarketScanner._calculate_confluence_score(None, analysis)
+                   - float(confluence_score(np.array(t), np.array(n), np.array(s)))) < 1e-9
+
+        strength, catalyst, sentiment, social = rng.integers(0, 4), rng.choice([0, 20]), rng.uniform(0, 15), rng.uniform(0, 15)
+        hourly = {'technical_strength': strength, 'catalyst_score': catalyst,
+                  'sentiment_boost': sentiment, 'social_boost': social}
+        assert abs(HourlyTradeScanner._calculate_opportunity_score(None, hourly)
+                   - float(hourly_opportunity_score(strength, catalyst, sentiment, social))) < 1e-9
+
+        change, volume, cap = rng.uniform(0, 80), 10 ** rng.uniform(5, 8), 10 ** rng.uniform(7, 11)
+        assert LiveTradeScanner._calculate_opportunity_score(None, change, volume, cap, catalyst) == \
+            float(live_opportunity_score(np.array(change), np.array(volume), np.array(cap), catalyst))
+
+        rsi, hist, macd, signal = rng.uniform(10, 40), rng.normal(), rng.normal(), rng.normal()
+        touch = bool(rng.integers(0, 2))
+        assert RealAlphaScanner._calculate_oversold_confidence(
+            None, rsi, {'histogram': hist, 'macd': macd, 'signal': signal}, {'lower_band_touch': touch}) == \
+            float(oversold_confidence(np.array(rsi), np.array(hist), np.array(macd), np.array(signal), np.array(touch)))
+    print("✅ 800 scores identical")
+
+def test_archive_and_panel():
+    """Archive merges pages without duplicates; the panel aligns ragged histories on one grid"""
+    print("🔍 Testing candle archive and panel alignment...")
+    archive = CandleArchive(tempfile.mkdtemp())
+    full = random_walk('BTC-USDT', 3000, seed=1, start=int(time.time() * 1000) // HOUR_MS * HOUR_MS - 3000 * HOUR_MS)
+    pages = []
+
+    def fetch(symbol, timeframe, limit, start_time):
+        pages.append(start_time)
+        return full[int(np.searchsorted(full.timestamp, start_time)):][:limit]
+
+    added = archive.update('BTC-USDT', '1h', days=3000 // 24, fetch=fetch)
+    assert added == 2999 and len(pages) == 3  # 1440 + 1440 + rest, from `days` back
+    assert archive.update('BTC-USDT', '1h', fetch=fetch) == 0 and len(pages) == 3  # up to date: no request
+    archive.save(full[-10:])  # re-saving overlapping bars doesn't duplicate them
+    assert len(archive.load('BTC-USDT')) == 2999
+
+    archive.save(random_walk('ETH-USDT', 100, seed=2, start=int(full.timestamp[-50])))
+    panel = CandlePanel.from_archive(archive, days=None)
+    assert panel.symbols == ['BTC-USDT', 'ETH-USDT'] and panel.shape == (2, 3049)
+    assert np.isnan(panel.close[1, :2949]).all() and not np.isnan(panel.close[1, 2949:]).any()
+    assert np.isnan(panel.close[0, 2999:]).all()
+    print(f"✅ {panel}")
+
+def test_alerts_and_outcomes():
+    """A planted selloff fires at its start (too early) and at the turn (right); each is scored by what followed"""
+    print("🔍 Testing alert metrics...")
+    close = np.full(300, 100.0)
+    close[100:120] = np.linspace(100, 70, 20)   # selloff drives RSI under 25
+    close[120:150] = np.linspace(70, 90, 30)    # ... then a rebound
+    candles = Candles(START + np.arange(300) * HOUR_MS, close, close * 1.001, close * 0.999, close,
+                      np.full(300, 1e5), symbol='DIP-USDT')
+    engine = BacktestEngine(CandlePanel.from_candles({'DIP-USDT': candles}), target_pct=5, label_horizon=24)
+    report = engine.run('real_alpha_oversold', params={'min_score': 60}, thresholds=[40, 60, 90])
+    live = report['live_threshold']
+    assert live['alerts'] == 2 and live['precision'] == 50.0 and live['hit_rate_24'] == 50.0
+    assert live['recall'] < 10  # every bar of the rebound counts as an opportunity
+    by = {row['threshold']: row for row in report['by_threshold']}
+    assert by[40]['alerts'] == 1 and by[90]['alerts'] == 0  # at 40 both fire in one unbroken run
+
+    continuous = BacktestEngine(engine.panel, edge_only=False).run('real_alpha_oversold', params={'min_score': 60})
+    assert continuous['live_threshold']['alerts'] > live['alerts']
+    assert engine.baseline()['bars'] == 300 - 24
+    print(f"✅ {live['alerts']} alerts, precision {live['precision']}%")
+
+def test_layers_from_scan_store():
+    """Stored news/social scores are held forward onto the grid until they go stale"""
+    print("🔍 Testing scan store layers...")
+    store = ScanResultStore(os.path.join(tempfile.mkdtemp(), 'scans.db'))
+    panel = CandlePanel.from_candles({'SOL-USDT': random_walk('SOL-USDT', 72, seed=3)})
+    store.record_scan('SOL', 60, payload={'technical_score': 40, 'news_score': 12, 'social_score': 6},
+                      ts=START / 1000 + 10 * 3600 + 60)
+    store.record_scan('SOL', 50)  # legacy row without layer scores is ignored
+    store.record_scan('DOGE', 70, payload={'news_score': 3}, ts=START / 1000 + 3600)  # not in the panel
+    store.record_scan('SOL', 80, payload={'news_score': 99}, ts=START / 1000 + 100 * 3600)  # after the panel
+    layers = layers_from_scan_store(panel, store, max_age_hours=24)
+    news = layers['news'][0]
+    assert np.isnan(news[:11]).all() and (news[11:35] == 12).all() and np.isnan(news[35:]).all()
+    assert (layers['social'][0][11:35] == 6).all()
+
+    engine = BacktestEngine(panel, layers)
+    score, gate, _ = engine.signals('comprehensive')
+    bare, _, _ = BacktestEngine(panel, allow_missing_layers=True).signals('comprehensive')
+    assert (score[0, 26:35] > bare[0, 26:35]).all() and (score[0, 40:] == bare[0, 40:]).all()
+    print("✅ Layer scores lift the confluence score while fresh")
+
+def test_missing_layers_and_macd_cross():
+    """Rules refuse absent layers unless told otherwise; reports say what was missing or dropped"""
+    print("🔍 Testing missing layer handling and the MACD crossover...")
+    panel = CandlePanel.from_candles({'SOL-USDT': random_walk('SOL-USDT', 500, seed=4)})
+    strict = BacktestEngine(panel)
+    try:
+        strict.run('hourly')
+        assert False, "hourly ran without its layers"
+    except MissingLayersError as e:
+        assert 'catalyst' in str(e)
+    report = strict.run_all(thresholds=[])
+    assert set(report['scanners']) == {'real_alpha_oversold'}
+    assert report['skipped'] == {'comprehensive': ['news', 'social'], 'live': ['catalyst'],
+                                 'hourly': ['catalyst', 'sentiment', 'social_momentum']}
+
+    shape = panel.shape
+    live = BacktestEngine(panel, {'catalyst': np.zeros(shape)}).run('live', thresholds=[])
+    assert live['missing_layers'] == [] and live['excluded_terms'] == ['market_cap']
+    capped = BacktestEngine(panel, {'catalyst': np.zeros(shape), 'market_cap': np.full(shape, 5e9)}).run('live', thresholds=[])
+    assert capped['excluded_terms'] == []
+    assert BacktestEngine(panel, allow_missing_layers=True).run('hourly', thresholds=[])['missing_layers'] == \
+        ['catalyst', 'sentiment', 'social_momentum']
+
+    features = compute_features(panel)
+    cross = bullish_macd_cross(features)
+    histogram = features['macd_histogram'][0]
+    turns = np.flatnonzero((histogram[1:] > 0) & (histogram[:-1] <= 0)) + 1
+    assert len(turns) > 5 and (np.flatnonzero(cross[0]) == turns).all()
+    print(f"✅ Strict engine skipped 3 scanners; {len(turns)} MACD crossovers found")
+
+def test_year_of_200_coins_and_sweep():
+    """A year of 200 coins on 1h bars scores in seconds; a sharded sweep matches the serial one"""
+    print("🔍 Testing full-universe speed and sweeps...")
+    panel = CandlePanel.from_candles({f'C{i}-USDT': random_walk(f'C{i}-USDT', 24 * 365, seed=i) for i in range(200)})
+    engine = BacktestEngine(panel, allow_missing_layers=True)
+    started = time.perf_counter()
+    report = engine.run_all()
+    elapsed = time.perf_counter() - started
+    assert elapsed < 20, elapsed
+    assert set(report['scanners']) == {'comprehensive', 'hourly', 'live', 'real_alpha_oversold'}
+    assert report['scanners']['live']['missing_layers'] == ['catalyst'] and not report['skipped']
+
+    grid = {'max_rsi': [20, 30], 'min_score': [50, 70]}
+    serial = engine.sweep('real_alpha_oversold', grid, processes=1)
+    sharded = engine.sweep('real_alpha_oversold', grid, processes=2)
+    assert serial == sharded and len(serial) == 4
+    print(f"✅ 4 scanners over {panel.shape[0]}x{panel.shape[1]} bars in {elapsed:.1f}s")
+
+def main():
+    """Run all backtest engine tests"""
+    print("🧪 BACKTEST ENGINE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_rules_match_scanners,
+        test_archive_and_panel,
+        test_alerts_and_outcomes,
+        test_layers_from_scan_store,
+        test_missing_layers_and_macd_cross,
+        test_year_of_200_coins_and_sweep,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
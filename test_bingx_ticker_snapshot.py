@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the BingX all-tickers snapshot
+Replaces requests.get with canned responses - no network needed
+"""
+
+import sys
+
+import bingx_direct_api
+from bingx_direct_api import BingXDirectAPI
+
+TICKERS = [
+    {'symbol': 'BTC-USDT', 'lastPrice': '60000', 'bidPrice': '59999', 'askPrice': '60001',
+     'highPrice': '61000', 'lowPrice': '59000', 'volume': '1000', 'quoteVolume': '60000000',
+     'priceChange': '600', 'priceChangePercent': '1.01', 'closeTime': 1700000000000},
+    {'symbol': 'ETH-USDT', 'lastPrice': '3000', 'bidPrice': '2999', 'askPrice': '3001',
+     'highPrice': '3100', 'lowPrice': '2900', 'volume': '5000', 'quoteVolume': '15000000',
+     'priceChange': '-30', 'priceChangePercent': '-0.99%', 'closeTime': 1700000000000},
+]
+PREMIUM = [
+    {'symbol': 'BTC-USDT', 'markPrice': '60002', 'indexPrice': '59998',
+     'lastFundingRate': '0.0001', 'nextFundingTime': 1700003600000},
+]
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+class FakeRequests:
+    """Records every GET and answers the bulk and per-symbol endpoints"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls.append((url, dict(params or {})))
+        if url.endswith('/quote/premiumIndex'):
+            return FakeResponse({'code': 0, 'data': PREMIUM})
+        if url.endswith('/quote/ticker') and 'symbol' not in (params or {}):
+            return FakeResponse({'code': 0, 'data': TICKERS})
+        return FakeResponse({'code': 0, 'data': dict(TICKERS[0], symbol=params['symbol'], lastPrice='1.5')})
+
+def make_client():
+    fake = FakeRequests()
+    bingx_direct_api.requests = fake
+    return BingXDirectAPI(), fake
+
+def test_single_request_for_many_tickers():
+    """Many per-symbol reads cost one ticker + one premium-index request"""
+    print("🔍 Testing bulk snapshot...")
+    client, fake = make_client()
+    for symbol in ('BTC/USDT', 'ETH-USDT', 'BTC', 'ETH/USDT:USDT') * 25:
+        client.get_ticker(symbol)
+    assert len(fake.calls) == 2
+    btc = client.get_ticker('BTC/USDT')
+    assert btc['last'] == 60000.0 and btc['source'] == 'bingx_snapshot'
+    assert btc['fundingRate'] == 0.0001 and btc['markPrice'] == 60002.0
+    assert client.get_ticker('ETH')['percentage'] == -0.99
+    print(f"✅ 101 ticker reads served by {len(fake.calls)} requests")
+
+def test_snapshot_miss_falls_back():
+    """Symbols missing from the snapshot still use the per-symbol endpoint"""
+    print("🔍 Testing snapshot miss...")
+    client, fake = make_client()
+    ticker = client.get_ticker('NEWCOIN/USDT')
+    assert ticker['last'] == 1.5
+    assert ticker['source'] == 'bingx_direct_api'
+    assert fake.calls[-1][1] == {'symbol': 'NEWCOIN-USDT'}
+    assert client.get_snapshot_status()['misses'] == 1
+    print("✅ Per-symbol REST used on a miss")
+
+def test_snapshot_expires():
+    """The snapshot is re-pulled once older than its TTL"""
+    print("🔍 Testing snapshot TTL...")
+    client, fake = make_client()
+    client.get_price('BTC/USDT')
+    client.snapshot_at -= client.snapshot_ttl + 1
+    assert client.get_price('BTC/USDT')['source'] == 'bingx_snapshot'
+    assert len(fake.calls) == 4
+    print("✅ Snapshot refreshed after TTL")
+
+def test_outage_stops_serving_stale_snapshot():
+    """Failed refreshes don't make old tickers look fresh; past max age REST takes over"""
+    print("🔍 Testing snapshot during an outage...")
+    client, fake = make_client()
+    client.get_ticker('BTC/USDT')
+    good_at = client.snapshot_ok_at
+
+    def outage(url, params=None, timeout=None, **kwargs):
+        if 'symbol' in (params or {}):
+            return FakeRequests.get(fake, url, params)
+        return FakeResponse({'code': 500, 'msg': 'down'}, status_code=500)
+
+    fake.get = outage
+    client.snapshot_at -= client.snapshot_ttl + 1
+    assert client.get_ticker('BTC/USDT')['source'] == 'bingx_snapshot'
+    assert client.snapshot_ok_at == good_at and client.get_snapshot_status()['errors'] == 1
+
+    client.snapshot_ok_at -= client.snapshot_max_age + 1
+    client.snapshot_at -= client.snapshot_ttl + 1
+    ticker = client.get_ticker('BTC/USDT')
+    assert ticker['source'] == 'bingx_direct_api' and ticker['last'] == 1.5
+    assert client.get_snapshot_status()['stale']
+    assert client.get_price_table() == {}
+    print("✅ Stale snapshot dropped for per-symbol REST")
+
+def test_price_table_for_oracle():
+    """The snapshot doubles as a price-oracle source keyed by base asset"""
+    print("🔍 Testing price table...")
+    client, _ = make_client()
+    table = client.get_price_table()
+    assert set(table) == {'BTC', 'ETH'}
+    assert table['BTC']['volume_24h'] == 60000000.0
+    print("✅ Price table built from snapshot")
+
+def main():
+    """Run all BingX snapshot tests"""
+    print("🧪 BINGX TICKER SNAPSHOT TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_single_request_for_many_tickers,
+        test_snapshot_miss_falls_back,
+        test_snapshot_expires,
+        test_outage_stops_serving_stale_snapshot,
+        test_price_table_for_oracle,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
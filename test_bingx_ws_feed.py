@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test script for the BingX WebSocket feed state table
+Feeds recorded-style frames straight into the handler - no network needed
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import sys
+import threading
+import time
+
+from bingx_ws_feed import WEBSOCKETS_AVAILABLE, BingXWebSocketFeed, to_bingx_symbol, websockets
+
+def frame(data_type, data):
+    """Gzipped push frame as BingX sends it"""
+    return gzip.compress(json.dumps({'code': 0, 'dataType': data_type, 'data': data}).encode('utf-8'))
+
+def test_symbol_format():
+    """Every symbol spelling maps to the BingX swap format"""
+    print("🔍 Testing symbol normalization...")
+    for raw in ('BTC', 'btc', 'BTC/USDT', 'BTCUSDT', 'BTC-USDT', 'BTC/USDT:USDT'):
+        assert to_bingx_symbol(raw) == 'BTC-USDT', raw
+    print("✅ All spellings map to BTC-USDT")
+
+def test_ticker_state():
+    """Gzipped ticker frames land in the state table in CCXT format"""
+    print("🔍 Testing ticker state...")
+    feed = BingXWebSocketFeed()
+    feed.subscribe('BTC/USDT')
+    text = feed.decode(frame('BTC-USDT@ticker', {
+        'e': '24hTicker', 'E': 1700000000000, 's': 'BTC-USDT', 'c': '64250.5', 'B': '64250.4',
+        'A': '64250.6', 'h': '65000', 'l': '63000', 'o': '63500', 'v': '1200', 'q': '77000000',
+        'p': '750.5', 'P': '1.18'
+    }))
+    feed.handle_message(text)
+
+    ticker = feed.get_ticker('BTC/USDT')
+    assert ticker['last'] == 64250.5
+    assert ticker['bid'] < ticker['ask']
+    assert ticker['source'] == 'bingx_websocket'
+    assert feed.get_price('BTCUSDT') == 64250.5
+    assert feed.get_ticker('ETH/USDT') is None
+    print(f"✅ Ticker served from memory: ${ticker['last']:,.2f}")
+
+def test_staleness():
+    """Stale entries read as misses so callers fall back to REST"""
+    print("🔍 Testing staleness...")
+    feed = BingXWebSocketFeed(stale_after=30)
+    feed.handle_message(json.dumps({'code': 0, 'dataType': 'ETH-USDT@ticker', 'data': {'c': '3100'}}))
+    assert feed.get_price('ETH') == 3100.0
+    feed.state['ETH-USDT']['ticker']['received_at'] -= 31
+    assert feed.get_price('ETH') is None
+    assert feed.get_price('ETH', max_age=60) == 3100.0
+    print("✅ Stale ticker rejected")
+
+def test_depth_ordering():
+    """Depth snapshots keep best bid and best ask first"""
+    print("🔍 Testing depth snapshot...")
+    feed = BingXWebSocketFeed(depth_level=20)
+    feed.handle_message(json.dumps({'code': 0, 'dataType': 'SOL-USDT@depth20@500ms', 'data': {
+        'bids': [['150.1', '10'], ['150.0', '5']],
+        'asks': [['150.4', '3'], ['150.3', '8'], ['150.2', '2']]
+    }}))
+    book = feed.get_orderbook('SOL/USDT', limit=2)
+    assert book['bids'][0] == [150.1, 10.0]
+    assert book['asks'] == [[150.2, 2.0], [150.3, 8.0]]
+    assert feed.get_orderbook('SOL/USDT', limit=50) is None  # deeper than the stream
+    print("✅ Order book top-of-book correct")
+
+def test_kline_gap_detection():
+    """A jump in kline open time is counted as a gap and flagged"""
+    print("🔍 Testing kline gap detection...")
+    feed = BingXWebSocketFeed()
+    start = 1700000000000
+    for open_time in (start, start, start + 60_000, start + 240_000):
+        feed.handle_message(json.dumps({'code': 0, 'dataType': 'BTC-USDT@kline_1m',
+                                        'data': [{'T': open_time, 'o': '1', 'h': '2', 'l': '1', 'c': '2', 'v': '5'}]}))
+    bar = feed.get_kline('BTC', '1m')
+    assert bar['open_time'] == start + 240_000
+    assert bar['gap_before'] is True
+    assert feed.stats['gaps_detected'] == 1
+    print("✅ Missed candles detected")
+
+def test_control_frames():
+    """Subscription acks and undecodable frames do not touch state"""
+    print("🔍 Testing control frames...")
+    feed = BingXWebSocketFeed()
+    feed.handle_message(json.dumps({'id': 'abc', 'code': 0, 'msg': ''}))
+    feed.handle_message('not json')
+    assert feed.stats['messages'] == 0
+    assert feed.stats['decode_errors'] == 1
+    assert feed.decode(gzip.compress(b'Ping')) == 'Ping'
+    print("✅ Control frames ignored")
+
+def test_subscription_budget():
+    """Unlisted symbols are refused; a full budget evicts the least recently read symbol and warns once"""
+    print("🔍 Testing subscription budget...")
+    feed = BingXWebSocketFeed()
+    feed.contract_source = lambda: ['BTC-USDT'] + [f'C{i}-USDT' for i in range(100)]
+    feed.subscribe('BTC', pin=True)
+    assert feed.subscribe('NOPE') == [] and feed.stats['rejected_symbols'] == 1
+    assert len(feed.subscribe([f'C{i}' for i in range(65)])) == 65  # 66 symbols x 3 topics fills the 200 budget
+    feed.get_price('C0')  # read: C1 is now the least recently used
+    assert feed.subscribe('C65') == ['C65-USDT']
+    assert not feed.is_subscribed('C1') and feed.is_subscribed('C0') and feed.is_subscribed('BTC')
+    assert feed.stats['evictions'] == 1 and len(feed.symbols) == 66
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('bingx_ws_feed')
+    logger.addHandler(handler)
+    try:
+        pinned = BingXWebSocketFeed()
+        pinned.subscribe([f'P{i}' for i in range(66)], pin=True)
+        for symbol in ('X1', 'X2', 'X3'):
+            assert pinned.subscribe(symbol) == []
+    finally:
+        logger.removeHandler(handler)
+    assert sum(r.levelno == logging.WARNING for r in records) == 1
+    print("✅ Contract check, LRU eviction and a single budget warning")
+
+def test_connect_subscribe_reconnect():
+    """Against a local mock server: subscribes on connect, adds topics live, resubscribes after a drop"""
+    print("🔍 Testing connect/subscribe/reconnect...")
+    if not WEBSOCKETS_AVAILABLE:
+        print("⚠️ websockets not installed - mock server test skipped")
+        return
+    requests_seen = []  # (connection, reqType, dataType)
+    connections = []
+
+    async def handler(ws, path=None):
+        n = len(connections)
+        connections.append(ws)
+        async for message in ws:
+            request = json.loads(message)
+            requests_seen.append((n, request['reqType'], request['dataType']))
+            if request['reqType'] == 'sub' and request['dataType'].endswith('@ticker'):
+                await ws.send(frame(request['dataType'], {'c': str(100 + n)}))
+            if n == 0 and request['dataType'] == 'ETH-USDT@ticker':
+                await ws.close()  # drop the first connection once ETH is live
+
+    loop = asyncio.new_event_loop()
+    ports = []
+    ready = threading.Event()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+
+        async def start():
+            return await websockets.serve(handler, '127.0.0.1', 0)
+
+        server = loop.run_until_complete(start())
+        ports.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    assert ready.wait(5)
+
+    def wait_for(condition, timeout=10):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    feed = BingXWebSocketFeed(url=f'ws://127.0.0.1:{ports[0]}', kline_intervals=[])
+    try:
+        assert feed.start(['BTC'], wait=5)
+        assert wait_for(lambda: feed.get_price('BTC') == 100.0)
+        assert feed.subscribe('ETH') == ['ETH-USDT']
+        assert wait_for(lambda: len(connections) == 2 and feed.get_price('ETH') == 101.0)
+        resubscribed = {topic for n, kind, topic in requests_seen if n == 1 and kind == 'sub'}
+        assert {'BTC-USDT@ticker', 'ETH-USDT@ticker', 'ETH-USDT@depth20@500ms'} <= resubscribed
+        assert feed.stats['reconnects'] >= 1
+    finally:
+        feed.stop()
+        loop.call_soon_threadsafe(loop.stop)
+    print(f"✅ {len(requests_seen)} subscription requests over {len(connections)} connections")
+
+def main():
+    """Run all BingX WebSocket feed tests"""
+    print("🧪 BINGX WEBSOCKET FEED TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_symbol_format,
+        test_ticker_state,
+        test_staleness,
+        test_depth_ordering,
+        test_kline_gap_detection,
+        test_control_frames,
+        test_subscription_budget,
+        test_connect_subscribe_reconnect,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
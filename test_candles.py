@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar Candles container
+Pure in-memory checks - no network needed
+"""
+
+import importlib.util
+import sys
+
+import numpy as np
+
+from candles import Candles
+
+ROWS = [
+    [1700000000000, '100.0', '105.0', '99.0', '104.0', '10.5', 1700003599999, '1092.0'],
+    [1700003600000, '104.0', '106.0', '101.0', '102.0', '8.0', 1700007199999, '816.0'],
+    [1700007200000, '102.0', '103.0', '97.5', '98.0', '20.0', 1700010799999, '1960.0'],
+]
+BINGX_KLINES = [
+    {'open': '100.0', 'close': '104.0', 'high': '105.0', 'low': '99.0', 'volume': '10.5', 'time': 1700000000000},
+    {'open': '104.0', 'close': '102.0', 'high': '106.0', 'low': '101.0', 'volume': '8.0', 'time': 1700003600000},
+    {'open': '102.0', 'close': '98.0', 'high': '103.0', 'low': '97.5', 'volume': '20.0', 'time': 1700007200000},
+]
+
+def test_parse_formats():
+    """Binance-style rows and BingX dicts give the same typed columns"""
+    print("🔍 Testing parsing...")
+    from_rows = Candles.from_ohlcv(ROWS, symbol='BTC/USDT', timeframe='1h')
+    from_dicts = Candles.from_records(BINGX_KLINES)
+    for candles in (from_rows, from_dicts):
+        assert len(candles) == 3
+        assert candles.timestamp.dtype == np.int64 and candles.close.dtype == np.float64
+        assert candles.close.flags['C_CONTIGUOUS'] and candles.high.flags['C_CONTIGUOUS']
+        assert candles.close.tolist() == [104.0, 102.0, 98.0]
+    assert from_rows.to_ohlcv() == from_dicts.to_ohlcv()
+    assert from_rows.to_ohlcv()[0] == [1700000000000, 100.0, 105.0, 99.0, 104.0, 10.5]
+    assert len(Candles.from_ohlcv([])) == 0
+    print("✅ Both payload formats parsed into int64/float64 columns")
+
+def test_slices_are_views():
+    """Slicing shares memory with the parent arrays"""
+    print("🔍 Testing zero-copy slicing...")
+    candles = Candles.from_ohlcv(ROWS, symbol='BTC/USDT', timeframe='1h')
+    last_two = candles.tail(2)
+    assert len(last_two) == 2 and last_two.symbol == 'BTC/USDT'
+    assert np.shares_memory(last_two.close, candles.close)
+    assert candles[-1] == {'timestamp': 1700007200000, 'open': 102.0, 'high': 103.0,
+                           'low': 97.5, 'close': 98.0, 'volume': 20.0}
+    assert len(candles.tail(0)) == 0
+    print("✅ tail() and slices share memory")
+
+def test_stack_for_batches():
+    """Equal-length series stack into a (symbols x candles) matrix"""
+    print("🔍 Testing stack...")
+    a = Candles.from_ohlcv(ROWS)
+    b = Candles.from_records(BINGX_KLINES)
+    matrix = Candles.stack([a, b], 'close', length=2)
+    assert matrix.shape == (2, 2)
+    assert matrix.tolist() == [[102.0, 98.0], [102.0, 98.0]]
+    print("✅ Stacked close matrix built")
+
+def test_dataframe_round_trip():
+    """DataFrame conversion (for `ta`) round-trips exactly"""
+    print("🔍 Testing DataFrame edge...")
+    if importlib.util.find_spec('pandas') is None:
+        print("⚠️ pandas not installed - skipped")
+        return
+    candles = Candles.from_ohlcv(ROWS)
+    df = candles.to_dataframe()
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert df.index.name == 'timestamp'
+    back = Candles.from_dataframe(df)
+    assert back.to_ohlcv() == candles.to_ohlcv()
+    records = candles.to_records(readable=True)
+    assert records[0]['open_time'] == 1700000000000 and 'open_time_readable' in records[0]
+    print("✅ DataFrame and JSON edges round-trip")
+
+def main():
+    """Run all Candles tests"""
+    print("🧪 CANDLES CONTAINER TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_parse_formats,
+        test_slices_are_views,
+        test_stack_for_batches,
+        test_dataframe_round_trip,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
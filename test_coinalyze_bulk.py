@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for Coinalyze bulk market intelligence
+Stubs the HTTP layer with canned rows - no network needed
+"""
+
+import sys
+import threading
+import time
+
+from coinalyze_api import CoinalyzeAPI, MAX_SYMBOLS_PER_REQUEST
+
+ASSETS = [f'COIN{i}' for i in range(30)]
+
+class FakeCoinalyze(CoinalyzeAPI):
+    """CoinalyzeAPI with _make_request answered from memory after `latency` seconds"""
+
+    def __init__(self, latency=0.0):
+        super().__init__(api_key='test')
+        self.latency = latency
+        self.calls = []
+        self._calls_lock = threading.Lock()
+
+    def _make_request(self, endpoint, params=None):
+        with self._calls_lock:
+            self.calls.append((endpoint, dict(params or {})))
+        time.sleep(self.latency)
+        if endpoint == 'future-markets':
+            markets = [{'symbol': f'{a}USDT_PERP.A', 'base_asset': a, 'exchange': 'A', 'is_perpetual': True} for a in ASSETS]
+            markets.append({'symbol': 'COIN0USDT.A', 'base_asset': 'COIN0', 'exchange': 'A', 'is_perpetual': False})
+            return markets
+        symbols = params['symbols'].split(',')
+        if endpoint == 'funding-rate':
+            # COIN<i>: rate steps from -0.02 to +0.0235
+            return [{'symbol': s, 'exchange': 'A', 'fundingRate': -0.02 + 0.0015 * int(s[4:s.index('USDT')])}
+                    for s in symbols]
+        if endpoint == 'open-interest':
+            return [{'symbol': s, 'value': 1000.0} for s in symbols]
+        return [{'symbol': s, 'history': [{'t': 1, 'l': 5.0, 's': 2.0}]} for s in symbols]
+
+def test_batched_requests():
+    """30 symbols -> one mapping call plus ceil(30/20) calls per endpoint"""
+    print("🔍 Testing request batching...")
+    api = FakeCoinalyze()
+    intelligence = api.get_market_intelligence(ASSETS)
+    endpoints = [endpoint for endpoint, _ in api.calls]
+    chunks = -(-len(ASSETS) // MAX_SYMBOLS_PER_REQUEST)
+    assert endpoints.count('future-markets') == 1
+    for endpoint in ('funding-rate', 'open-interest', 'liquidation-history'):
+        assert endpoints.count(endpoint) == chunks, endpoint
+    assert len(intelligence['market_data']) == 30
+    entry = intelligence['market_data']['COIN3']
+    assert entry['coinalyze_symbol'] == 'COIN3USDT_PERP.A'
+    assert entry['open_interest'] == [{'symbol': 'COIN3USDT_PERP.A', 'value': 1000.0}]
+    assert entry['liquidations'][0]['history'][0]['l'] == 5.0
+    print(f"✅ {len(api.calls)} requests for {len(ASSETS)} symbols")
+
+def test_mapping_cached():
+    """The future-markets mapping is fetched once across calls"""
+    print("🔍 Testing symbol mapping cache...")
+    api = FakeCoinalyze()
+    api.get_market_intelligence(ASSETS[:5])
+    api.get_market_intelligence(ASSETS[5:10])
+    assert api.get_symbol_for_asset('coin0') == 'COIN0USDT_PERP.A'
+    assert [endpoint for endpoint, _ in api.calls].count('future-markets') == 1
+    print("✅ Mapping reused")
+
+def test_vectorized_sentiment():
+    """Per-asset sentiment matches the per-symbol thresholds"""
+    print("🔍 Testing funding sentiment...")
+    api = FakeCoinalyze()
+    market = api.get_market_intelligence(ASSETS + ['NOPE'])['market_data']
+    expected = {0: ('very_bullish', 'bullish'), 8: ('bullish', 'bullish'), 13: ('bullish', 'neutral'),
+                18: ('bearish', 'bearish'), 29: ('very_bearish', 'bearish')}
+    for i, (signal, overall) in expected.items():
+        analysis = market[f'COIN{i}']['funding_analysis']
+        assert analysis['funding_signals'][0]['sentiment'] == signal, (i, analysis)
+        assert analysis['overall_sentiment'] == overall, (i, analysis)
+        assert analysis['exchanges_analyzed'] == 1
+    assert 'error' in market['NOPE']['funding_analysis']
+    single = api.analyze_funding_sentiment('COIN0')
+    assert single['average_funding_rate'] == -0.02 and single['symbol'] == 'COIN0'
+    print("✅ Sentiment thresholds applied across the batch")
+
+def test_one_round_trip():
+    """Endpoints and chunks run concurrently, so latency ~ mapping + one request"""
+    print("🔍 Testing concurrency...")
+    api = FakeCoinalyze(latency=0.2)
+    api.get_symbol_mapping()
+    start = time.time()
+    api.get_market_intelligence(ASSETS)
+    elapsed = time.time() - start
+    assert elapsed < 0.5, elapsed
+    print(f"✅ 6 batched requests in {elapsed:.2f}s")
+
+def main():
+    """Run all Coinalyze bulk tests"""
+    print("🧪 COINALYZE BULK TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_batched_requests,
+        test_mapping_cached,
+        test_vectorized_sentiment,
+        test_one_round_trip,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
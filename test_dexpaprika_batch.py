@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for DexPaprika batching and caching
+Answers dexpaprika-mcp tool calls from memory - no npx/network needed
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from mcp_servers.dexpaprika_mcp_integration import DexPaprikaMCPClient, get_multi_chain_overview, dexpaprika_client
+
+HOUR = 3600
+
+def iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class FakeDexPaprika(DexPaprikaMCPClient):
+    """Tool calls answered after `latency` seconds; hourly candles run up to the current hour"""
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = []
+        self._calls_lock = threading.Lock()
+
+    def _run_tool(self, tool, *args, timeout=30):
+        options = dict(zip(args[::2], args[1::2]))
+        with self._calls_lock:
+            self.calls.append((tool, options))
+        time.sleep(self.latency)
+        if tool == 'getNetworkPools':
+            network = options['--network']
+            payload = {'pools': [{'address': f'{network}-pool{i}', 'token0_symbol': 'A', 'token1_symbol': 'B'}
+                                 for i in range(int(options['--limit']))]}
+        elif tool == 'getTokenDetails':
+            payload = {'symbol': options['--tokenAddress'][-3:].upper(), 'price_usd': 1.5}
+        else:
+            start = options['--start']
+            start = datetime.fromisoformat(start.replace('Z', '+00:00') if 'T' in start else start + 'T00:00:00+00:00')
+            first = -(-int(start.timestamp()) // HOUR) * HOUR
+            last = int(time.time()) // HOUR * HOUR
+            bars = range(first, last + 1, HOUR)[:int(options['--limit'])]
+            payload = {'data': [{'timestamp': iso(t), 'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 10}
+                                for t in bars]}
+        return subprocess.CompletedProcess(args, 0, stdout=json.dumps(payload), stderr='')
+
+def test_multi_chain_one_round_trip():
+    """Five networks are fetched concurrently, then served from cache"""
+    print("🔍 Testing concurrent multi-chain overview...")
+    client = FakeDexPaprika(latency=0.2)
+    start = time.time()
+    overview = client.get_networks_top_pools(['ethereum', 'solana', 'polygon', 'arbitrum', 'bsc'], 10)
+    elapsed = time.time() - start
+    assert elapsed < 0.5, elapsed
+    assert overview['solana'][0]['pool_address'] == 'solana-pool0' and len(overview['bsc']) == 10
+    client.get_networks_top_pools(['ethereum', 'bsc'], 10)
+    assert len(client.calls) == 5
+    print(f"✅ 5 networks in {elapsed:.2f}s")
+
+def test_token_details_cache():
+    """Batch lookups dedupe; EVM addresses ignore case, Solana mints don't"""
+    print("🔍 Testing token details cache...")
+    client = FakeDexPaprika(latency=0.1)
+    start = time.time()
+    details = client.get_tokens_details('ethereum', ['0xAbc', '0xdef', '0xAbc', '0x123'])
+    assert time.time() - start < 0.3
+    assert len(details) == 3 and details['0xdef']['symbol'] == 'DEF'
+    assert client.get_token_details('ethereum', '0xABC') is not None and len(client.calls) == 3
+    client.get_tokens_details('solana', ['MintAbc', 'mintabc'])
+    assert len(client.calls) == 5
+    print("✅ Token details cached per chain")
+
+def test_incremental_ohlcv():
+    """Repeat requests reuse the series; a stale one fetches only bars after the newest held"""
+    print("🔍 Testing incremental OHLCV cache...")
+    client = FakeDexPaprika()
+    first = client.get_pool_ohlcv('ethereum', '0xPool', days=2)
+    assert first and len(client.calls) == 1
+    assert client.get_pool_ohlcv('ethereum', '0xpool', days=1)
+    assert len(client.calls) == 1  # shorter window sliced from the held series
+
+    key = ('ethereum', '0xpool', '1h')
+    series = client.ohlcv_series.get(key)
+    newest = max(series['candles'])
+    # Pretend the series was last refreshed three hours ago and is missing its last 3 bars
+    stale = {ts: c for ts, c in series['candles'].items() if ts < iso(time.time() // HOUR * HOUR - 2 * HOUR)}
+    client.ohlcv_series.set(key, {**series, 'candles': stale, 'fetched_at': time.time() - 3 * HOUR})
+    refreshed = client.get_pool_ohlcv('ethereum', '0xPool', days=2)
+    tool, options = client.calls[-1]
+    assert len(client.calls) == 2 and options['--start'] == max(stale) and int(options['--limit']) <= 5
+    assert refreshed[-1]['timestamp'] == newest
+    stamps = [c['timestamp'] for c in refreshed]
+    assert stamps == sorted(set(stamps))
+
+    client.get_pool_ohlcv('ethereum', '0xPool', days=10)
+    assert len(client.calls) == 3  # longer window than held -> full fetch
+    print(f"✅ Refresh fetched {options['--limit']} bars instead of {2 * 24}")
+
+def test_module_overview_uses_batch():
+    """get_multi_chain_overview keeps its shape and goes through the batched path"""
+    print("🔍 Testing module-level overview...")
+    calls = []
+    original = dexpaprika_client.get_networks_top_pools
+    dexpaprika_client.get_networks_top_pools = lambda networks, limit: calls.append((networks, limit)) or {n: [] for n in networks}
+    try:
+        overview = get_multi_chain_overview()
+    finally:
+        dexpaprika_client.get_networks_top_pools = original
+    assert list(overview) == ['ethereum', 'solana', 'polygon', 'arbitrum', 'bsc'] and calls[0][1] == 10
+    print("✅ Overview shape unchanged")
+
+def main():
+    """Run all DexPaprika batching tests"""
+    print("🧪 DEXPAPRIKA BATCH TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_multi_chain_one_round_trip,
+        test_token_details_cache,
+        test_incremental_ohlcv,
+        test_module_overview_uses_batch,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
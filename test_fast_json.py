@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the fast JSON provider, compression and byte cache
+Builds a small Flask app in-process - no server or network needed
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+from flask import Flask, Response, jsonify
+
+from fast_json import FastJSONProvider, cached_response, clear_response_cache, dumps_bytes, init_compression
+
+def make_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+    calls = []
+
+    @app.route('/api/big')
+    @cached_response(ttl=60)
+    def big():
+        calls.append(1)
+        return jsonify({'markets': [{'symbol': f'COIN{i}/USDT', 'active': True} for i in range(500)]})
+
+    @app.route('/api/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/api/fail')
+    @cached_response(ttl=60)
+    def fail():
+        calls.append(1)
+        return jsonify({'error': 'Internal server error'}), 500
+
+    @app.route('/api/partial')
+    @cached_response(ttl=60, cacheable=lambda payload: all(e['status'] == 'success' for e in payload['exchanges'].values()))
+    def partial():
+        calls.append(1)
+        status = 'error' if len(calls) % 2 else 'success'
+        return jsonify({'exchanges': {'bingx': {'status': status, 'positions': [{'id': i} for i in range(100)]}}})
+
+    @app.route('/api/stream')
+    def stream():
+        return Response((chunk for chunk in ['{"a":', ' 1}'] * 200), mimetype='application/json')
+
+    clear_response_cache()
+    return app, calls
+
+def test_extended_types():
+    """NumPy, datetime and Decimal values serialize without custom encoders"""
+    print("🔍 Testing serialization...")
+    payload = {
+        'close': np.float64(101.5),
+        'volumes': np.array([1.0, 2.0]),
+        'strided': np.arange(6.0)[::2],
+        'count': np.int64(3),
+        'at': datetime(2024, 1, 2, 3, 4, 5),
+        'fee': Decimal('0.1'),
+        1: 'int key'
+    }
+    decoded = json.loads(dumps_bytes(payload))
+    assert decoded['close'] == 101.5 and decoded['volumes'] == [1.0, 2.0]
+    assert decoded['strided'] == [0.0, 2.0, 4.0] and decoded['count'] == 3
+    assert decoded['at'].startswith('2024-01-02T03:04:05') and decoded['fee'] == 0.1
+    assert decoded['1'] == 'int key'
+    assert json.loads(dumps_bytes({'big': 2 ** 70}))['big'] == 2 ** 70
+    print("✅ Extended types serialized")
+
+def test_compression_negotiated():
+    """Large bodies are gzipped when accepted; small ones and non-acceptors are not"""
+    print("🔍 Testing compression...")
+    app, _ = make_app()
+    client = app.test_client()
+    zipped = client.get('/api/big', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    body = json.loads(gzip.decompress(zipped.data))
+    assert len(body['markets']) == 500
+    assert int(zipped.headers['Content-Length']) == len(zipped.data)
+    plain = client.get('/api/big')
+    assert 'Content-Encoding' not in plain.headers and len(plain.get_json()['markets']) == 500
+    small = client.get('/api/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    print(f"✅ {len(plain.data)} bytes sent as {len(zipped.data)} gzipped")
+
+def test_cached_bytes_reused():
+    """A cached endpoint builds its payload once; errors are never cached"""
+    print("🔍 Testing byte cache...")
+    app, calls = make_app()
+    client = app.test_client()
+    for _ in range(5):
+        client.get('/api/big', headers={'Accept-Encoding': 'gzip'})
+        client.get('/api/big')
+    assert len(calls) == 1
+    client.get('/api/big?fresh=true')
+    assert len(calls) == 2
+    client.get('/api/fail')
+    client.get('/api/fail')
+    assert len(calls) == 4
+
+    calls.clear()
+    assert client.get('/api/partial').get_json()['exchanges']['bingx']['status'] == 'error'
+    for _ in range(3):
+        assert client.get('/api/partial').get_json()['exchanges']['bingx']['status'] == 'success'
+    assert len(calls) == 2  # the 200 carrying an exchange error wasn't cached; the clean one was
+    print("✅ Payload built once, served from bytes")
+
+def test_streams_untouched():
+    """Streaming responses (SSE/job progress) are never buffered for compression"""
+    print("🔍 Testing streamed responses...")
+    app, _ = make_app()
+    response = app.test_client().get('/api/stream', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.startswith(b'{"a": 1}')
+    print("✅ Stream passed through")
+
+def main():
+    """Run all fast JSON tests"""
+    print("🧪 FAST JSON TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_extended_types,
+        test_compression_negotiated,
+        test_cached_bytes_reused,
+        test_streams_untouched,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the funding/open-interest time-series store
+Uses a temporary SQLite file and a canned Coinalyze client - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from futures_timeseries import FuturesTimeSeriesStore, rolling_zscore
+
+HOUR = 3600
+
+class FakeCoinalyze:
+    """Serves hourly history ending at `now` and records every history call"""
+
+    def __init__(self, hours=48):
+        self.now = (int(time.time()) // HOUR) * HOUR
+        self.hours = hours
+        self.calls = []
+
+    def _resolve_symbols(self, assets):
+        return {asset: f'{asset}USDT_PERP.A' for asset in assets if asset != 'NOPE'}
+
+    def get_history_bulk(self, endpoint, symbols, start, end=None, interval='1hour', extra=None):
+        self.calls.append((endpoint, list(symbols), start))
+        rows = []
+        for symbol in symbols:
+            history = []
+            for n in range(self.hours):
+                t = self.now - (self.hours - 1 - n) * HOUR
+                if t < start:
+                    continue
+                if endpoint == 'funding-rate-history':
+                    value = 0.01 + (0.05 if n == self.hours - 1 else 0.001 * (n % 3))
+                elif endpoint == 'open-interest-history':
+                    value = 1_000_000 + 10_000 * n
+                else:
+                    value = 101.0
+                history.append({'t': t, 'o': value, 'h': value, 'l': value, 'c': value})
+            rows.append({'symbol': symbol, 'history': history})
+        return rows
+
+def make_store(api, **kwargs):
+    path = os.path.join(tempfile.mkdtemp(), 'futures.db')
+    return FuturesTimeSeriesStore(api=api, db_path=path, universe=['BTC', 'ETH'], **kwargs)
+
+def test_rolling_zscore():
+    """Vectorized rolling z-score matches a direct window computation"""
+    print("🔍 Testing rolling z-score...")
+    values = np.random.default_rng(7).normal(0.01, 0.004, 300)
+    z = rolling_zscore(values, window=50, min_periods=24)
+    assert np.isnan(z[:23]).all() and not np.isnan(z[23])
+    for i in (23, 60, 299):
+        window = values[max(0, i - 49):i + 1]
+        assert abs(z[i] - (values[i] - window.mean()) / window.std()) < 1e-9, i
+    print("✅ Rolling z-score matches reference")
+
+def test_backfill_then_incremental():
+    """First sync backfills; the next refetches the last stored (open) bar and replaces it"""
+    print("🔍 Testing backfill and incremental sync...")
+    api = FakeCoinalyze(hours=48)
+    store = make_store(api)
+    result = store.sync()
+    assert result['ingested']['funding'] == 96 and result['ingested']['open_interest'] == 96
+    assert len(api.calls) == 2 and all(start < api.now - 47 * HOUR for _, _, start in api.calls)
+
+    api.calls.clear()
+    api.now += HOUR
+    result = store.sync()
+    assert result['ingested']['funding'] == 4 and result['ingested']['open_interest'] == 4
+    assert all(start == api.now - HOUR for _, _, start in api.calls)
+    funding = store.funding_series('btc')
+    assert len(funding) == 49
+    assert abs(funding[-2]['rate'] - 0.011) < 1e-12  # the spike on the then-open bar was revised
+    oi = store.open_interest_series('btc')
+    assert oi[-2]['oi_delta'] == 0 and oi[-1]['oi_delta'] == 10_000  # deltas recomputed around the revised bar
+    print("✅ Backfilled 96 rows, then replaced the open bar and appended the next")
+
+def test_derived_series():
+    """OI delta and funding z-score are stored with each bar; basis is sampled per sync"""
+    print("🔍 Testing derived series...")
+    api = FakeCoinalyze(hours=48)
+    store = make_store(api, spot_prices=lambda assets: {asset: 100.0 for asset in assets})
+    store.sync()
+    oi = store.open_interest_series('ETH')
+    assert oi[0]['oi_delta'] is None and oi[1]['oi_delta'] == 10_000
+    assert abs(oi[1]['oi_delta_pct'] - 1.0) < 1e-9
+    latest = store.latest('BTC')
+    assert abs(latest['funding_rate'] - 0.06) < 1e-12 and latest['funding_zscore'] > 4
+    assert abs(latest['basis_pct'] - 1.0) < 1e-9
+    print(f"✅ Latest BTC funding z-score {latest['funding_zscore']:+.1f}")
+
+def test_latest_many_and_tracking():
+    """One query returns the newest row per asset; stale rows and untracked assets are skipped"""
+    print("🔍 Testing latest lookups...")
+    api = FakeCoinalyze(hours=30)
+    store = make_store(api)
+    store.track(['SOL', 'btc', 'NOPE'])
+    store.sync()
+    latest = store.latest_many(['BTC', 'SOL', 'DOGE'])
+    assert set(latest) == {'BTC', 'SOL'}
+    assert store.latest('SOL', max_age=10 * HOUR) is not None
+    store._conn().execute('UPDATE funding SET ts = ts - ?', (100 * HOUR,))
+    assert store.latest('SOL', max_age=10 * HOUR) is None
+    status = store.get_status()
+    assert status['tables']['funding']['assets'] == 3 and status['stats']['syncs'] == 1
+    print(f"✅ {len(latest)} assets from one query")
+
+def test_single_syncer():
+    """Stores sharing a database sync from one process only, until its lease lapses"""
+    print("🔍 Testing sync lease...")
+    api = FakeCoinalyze(hours=24)
+    first = make_store(api)
+    second = FuturesTimeSeriesStore(api=api, db_path=first.db_path, universe=['BTC', 'ETH'])
+    first._tick()
+    second._tick()
+    first._tick()
+    assert first.stats['syncs'] == 2 and second.stats['syncs'] == 0
+    first._conn().execute('UPDATE leases SET expires_at = 0')
+    first._conn().commit()
+    second._tick()
+    first._tick()
+    assert second.stats['syncs'] == 1 and first.stats['syncs'] == 2
+    print("✅ One syncer at a time, lease handed over on expiry")
+
+def main():
+    """Run all futures time-series tests"""
+    print("🧪 FUTURES TIME-SERIES TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_rolling_zscore,
+        test_backfill_then_incremental,
+        test_derived_series,
+        test_latest_many_and_tracking,
+        test_single_syncer,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the lazy integration registry
+Uses in-process loaders - no real integrations are imported
+"""
+
+import sys
+import time
+
+from integration_registry import IntegrationRegistry
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_indicator(self, symbol):
+        self.calls += 1
+        return {'symbol': symbol, 'value': 42}
+
+def test_nothing_loads_at_registration():
+    """Registering proxies and flags does not run the loader"""
+    print("🔍 Testing deferred loading...")
+    registry = IntegrationRegistry()
+    loads = []
+    registry.register('taapi', lambda: loads.append(1) or {'client': FakeClient()})
+    client = registry.proxy('taapi', 'client')
+    available = registry.flag('taapi')
+    assert loads == []
+    assert registry.get_status()['taapi']['loaded'] is False
+
+    assert available
+    assert client.get_indicator('BTCUSDT')['value'] == 42
+    assert loads == [1]  # loaded exactly once
+    print("✅ Loader ran on first use only")
+
+def test_failed_integration():
+    """A failing loader makes flags and proxies falsy instead of raising at import"""
+    print("🔍 Testing failed integration...")
+    registry = IntegrationRegistry()
+
+    def broken():
+        raise ImportError("No module named 'tradingview_ta'")
+
+    registry.register('lumif', broken)
+    analysis = registry.proxy('lumif', 'get_analysis')
+    assert not registry.flag('lumif')
+    assert not analysis
+    try:
+        analysis('BTC')
+        assert False, "calling an unavailable integration should raise"
+    except RuntimeError as e:
+        assert 'tradingview_ta' in str(e)
+    assert registry.get_status()['lumif']['available'] is False
+    print("✅ Failure reported without breaking startup")
+
+def test_callable_proxy_and_resolve():
+    """Function exports are callable through the proxy; resolve() unwraps it"""
+    print("🔍 Testing callable proxies...")
+    registry = IntegrationRegistry()
+    registry.register('mcp', lambda: {'get_market_data': lambda limit=10: list(range(limit))})
+    get_market_data = registry.proxy('mcp', 'get_market_data')
+    assert get_market_data(limit=3) == [0, 1, 2]
+    assert callable(registry.resolve(get_market_data))
+    print("✅ Proxied function call works")
+
+def test_background_warm_up():
+    """warm_up loads slow integrations off the request path"""
+    print("🔍 Testing background warm-up...")
+    registry = IntegrationRegistry()
+    registry.register('exchanges', lambda: time.sleep(0.05) or {'exchange_manager': object()})
+    assert registry.warm_up(delay=0)
+    registry._warmup_thread.join(timeout=2)
+    status = registry.get_status()['exchanges']
+    assert status['loaded'] and status['available']
+    assert status['load_seconds'] >= 0.05
+    print(f"✅ Warm-up loaded integration in {status['load_seconds']}s")
+
+def main():
+    """Run all integration registry tests"""
+    print("🧪 INTEGRATION REGISTRY TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_nothing_loads_at_registration,
+        test_failed_integration,
+        test_callable_proxy_and_resolve,
+        test_background_warm_up,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
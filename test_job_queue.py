@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test script for the scan job queue
+Uses a temporary SQLite file - no Flask or network needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from job_queue import JobQueue, JobStore, params_key, report_progress
+
+def make_queue(workers=2):
+    path = os.path.join(tempfile.mkdtemp(), 'jobs.db')
+    return JobQueue(JobStore(path), max_workers=workers), path
+
+def test_fast_job_returns_inline():
+    """A job that finishes inside the wait window is returned directly"""
+    print("🔍 Testing fast job...")
+    queue, _ = make_queue()
+    job_id = queue.submit('rsi_scan', lambda: {'results': [1, 2, 3]}, {'timeframe': '1h'})
+    job = queue.wait(job_id, 2)
+    assert job['status'] == 'completed'
+    assert job['result'] == {'results': [1, 2, 3]}
+    assert job['http_status'] == 200
+    print("✅ Result available after wait")
+
+def test_slow_job_is_pollable():
+    """A slow job reports running, then completed, through the store"""
+    print("🔍 Testing slow job polling...")
+    queue, path = make_queue()
+    job_id = queue.submit('macd_scan', lambda: time.sleep(0.3) or {'done': True})
+    job = queue.wait(job_id, 0.05)
+    assert job['status'] in ('queued', 'running')
+    assert 'result' not in queue.describe(job_id)
+
+    # Another process (gunicorn worker) sees the same record
+    other = JobStore(path)
+    time.sleep(0.5)
+    assert other.get(job_id)['status'] == 'completed'
+    assert queue.describe(job_id)['result'] == {'done': True}
+    print("✅ Job visible across stores")
+
+def test_failures_are_recorded():
+    """Exceptions and error status codes mark the job failed"""
+    print("🔍 Testing failed jobs...")
+    queue, _ = make_queue()
+
+    def boom():
+        raise ValueError('TAAPI rate limited')
+
+    crashed = queue.wait(queue.submit('rsi_scan', boom), 2)
+    assert crashed['status'] == 'failed' and 'rate limited' in crashed['error']
+    rejected = queue.wait(queue.submit('lumif_market_scan', lambda: ({'error': 'unavailable'}, 503)), 2)
+    assert rejected['status'] == 'failed' and rejected['http_status'] == 503
+    assert queue.get_stats()['failed'] == 2
+    print("✅ Failures captured with status codes")
+
+def test_bounded_workers():
+    """Scans beyond the pool size wait their turn instead of spawning threads"""
+    print("🔍 Testing bounded pool...")
+    queue, _ = make_queue(workers=2)
+    start = time.time()
+    ids = [queue.submit('scan', lambda: time.sleep(0.2) or {}) for _ in range(4)]
+    for job_id in ids:
+        queue.wait(job_id, 2)
+    elapsed = time.time() - start
+    assert elapsed >= 0.4
+    assert all(queue.get(job_id)['status'] == 'completed' for job_id in ids)
+    print(f"✅ 4 jobs on 2 workers took {elapsed:.2f}s")
+
+def test_progress_events():
+    """report_progress inside a job records progress and partial results"""
+    print("🔍 Testing progress streaming...")
+    queue, _ = make_queue()
+
+    def scan():
+        symbols = ['BTC', 'ETH', 'SOL']
+        for done, symbol in enumerate(symbols, 1):
+            report_progress(done, len(symbols), {'symbol': symbol} if symbol != 'ETH' else None)
+            time.sleep(0.1)
+        return {'results': ['BTC', 'SOL']}
+
+    job_id = queue.submit('rsi_scan', scan)
+    time.sleep(0.15)
+    running = queue.describe(job_id)
+    assert running['status'] == 'running'
+    assert running['progress']['total'] == 3
+    assert {'symbol': 'BTC'} in running['partial_results']
+
+    queue.wait(job_id, 2)
+    events = queue.store.events_after(job_id)
+    assert [e['type'] for e in events] == ['progress', 'progress', 'progress', 'done']
+    assert queue.store.events_after(job_id, events[1]['seq'])[0]['data']['done'] == 3
+    report_progress(1, 1)  # outside a job: no-op
+    print("✅ Per-symbol events recorded")
+
+def test_result_cache():
+    """Identical scans reuse the recent job; different params do not"""
+    print("🔍 Testing parameter-keyed cache...")
+    queue, _ = make_queue()
+    calls = []
+    scan = lambda: calls.append(1) or {'results': []}
+
+    first = queue.submit('rsi_scan', scan, {'args': {'rsi_max': '30', 'timeframe': '1H'}}, cache_ttl=60)
+    queue.wait(first, 2)
+    again = queue.submit('rsi_scan', scan, {'args': {'timeframe': '1h', 'rsi_max': '30'}}, cache_ttl=60)
+    other = queue.submit('rsi_scan', scan, {'args': {'rsi_max': '70'}}, cache_ttl=60)
+    queue.wait(other, 2)
+    fresh = queue.submit('rsi_scan', scan, {'args': {'rsi_max': '30', 'timeframe': '1h'}})
+    queue.wait(fresh, 2)
+
+    assert again == first
+    assert other != first and fresh != first
+    assert len(calls) == 3
+    assert queue.get_stats()['cache_hits'] == 1
+    assert params_key('a', {'x': 'BTC'}) == params_key('a', {'x': ' btc '})
+    print("✅ Repeat scan served from cache")
+
+def test_in_flight_coalescing():
+    """A second identical request joins the running job instead of starting another"""
+    print("🔍 Testing in-flight coalescing...")
+    queue, _ = make_queue()
+    first = queue.submit('macd_scan', lambda: time.sleep(0.2) or {}, {'args': {}}, cache_ttl=60)
+    second = queue.submit('macd_scan', lambda: {}, {'args': {}}, cache_ttl=60)
+    assert first == second
+    print("✅ Concurrent identical scans share one job")
+
+def test_orphaned_jobs():
+    """A dead worker's running job is never joined and gets failed on startup"""
+    print("🔍 Testing orphaned jobs...")
+    queue, path = make_queue()
+    store = queue.store
+    params = {'args': {'rsi_max': '30'}}
+    # A job left 'running' by a worker that was recycled mid-scan
+    dead = store.create('rsi_scan', params, params_key('rsi_scan', params))
+    store.update(dead, status='running', owner_pid=-1, heartbeat_at=time.time() - 600)
+    # And one from an earlier process that had this worker's pid
+    reused_pid = store.create('macd_scan', {}, params_key('macd_scan', {}))
+
+    fresh = queue.submit('rsi_scan', lambda: {'results': []}, params, cache_ttl=60)
+    assert fresh != dead
+    queue.wait(fresh, 2)
+
+    assert JobStore(path).fail_orphans(os.getpid()) == 2
+    assert store.get(dead)['status'] == 'failed'
+    assert store.get(reused_pid)['status'] == 'failed'
+    assert store.get(fresh)['status'] == 'completed'
+    assert store.events_after(dead, 0, 'done')
+
+    # A live job keeps its heartbeat fresh while it runs
+    beating, _ = make_queue()
+    beating.heartbeat_interval = 0.05
+    job_id = beating.submit('macd_scan', lambda: time.sleep(0.3) or {})
+    store = beating.store
+    store.update(job_id, heartbeat_at=0)
+    time.sleep(0.15)
+    assert store.get(job_id)['heartbeat_at'] > time.time() - 1
+    assert store.find_reusable(params_key('macd_scan', {}), 60) == job_id
+    beating.wait(job_id, 2)
+    print("✅ Orphans skipped and failed, live jobs keep beating")
+
+def main():
+    """Run all job queue tests"""
+    print("🧪 JOB QUEUE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_fast_job_returns_inline,
+        test_slow_job_is_pollable,
+        test_failures_are_recorded,
+        test_bounded_workers,
+        test_progress_events,
+        test_result_cache,
+        test_in_flight_coalescing,
+        test_orphaned_jobs,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
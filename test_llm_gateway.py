@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM gateway
+Uses a fake OpenAI client - no API key or network needed
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from llm_gateway import LLMGateway, content_hash
+from ttl_cache import get_cache_stats
+
+class FakeCompletions:
+    """Mimics client.chat.completions.create and records every call"""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def create(self, model, messages, **kwargs):
+        with self.lock:
+            self.calls.append({'model': model, 'messages': messages, 'kwargs': kwargs})
+        time.sleep(self.delay)
+        user = messages[-1]['content']
+        if 'Items:' in user:
+            ids = [int(i) for i in re.findall(r'^\[(\d+)\]', user, re.MULTILINE)]
+            content = json.dumps({'results': [{'id': i, 'sentiment': 'BULLISH', 'impact_score': 7} for i in ids]})
+        elif kwargs.get('response_format'):
+            content = json.dumps({'sentiment_score': 8, 'market_impact': 6, 'is_catalyst': True})
+        else:
+            content = '  BTC looks strong.  '
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def fake_client(delay=0.0):
+    completions = FakeCompletions(delay)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+def test_memoization():
+    """Identical normalized input hits the cache instead of the API"""
+    print("🔍 Testing content-hash memoization...")
+    gateway = LLMGateway()
+    client, completions = fake_client()
+    first = gateway.complete_json(client, 'news', 'gpt-4o', 'sys', 'Analyze BTC',
+                                  cache_input={'symbol': 'BTC', 'news': 'ETF  approved'})
+    second = gateway.complete_json(client, 'news', 'gpt-4o', 'sys', 'Analyze BTC (again)',
+                                   cache_input={'news': 'etf approved', 'symbol': 'BTC'})
+    assert first == second
+    assert len(completions.calls) == 1
+    assert gateway.get_stats()['cache_hits'] == 1
+    assert any(name.startswith('llm_gateway') and stats['hits'] == 1 for name, stats in get_cache_stats().items())
+    print("✅ Repeated prompt served from cache")
+
+def test_template_isolation():
+    """The same input under a different template is a different key"""
+    print("🔍 Testing template isolation...")
+    assert content_hash('news', 'x') != content_hash('social', 'x')
+    print("✅ Templates do not share cache entries")
+
+def test_ttl_expiry():
+    """Entries expire after their TTL"""
+    print("🔍 Testing TTL expiry...")
+    gateway = LLMGateway(ttl=0)
+    client, completions = fake_client()
+    gateway.complete_text(client, 'insight', 'gpt-4o', 'sys', 'BTC?')
+    text = gateway.complete_text(client, 'insight', 'gpt-4o', 'sys', 'BTC?')
+    assert text == 'BTC looks strong.'
+    assert len(completions.calls) == 2
+    print("✅ Expired entries are refetched")
+
+def test_batch_packing():
+    """Uncached items are packed into batches and cached individually"""
+    print("🔍 Testing batch packing...")
+    gateway = LLMGateway()
+    client, completions = fake_client()
+    items = [{'title': f'Headline {i}'} for i in range(10)]
+    results = gateway.grade_batch(client, 'article', 'gpt-5-mini', 'sys', 'Grade these',
+                                  items, render=lambda a: a['title'], batch_size=4)
+    assert len(completions.calls) == 3
+    assert all(r == {'sentiment': 'BULLISH', 'impact_score': 7} for r in results)
+
+    # Overlapping second run only sends the new items
+    more = items[5:] + [{'title': 'Headline 10'}]
+    gateway.grade_batch(client, 'article', 'gpt-5-mini', 'sys', 'Grade these',
+                        more, render=lambda a: a['title'], batch_size=4)
+    assert len(completions.calls) == 4
+    assert 'Headline 10' in completions.calls[-1]['messages'][-1]['content']
+    print("✅ 16 gradings took 4 requests")
+
+def test_token_budget():
+    """Concurrent batches never exceed the in-flight token budget"""
+    print("🔍 Testing token budget...")
+    gateway = LLMGateway(token_budget=1000, max_workers=4)
+    client, completions = fake_client(delay=0.05)
+    peak = []
+
+    original = gateway.budget.acquire
+    def tracking_acquire(tokens):
+        reserved = original(tokens)
+        peak.append(gateway.budget.in_flight)
+        return reserved
+    gateway.budget.acquire = tracking_acquire
+
+    items = [{'title': f'Headline {i}'} for i in range(8)]
+    gateway.grade_batch(client, 'article', 'gpt-5-mini', 'sys', 'Grade', items,
+                        render=lambda a: a['title'], batch_size=1, tokens_per_item=300)
+    assert len(completions.calls) == 8
+    assert max(peak) <= 1000
+    assert gateway.budget.in_flight == 0
+    print(f"✅ Peak tokens in flight: {max(peak)}")
+
+def main():
+    """Run all LLM gateway tests"""
+    print("🧪 LLM GATEWAY TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_memoization,
+        test_template_isolation,
+        test_ttl_expiry,
+        test_batch_packing,
+        test_token_budget,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the L2 order book replica
+Drives snapshot/diff sequences directly - no network needed
+"""
+
+import sys
+
+from orderbook_replica import L2OrderBook, OrderBookManager
+
+def seeded_book():
+    book = L2OrderBook('BTC-USDT')
+    book.apply_snapshot(
+        bids=[['100.0', '10'], ['99.9', '5'], ['99.5', '200'], ['98.0', '50']],
+        asks=[['100.1', '8'], ['100.2', '4'], ['100.8', '6'], ['103.0', '100']],
+        last_update_id=10
+    )
+    return book
+
+def test_snapshot_metrics():
+    """Spread, mid and depth bands are precomputed from the snapshot"""
+    print("🔍 Testing snapshot metrics...")
+    m = seeded_book().metrics
+    assert m['best_bid'] == 100.0 and m['best_ask'] == 100.1
+    assert round(m['spread'], 6) == 0.1
+    assert m['depth_bands']['0.5%']['bid_usd'] == round(100.0 * 10 + 99.9 * 5, 2)
+    assert m['depth_bands']['1%']['bid_usd'] == round(100.0 * 10 + 99.9 * 5 + 99.5 * 200, 2)
+    # 103.0 is outside every band
+    assert m['depth_bands']['2%']['ask_usd'] == round(100.1 * 8 + 100.2 * 4 + 100.8 * 6, 2)
+    print(f"✅ Spread {m['spread_bps']} bps, 1% imbalance {m['depth_bands']['1%']['imbalance']}")
+
+def test_incremental_updates():
+    """Diffs add, update and delete levels while keeping best-first order"""
+    print("🔍 Testing incremental diffs...")
+    book = seeded_book()
+    assert book.apply_update(bids=[['100.05', '3'], ['99.9', '0']], asks=[['100.1', '2']], last_update_id=11)
+    assert book.bids.levels(3) == [[100.05, 3.0], [100.0, 10.0], [99.5, 200.0]]
+    assert book.asks.levels(1) == [[100.1, 2.0]]
+    assert book.metrics['best_bid'] == 100.05
+    assert book.last_update_id == 11
+    print("✅ Book updated in place")
+
+def test_out_of_order_and_gap():
+    """Slightly reordered diffs are merged; a real gap forces a resync"""
+    print("🔍 Testing sequence handling...")
+    book = seeded_book()
+    assert book.apply_update([], [['100.2', '9']], last_update_id=12)  # held
+    assert book.apply_update([], [['100.1', '1']], last_update_id=11)  # fills the hole
+    assert book.last_update_id == 12
+    assert book.asks.levels(2) == [[100.1, 1.0], [100.2, 9.0]]
+
+    for update_id in (14, 15, 16, 17):
+        book.apply_update([], [], last_update_id=update_id)
+    assert not book.synced and book.gaps == 1
+    assert not book.apply_update([], [], last_update_id=18)
+    print("✅ Out-of-order merged, gap detected")
+
+def test_slippage_and_walls():
+    """Slippage walks the book; outsized levels are reported as walls"""
+    print("🔍 Testing slippage and walls...")
+    m = seeded_book().metrics
+    small = m['slippage_bps']['sell']['10000']
+    large = m['slippage_bps']['sell']['100000']
+    assert small is not None and small < 100
+    assert large is None  # deeper than the 2% band holds
+    assert m['walls']['bids'][0]['price'] == 99.5
+    print(f"✅ $10k sell slippage {small} bps, bid wall at 99.5")
+
+def test_manager_feed_messages():
+    """Manager builds books from the feed's incrDepth messages"""
+    print("🔍 Testing manager feed handling...")
+    manager = OrderBookManager()
+    manager.on_feed_message('ETH-USDT', 'incrDepth', {
+        'action': 'all', 'lastUpdateId': 1,
+        'bids': [['3000', '1'], ['2999', '2']], 'asks': [['3001', '1'], ['3002', '2']]
+    })
+    manager.on_feed_message('ETH-USDT', 'incrDepth', {
+        'action': 'update', 'lastUpdateId': 2, 'bids': [['3000', '5']], 'asks': []
+    })
+    manager.on_feed_message('ETH-USDT', 'ticker', {'c': '3000'})
+    metrics = manager.get_metrics('ETH/USDT')
+    assert metrics['bid_depth_5'] == 7.0
+    assert manager.get_orderbook('ETH', limit=1)['bids'] == [[3000.0, 5.0]]
+    assert list(manager.get_all_metrics()) == ['ETH-USDT']
+    print("✅ Feed messages maintain the replica")
+
+class FakeFeed:
+    """Records resubscribe requests"""
+
+    def __init__(self):
+        self.resubscribed = []
+
+    def resubscribe(self, topics):
+        self.resubscribed.append(list(topics))
+
+def test_resync_once_and_replay():
+    """A lost book resubscribes once, buffers diffs, and replays the newer ones onto the snapshot"""
+    print("🔍 Testing resync buffering...")
+    manager = OrderBookManager()
+    feed = FakeFeed()
+    manager.feed = feed
+    levels = {'bids': [['3000', '1']], 'asks': [['3001', '1']]}
+    manager.on_feed_message('ETH-USDT', 'incrDepth', {'action': 'all', 'lastUpdateId': 1, **levels})
+    for update_id in range(5, 11):  # 2-4 never arrive
+        manager.on_feed_message('ETH-USDT', 'incrDepth', {
+            'action': 'update', 'lastUpdateId': update_id, 'bids': [['2999', str(update_id)]], 'asks': []
+        })
+    assert feed.resubscribed == [['ETH-USDT@incrDepth']]
+    assert manager.get_stats()['awaiting_snapshot'] == 1 and manager.get_metrics('ETH') is None
+
+    manager.on_feed_message('ETH-USDT', 'incrDepth', {'action': 'all', 'lastUpdateId': 8, **levels})
+    book = manager.books['ETH-USDT']
+    assert book.synced and book.last_update_id == 10
+    assert book.bids.levels(2) == [[3000.0, 1.0], [2999.0, 10.0]]  # 9 and 10 replayed, 5-8 skipped
+    assert manager.get_stats()['awaiting_snapshot'] == 0
+
+    for update_id in (20, 21, 22, 23):
+        manager.on_feed_message('ETH-USDT', 'incrDepth', {'action': 'update', 'lastUpdateId': update_id,
+                                                          'bids': [], 'asks': []})
+    book.resync_requested_at -= 60  # the snapshot never came
+    manager.on_feed_message('ETH-USDT', 'incrDepth', {'action': 'update', 'lastUpdateId': 24, 'bids': [], 'asks': []})
+    assert len(feed.resubscribed) == 3 and manager.resync_requests == 3
+    print("✅ One request per lost sync, retried after a timeout, buffered diffs replayed")
+
+def main():
+    """Run all order book replica tests"""
+    print("🧪 ORDER BOOK REPLICA TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_snapshot_metrics,
+        test_incremental_updates,
+        test_out_of_order_and_gap,
+        test_slippage_and_walls,
+        test_manager_feed_messages,
+        test_resync_once_and_replay,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
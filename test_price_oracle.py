@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the price oracle
+Uses fake bulk sources and a fake WebSocket feed - no network needed
+"""
+
+import sys
+import time
+
+from price_oracle import PriceOracle, base_symbol
+
+class FakeFeed:
+    """Mimics BingXWebSocketFeed.get_ticker for a fixed set of live symbols"""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_ticker(self, symbol, max_age=None):
+        price = self.prices.get(symbol)
+        if price is None:
+            return None
+        return {'last': price, 'percentage': 1.5, 'quoteVolume': 1e9,
+                'source': 'bingx_websocket', 'age_seconds': 0.2}
+
+def make_oracle():
+    oracle = PriceOracle(refresh_interval=60, max_age=600)
+    oracle.register_source('coingecko', lambda: {
+        'BTC': {'price': 60000.0, 'market_cap': 1.2e12, 'change_24h': 2.0, 'volume_24h': 3e10},
+        'ETH': {'price': 3000.0, 'market_cap': 3.6e11},
+        'AVAX': {'price': 25.0, 'market_cap': 1e10},
+    }, priority=50)
+    oracle.register_source('bingx_bulk', lambda: {
+        'BTC': {'price': 60010.0},
+        'PEPE': {'price': 0.00001},
+    }, priority=10)
+    return oracle
+
+def test_base_symbol():
+    """Exchange-specific spellings map to one key"""
+    print("🔍 Testing symbol normalization...")
+    for raw in ('BTC', 'btc/usdt', 'BTC-USDT', 'BTCUSDT', 'BTC/USDT:USDT', 'XBT/USD', 'XXBT'):
+        assert base_symbol(raw) == 'BTC', raw
+    assert base_symbol('SOL.F') == 'SOL'
+    assert base_symbol('USDT') == 'USDT'
+    for asset in ('TUSD', 'SUSD', 'BUSD', 'LUSD', 'FDUSD'):
+        assert base_symbol(asset) == asset, asset
+    assert base_symbol('TUSD/USDT') == 'TUSD' and base_symbol('FDUSDUSDT') == 'FDUSD'
+    print("✅ All spellings normalize to BTC")
+
+def test_usd_suffixed_assets_keep_their_price():
+    """Stablecoins ending in USD don't collide with the tickers left after stripping USD"""
+    print("🔍 Testing USD-suffixed tickers...")
+    oracle = PriceOracle()
+    oracle.register_source('coingecko', lambda: {
+        'T': {'price': 0.015, 'market_cap': 1.5e8},
+        'TUSD': {'price': 0.999, 'market_cap': 4.9e8},
+        'S': {'price': 0.45, 'market_cap': 1.3e9},
+        'SUSD': {'price': 1.0, 'market_cap': 3e7},
+        'FD': {'price': 0.002, 'market_cap': 1e6},
+        'FDUSD': {'price': 1.001, 'market_cap': 1.1e9},
+    })
+    assert oracle.refresh() == 6
+    assert oracle.get_price('T') == 0.015 and oracle.get_price('TUSD') == 0.999
+    assert oracle.get_price('S') == 0.45 and oracle.get_price('SUSD') == 1.0
+    assert oracle.get_price('FD') == 0.002 and oracle.get_price('FDUSD') == 1.001
+    assert oracle.get_price('TUSD/USDT') == 0.999 and oracle.get_price('SUSDUSDT') == 1.0
+    print("✅ 6 tickers priced independently")
+
+def test_merge_priority():
+    """Preferred source wins; gaps (market cap) are filled from the others"""
+    print("🔍 Testing source merge...")
+    oracle = make_oracle()
+    assert oracle.refresh() == 4
+    btc = oracle.get('BTC/USDT')
+    assert btc['price'] == 60010.0 and btc['source'] == 'bingx_bulk'
+    assert btc['market_cap'] == 1.2e12
+    assert oracle.get('ETH')['source'] == 'coingecko'
+    assert oracle.get_price('PEPEUSDT') == 0.00001
+    assert oracle.get('UNKNOWN') is None
+    print("✅ Merged table built from both sources")
+
+def test_ws_ticks_override():
+    """Live WebSocket ticks beat the bulk table"""
+    print("🔍 Testing WebSocket overlay...")
+    oracle = make_oracle()
+    oracle.refresh()
+    oracle.attach_ws_feed(FakeFeed({'BTC': 60123.0}))
+    quote = oracle.get('BTC')
+    assert quote['price'] == 60123.0
+    assert quote['source'] == 'bingx_websocket'
+    assert quote['market_cap'] == 1.2e12
+    assert oracle.get('ETH')['source'] == 'coingecko'
+    assert oracle.stats['ws_hits'] == 1
+    print("✅ Tick used where available, table elsewhere")
+
+def test_failed_source_keeps_snapshot():
+    """A failing refresh keeps the last good data until it ages out"""
+    print("🔍 Testing failed refresh...")
+    oracle = PriceOracle(max_age=0.2)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("HTTP 429")
+        return {'SOL': {'price': 150.0}}
+
+    oracle.register_source('flaky', flaky)
+    oracle.refresh()
+    oracle.refresh()
+    assert oracle.get_price('SOL') == 150.0
+    assert oracle.get_status()['sources']['flaky']['error'] == 'HTTP 429'
+    time.sleep(0.25)
+    assert oracle.get_price('SOL') is None
+    print("✅ Stale data served until max_age, then dropped")
+
+def test_portfolio_valuation():
+    """Valuing many holdings is one call with no fetches"""
+    print("🔍 Testing bulk valuation...")
+    oracle = make_oracle()
+    fetches = []
+    oracle.register_source('counting', lambda: fetches.append(1) or {}, priority=100)
+    oracle.refresh()
+    holdings = {'BTC': 0.5, 'ETH': 2, 'AVAX/USD': 100, 'SOL.F': 3}
+    prices = oracle.get_prices(holdings)
+    value = sum(qty * (prices[sym] or 0) for sym, qty in holdings.items())
+    assert prices['SOL.F'] is None
+    assert value == 0.5 * 60010.0 + 2 * 3000.0 + 100 * 25.0
+    assert len(fetches) == 1
+    print(f"✅ Portfolio valued at ${value:,.2f} from memory")
+
+def main():
+    """Run all price oracle tests"""
+    print("🧪 PRICE ORACLE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_base_symbol,
+        test_usd_suffixed_assets_keep_their_price,
+        test_merge_priority,
+        test_ws_ticks_override,
+        test_failed_source_keeps_snapshot,
+        test_portfolio_valuation,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent RugCheck bulk checks and the verdict cache
+Answers HTTP calls from a canned session - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from rugcheck_integration import RugCheckAPI, VerdictCache
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+class FakeSession:
+    """Scores mints by name: rug* -> rugpull risk, safe* -> 90, anything else -> 50; gone* -> 404"""
+
+    def __init__(self, latency=0.0, throttle_first=0):
+        self.latency = latency
+        self.throttle_first = throttle_first
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        mint = url.rsplit('/', 1)[-1]
+        with self._lock:
+            self.calls.append((mint, time.monotonic()))
+            throttled = self.throttle_first > 0
+            self.throttle_first -= 1
+        time.sleep(self.latency)
+        if throttled:
+            return FakeResponse(429, headers={'Retry-After': '0'})
+        if mint.startswith('gone'):
+            return FakeResponse(404)
+        if mint.startswith('error'):
+            return FakeResponse(500)
+        risks = [{'type': 'rugpull'}] if mint.startswith('rug') else []
+        score = 90 if mint.startswith('safe') else 50
+        return FakeResponse(200, {'address': mint, 'score': score, 'risks': risks, 'liquidity': {'score': 80}})
+
+def make_api(session, workers=8, rate_limit=1000.0):
+    cache = VerdictCache(os.path.join(tempfile.mkdtemp(), 'rugcheck.db'))
+    api = RugCheckAPI(cache=cache, workers=workers, rate_limit=rate_limit)
+    api.session = session
+    return api
+
+def test_concurrent_bulk():
+    """Hundreds of mints finish in about (n / workers) round trips, not n"""
+    print("🔍 Testing concurrent bulk check...")
+    session = FakeSession(latency=0.05)
+    api = make_api(session, workers=20)
+    mints = [f'mint{i}' for i in range(200)] + ['mint0']
+    start = time.time()
+    results = api.bulk_check_tokens(mints)
+    elapsed = time.time() - start
+    assert len(results) == 200 and len(session.calls) == 200
+    assert list(results)[:3] == ['mint0', 'mint1', 'mint2']
+    assert all(r['risk_level'] == 'MEDIUM' for r in results.values())
+    assert elapsed < 2.0, elapsed
+    print(f"✅ 200 mints in {elapsed:.2f}s (serial would take {200 * 0.15:.0f}s)")
+
+def test_rate_limit_and_retry():
+    """Request starts are spaced 1/rate apart across workers; a 429 is retried"""
+    print("🔍 Testing rate limiter...")
+    session = FakeSession()
+    api = make_api(session, workers=8, rate_limit=40.0)
+    api.bulk_check_tokens([f'mint{i}' for i in range(21)])
+    starts = sorted(t for _, t in session.calls)
+    assert starts[-1] - starts[0] >= 0.45, starts[-1] - starts[0]
+
+    throttled = FakeSession(throttle_first=1)
+    api = make_api(throttled)
+    result = api.check_token('safe1')
+    assert result['risk_level'] == 'SAFE' and len(throttled.calls) == 2
+    print(f"✅ 21 requests spread over {starts[-1] - starts[0]:.2f}s")
+
+def test_verdict_cache_ttls():
+    """Rugs never expire, good verdicts do, failures are never stored"""
+    print("🔍 Testing verdict cache...")
+    session = FakeSession()
+    api = make_api(session)
+    mints = ['rug1', 'safe1', 'mint1', 'gone1', 'error1']
+    first = api.bulk_check_tokens(mints)
+    assert first['rug1']['risk_level'] == 'CRITICAL' and first['gone1']['status'] == 'not_found'
+    assert len(session.calls) == 5
+
+    second = api.bulk_check_tokens(mints)
+    assert len(session.calls) == 6  # only the failed mint is re-checked
+    assert second['safe1']['cached'] and 'cached' not in second['error1']
+    assert api.check_token('rug1')['cached'] and len(session.calls) == 6
+
+    conn = api.cache._conn()
+    rows = {row['mint']: row['expires_at'] for row in conn.execute('SELECT mint, expires_at FROM verdicts')}
+    assert rows['rug1'] is None and rows['safe1'] - time.time() <= 3 * 3600 + 1
+    assert rows['mint1'] > rows['safe1'] and 'error1' not in rows
+
+    # A day later everything but the rug is re-checked
+    conn.execute('UPDATE verdicts SET expires_at = expires_at - 86400 WHERE expires_at IS NOT NULL')
+    conn.commit()
+    session.calls.clear()
+    api.bulk_check_tokens(mints)
+    assert sorted(mint for mint, _ in session.calls) == ['error1', 'gone1', 'mint1', 'safe1']
+    status = api.cache.get_status()
+    assert status['verdicts']['CRITICAL'] == 1 and status['stats']['hits'] >= 5
+    print("✅ Verdict lifetimes follow risk level")
+
+def main():
+    """Run all RugCheck cache tests"""
+    print("🧪 RUGCHECK BULK + CACHE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_bulk,
+        test_rate_limit_and_retry,
+        test_verdict_cache_ttls,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
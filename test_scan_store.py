@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the append-only scan result store
+Uses a temporary SQLite file - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from scan_store import ScanResultStore
+
+def make_store():
+    return ScanResultStore(os.path.join(tempfile.mkdtemp(), 'scans.db'))
+
+def test_append_and_recent_window():
+    """Every scan is kept; recent reads come back newest first with dashboard fields"""
+    print("🔍 Testing scan appends...")
+    store = make_store()
+    now = time.time()
+    for i, symbol in enumerate(['btc', 'eth', 'sol', 'btc', 'ton']):
+        store.record_scan(symbol, 50.0 + i * 10, alert_triggered=50 + i * 10 >= 75,
+                          batch='1/16', position=i + 1, total=200, ts=now - 100 + i)
+    recent = store.recent_scans(limit=3)
+    assert [s['symbol'] for s in recent] == ['TON', 'BTC', 'SOL']
+    assert recent[0]['alert_triggered'] and recent[0]['position'] == 5 and recent[0]['status'] == 'completed'
+    assert len(recent[0]['timestamp']) == 8  # HH:MM:SS as the dashboard shows it
+    assert store.latest_scan()['confidence'] == 90.0
+    assert store.get_status()['scans'] == 5 and store.get_status()['symbols'] == 4
+    print("✅ 5 scans appended, window of 3 read back")
+
+def test_symbol_and_time_queries():
+    """Per-symbol history is oldest first and respects `since`; the index is used"""
+    print("🔍 Testing indexed queries...")
+    store = make_store()
+    now = time.time()
+    for hour in range(48):
+        store.record_scan('BTC', 40.0 + hour, ts=now - (47 - hour) * 3600)
+        store.record_scan('ETH', 60.0, ts=now - (47 - hour) * 3600, source='hourly_scanner')
+    history = store.symbol_history('btc', since=now - 24 * 3600 + 1)
+    assert len(history) == 24 and history[0]['confidence'] < history[-1]['confidence']
+    assert [s['symbol'] for s in store.recent_scans(limit=5, source='hourly_scanner')] == ['ETH'] * 5
+    plan = ' '.join(row[3] for row in store._conn().execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM scans WHERE ts >= 0 AND symbol = ? ORDER BY ts DESC', ('BTC',)))
+    assert 'idx_scans_symbol_ts' in plan, plan
+    print("✅ 24h BTC history from the (symbol, ts) index")
+
+def test_alerts():
+    """Alert batches append; latest-first reads keep the full alert dict"""
+    print("🔍 Testing alert log...")
+    store = make_store()
+    store.record_alerts([{'type': 'oversold', 'symbol': 'sol', 'message': 'SOL RSI 24', 'rsi': 24}],
+                        ts=time.time() - 7200)
+    store.record_alerts([{'type': 'losing_trade', 'symbol': 'BTC', 'platform': 'BingX', 'message': 'BTC -8%'},
+                         {'type': 'no_stop_loss', 'symbol': 'ETH', 'message': 'ETH has no SL'}, 'junk'])
+    alerts = store.recent_alerts()
+    assert len(alerts) == 3 and alerts[-1]['rsi'] == 24 and alerts[-1]['symbol'] == 'sol'
+    assert store.recent_alerts(symbol='sol')[0]['message'] == 'SOL RSI 24'
+    assert store.count_alerts(since=time.time() - 3600) == 2
+    print("✅ 3 alerts logged across 2 batches")
+
+def test_concurrent_writers():
+    """Threads (or processes) append without clobbering each other"""
+    print("🔍 Testing concurrent writers...")
+    store = make_store()
+    threads = [threading.Thread(target=lambda n=n: [store.record_scan(f'COIN{n}', float(i)) for i in range(25)])
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other = ScanResultStore(store.db_path)
+    assert other.get_status()['scans'] == 100
+    print("✅ 100 rows from 4 writers")
+
+def main():
+    """Run all scan store tests"""
+    print("🧪 SCAN STORE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_append_and_recent_window,
+        test_symbol_and_time_queries,
+        test_alerts,
+        test_concurrent_writers,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
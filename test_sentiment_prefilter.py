@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the local sentiment pre-filter
+Checks lexicon scoring, the escalation policy and per-article speed
+"""
+
+import sys
+import time
+
+from sentiment_prefilter import SentimentPreFilter, local_grade, to_ten_point
+
+def test_clear_cut_headlines():
+    """Obvious bullish/bearish/neutral headlines are resolved locally"""
+    print("🔍 Testing clear-cut headlines...")
+    prefilter = SentimentPreFilter()
+    bullish = prefilter.score_article({'title': 'XRP gains on new partnership'})
+    neutral = prefilter.score_article({'title': 'Solana price update for Tuesday'})
+    assert bullish['sentiment'] == 'BULLISH' and not bullish['escalate']
+    assert neutral['sentiment'] == 'NEUTRAL' and not neutral['escalate']
+    print("✅ Clear-cut headlines graded locally")
+
+def test_negation():
+    """Negated terms flip direction at reduced weight"""
+    print("🔍 Testing negation...")
+    result = SentimentPreFilter().score_text('Bitcoin does not crash despite outflows')
+    assert 'not crash' in result['matched_terms']
+    assert result['bullish_weight'] == 1.0
+    print("✅ Negation handled")
+
+def test_escalation_rules():
+    """High-impact, mixed or provider-conflicting articles escalate"""
+    print("🔍 Testing escalation rules...")
+    prefilter = SentimentPreFilter()
+    assert prefilter.score_article({'title': 'DeFi protocol hacked for $50M'})['escalate']
+    assert prefilter.score_article({'title': 'Dogecoin rallies but fears of a sell-off grow'})['ambiguous']
+    assert prefilter.score_article({'title': 'Price rallies strongly', 'sentiment': 'Negative'})['ambiguous']
+    provider_only = prefilter.score_article({'title': 'Cardano weekly recap', 'sentiment': 'Positive'})
+    assert provider_only['sentiment'] == 'BULLISH' and not provider_only['escalate']
+    print("✅ Escalation policy applied")
+
+def test_escalation_rate():
+    """Escalation rate is measured across scored articles"""
+    print("🔍 Testing escalation stats...")
+    prefilter = SentimentPreFilter()
+    local, escalate = prefilter.split([
+        {'title': 'ETH surges to record high'},
+        {'title': 'SEC sues exchange'},
+        {'title': 'Weekly market recap'},
+        {'title': 'LINK climbs after upgrade'},
+    ])
+    stats = prefilter.get_stats()
+    assert len(local) == 3 and len(escalate) == 1
+    assert stats['escalation_rate'] == 0.25
+    print(f"✅ Escalation rate: {stats['escalation_rate']:.0%}")
+
+def test_local_grade_shape():
+    """Local grades match the LLM article grade schema"""
+    print("🔍 Testing local grade shape...")
+    article = {'title': 'ETH surges to record high', 'tickers': ['ETH']}
+    grade = local_grade(article, SentimentPreFilter().score_article(article))
+    assert grade['sentiment'] == 'BULLISH' and grade['trading_signal'] == 'BUY'
+    assert grade['affected_tickers'] == ['ETH']
+    assert 1 <= grade['impact_score'] <= 10 and 1 <= grade['confidence'] <= 10
+    assert to_ten_point(-1) == 0 and to_ten_point(1) == 10
+    print("✅ Local grades are drop-in replacements")
+
+def test_speed():
+    """Scoring stays in the tens of microseconds per article"""
+    print("🔍 Testing scoring speed...")
+    prefilter = SentimentPreFilter()
+    article = {
+        'title': 'Bitcoin surges to record high as ETF inflows climb',
+        'text': 'Analysts said the rally could continue as institutional buyers accumulate. ' * 5
+    }
+    start = time.perf_counter()
+    for _ in range(2000):
+        prefilter.score_article(article)
+    per_article = (time.perf_counter() - start) / 2000 * 1e6
+    assert per_article < 500, f"{per_article:.0f}us per article"
+    print(f"✅ {per_article:.0f}us per article")
+
+def main():
+    """Run all sentiment pre-filter tests"""
+    print("🧪 SENTIMENT PRE-FILTER TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_clear_cut_headlines,
+        test_negation,
+        test_escalation_rules,
+        test_escalation_rate,
+        test_local_grade_shape,
+        test_speed,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for hedged source fan-out and the shared source cache
+Uses sleeping stand-in sources - no network needed
+"""
+
+import sys
+import threading
+import time
+
+from source_fanout import cached_call, cached_result, clear_source_cache, fetch, hedged_fanout
+
+FIELDS = {
+    'price': lambda r: (r.get('price_data') or {}).get('current_price'),
+    'recommendation': lambda r: r.get('overall_recommendation'),
+}
+
+def source(delay, calls=None, **payload):
+    """Stand-in analysis source that answers after `delay` seconds"""
+    def fn(symbol, exchange):
+        if calls is not None:
+            calls.append(symbol)
+        time.sleep(delay)
+        if payload.get('fail'):
+            raise RuntimeError('upstream down')
+        return {'status': payload.get('status', 'success'), 'symbol': symbol, **payload.get('data', {})}
+    return fn
+
+def test_fastest_source_wins():
+    """Latency tracks the fastest healthy source, not the slowest"""
+    print("🔍 Testing hedged fan-out...")
+    clear_source_cache()
+    full = {'price_data': {'current_price': 100.0}, 'overall_recommendation': 'BUY'}
+    sources = {
+        'fast': (source(0.05, data=full), ('BTC', 'BINANCE')),
+        'slow': (source(1.5, data=full), ('BTC', 'BINANCE')),
+    }
+    start = time.time()
+    fanout = hedged_fanout(sources, FIELDS)
+    elapsed = time.time() - start
+    assert elapsed < 0.5, elapsed
+    assert list(fanout['results']) == ['fast'] and fanout['pending'] == ['slow']
+    assert fanout['fields']['price'] == {'value': 100.0, 'source': 'fast'}
+    print(f"✅ Answered in {elapsed * 1000:.0f}ms with slow source pending")
+
+def test_fields_from_different_sources():
+    """Each field takes the first source that actually carries it; failures are skipped"""
+    print("🔍 Testing per-field selection...")
+    clear_source_cache()
+    sources = {
+        'broken': (source(0.01, fail=True), ('ETH', 'BINANCE')),
+        'rejected': (source(0.01, status='error', data={'error': 'rate limited'}), ('ETH', 'BINANCE')),
+        'rec_only': (source(0.05, data={'overall_recommendation': 'SELL'}), ('ETH', 'BINANCE')),
+        'price_only': (source(0.15, data={'price_data': {'current_price': 3100.0}}), ('ETH', 'BINANCE')),
+    }
+    fanout = hedged_fanout(sources, FIELDS)
+    assert fanout['fields']['recommendation']['source'] == 'rec_only'
+    assert fanout['fields']['price']['source'] == 'price_only'
+    assert set(fanout['errors']) == {'broken', 'rejected'} and fanout['errors']['rejected'] == 'rate limited'
+    print("✅ Fields merged across sources")
+
+def test_shared_cache_and_dedupe():
+    """Concurrent identical calls run once; endpoints reuse fan-out results; errors aren't cached"""
+    print("🔍 Testing shared cache...")
+    clear_source_cache()
+    calls = []
+    fn = source(0.2, calls, data={'overall_recommendation': 'BUY'})
+    threads = [threading.Thread(target=cached_call, args=('advanced_api', fn, 'SOL', 'BINANCE')) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert cached_result('advanced_api', 'sol', 'binance')['overall_recommendation'] == 'BUY'
+    hedged_fanout({'advanced_api': (fn, ('SOL', 'BINANCE'))}, FIELDS, timeout=1)
+    assert len(calls) == 1
+    failing = []
+    for _ in range(2):
+        cached_call('lumif', source(0, failing, status='error'), 'SOL', 'BINANCE')
+    assert len(failing) == 2
+    print("✅ One upstream call served six requests")
+
+def test_timeout_leaves_laggards_running():
+    """At the deadline the handler returns what it has; the shared call it joined keeps running"""
+    print("🔍 Testing timeout...")
+    clear_source_cache()
+    calls = []
+    joined = fetch('stuck', source(0.8, calls), 'DOGE', 'BINANCE')  # another request's in-flight call
+    sources = {'stuck': (source(0.8, calls), ('DOGE', 'BINANCE'))}
+    start = time.time()
+    fanout = hedged_fanout(sources, FIELDS, timeout=0.1)
+    assert time.time() - start < 0.5
+    assert fanout['results'] == {} and fanout['pending'] == ['stuck']
+    # The other request still gets its answer, and it lands in the cache for the next one
+    assert not joined.cancelled() and joined.result(2)['status'] == 'success'
+    assert cached_result('stuck', 'DOGE', 'BINANCE')['status'] == 'success'
+    assert len(calls) == 1
+    print("✅ Returned at the deadline without cancelling the shared call")
+
+def main():
+    """Run all source fan-out tests"""
+    print("🧪 SOURCE FAN-OUT TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_fastest_source_wins,
+        test_fields_from_different_sources,
+        test_shared_cache_and_dedupe,
+        test_timeout_leaves_laggards_running,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
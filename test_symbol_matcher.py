@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the Aho-Corasick symbol matcher
+Runs offline against the built-in symbol universe
+"""
+
+import sys
+import threading
+import time
+
+import symbol_matcher
+from symbol_matcher import SymbolMatcher
+
+matcher = SymbolMatcher()
+
+def test_tickers_and_names():
+    """Tickers and coin names resolve to symbols in order of appearance"""
+    print("🔍 Testing ticker and name extraction...")
+    assert matcher.extract_symbols("Bitcoin and Ethereum rally as SOL tops $200") == ['BTC', 'ETH', 'SOL']
+    assert matcher.extract_symbols("Chainlink partners with SWIFT, LINK up 8%") == ['LINK']
+    print("✅ Tickers and names extracted")
+
+def test_longest_match_wins():
+    """Multi-word names beat their prefixes (Bitcoin Cash is not BTC)"""
+    print("🔍 Testing leftmost-longest matching...")
+    assert matcher.extract_symbols("Bitcoin Cash jumps while Ethereum Classic lags") == ['BCH', 'ETC']
+    print("✅ Longest names preferred")
+
+def test_word_boundaries():
+    """Tickers inside other words are not matched"""
+    print("🔍 Testing word boundaries...")
+    assert matcher.extract_symbols("BTCUSDT longs liquidated as ETHBTC ratio slides") == []
+    assert matcher.extract_symbols("Solana-based WIF jumps") == ['SOL', 'WIF']
+    print("✅ Word boundaries respected")
+
+def test_ambiguous_symbols():
+    """Ambiguous tickers need a cashtag or parentheses"""
+    print("🔍 Testing ambiguity rules...")
+    assert matcher.extract_symbols("Gas fees drop as ONE developer says link is next") == []
+    assert matcher.extract_symbols("$ONE rallies 20% as GAS demand rises") == ['ONE']
+    assert matcher.extract_symbols("Harmony (ONE) lists on Binance") == ['ONE']
+    print("✅ Ambiguous tickers filtered")
+
+def remote_matcher():
+    """Seed universe plus a listing full of word-like tickers and names"""
+    extended = SymbolMatcher()
+    extended.add_universe({'HIGH': ['Highstreet'], 'STX': ['Stacks'], 'ROSE': ['Oasis'], 'BTC': ['Bitcoin']}, trusted=False)
+    extended.build()
+    return extended
+
+def test_all_caps_headlines():
+    """All-caps headlines keep curated tickers; listed-only tickers need a cashtag"""
+    print("🔍 Testing all-caps headlines...")
+    extended = remote_matcher()
+    assert extended.extract_symbols("BREAKING: ETHEREUM HITS NEW HIGH AS DOT AND $SOL FOLLOW") == ['ETH', 'DOT', 'SOL']
+    assert extended.extract_symbols("ETH AND BTC SURGE AFTER ETF APPROVAL") == ['ETH', 'BTC']
+    assert extended.extract_symbols("MARKETS HIT A NEW HIGH, $HIGH FOLLOWS") == ['HIGH']
+    assert extended.extract_symbols("Highstreet lists HIGH perpetuals") == ['HIGH']
+    print("✅ All-caps headlines handled")
+
+def test_name_case():
+    """Names match as listed; a one-word listed name only mid-sentence"""
+    print("🔍 Testing coin name case rules...")
+    extended = remote_matcher()
+    assert extended.extract_symbols("the ripple effects of the rate cut reached bitcoin miners") == []
+    assert extended.extract_symbols("Ripple wins appeal") == ['XRP']
+    assert extended.extract_symbols("Stacks of paperwork pile up. Miners seek an oasis of calm") == []
+    assert extended.extract_symbols("Bitcoin layer Stacks and Oasis rally") == ['BTC', 'STX', 'ROSE']
+    assert extended.extract_symbols("Stacks Rallies As Oasis Upgrade Ships") == []
+    assert len(extended.known_symbols) == len(extended.symbols) - 3
+    print("✅ Case-sensitive names, listed names only as proper nouns")
+
+def test_rebuild_is_idempotent():
+    """Building again (as the background listing load does) doesn't duplicate outputs"""
+    print("🔍 Testing repeated build()...")
+    rebuilt = SymbolMatcher()
+    before = sum(map(len, rebuilt._out))
+    rebuilt.build()
+    assert sum(map(len, rebuilt._out)) == before
+    rebuilt.add_universe({'NEWCOIN': ['Newcoin Protocol']}, trusted=False)
+    rebuilt.build()
+    after = sum(map(len, rebuilt._out))
+    rebuilt.build()
+    assert sum(map(len, rebuilt._out)) == after
+    text = "Bitcoin and Ethereum rally as SOL tops $200"
+    assert rebuilt.extract_symbols(text) == matcher.extract_symbols(text) == ['BTC', 'ETH', 'SOL']
+    print(f"✅ {after} outputs after every rebuild")
+
+def test_remote_universe_loads_in_background():
+    """The first lookup answers from the seed universe while the listing is still loading"""
+    print("🔍 Testing background universe load...")
+    release = threading.Event()
+
+    def slow_listing():
+        release.wait(5)
+        return {'NEWCOIN': ['Newcoin Protocol']}
+
+    saved = (symbol_matcher.fetch_cmc_universe, symbol_matcher._matcher)
+    symbol_matcher.fetch_cmc_universe, symbol_matcher._matcher = slow_listing, None
+    try:
+        start = time.perf_counter()
+        assert symbol_matcher.extract_symbols("analysts watch NEWCOIN and SOL") == ['SOL']
+        assert time.perf_counter() - start < 1
+        release.set()
+        deadline = time.time() + 5
+        while 'NEWCOIN' not in symbol_matcher.get_symbol_matcher().symbols and time.time() < deadline:
+            time.sleep(0.01)
+        assert symbol_matcher.extract_symbols("analysts watch NEWCOIN and SOL") == ['NEWCOIN', 'SOL']
+    finally:
+        release.set()
+        symbol_matcher.fetch_cmc_universe, symbol_matcher._matcher = saved
+    print("✅ Seed matcher served first, listing swapped in")
+
+def test_article_tagging_speed():
+    """1,000 articles (title + body) tag in under a second"""
+    print("🔍 Testing bulk tagging speed...")
+    article = {
+        'title': 'Bitcoin and Ethereum rally as SOL, AVAX and $PEPE surge',
+        'text': 'Analysts expect Chainlink (LINK) and Polygon to follow. ' * 8
+    }
+    start = time.perf_counter()
+    tags = matcher.tag_articles([article] * 1000)
+    elapsed = time.perf_counter() - start
+    assert tags[0] == ['BTC', 'ETH', 'SOL', 'AVAX', 'PEPE', 'LINK', 'MATIC']
+    assert elapsed < 1.0, f"took {elapsed:.2f}s"
+    print(f"✅ Tagged 1,000 articles in {elapsed:.3f}s")
+
+def main():
+    """Run all symbol matcher tests"""
+    print("🧪 SYMBOL MATCHER TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_tickers_and_names,
+        test_longest_match_wins,
+        test_word_boundaries,
+        test_ambiguous_symbols,
+        test_all_caps_headlines,
+        test_name_case,
+        test_rebuild_is_idempotent,
+        test_remote_universe_loads_in_background,
+        test_article_tagging_speed,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for the TradingView universe snapshot
+Feeds a fake scanner - no network needed
+"""
+
+import sys
+
+import numpy as np
+
+from tradingview_snapshot import INDICATORS, TradingViewSnapshot, column_name, split_listing, tv_timeframe
+
+def fake_scanner(coins, total=None):
+    """Scanner stub returning `coins` as paged rows; values vary per coin"""
+    calls = []
+
+    def post(payload):
+        calls.append(payload)
+        start, end = payload['range']
+        columns = payload['columns'][2:]
+        rows = []
+        for n, (name, exchange) in enumerate(coins[start:end], start=start):
+            values = []
+            for column in columns:
+                indicator = column.split('|')[0]
+                if indicator == 'RSI':
+                    values.append(10.0 + n)
+                elif indicator == 'MACD.macd':
+                    values.append(1.0 if n % 2 else -1.0)
+                elif indicator == 'MACD.signal':
+                    values.append(0.0)
+                elif indicator == 'ADX':
+                    values.append(None)
+                else:
+                    values.append(float(n + 1))
+            rows.append({'s': f'{exchange}:{name}', 'd': [f'{exchange}:{name}', exchange] + values})
+        return {'totalCount': len(coins) if total is None else total, 'data': rows}
+    return post, calls
+
+COINS = [(f'COIN{i}USDT', 'BINANCE') for i in range(60)]
+
+def test_timeframe_columns():
+    """API timeframes map to scanner column suffixes"""
+    print("🔍 Testing timeframe mapping...")
+    assert tv_timeframe('1h') == '60' and tv_timeframe('4h') == '240' and tv_timeframe('1d') == '1D'
+    assert column_name('RSI', '1h') == 'RSI|60' and column_name('RSI', '1D') == 'RSI'
+    snapshot = TradingViewSnapshot(timeframes=['1h'], post=fake_scanner([])[0])
+    assert snapshot.timeframes == ['60', '1D']
+    assert len(snapshot.column_names) == 2 * len(INDICATORS)
+    print("✅ Timeframes mapped")
+
+def test_paged_refresh_and_dedupe():
+    """Whole universe in ceil(total/page) POSTs; a coin listed on two exchanges counts once"""
+    print("🔍 Testing paged refresh...")
+    coins = COINS + [('COIN3USDT.P', 'BINGX'), ('ETHUSDT.P', 'BINGX')]
+    post, calls = fake_scanner(coins)
+    snapshot = TradingViewSnapshot(timeframes=['1h'], page_size=25, post=post)
+    assert snapshot.refresh() == 61
+    assert len(calls) == 3 and snapshot.stats['requests'] == 3
+    assert snapshot.table['symbols'][3] == 'COIN3' and snapshot.table['exchanges'][3] == 'BINANCE'
+    assert 'ETH' in snapshot.table['index']
+    assert snapshot.table['columns']['RSI|60'].flags['C_CONTIGUOUS']
+    assert snapshot.get_status()['coins'] == 61 and snapshot.get_status()['listings'] == 62
+    print(f"✅ {len(snapshot.table['index'])} coins in {len(calls)} requests")
+
+def test_screen_masks():
+    """Range filters, custom masks, sorting and limits run over the columns"""
+    print("🔍 Testing vectorized screen...")
+    snapshot = TradingViewSnapshot(timeframes=['1h'], post=fake_scanner(COINS)[0])
+    snapshot.refresh()
+    oversold = snapshot.screen('1h', {'RSI': (0, 30)}, sort_by='RSI', descending=True)
+    assert [row['symbol'] for row in oversold][:2] == ['COIN20', 'COIN19'] and len(oversold) == 21
+    bullish = snapshot.screen('1h', mask=lambda col: col('MACD.macd') > col('MACD.signal'), limit=5)
+    assert len(bullish) == 5 and all(row['MACD.macd'] > 0 for row in bullish)
+    picked = snapshot.screen('1h', symbols=['COIN5/USDT', 'UNKNOWN'])
+    assert [row['symbol'] for row in picked] == ['COIN5']
+    assert picked[0]['price'] == 6.0 and picked[0]['volume_24h'] == 36.0
+    assert snapshot.screen('5m') == []
+
+    # RSI missing for some coins: a descending sort still leads with real values
+    snapshot.table['columns']['RSI|60'][[40, 50]] = np.nan
+    top = snapshot.screen('1h', sort_by='RSI', descending=True, limit=3)
+    assert [row['symbol'] for row in top] == ['COIN59', 'COIN58', 'COIN57']
+    last = snapshot.screen('1h', sort_by='RSI', descending=True)[-2:]
+    assert [row['RSI'] for row in last] == [None, None]
+    print(f"✅ {len(oversold)} oversold, {len(bullish)} bullish")
+
+def test_exchange_prefixed_lookups():
+    """BINGX:COIN3USDT reads the BingX listing; unprefixed symbols read the most liquid one"""
+    print("🔍 Testing exchange-prefixed lookups...")
+    assert split_listing('BINANCE:BTCUSDT') == ('BINANCE', 'BTC') and split_listing('bingx:ethusdt.p') == ('BINGX', 'ETH')
+    assert split_listing('BTC/USDT:USDT') == (None, 'BTC') and split_listing('SOL-USDT') == (None, 'SOL')
+    post, _ = fake_scanner(COINS + [('COIN3USDT.P', 'BINGX')])
+    snapshot = TradingViewSnapshot(timeframes=['1h'], post=post)
+    snapshot.refresh()
+    assert snapshot.row('COIN3', '1h')['RSI'] == 13.0
+    assert snapshot.row('BINANCE:COIN3USDT', '1h')['RSI'] == 13.0
+    assert snapshot.row('BINGX:COIN3USDT.P', '1h')['RSI'] == 70.0
+    assert snapshot.row('BINGX:COIN4USDT', '1h') is None  # not listed there: no silent fallback
+    picked = snapshot.screen('1h', symbols=['BINGX:COIN3USDT', 'COIN3'])
+    assert sorted((row['exchange'], row['RSI']) for row in picked) == [('BINANCE', 13.0), ('BINGX', 70.0)]
+    assert len(snapshot.screen('1h')) == 60  # unfiltered: one row per coin
+    print("✅ Prefixed lookups pick their exchange's listing")
+
+def test_advanced_api_reads_requested_exchange():
+    """The scanner client's snapshot path reads the listing of the exchange it was asked for"""
+    print("🔍 Testing advanced API snapshot lookups...")
+    try:
+        sys.path.append('mcp_servers')
+        import tradingview_advanced_api
+    except ImportError as e:
+        print(f"⚠️ Advanced API not importable here ({e}) - check skipped")
+        return
+    post, _ = fake_scanner(COINS + [('COIN3USDT.P', 'BINGX')])
+    snapshot = TradingViewSnapshot(timeframes=['1D'], post=post)
+    snapshot.refresh()
+    saved = tradingview_advanced_api.get_tradingview_snapshot
+    tradingview_advanced_api.get_tradingview_snapshot = lambda: snapshot
+    try:
+        api = tradingview_advanced_api.TradingViewAdvancedAPI()
+        assert api._from_snapshot('COIN3USDT')['technical_indicators']['rsi'] == 13.0
+        assert api._from_snapshot('COIN3USDT.P', 'BINGX')['technical_indicators']['rsi'] == 70.0
+        assert api._from_snapshot('COIN4USDT', 'BINGX') is None
+    finally:
+        tradingview_advanced_api.get_tradingview_snapshot = saved
+    print("✅ Snapshot rows follow the requested exchange")
+
+def test_row_lookup_and_staleness():
+    """Single-coin rows map NaN to None; a stale table is not served"""
+    print("🔍 Testing row lookup...")
+    post, _ = fake_scanner(COINS)
+    snapshot = TradingViewSnapshot(timeframes=['1h'], max_age=60, post=post)
+    assert snapshot.row('COIN1', '1h') is None
+    snapshot.refresh()
+    row = snapshot.row('coin7usdt', '1h')
+    assert row['RSI'] == 17.0 and row['ADX'] is None
+    assert snapshot.row('NOPE', '1h') is None
+    snapshot.table['updated_at'] -= 120
+    assert not snapshot.has('1h') and snapshot.row('COIN7', '1h') is None
+    assert snapshot.get_status()['fresh'] is False
+    print("✅ Rows served only while fresh")
+
+def main():
+    """Run all TradingView snapshot tests"""
+    print("🧪 TRADINGVIEW SNAPSHOT TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_timeframe_columns,
+        test_paged_refresh_and_dedupe,
+        test_screen_masks,
+        test_exchange_prefixed_lookups,
+        test_advanced_api_reads_requested_exchange,
+        test_row_lookup_and_staleness,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
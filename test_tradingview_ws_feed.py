@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the multiplexed TradingView WebSocket feed
+Feeds framed messages straight into the handler - no network needed
+"""
+
+import json
+import sys
+import threading
+import time
+
+from tradingview_ws_feed import FrameParser, TradingViewWebSocketFeed, encode_frame, to_tv_symbol
+
+def frame(payload):
+    """Wrap a raw payload string in TradingView's ~m~ framing"""
+    return f"~m~{len(payload)}~m~{payload}"
+
+def qsd(session, tv_symbol, values):
+    return encode_frame('qsd', [session, {'n': tv_symbol, 's': 'ok', 'v': values}])
+
+def test_frame_parser():
+    """Frames split across messages and batched frames both parse; garbage resyncs"""
+    print("🔍 Testing incremental frame parser...")
+    parser = FrameParser()
+    stream = frame('{"m":"a","p":[]}') + frame('~h~7') + frame('{"m":"b","p":["é"]}')
+    frames = []
+    for cut in range(0, len(stream), 5):
+        frames.extend(parser.feed(stream[cut:cut + 5]))
+    assert frames == ['{"m":"a","p":[]}', '~h~7', '{"m":"b","p":["é"]}']
+    assert parser.feed('junk' + frame('ok')) == ['ok'] and parser.errors == 1
+    assert parser.feed('~m~9~m~{"m":') == [] and parser.feed('"x"}~') == ['{"m":"x"}']
+    assert parser.feed('m~2~m~ok') == ['ok']
+    print(f"✅ {len(frames)} frames from {len(stream) // 5 + 1} chunks")
+
+def test_one_subscription_message():
+    """Fifty symbols go out as one quote_add_symbols plus a handful of chart sessions"""
+    print("🔍 Testing subscription batching...")
+    feed = TradingViewWebSocketFeed(series_per_chart=10)
+    symbols = [f'COIN{i}' for i in range(50)]
+    feed.subscribe(symbols, bars=True)
+    frames = feed.session_frames()
+    methods = [json.loads(FrameParser().feed(f)[0])['m'] for f in frames]
+    assert methods.count('quote_add_symbols') == 1
+    assert methods.count('chart_create_session') == 5 and methods.count('create_series') == 50
+    add = json.loads(FrameParser().feed(frames[methods.index('quote_add_symbols')])[0])
+    assert add['p'][1:] == [to_tv_symbol(s) for s in symbols]
+    # Reconnect rebuilds the same layout instead of piling up sessions
+    assert len(feed.session_frames()) == len(frames) and len(feed.chart_sessions) == 5
+    assert to_tv_symbol('btc/usdt') == 'BINANCE:BTCUSDT' and to_tv_symbol('BINGX:ETHUSDT.P') == 'BINGX:ETHUSDT.P'
+    print(f"✅ {len(symbols)} symbols in {len(frames)} frames")
+
+def test_quote_and_bar_state():
+    """qsd updates merge into the quote; series updates keep the latest bars; heartbeats echo"""
+    print("🔍 Testing state updates...")
+    feed = TradingViewWebSocketFeed(bar_count=3)
+    feed.subscribe(['BTC', 'ETH'], bars=True)
+    feed.session_frames()
+    message = (qsd(feed.quote_session, 'BINANCE:BTCUSDT', {'lp': 64000.5, 'chp': 1.2, 'volume': 900}) +
+               qsd(feed.quote_session, 'BINANCE:BTCUSDT', {'lp': 64010.0}) + frame('~h~42'))
+    replies = feed.handle_message(message)
+    assert replies == [frame('~h~42')]
+    quote = feed.get_quote('BTCUSDT')
+    assert quote['price'] == 64010.0 and quote['change_percent'] == 1.2 and quote['volume'] == 900
+    assert feed.get_quote('ETH') is None
+    bars = [{'i': n, 'v': [1700000000 + n * 60, 1, 2, 0.5, 1.5 + n, 10]} for n in range(5)]
+    feed.handle_message(encode_frame('timescale_update', [feed.chart_sessions[0], {'sds_1': {'s': bars}}]))
+    assert [bar[0] for bar in feed.get_bars('BTC')] == [1700000120, 1700000180, 1700000240]
+    assert feed.get_quote('BTC')['ohlcv']['close'] == 5.5
+    feed.quotes['BINANCE:BTCUSDT']['received_at'] -= 1000
+    assert feed.get_quote('BTC') is None
+    print("✅ Latest values served from memory")
+
+def test_get_quotes_waits_for_first_update():
+    """get_quotes returns as soon as every symbol has a quote, not after the timeout"""
+    print("🔍 Testing batched wait...")
+    feed = TradingViewWebSocketFeed()
+    feed._thread = threading.current_thread()  # pretend the socket thread is running
+    feed.subscribe(['SOL', 'XRP'])
+
+    def deliver():
+        time.sleep(0.1)
+        feed.handle_message(qsd(feed.quote_session, 'BINANCE:SOLUSDT', {'lp': 150.0}) +
+                            qsd(feed.quote_session, 'BINANCE:XRPUSDT', {'lp': 0.5}))
+    threading.Thread(target=deliver).start()
+    start = time.time()
+    quotes = feed.get_quotes(['SOL', 'XRP'], wait=3)
+    elapsed = time.time() - start
+    assert set(quotes) == {'SOL', 'XRP'} and elapsed < 1.0
+    assert feed.get_quotes(['DOGE'], wait=0.05) == {}
+    print(f"✅ Both quotes in {elapsed:.2f}s")
+
+def methods_of(frames):
+    return [json.loads(FrameParser().feed(f)[0])['m'] for f in frames]
+
+def test_errored_symbols_are_dropped():
+    """Malformed symbols are refused; ones TradingView rejects are unsubscribed and not resent"""
+    print("🔍 Testing symbol validation and errors...")
+    feed = TradingViewWebSocketFeed()
+    assert feed.subscribe(['BTC', 'bad symbol!', '', None]) == ['BINANCE:BTCUSDT']
+    assert feed.get_status()['stats']['rejected_symbols'] == 3
+    feed.subscribe(['NOTACOIN'], bars=True)
+    feed.session_frames()
+    feed._go_live()
+    error = encode_frame('qsd', [feed.quote_session, {'n': 'BINANCE:NOTACOINUSDT', 's': 'error', 'v': {}}])
+    replies = feed.handle_message(error)
+    assert sorted(methods_of(replies)) == ['quote_remove_symbols', 'remove_series']
+    assert feed.symbols == ['BINANCE:BTCUSDT'] and feed.bar_symbols == []
+    assert feed.subscribe(['NOTACOIN']) == []
+    # A late update for the dropped symbol doesn't bring it back
+    feed.handle_message(qsd(feed.quote_session, 'BINANCE:NOTACOINUSDT', {'lp': 1.0}))
+    assert 'BINANCE:NOTACOINUSDT' not in feed.quotes
+    resent = json.loads(FrameParser().feed([f for f in feed.session_frames() if 'quote_add_symbols' in f][0])[0])
+    assert resent['p'][1:] == ['BINANCE:BTCUSDT']
+    print("✅ Errored symbol dropped and kept out of reconnects")
+
+def test_subscriptions_are_bounded():
+    """Past the budget the least recently read symbol is evicted"""
+    print("🔍 Testing LRU-bounded subscriptions...")
+    feed = TradingViewWebSocketFeed(max_symbols=3, max_series=2, series_per_chart=2)
+    feed.subscribe(['AAA', 'BBB', 'CCC'], bars=True)
+    feed.session_frames()
+    feed._go_live()
+    feed.handle_message(qsd(feed.quote_session, 'BINANCE:AAAUSDT', {'lp': 1.0}))
+    assert feed.get_quote('AAA') is not None  # AAA is now the most recently read
+    feed.subscribe(['DDD'], bars=True)
+    assert feed.symbols == ['BINANCE:AAAUSDT', 'BINANCE:CCCUSDT', 'BINANCE:DDDUSDT']
+    assert set(feed.bar_symbols) == {'BINANCE:DDDUSDT', 'BINANCE:CCCUSDT'} and len(feed._series) == 2
+    assert len(feed.chart_sessions) == 1  # the evicted series' slot was reused
+    for n in range(20):
+        feed.subscribe([f'COIN{n}'])
+    assert len(feed.symbols) == 3 and len(feed.quotes) == 3
+    assert feed.get_status()['stats']['evictions'] == 2 + 20
+    print(f"✅ Capped at {feed.max_symbols} quotes / {feed.max_series} series")
+
+def main():
+    """Run all TradingView WebSocket feed tests"""
+    print("🧪 TRADINGVIEW WS FEED TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_frame_parser,
+        test_one_subscription_message,
+        test_quote_and_bar_state,
+        test_get_quotes_waits_for_first_update,
+        test_errored_symbols_are_dropped,
+        test_subscriptions_are_bounded,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
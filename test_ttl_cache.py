@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded LRU + TTL cache
+Uses a temporary SQLite file for spill-over - no network needed
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from ttl_cache import TTLCache, get_cache_stats
+
+def test_lru_eviction():
+    """The least recently used entry goes first when max_entries is hit"""
+    print("🔍 Testing LRU eviction...")
+    cache = TTLCache('test_lru', ttl=60, max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key.upper())
+    assert cache.get('a') == 'A'  # 'b' is now the oldest
+    cache.set('d', 'D')
+    assert cache.get('b') is None
+    assert [cache.get(k) for k in ('a', 'c', 'd')] == ['A', 'C', 'D']
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 3
+    print("✅ Oldest entry evicted, recent ones kept")
+
+def test_per_entry_ttl():
+    """Entries expire on their own TTL, including TTLs longer than a day"""
+    print("🔍 Testing per-entry TTL...")
+    cache = TTLCache('test_ttl', ttl=0.1)
+    cache.set('short', 1)
+    cache.set('long', 2, ttl=2 * 86400)
+    assert 'short' in cache
+    time.sleep(0.15)
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+    stats = cache.get_stats()
+    assert stats['expirations'] == 1
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print("✅ Short entry expired, two-day entry still fresh")
+
+def test_memory_bound():
+    """Large values push out older ones once max_bytes is exceeded"""
+    print("🔍 Testing memory bound...")
+    cache = TTLCache('test_bytes', ttl=60, max_entries=100, max_bytes=50_000)
+    for i in range(10):
+        cache.set(i, 'x' * 10_000)
+    stats = cache.get_stats()
+    assert stats['approx_bytes'] <= 50_000
+    assert stats['entries'] < 10
+    assert cache.get(9) is not None
+    print(f"✅ {stats['entries']} entries kept in {stats['approx_bytes']} bytes")
+
+def test_get_or_set():
+    """The factory runs once; None results are not cached"""
+    print("🔍 Testing get_or_set...")
+    cache = TTLCache('test_factory', ttl=60)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_set('k', lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+    cache.get_or_set('none', lambda: calls.append(1))
+    cache.get_or_set('none', lambda: calls.append(1))
+    assert len(calls) == 3
+    print("✅ Factory called once per cacheable value")
+
+def test_sqlite_spill():
+    """Evicted entries spill to SQLite and come back on the next lookup"""
+    print("🔍 Testing SQLite spill-over...")
+    path = os.path.join(tempfile.mkdtemp(), 'spill.db')
+    cache = TTLCache('test_spill', ttl=60, max_entries=2, spill=True, spill_path=path)
+    cache.set('a', {'price': 1.0})
+    cache.set('b', {'price': 2.0})
+    cache.set('c', {'price': 3.0})
+    assert len(cache) == 2
+    assert cache.get('a') == {'price': 1.0}
+    stats = cache.get_stats()
+    assert stats['spill_writes'] >= 1
+    assert stats['spill_hits'] == 1
+
+    # Expired spilled entries are not resurrected
+    cache.set('old', 'stale', ttl=0.05)
+    cache.set('x', 1)
+    cache.set('y', 2)
+    time.sleep(0.1)
+    assert cache.get('old') is None
+    print("✅ Spilled entry promoted back, expired one dropped")
+
+def test_stats_registry():
+    """Every cache shows up in get_cache_stats(), even when two share a name"""
+    print("🔍 Testing stats registry...")
+    cache = TTLCache('test_registry', ttl=60)
+    cache.set('k', 'v')
+    cache.get('k')
+    cache.get('missing')
+    stats = get_cache_stats()['test_registry']
+    assert stats['hit_rate'] == 0.5
+    assert stats['entries'] == 1
+
+    twin = TTLCache('test_registry', ttl=60)  # e.g. a client built twice
+    twin.get('k')
+    stats = get_cache_stats()
+    assert stats['test_registry']['hits'] == 1 and stats['test_registry#2']['misses'] == 1
+    del twin
+    assert 'test_registry#2' not in get_cache_stats()
+    print("✅ Registry reports hit rate per instance")
+
+def main():
+    """Run all TTL cache tests"""
+    print("🧪 TTL CACHE TESTS")
+    print("=" * 50)
+
+    tests = [
+        test_lru_eviction,
+        test_per_entry_ttl,
+        test_memory_bound,
+        test_get_or_set,
+        test_sqlite_spill,
+        test_stats_registry,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL - {test.__name__}: {e}")
+
+    print(f"\n🎯 Overall Result: {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
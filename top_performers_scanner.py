@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict, Optional
 
+from symbol_matcher import extract_primary_symbol
+
 # Railway API configuration
 RAILWAY_API_URL = "https://titan-trading-2-production.up.railway.app"
 
@@ -196,18 +198,7 @@ class TopPerformersScanner:
     
     def _extract_symbol_from_title(self, title: str) -> Optional[str]:
         """Extract cryptocurrency symbol from title"""
-        common_symbols = [
-            'BTC', 'ETH', 'XRP', 'ADA', 'SOL', 'MATIC', 'LINK', 'UNI', 'AAVE', 'SUSHI',
-            'DOGE', 'SHIB', 'AVAX', 'DOT', 'ATOM', 'LUNA', 'FTM', 'NEAR', 'ALGO', 'ICP',
-            'VET', 'THETA', 'FIL', 'TRX', 'ETC', 'XLM', 'MANA', 'SAND', 'CRV', 'COMP'
-        ]
-        
-        title_upper = title.upper()
-        for symbol in common_symbols:
-            if symbol in title_upper:
-                return symbol
-        
-        return None
+        return extract_primary_symbol(title)
     
     async def generate_trading_opportunities(self):
         """Generate trading opportunities from performers and catalysts"""
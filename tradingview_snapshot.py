@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+TradingView Universe Snapshot
+Pulls the TradingView crypto scanner for every USDT pair on the
+configured exchanges (BINANCE, BINGX) across several timeframes in a
+handful of paged POSTs, and keeps the result as a columnar table (one
+float64 array per indicator/timeframe). RSI, MACD and multi-indicator
+scans become boolean masks over 500+ coins instead of one TAAPI call
+per symbol.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from price_oracle import PAIR_QUOTES, base_symbol
+from service_base import PeriodicWorker, Singleton
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    requests = None
+    REQUESTS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TV_SCAN_URL = "https://scanner.tradingview.com/crypto/scan"
+SNAPSHOT_REFRESH_SECONDS = int(os.getenv('TV_SNAPSHOT_REFRESH', '300'))
+SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv('TV_SNAPSHOT_MAX_AGE', '900'))
+SNAPSHOT_PAGE_SIZE = int(os.getenv('TV_SNAPSHOT_PAGE_SIZE', '500'))
+SNAPSHOT_EXCHANGES = [e.strip().upper() for e in os.getenv('TV_SNAPSHOT_EXCHANGES', 'BINANCE,BINGX').split(',') if e.strip()]
+SNAPSHOT_TIMEFRAMES = [t.strip() for t in os.getenv('TV_SNAPSHOT_TIMEFRAMES', '15,60,240,1D').split(',') if t.strip()]
+
+# Same indicator set TradingViewAdvancedAPI.get_scanner_data requests per symbol
+INDICATORS = (
+    'close', 'change', 'change_abs', 'volume', 'Recommend.All', 'RSI', 'MACD.macd', 'MACD.signal',
+    'BB.upper', 'BB.lower', 'EMA20', 'EMA50', 'SMA20', 'SMA50', 'Stoch.K', 'Stoch.D', 'ADX', 'CCI20', 'Mom', 'ROC'
+)
+
+# API timeframe spellings -> scanner column suffix (daily columns carry no suffix)
+TIMEFRAME_ALIASES = {
+    '1m': '1', '5m': '5', '15m': '15', '30m': '30', '1h': '60', '60m': '60', '2h': '120',
+    '4h': '240', '1d': '1D', 'd': '1D', '1w': '1W', 'w': '1W'
+}
+
+
+def tv_timeframe(timeframe: str) -> str:
+    tf = str(timeframe).strip()
+    return TIMEFRAME_ALIASES.get(tf.lower(), tf.upper() if tf.lower().endswith(('d', 'w')) else tf)
+
+
+def column_name(indicator: str, timeframe: str) -> str:
+    tf = tv_timeframe(timeframe)
+    return indicator if tf == '1D' else f"{indicator}|{tf}"
+
+
+def split_listing(symbol: str) -> Tuple[Optional[str], str]:
+    """'BINANCE:BTCUSDT' / 'BINGX:ETHUSDT.P' -> (exchange, base); unprefixed symbols -> (None, base).
+    A ccxt settle suffix (BTC/USDT:USDT) is not an exchange prefix."""
+    prefix, _, rest = str(symbol).strip().partition(':')
+    if rest and not any(c in prefix for c in '/-') and rest.upper() not in PAIR_QUOTES:
+        rest = rest[:-2] if rest.upper().endswith('.P') else rest
+        return prefix.upper(), base_symbol(rest)
+    return None, base_symbol(symbol)
+
+
+def post_scanner(payload: Dict) -> Dict:
+    """One scanner POST; returns the raw {'totalCount', 'data'} body"""
+    if not REQUESTS_AVAILABLE:
+        raise RuntimeError("requests not installed")
+    response = requests.post(TV_SCAN_URL, json=payload, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"TradingView scanner HTTP {response.status_code}")
+    return response.json()
+
+
+class TradingViewSnapshot(PeriodicWorker):
+    """Columnar full-universe scanner table, refreshed in the background"""
+
+    worker_name = 'tradingview-snapshot'
+
+    def __init__(self, timeframes: Sequence[str] = SNAPSHOT_TIMEFRAMES, exchanges: Sequence[str] = SNAPSHOT_EXCHANGES,
+                 refresh_interval: float = SNAPSHOT_REFRESH_SECONDS, max_age: float = SNAPSHOT_MAX_AGE_SECONDS,
+                 page_size: int = SNAPSHOT_PAGE_SIZE, auto_start: bool = False, initial_wait: float = 10.0,
+                 post: Callable[[Dict], Dict] = post_scanner):
+        timeframes = [tv_timeframe(tf) for tf in timeframes]
+        if '1D' not in timeframes:
+            timeframes.append('1D')  # daily price/volume/change context for every scan
+        self.timeframes = timeframes
+        self.exchanges = list(exchanges)
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.page_size = page_size
+        self.post = post
+        self.column_names = [column_name(ind, tf) for tf in self.timeframes for ind in INDICATORS]
+        # Swapped as a whole on refresh so readers never see a half-built table
+        self.table: Dict = {'symbols': [], 'exchanges': [], 'index': {}, 'listings': {},
+                            'primary': np.zeros(0, dtype=bool), 'columns': {}, 'updated_at': 0.0}
+        self._refresh_lock = threading.Lock()
+        self._init_worker(auto_start, initial_wait)
+        self.stats = {'refreshes': 0, 'refresh_errors': 0, 'requests': 0, 'last_error': None, 'fetch_seconds': 0.0}
+
+    # ---- refresh -----------------------------------------------------------
+
+    def _payload(self, offset: int) -> Dict:
+        return {
+            'filter': [
+                {'left': 'exchange', 'operation': 'in_range', 'right': self.exchanges},
+                {'left': 'name', 'operation': 'match', 'right': 'USDT'}
+            ],
+            'columns': ['name', 'exchange'] + self.column_names,
+            'sort': {'sortBy': 'volume', 'sortOrder': 'desc'},  # most liquid listing of a coin comes first
+            'range': [offset, offset + self.page_size]
+        }
+
+    def refresh(self) -> int:
+        """Pull every page and rebuild the table; returns the number of coins"""
+        with self._refresh_lock:
+            start = time.time()
+            try:
+                rows, offset, total = [], 0, None
+                while total is None or offset < total:
+                    body = self.post(self._payload(offset)) or {}
+                    self.stats['requests'] += 1
+                    page = body.get('data') or []
+                    rows.extend(page)
+                    total = body.get('totalCount', len(rows))
+                    offset += self.page_size
+                    if not page:
+                        break
+                self.table = self._build(rows)
+                self.stats['refreshes'] += 1
+                self.stats['last_error'] = None
+            except Exception as e:
+                # Keep serving the previous table until it ages out
+                logger.warning(f"⚠️ TradingView snapshot refresh failed: {e}")
+                self.stats['refresh_errors'] += 1
+                self.stats['last_error'] = str(e)
+            self.stats['fetch_seconds'] = round(time.time() - start, 2)
+        if self.table['symbols']:
+            self._ready.set()
+        return len(self.table['index'])
+
+    def _build(self, rows: List[Dict]) -> Dict:
+        """One row per exchange listing; `index` points each coin at its most liquid one (the `primary` rows)"""
+        symbols, exchanges, values = [], [], []
+        index: Dict[str, int] = {}
+        listings: Dict[Tuple[str, str], int] = {}
+        for row in rows:
+            d = row.get('d') or []
+            if len(d) < 2 + len(self.column_names):
+                continue
+            name = str(d[0]).split(':')[-1]
+            if name.endswith('.P'):
+                name = name[:-2]
+            if not name.endswith('USDT') or len(name) <= 4:
+                continue
+            base, exchange = base_symbol(name), str(d[1]).upper()
+            if (exchange, base) in listings:
+                continue  # spot and perp on one exchange: keep the more liquid
+            listings[(exchange, base)] = len(symbols)
+            index.setdefault(base, len(symbols))
+            symbols.append(base)
+            exchanges.append(exchange)
+            values.append([v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+                           for v in d[2:2 + len(self.column_names)]])
+        matrix = np.array(values, dtype=np.float64).reshape(len(values), len(self.column_names))
+        columns = {name: np.ascontiguousarray(matrix[:, j]) for j, name in enumerate(self.column_names)}
+        primary = np.zeros(len(symbols), dtype=bool)
+        primary[list(index.values())] = True
+        return {'symbols': symbols, 'exchanges': exchanges, 'index': index, 'listings': listings,
+                'primary': primary, 'columns': columns, 'updated_at': time.time()}
+
+    # ---- background refresh ------------------------------------------------
+
+    def _tick(self):
+        self.refresh()
+
+    def _interval(self) -> float:
+        return self.refresh_interval
+
+    def _describe(self) -> str:
+        return (f"every {self.refresh_interval}s ({','.join(self.exchanges)} USDT pairs, "
+                f"timeframes {self.timeframes})")
+
+    # ---- lookups -----------------------------------------------------------
+
+    @property
+    def age(self) -> float:
+        updated_at = self.table['updated_at']
+        return time.time() - updated_at if updated_at else float('inf')
+
+    def has(self, timeframe: str) -> bool:
+        """True when a fresh table covers `timeframe`"""
+        self._ensure_started()
+        return (tv_timeframe(timeframe) in self.timeframes and bool(self.table['symbols'])
+                and self.age <= self.max_age)
+
+    @staticmethod
+    def _locate(table: Dict, symbol: str) -> Optional[int]:
+        """Row for a symbol: that exchange's listing when prefixed (BINGX:SOLUSDT), else the coin's most liquid"""
+        exchange, base = split_listing(symbol)
+        if exchange:
+            return table['listings'].get((exchange, base))
+        return table['index'].get(base)
+
+    def row(self, symbol: str, timeframe: str = '1D') -> Optional[Dict[str, Optional[float]]]:
+        """All indicators for one coin at one timeframe (NaN -> None), or None when unknown/stale"""
+        if not self.has(timeframe):
+            return None
+        table = self.table
+        i = self._locate(table, symbol)
+        if i is None:
+            return None
+        values = {}
+        for indicator in INDICATORS:
+            value = table['columns'][column_name(indicator, timeframe)][i]
+            values[indicator] = None if np.isnan(value) else float(value)
+        return values
+
+    def screen(self, timeframe: str, ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+               mask: Optional[Callable[[Callable[[str], np.ndarray]], np.ndarray]] = None,
+               symbols: Optional[Iterable[str]] = None, sort_by: Optional[str] = None,
+               descending: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """Vectorized filter over the universe.
+
+        `ranges` maps indicator -> (min, max) inclusive; `mask(col)` can add
+        any array condition, where col('RSI') is that indicator's column at
+        `timeframe`. Rows carry every indicator at `timeframe` plus daily
+        price, change_24h and volume_24h (quote volume). Without `symbols`
+        each coin appears once, from its most liquid listing; an
+        exchange-prefixed symbol picks that exchange's listing. Sorting
+        puts missing values last either way.
+        """
+        if not self.has(timeframe):
+            return []
+        table = self.table
+        columns = table['columns']
+
+        def col(indicator: str) -> np.ndarray:
+            return columns[column_name(indicator, timeframe)]
+
+        if symbols is not None:
+            keep = np.zeros(len(table['symbols']), dtype=bool)
+            for symbol in symbols:
+                i = self._locate(table, symbol)
+                if i is not None:
+                    keep[i] = True
+        else:
+            keep = table['primary'].copy()
+        with np.errstate(invalid='ignore'):
+            for indicator, (low, high) in (ranges or {}).items():
+                values = col(indicator)
+                keep &= (values >= low) & (values <= high)  # NaN never matches
+            if mask is not None:
+                keep &= mask(col)
+
+        rows = np.flatnonzero(keep)
+        if sort_by:
+            values = col(sort_by)[rows]
+            rows = rows[np.argsort(-values if descending else values, kind='stable')]  # NaN sorts last
+        if limit is not None:
+            rows = rows[:limit]
+
+        close_1d, change_1d, volume_1d = columns['close'], columns['change'], columns['volume']
+        picked = {ind: col(ind)[rows].tolist() for ind in INDICATORS}
+        results = []
+        for n, i in enumerate(rows.tolist()):
+            entry = {'symbol': table['symbols'][i], 'exchange': table['exchanges'][i], 'timeframe': timeframe}
+            for ind in INDICATORS:
+                value = picked[ind][n]
+                entry[ind] = None if value != value else value
+            entry['price'] = None if np.isnan(close_1d[i]) else float(close_1d[i])
+            entry['change_24h'] = 0.0 if np.isnan(change_1d[i]) else float(change_1d[i])
+            entry['volume_24h'] = 0.0 if np.isnan(volume_1d[i]) else float(volume_1d[i] * close_1d[i])
+            results.append(entry)
+        return results
+
+    def get_status(self) -> Dict:
+        age = self.age
+        return {
+            'coins': len(self.table['index']),
+            'listings': len(self.table['symbols']),
+            'exchanges': self.exchanges,
+            'timeframes': self.timeframes,
+            'columns': len(self.column_names),
+            'age_seconds': round(age, 1) if age != float('inf') else None,
+            'fresh': age <= self.max_age,
+            'refresh_interval': self.refresh_interval,
+            'running': self.running,
+            'stats': self.stats.copy()
+        }
+
+
+_snapshot: Singleton[TradingViewSnapshot] = Singleton('TV_SNAPSHOT_ENABLED')
+
+
+def get_tradingview_snapshot() -> Optional[TradingViewSnapshot]:
+    """Shared snapshot; TV_SNAPSHOT_ENABLED=false disables it"""
+    if not REQUESTS_AVAILABLE:
+        return None
+    return _snapshot.get(lambda: TradingViewSnapshot(auto_start=True))
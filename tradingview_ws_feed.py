@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+TradingView WebSocket Market Data Feed
+One long-lived connection to TradingView's socket.io endpoint carrying a
+single quote session for every subscribed symbol plus a few chart
+sessions for bars. The `~m~<len>~m~` framed stream is parsed
+incrementally and the latest quote/bars per symbol are kept in memory,
+so fifty symbols cost one connection and one round trip instead of a
+connect-and-sleep per symbol. On-demand subscriptions are validated,
+bounded with least-recently-used eviction, and symbols TradingView
+rejects are dropped instead of being resubscribed on every reconnect.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import string
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TV_WS_URL = "wss://data.tradingview.com/socket.io/websocket"
+TV_WS_ORIGIN = "https://data.tradingview.com"
+
+SERIES_PER_CHART_SESSION = int(os.getenv('TV_WS_SERIES_PER_CHART', '10'))
+DEFAULT_BAR_INTERVAL = os.getenv('TV_WS_BAR_INTERVAL', '240')
+DEFAULT_BAR_COUNT = int(os.getenv('TV_WS_BAR_COUNT', '300'))
+MAX_QUOTE_SYMBOLS = int(os.getenv('TV_WS_MAX_SYMBOLS', '400'))
+MAX_CHART_SERIES = int(os.getenv('TV_WS_MAX_SERIES', '50'))
+ERROR_RETRY_SECONDS = 3600  # a symbol TradingView rejected isn't subscribed again for this long
+
+TV_SYMBOL_PATTERN = re.compile(r'^[A-Z0-9_]{2,20}:[A-Z0-9_.!]{2,40}$')
+
+QUOTE_FIELDS = [
+    'lp', 'ch', 'chp', 'volume', 'bid', 'ask', 'high_price', 'low_price', 'open_price',
+    'prev_close_price', 'lp_time', 'description', 'exchange', 'type', 'currency_code'
+]
+
+FRAME_MARKER = '~m~'
+HEARTBEAT_PREFIX = '~h~'
+
+
+def encode_frame(method: str, params: List) -> str:
+    payload = json.dumps({'m': method, 'p': params}, separators=(',', ':'))
+    return f"{FRAME_MARKER}{len(payload)}{FRAME_MARKER}{payload}"
+
+
+def to_tv_symbol(symbol: str, exchange: str = 'BINANCE') -> str:
+    """BTC, BTC/USDT, BTC-USDT or BTCUSDT -> BINANCE:BTCUSDT (EXCHANGE:TICKER passes through)"""
+    symbol = symbol.strip().upper()
+    if ':' in symbol and not symbol.endswith(':USDT'):
+        return symbol
+    symbol = symbol.replace(':USDT', '').replace('/', '').replace('-', '')
+    if not symbol.endswith('USDT'):
+        symbol += 'USDT'
+    return f"{exchange.upper()}:{symbol}"
+
+
+def _session_id(prefix: str) -> str:
+    return prefix + ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(12))
+
+
+class FrameParser:
+    """Incremental `~m~<len>~m~<payload>` parser.
+
+    Frames are cut out of the buffer by offset; a frame split across two
+    socket messages stays buffered until the rest arrives.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self.errors = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        buf = self._buffer + chunk if self._buffer else chunk
+        frames = []
+        pos, size_end = 0, len(buf)
+        while pos < size_end:
+            if not buf.startswith(FRAME_MARKER, pos):
+                if FRAME_MARKER.startswith(buf[pos:]):
+                    break  # marker itself is split
+                resync = buf.find(FRAME_MARKER, pos)
+                self.errors += 1
+                if resync < 0:
+                    pos = size_end
+                    break
+                pos = resync
+                continue
+            length_end = buf.find(FRAME_MARKER, pos + 3)
+            if length_end < 0:
+                break
+            try:
+                length = int(buf[pos + 3:length_end])
+            except ValueError:
+                self.errors += 1
+                pos = length_end
+                continue
+            start = length_end + 3
+            if start + length > size_end:
+                break
+            frames.append(buf[start:start + length])
+            pos = start + length
+        self._buffer = buf[pos:]
+        return frames
+
+    def reset(self):
+        self._buffer = ''
+
+
+class TradingViewWebSocketFeed:
+    """Latest quotes and bars for subscribed TradingView symbols"""
+
+    def __init__(self, url: str = TV_WS_URL, bar_interval: str = DEFAULT_BAR_INTERVAL,
+                 bar_count: int = DEFAULT_BAR_COUNT, series_per_chart: int = SERIES_PER_CHART_SESSION,
+                 stale_after: float = 120.0, max_backoff: float = 60.0,
+                 max_symbols: int = MAX_QUOTE_SYMBOLS, max_series: int = MAX_CHART_SERIES):
+        self.url = url
+        self.bar_interval = bar_interval
+        self.bar_count = bar_count
+        self.series_per_chart = series_per_chart
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+        self.max_symbols = max_symbols
+        self.max_series = max_series
+
+        self.symbols: List[str] = []          # quote subscriptions, in order
+        self.bar_symbols: List[str] = []      # symbols that also get a chart series
+        self.quotes: Dict[str, Dict] = {}
+        self.bars: Dict[str, Dict] = {}
+        self.errored: Dict[str, float] = {}   # symbol -> when TradingView rejected it
+        self.quote_session = _session_id('qs_')
+        self.chart_sessions: List[str] = []
+        self._series: Dict[str, str] = {}     # series id -> symbol
+        self._series_session: Dict[str, str] = {}  # series id -> chart session
+        self._session_load: Dict[str, int] = {}    # chart session -> live series
+        self._series_seq = 0
+        self._recent: 'OrderedDict[str, None]' = OrderedDict()       # quote symbols, least recently used first
+        self._recent_bars: 'OrderedDict[str, None]' = OrderedDict()  # charted symbols, likewise
+        self._sent = (set(), set())
+        self._pending_removals: List[str] = []
+        self.parser = FrameParser()
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._running = False
+        self._connected = threading.Event()
+
+        self.stats = {
+            'frames': 0,
+            'quote_updates': 0,
+            'bar_updates': 0,
+            'heartbeats': 0,
+            'reconnects': 0,
+            'parse_errors': 0,
+            'rejected_symbols': 0,
+            'errored_symbols': 0,
+            'evictions': 0,
+            'connected_since': None
+        }
+
+    # ---- subscriptions -------------------------------------------------------
+
+    def subscribe(self, symbols: Iterable[str], exchange: str = 'BINANCE', bars: bool = False) -> List[str]:
+        """Add symbols to the quote session (and a chart series when `bars`); any thread.
+
+        Malformed symbols and ones TradingView recently rejected are skipped.
+        When the quote or chart budget is full, the least recently read
+        symbol makes room.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        new_quotes, new_bars, evicted_quotes, evicted_bars = [], [], [], []
+        now = time.time()
+        with self._lock:
+            for symbol in symbols:
+                tv_symbol = to_tv_symbol(symbol, exchange) if isinstance(symbol, str) and symbol.strip() else ''
+                if not TV_SYMBOL_PATTERN.match(tv_symbol) or now - self.errored.get(tv_symbol, 0) < ERROR_RETRY_SECONDS:
+                    self.stats['rejected_symbols'] += 1
+                    continue
+                self.errored.pop(tv_symbol, None)
+                if tv_symbol in self.quotes:
+                    self._recent.move_to_end(tv_symbol)
+                else:
+                    if len(self.symbols) >= self.max_symbols:
+                        oldest, _ = self._recent.popitem(last=False)
+                        evicted_quotes.append(oldest)
+                        self._drop(oldest)
+                    self.symbols.append(tv_symbol)
+                    self.quotes[tv_symbol] = {}
+                    self._recent[tv_symbol] = None
+                    new_quotes.append(tv_symbol)
+                if not bars:
+                    continue
+                if tv_symbol in self.bars:
+                    self._recent_bars.move_to_end(tv_symbol)
+                else:
+                    if len(self.bar_symbols) >= self.max_series:
+                        oldest, _ = self._recent_bars.popitem(last=False)
+                        evicted_bars.append(oldest)
+                        self._drop(oldest, bars_only=True)
+                    self.bar_symbols.append(tv_symbol)
+                    self.bars[tv_symbol] = {'bars': {}}
+                    self._recent_bars[tv_symbol] = None
+                    new_bars.append(tv_symbol)
+            # A symbol added and evicted within this call was never sent
+            new_quotes = [s for s in new_quotes if s in self.quotes]
+            new_bars = [s for s in new_bars if s in self.bars]
+            self.stats['evictions'] += len(evicted_quotes) + len(evicted_bars)
+            frames = self._subscription_frames(new_quotes, new_bars) if (new_quotes or new_bars) else []
+            # Decided under the lock so nothing falls between session_frames() and going live
+            live = self._connected.is_set()
+            frames = self._take_removals(live) + frames
+
+        if frames and self._loop and live:
+            asyncio.run_coroutine_threadsafe(self._send(frames), self._loop)
+        return new_quotes
+
+    def _drop(self, tv_symbol: str, bars_only: bool = False):
+        """Forget a symbol's chart series (and its quote unless `bars_only`), queueing the remove frames; lock held"""
+        if tv_symbol in self.bars:
+            del self.bars[tv_symbol]
+            self.bar_symbols.remove(tv_symbol)
+            self._recent_bars.pop(tv_symbol, None)
+            for series_id in [sid for sid, sym in self._series.items() if sym == tv_symbol]:
+                session = self._series_session.pop(series_id)
+                del self._series[series_id]
+                self._session_load[session] -= 1
+                self._pending_removals.append(encode_frame('remove_series', [session, series_id]))
+        if not bars_only and tv_symbol in self.quotes:
+            del self.quotes[tv_symbol]
+            self.symbols.remove(tv_symbol)
+            self._recent.pop(tv_symbol, None)
+            self._pending_removals.append(encode_frame('quote_remove_symbols', [self.quote_session, tv_symbol]))
+
+    def _take_removals(self, live: bool) -> List[str]:
+        """Queued remove frames, for sending now when live; lock held.
+
+        While disconnected they are dropped: the next session_frames() only
+        subscribes what is still wanted.
+        """
+        frames = self._pending_removals if live else []
+        self._pending_removals = []
+        return frames
+
+    def session_frames(self) -> List[str]:
+        """Everything sent right after connecting: auth, sessions and all subscriptions"""
+        with self._lock:
+            self.chart_sessions = []
+            self._series = {}
+            self._series_session = {}
+            self._session_load = {}
+            self._series_seq = 0
+            self._pending_removals = []
+            frames = [
+                encode_frame('set_auth_token', ['unauthorized_user_token']),
+                encode_frame('quote_create_session', [self.quote_session]),
+                encode_frame('quote_set_fields', [self.quote_session] + QUOTE_FIELDS)
+            ]
+            self._sent = (set(self.symbols), set(self.bar_symbols))
+            return frames + self._subscription_frames(list(self.symbols), list(self.bar_symbols))
+
+    def _go_live(self) -> List[str]:
+        """Mark connected; returns changes made while the session frames were in flight"""
+        with self._lock:
+            quotes_sent, bars_sent = self._sent
+            frames = self._take_removals(True) + self._subscription_frames(
+                [s for s in self.symbols if s not in quotes_sent], [s for s in self.bar_symbols if s not in bars_sent])
+            self._connected.set()
+            return frames
+
+    def _subscription_frames(self, quote_symbols: List[str], bar_symbols: List[str]) -> List[str]:
+        frames = []
+        if quote_symbols:
+            # One message for the whole batch
+            frames.append(encode_frame('quote_add_symbols', [self.quote_session] + quote_symbols))
+        for tv_symbol in bar_symbols:
+            # Fill chart sessions that evictions left room in before opening another
+            session = next((cs for cs in self.chart_sessions if self._session_load[cs] < self.series_per_chart), None)
+            if session is None:
+                session = _session_id('cs_')
+                self.chart_sessions.append(session)
+                self._session_load[session] = 0
+                frames.append(encode_frame('chart_create_session', [session, '']))
+            self._series_seq += 1
+            n = self._series_seq
+            series_id, symbol_ref = f"sds_{n}", f"sds_sym_{n}"
+            self._series[series_id] = tv_symbol
+            self._series_session[series_id] = session
+            self._session_load[session] += 1
+            frames.append(encode_frame('resolve_symbol', [
+                session, symbol_ref, '=' + json.dumps({'symbol': tv_symbol, 'adjustment': 'splits'})]))
+            frames.append(encode_frame('create_series', [
+                session, series_id, f"s{n}", symbol_ref, self.bar_interval, self.bar_count, '']))
+        return frames
+
+    async def _send(self, frames: List[str]):
+        ws = self._ws
+        if ws is None:
+            return
+        for frame in frames:
+            await ws.send(frame)
+
+    # ---- lifecycle -----------------------------------------------------------
+
+    def start(self, wait: float = 0) -> bool:
+        """Start the background thread; optionally wait for the first connect"""
+        if not WEBSOCKETS_AVAILABLE:
+            logger.warning("⚠️ websockets not installed - TradingView WS feed disabled")
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        self._running = True
+        self._thread = threading.Thread(target=self._run_thread, name='tradingview-ws-feed', daemon=True)
+        self._thread.start()
+        if wait:
+            self._connected.wait(wait)
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._loop and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run_thread(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        backoff = 1.0
+        while self._running:
+            try:
+                async with websockets.connect(self.url, origin=TV_WS_ORIGIN, ping_interval=None,
+                                              max_size=2 ** 23) as ws:
+                    self._ws = ws
+                    self.parser.reset()
+                    frames = self.session_frames()
+                    await self._send(frames)
+                    await self._send(self._go_live())
+                    self.stats['connected_since'] = time.time()
+                    backoff = 1.0
+                    logger.info(f"✅ TradingView WS connected - {len(self.symbols)} quotes, "
+                                f"{len(self.bar_symbols)} series in {len(self.chart_sessions)} chart sessions")
+                    async for message in ws:
+                        for reply in self.handle_message(message):
+                            await ws.send(reply)
+                        if not self._running:
+                            break
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"⚠️ TradingView WS disconnected: {e}")
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            if self._running:
+                # Reconnect with exponential backoff; sessions and symbols are recreated on connect
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(backoff * (1 + random.random() * 0.25))
+                backoff = min(backoff * 2, self.max_backoff)
+
+    # ---- message handling ----------------------------------------------------
+
+    def handle_message(self, message) -> List[str]:
+        """Apply one socket message; returns frames to send back (heartbeat echoes, unsubscribes)"""
+        if isinstance(message, (bytes, bytearray)):
+            message = bytes(message).decode('utf-8', errors='replace')
+        replies = []
+        for payload in self.parser.feed(message):
+            self.stats['frames'] += 1
+            if payload.startswith(HEARTBEAT_PREFIX):
+                self.stats['heartbeats'] += 1
+                replies.append(f"{FRAME_MARKER}{len(payload)}{FRAME_MARKER}{payload}")
+                continue
+            try:
+                packet = json.loads(payload)
+            except ValueError:
+                self.stats['parse_errors'] += 1
+                continue
+            if isinstance(packet, dict):
+                replies.extend(self._apply(packet.get('m'), packet.get('p') or []))
+        if self.parser.errors:
+            self.stats['parse_errors'] += self.parser.errors
+            self.parser.errors = 0
+        return replies
+
+    def _apply(self, method: Optional[str], params: List) -> List[str]:
+        """Apply one packet; returns frames to send back (unsubscribing symbols TradingView rejected)"""
+        if method == 'qsd' and len(params) > 1 and isinstance(params[1], dict):
+            update = params[1]
+            values = update.get('v') or {}
+            tv_symbol = update.get('n')
+            if not tv_symbol:
+                return []
+            with self._updated:
+                if update.get('s') == 'error':
+                    if tv_symbol in self.quotes:
+                        logger.info(f"TradingView rejected {tv_symbol}, unsubscribing")
+                        now = time.time()
+                        self.errored = {s: at for s, at in self.errored.items() if now - at < ERROR_RETRY_SECONDS}
+                        self.errored[tv_symbol] = now
+                        self.stats['errored_symbols'] += 1
+                        self._drop(tv_symbol)
+                    return self._take_removals(True)
+                quote = self.quotes.get(tv_symbol)
+                if quote is None:
+                    return []  # no longer subscribed
+                quote.update(values)
+                quote['received_at'] = time.monotonic()
+                self.stats['quote_updates'] += 1
+                self._updated.notify_all()
+        elif method in ('timescale_update', 'du') and len(params) > 1 and isinstance(params[1], dict):
+            with self._updated:
+                for series_id, series in params[1].items():
+                    tv_symbol = self._series.get(series_id)
+                    if not tv_symbol or not isinstance(series, dict):
+                        continue
+                    entry = self.bars.get(tv_symbol)
+                    if entry is None:
+                        continue
+                    bars = entry['bars']
+                    for point in series.get('s') or []:
+                        values = point.get('v') or []
+                        if len(values) >= 5:
+                            bars[int(values[0])] = [float(v) for v in values[1:6]]
+                    if len(bars) > self.bar_count:
+                        for stamp in sorted(bars)[:len(bars) - self.bar_count]:
+                            del bars[stamp]
+                    entry['received_at'] = time.monotonic()
+                    self.stats['bar_updates'] += 1
+                self._updated.notify_all()
+        return []
+
+    # ---- reads ---------------------------------------------------------------
+
+    def _fresh(self, entry: Optional[Dict], max_age: Optional[float]) -> bool:
+        if not entry or 'received_at' not in entry:
+            return False
+        max_age = self.stale_after if max_age is None else max_age
+        return time.monotonic() - entry['received_at'] <= max_age
+
+    def get_quote(self, symbol: str, exchange: str = 'BINANCE', max_age: Optional[float] = None) -> Optional[Dict]:
+        """Latest quote fields plus the last bar (when charted), or None if missing/stale"""
+        tv_symbol = to_tv_symbol(symbol, exchange)
+        with self._lock:
+            quote = self.quotes.get(tv_symbol)
+            if not self._fresh(quote, max_age) or quote.get('lp') is None:
+                return None
+            self._recent.move_to_end(tv_symbol)
+            data = {
+                'price': quote.get('lp'),
+                'change': quote.get('ch'),
+                'change_percent': quote.get('chp'),
+                'volume': quote.get('volume'),
+                'bid': quote.get('bid'),
+                'ask': quote.get('ask'),
+                'high': quote.get('high_price'),
+                'low': quote.get('low_price'),
+                'age_seconds': round(time.monotonic() - quote['received_at'], 3)
+            }
+            bars = (self.bars.get(tv_symbol) or {}).get('bars')
+            if bars:
+                open_, high, low, close, volume = (bars[max(bars)] + [None] * 5)[:5]
+                data['ohlcv'] = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+        return data
+
+    def get_bars(self, symbol: str, exchange: str = 'BINANCE') -> List[List[float]]:
+        """[[time, open, high, low, close, volume], ...] oldest first"""
+        with self._lock:
+            bars = dict((self.bars.get(to_tv_symbol(symbol, exchange)) or {}).get('bars') or {})
+        return [[stamp] + values for stamp, values in sorted(bars.items())]
+
+    def get_quotes(self, symbols: Iterable[str], exchange: str = 'BINANCE', wait: float = 1.5,
+                   bars: bool = False) -> Dict[str, Dict]:
+        """Subscribe whatever is missing, wait up to `wait` seconds for first quotes, return what's there"""
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        self.subscribe(symbols, exchange, bars=bars)
+        if not (self._thread and self._thread.is_alive()):
+            self.start()
+        wanted: List[Tuple[str, str]] = [(symbol, to_tv_symbol(symbol, exchange)) for symbol in symbols]
+        deadline = time.monotonic() + wait
+        with self._updated:
+            while True:
+                missing = [tv for _, tv in wanted if not self._fresh(self.quotes.get(tv), None)]
+                remaining = deadline - time.monotonic()
+                if not missing or remaining <= 0:
+                    break
+                self._updated.wait(remaining)
+        results = {}
+        for symbol, _ in wanted:
+            quote = self.get_quote(symbol, exchange)
+            if quote:
+                results[symbol] = quote
+        return results
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            fresh = sum(1 for quote in self.quotes.values() if self._fresh(quote, None))
+            return {
+                'connected': self._connected.is_set(),
+                'url': self.url,
+                'quote_symbols': len(self.symbols),
+                'chart_series': len(self.bar_symbols),
+                'chart_sessions': len(self.chart_sessions),
+                'max_symbols': self.max_symbols,
+                'max_series': self.max_series,
+                'errored_symbols': len(self.errored),
+                'fresh_quotes': fresh,
+                'stats': self.stats.copy()
+            }
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_tradingview_ws_feed(start: bool = True) -> Optional[TradingViewWebSocketFeed]:
+    """Shared feed; TV_WS_ENABLED=false disables it"""
+    global _feed
+    if os.getenv('TV_WS_ENABLED', 'true').lower() != 'true' or not WEBSOCKETS_AVAILABLE:
+        return None
+    with _feed_lock:
+        if _feed is None:
+            _feed = TradingViewWebSocketFeed(url=os.getenv('TV_WS_URL', TV_WS_URL))
+        if start:
+            _feed.start()
+    return _feed
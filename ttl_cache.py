@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Bounded LRU + TTL Cache
+Replaces the plain dict caches held by long-lived clients (local TA,
+CoinGecko, DexPaprika, LunarCrush). The TAAPI client in indicators/ is
+deployed on its own and keeps its RateLimitManager cache. Entries expire
+per-entry, the cache is capped by entry count and approximate memory,
+and every instance reports hits/misses/evictions so cache effectiveness
+shows up in /api/cache/stats. Optionally, LRU-evicted entries spill to
+SQLite and are promoted back on the next miss.
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import itertools
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from service_base import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+CACHE_SPILL_PATH = os.getenv('CACHE_SPILL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 'cache_spill.db'))
+
+_MISSING = object()
+
+# Every live cache, by creation order (names may repeat across instances), for /api/cache/stats
+_registry: 'weakref.WeakValueDictionary[int, TTLCache]' = weakref.WeakValueDictionary()
+_registry_serial = itertools.count()
+_registry_lock = threading.Lock()
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate in-memory size of a cached value in bytes.
+
+    DataFrames/ndarrays report their own buffer sizes; containers are walked
+    a few levels deep. Good enough to keep a cache in the right ballpark.
+    """
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except Exception:
+            pass
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in value)
+    return size
+
+
+class _SpillStore(SQLiteStore):
+    """SQLite table holding entries evicted from memory (values pickled)"""
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_spill (
+                cache TEXT,
+                key TEXT,
+                value BLOB,
+                expires_at REAL,
+                PRIMARY KEY (cache, key)
+            )
+        ''')
+
+    def put(self, cache: str, key: str, value: Any, expires_at: float):
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO cache_spill (cache, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                     (cache, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at))
+        conn.commit()
+
+    def pop(self, cache: str, key: str):
+        """(value, expires_at) if present and fresh, else None; the row is removed either way"""
+        conn = self._conn()
+        row = conn.execute('SELECT value, expires_at FROM cache_spill WHERE cache = ? AND key = ?',
+                           (cache, key)).fetchone()
+        if row is None:
+            return None
+        conn.execute('DELETE FROM cache_spill WHERE cache = ? AND key = ?', (cache, key))
+        conn.commit()
+        if row[1] <= time.time():
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def delete(self, cache: str, key: Optional[str] = None):
+        conn = self._conn()
+        if key is None:
+            conn.execute('DELETE FROM cache_spill WHERE cache = ?', (cache,))
+        else:
+            conn.execute('DELETE FROM cache_spill WHERE cache = ? AND key = ?', (cache, key))
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        conn = self._conn()
+        cursor = conn.execute('DELETE FROM cache_spill WHERE expires_at <= ?', (time.time(),))
+        conn.commit()
+        return cursor.rowcount
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and size/memory bounds"""
+
+    def __init__(self, name: str, ttl: float = 300, max_entries: int = 1024,
+                 max_bytes: Optional[int] = None, spill: bool = False,
+                 spill_path: str = CACHE_SPILL_PATH):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._spill = None
+        if spill:
+            try:
+                self._spill = _SpillStore(spill_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Cache {name}: SQLite spill-over disabled: {e}")
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'spill_writes': 0,
+            'spill_hits': 0
+        }
+        with _registry_lock:
+            _registry[next(_registry_serial)] = self
+
+    # ---- internals ---------------------------------------------------------
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _enforce_bounds(self):
+        while self._data and (len(self._data) > self.max_entries
+                              or (self.max_bytes and self._bytes > self.max_bytes and len(self._data) > 1)):
+            key, (expires_at, size, value) = self._data.popitem(last=False)
+            self._bytes -= size
+            if expires_at <= time.time():
+                self.stats['expirations'] += 1
+                continue
+            self.stats['evictions'] += 1
+            if self._spill is not None:
+                try:
+                    self._spill.put(self.name, repr(key), value, expires_at)
+                    self.stats['spill_writes'] += 1
+                except Exception as e:
+                    logger.debug(f"Cache {self.name}: spill write failed for {key!r}: {e}")
+
+    # ---- public API --------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._data.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[2]
+                self._remove(key)
+                self.stats['expirations'] += 1
+
+            if self._spill is not None:
+                try:
+                    spilled = self._spill.pop(self.name, repr(key))
+                except Exception as e:
+                    logger.debug(f"Cache {self.name}: spill read failed for {key!r}: {e}")
+                    spilled = None
+                if spilled is not None:
+                    value, expires_at = spilled
+                    self._store(key, value, expires_at)
+                    self.stats['hits'] += 1
+                    self.stats['spill_hits'] += 1
+                    return value
+
+            self.stats['misses'] += 1
+            return default
+
+    def _store(self, key: Hashable, value: Any, expires_at: float):
+        if key in self._data:
+            self._remove(key)
+        size = estimate_size(value)
+        self._data[key] = (expires_at, size, value)
+        self._bytes += size
+        self._enforce_bounds()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store `value`; `ttl` overrides the cache default for this entry"""
+        with self._lock:
+            self._store(key, value, time.time() + (ttl if ttl is not None else self.ttl))
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None,
+                   cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Cached value, or factory() stored when `cache_if(value)` allows (default: not None)"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = factory()
+        if (cache_if(value) if cache_if else value is not None):
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self._spill is not None:
+                self._spill.delete(self.name, repr(key))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            if self._spill is not None:
+                self._spill.delete(self.name)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries now instead of waiting for them to be looked up"""
+        with self._lock:
+            now = time.time()
+            expired = [key for key, (expires_at, _, _) in self._data.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.stats['expirations'] += len(expired)
+            if self._spill is not None:
+                self._spill.purge_expired()
+            return len(expired)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.time()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['entries'] = len(self._data)
+            stats['approx_bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats.update({
+            'ttl_seconds': self.ttl,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'spill': self._spill is not None
+        })
+        return stats
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    """Stats for every live TTLCache, keyed by cache name; later instances sharing a name get name#2, name#3..."""
+    with _registry_lock:
+        caches = [cache for _, cache in sorted(_registry.items())]
+    stats, seen = {}, {}
+    for cache in caches:
+        seen[cache.name] = seen.get(cache.name, 0) + 1
+        stats[cache.name if seen[cache.name] == 1 else f"{cache.name}#{seen[cache.name]}"] = cache.get_stats()
+    return stats